@@ -25,6 +25,7 @@ def setup(
     signer=None,
     transport_timeout_s=DEFAULT_TRANSPORT_TIMEOUT_S,
     log_errors=True,
+    profile_cache=None,
 ):
     """Connect to a device and determine whether it's an Android TV or an Amazon Fire TV.
 
@@ -52,6 +53,8 @@ def setup(
         Transport timeout (in seconds)
     log_errors: bool
         Whether connection errors should be logged
+    profile_cache : androidtv.profile_cache.ProfileCache, None
+        If provided, the device properties and installed apps are loaded from this cache when the device has not changed
 
     Returns
     -------
@@ -62,15 +65,13 @@ def setup(
     if device_class == "androidtv":
         atv = AndroidTVSync(host, port, adbkey, adb_server_ip, adb_server_port, state_detection_rules, signer)
         atv.adb_connect(log_errors=log_errors, auth_timeout_s=auth_timeout_s, transport_timeout_s=transport_timeout_s)
-        atv.get_device_properties()
-        atv.get_installed_apps()
+        _discover(atv, profile_cache)
         return atv
 
     if device_class == "firetv":
         ftv = FireTVSync(host, port, adbkey, adb_server_ip, adb_server_port, state_detection_rules, signer)
         ftv.adb_connect(log_errors=log_errors, auth_timeout_s=auth_timeout_s, transport_timeout_s=transport_timeout_s)
-        ftv.get_device_properties()
-        ftv.get_installed_apps()
+        _discover(ftv, profile_cache)
         return ftv
 
     if device_class != "auto":
@@ -81,11 +82,8 @@ def setup(
     # establish the ADB connection
     aftv.adb_connect(log_errors=log_errors, auth_timeout_s=auth_timeout_s, transport_timeout_s=transport_timeout_s)
 
-    # get device properties
-    aftv.device_properties = aftv.get_device_properties()
-
-    # get the installed apps
-    aftv.get_installed_apps()
+    # get the device properties and the installed apps
+    _discover(aftv, profile_cache)
 
     # Fire TV
     if aftv.device_properties.get("manufacturer") == "Amazon":
@@ -95,6 +93,24 @@ def setup(
     return AndroidTVSync.from_base(aftv)
 
 
+def _discover(aftv, profile_cache):
+    """Get the device properties and the installed apps, using the profile cache if one is provided.
+
+    Parameters
+    ----------
+    aftv : BaseTVSync
+        The device
+    profile_cache : androidtv.profile_cache.ProfileCache, None
+        The profile cache
+
+    """
+    if profile_cache is not None:
+        aftv.get_device_profile(profile_cache)
+    else:
+        aftv.get_device_properties()
+        aftv.get_installed_apps()
+
+
 def ha_state_detection_rules_validator(exc):
     """Validate the rules (i.e., the ``state_detection_rules`` value) for a given app ID (i.e., a key in ``state_detection_rules``).
 
@@ -1,32 +1,56 @@
 """Classes to manage ADB connections.
 
 * :py:class:`ADBPythonAsync` utilizes a Python implementation of the ADB protocol.
-* :py:class:`ADBServerAsync` utilizes an ADB server to communicate with the device.
+* :py:class:`ADBServerAsync` utilizes an ADB server to communicate with the device, via the ``asyncio``-based :py:class:`ClientAsync`.
 
 """
 
 import asyncio
 from contextlib import asynccontextmanager
+import heapq
+import itertools
 import logging
+import os
+import re
+import stat
+import struct
+import uuid
+import weakref
 
 from adb_shell.adb_device import AdbDeviceUsb
 from adb_shell.adb_device_async import AdbDeviceTcpAsync
+from adb_shell.adb_message import AdbMessage
 from adb_shell.auth.sign_pythonrsa import PythonRSASigner
-from adb_shell.constants import DEFAULT_PUSH_MODE, DEFAULT_READ_TIMEOUT_S
+from adb_shell.constants import CLSE, DEFAULT_PUSH_MODE, DEFAULT_READ_TIMEOUT_S, OKAY, WRTE
 import aiofiles
 import async_timeout
-from ppadb.client import Client
 
 from ..constants import (
+    CMD_EXEC_OUT_PROBE,
+    COMMAND_PRIORITIES,
+    DEFAULT_ADB_SERVER_MAX_CONNECTIONS,
     DEFAULT_ADB_TIMEOUT_S,
     DEFAULT_AUTH_TIMEOUT_S,
+    DEFAULT_EXEC_OUT_PROBE_TIMEOUT_S,
     DEFAULT_LOCK_TIMEOUT_S,
+    DEFAULT_LOCK_TIMEOUTS_S,
+    DEFAULT_MAX_CONCURRENT_HANDSHAKES,
+    DEFAULT_SINGLE_FLIGHT_TTL_S,
     DEFAULT_TRANSPORT_TIMEOUT_S,
+    PRIORITY_BULK,
+    PRIORITY_CONTROL,
+    PRIORITY_POLL,
+    SINGLE_FLIGHT_COMMANDS,
 )
 from ..exceptions import LockNotAcquiredException
+from ..metrics import command_name, measure
 
 _LOGGER = logging.getLogger(__name__)
 
+#: The signers loaded by :meth:`ADBPythonAsync.load_adbkey`, keyed by the path to the ``adbkey`` file; the values are
+#: ``(modification time, signer)`` tuples
+_SIGNERS = {}
+
 
 class AdbDeviceUsbAsync:
     """An async wrapper for the adb-shell ``AdbDeviceUsb`` class."""
@@ -56,6 +80,14 @@ class AdbDeviceUsbAsync:
             None, self._adb.connect, rsa_keys, transport_timeout_s, auth_timeout_s, read_timeout_s, auth_callback
         )
 
+    async def exec_out(
+        self, command, transport_timeout_s=None, read_timeout_s=DEFAULT_READ_TIMEOUT_S, timeout_s=None, decode=True
+    ):
+        """Send an ADB ``exec-out`` command to the device."""
+        return await asyncio.get_running_loop().run_in_executor(
+            None, self._adb.exec_out, command, transport_timeout_s, read_timeout_s, timeout_s, decode
+        )
+
     async def pull(
         self,
         device_path,
@@ -101,54 +133,913 @@ class AdbDeviceUsbAsync:
         )
 
 
+class _AdbServerConnectionAsync:
+    """A socket connection to an ADB server.
+
+    The ADB server hands each socket over to a single service (e.g., ``shell:``), so a connection cannot be reused
+    after that service has been requested.
+
+    Parameters
+    ----------
+    reader : asyncio.StreamReader
+        The reader for the socket
+    writer : asyncio.StreamWriter
+        The writer for the socket
+
+    """
+
+    def __init__(self, reader, writer):
+        self._reader = reader
+        self._writer = writer
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    @classmethod
+    async def open(cls, host, port):
+        """Open a socket connection to an ADB server.
+
+        Parameters
+        ----------
+        host : str
+            The IP address of the ADB server
+        port : int
+            The port for the ADB server
+
+        Returns
+        -------
+        _AdbServerConnectionAsync
+            The connection
+
+        Raises
+        ------
+        RuntimeError
+            The connection could not be established
+
+        """
+        try:
+            reader, writer = await asyncio.open_connection(host, port)
+        except OSError as exc:
+            raise RuntimeError(
+                "ERROR: connecting to {}:{} {}.\nIs adb running on your computer?".format(host, port, exc)
+            ) from exc
+
+        return cls(reader, writer)
+
+    async def close(self):
+        """Close the socket."""
+        self._writer.close()
+        try:
+            await self._writer.wait_closed()
+        except OSError:
+            pass
+
+    async def read(self, length):
+        """Read exactly ``length`` bytes."""
+        return await self._reader.readexactly(length)
+
+    async def read_chunk(self, length):
+        """Read up to ``length`` bytes, or an empty ``bytes`` object if the ADB server closed the socket."""
+        return await self._reader.read(length)
+
+    async def read_all(self):
+        """Read until the ADB server closes the socket."""
+        return await self._reader.read()
+
+    async def readline(self):
+        """Read one line, or an empty ``bytes`` object if the ADB server closed the socket."""
+        return await self._reader.readline()
+
+    async def write(self, data):
+        """Write data to the socket."""
+        self._writer.write(data)
+        await self._writer.drain()
+
+    async def receive(self):
+        """Read a length-prefixed response from the ADB server."""
+        length = int(await self.read(4), 16)
+        return (await self.read(length)).decode("utf-8")
+
+    async def send(self, request):
+        """Send a length-prefixed request to the ADB server and check that it succeeded.
+
+        Parameters
+        ----------
+        request : str
+            The request, e.g. ``'host:devices'`` or ``'shell:ls'``
+
+        """
+        data = request.encode("utf-8")
+        await self.write("{:04X}".format(len(data)).encode("utf-8") + data)
+        await self.check_status()
+
+    async def check_status(self):
+        """Read the status of the last request.
+
+        Raises
+        ------
+        RuntimeError
+            The status was not ``OKAY``
+
+        """
+        status = await self.read(4)
+        if status != b"OKAY":
+            error = await self._reader.read(1024)
+            raise RuntimeError("ERROR: {} {}".format(repr(status.decode("utf-8")), error.decode("utf-8")))
+
+
 class DeviceAsync:
-    """An async wrapper for the pure-python-adb ``Device`` class."""
+    """A device that is connected to an ADB server.
+
+    Parameters
+    ----------
+    client : ClientAsync
+        The client for the ADB server
+    serial : str
+        The serial of the device, e.g. ``'192.168.0.111:5555'``
+
+    """
+
+    #: The maximum length of the data in a ``sync:`` ``DATA`` message
+    SYNC_DATA_MAX_LENGTH = 65536
+
+    #: The maximum size of the chunks that are yielded by :meth:`streaming_exec_out`
+    STREAMING_CHUNK_SIZE = 65536
+
+    def __init__(self, client, serial):
+        self._client = client
+        self.serial = serial
+
+    @asynccontextmanager
+    async def _service(self, service, streaming=False):
+        """Open a connection to the ADB server, switch it to this device, and request a service.
+
+        Parameters
+        ----------
+        service : str
+            The service, e.g. ``'shell:ls'`` or ``'sync:'``
+        streaming : bool
+            Whether the connection will be held open for a stream (see :meth:`ClientAsync.connection`)
+
+        Yields
+        ------
+        _AdbServerConnectionAsync
+            The connection, which is closed afterwards
+
+        """
+        async with self._client.connection(streaming) as conn:
+            await conn.send("host:transport:{}".format(self.serial))
+            await conn.send(service)
+            yield conn
+
+    async def exec_out(self, cmd):
+        """Send a command via the ``exec:`` service, which does not modify the output.
+
+        Parameters
+        ----------
+        cmd : str
+            The command
+
+        Returns
+        -------
+        bytes
+            The output of the command
 
-    def __init__(self, device):
-        self._device = device
+        Raises
+        ------
+        RuntimeError
+            The device does not support the ``exec:`` service
+
+        """
+        async with self._service("exec:{}".format(cmd)) as conn:
+            return await conn.read_all()
 
     async def pull(self, device_path, local_path):
-        """Download a file."""
-        return await asyncio.get_running_loop().run_in_executor(None, self._device.pull, device_path, local_path)
+        """Download a file.
 
-    async def push(self, local_path, device_path):
-        """Upload a file."""
-        return await asyncio.get_running_loop().run_in_executor(None, self._device.push, local_path, device_path)
+        Parameters
+        ----------
+        device_path : str
+            The file on the device that will be pulled
+        local_path : str
+            The path where the file will be saved
+
+        Returns
+        -------
+        str, None
+            The error message from the device, if the pull failed
+
+        """
+        async with self._service("sync:") as conn, aiofiles.open(local_path, "wb") as f:
+            path = device_path.encode("utf-8")
+            await conn.write(b"RECV" + struct.pack("<I", len(path)) + path)
+
+            while True:
+                flag = await conn.read(4)
+                length = struct.unpack("<I", await conn.read(4))[0]
 
-    async def screencap(self):
-        """Take a screencap."""
-        return await asyncio.get_running_loop().run_in_executor(None, self._device.screencap)
+                if flag == b"DATA":
+                    await f.write(await conn.read(length))
+                elif flag == b"DONE":
+                    return None
+                else:
+                    return (await conn.read(length)).decode("utf-8")
 
-    async def shell(self, cmd):
-        """Send a shell command."""
-        return await asyncio.get_running_loop().run_in_executor(None, self._device.shell, cmd)
+    async def push(self, local_path, device_path, mode=0o644):
+        """Upload a file or directory.
+
+        Parameters
+        ----------
+        local_path : str
+            The file or directory that will be pushed to the device
+        device_path : str
+            The path where the file will be saved on the device
+        mode : int
+            The permissions for the file
+
+        """
+        if not os.path.exists(local_path):
+            raise FileNotFoundError("Cannot find {}".format(local_path))
+
+        if os.path.isdir(local_path):
+            basename = os.path.basename(local_path)
+            for root, _, files in os.walk(local_path):
+                root_dir_path = os.path.join(basename, root.replace(local_path, ""))
+                await self.shell("mkdir -p {}/{}".format(device_path, root_dir_path))
+
+                for item in files:
+                    await self.push(os.path.join(root, item), os.path.join(device_path, root_dir_path, item), mode)
+            return
+
+        timestamp = int(os.stat(local_path).st_mtime)
+        args = "{},{}".format(device_path, mode | stat.S_IFREG).encode("utf-8")
+
+        async with self._service("sync:") as conn, aiofiles.open(local_path, "rb") as f:
+            await conn.write(b"SEND" + struct.pack("<I", len(args)) + args)
+
+            while True:
+                chunk = await f.read(self.SYNC_DATA_MAX_LENGTH)
+                if not chunk:
+                    break
+                await conn.write(b"DATA" + struct.pack("<I", len(chunk)) + chunk)
+
+            await conn.write(b"DONE" + struct.pack("<I", timestamp))
+            await conn.check_status()
+
+    async def screencap(self, raw=False):
+        """Take a screencap.
+
+        Parameters
+        ----------
+        raw : bool
+            Whether to get the raw framebuffer (see :mod:`androidtv.screencap`) instead of a .png image
+
+        Returns
+        -------
+        bytes
+            The screencap as a binary .png image or the raw framebuffer
+
+        """
+        async with self._service("shell:/system/bin/screencap" if raw else "shell:/system/bin/screencap -p") as conn:
+            result = await conn.read_all()
+
+        if not raw and result and len(result) > 5 and result[5] == 0x0D:
+            return result.replace(b"\r\n", b"\n")
+        return result
+
+    async def shell(self, cmd, decode=True):
+        """Send a shell command.
+
+        Parameters
+        ----------
+        cmd : str
+            The shell command
+        decode : bool
+            Whether to decode the output to a string
+
+        Returns
+        -------
+        str, bytes
+            The output of the command
+
+        """
+        async with self._service("shell:{}".format(cmd)) as conn:
+            result = await conn.read_all()
+
+        return result.decode("utf-8") if decode else result
+
+    async def streaming_exec_out(self, cmd, service="exec"):
+        """Send a command via the ``exec:`` service and yield its output in chunks as it arrives.
+
+        The connection to the ADB server is held until the command exits or the caller stops iterating; it does not
+        count against the client's connection limit.
+
+        Parameters
+        ----------
+        cmd : str
+            The command
+        service : str
+            The service via which the command is sent, i.e., ``'exec'`` or (for devices that do not support it)
+            ``'shell'``
+
+        Yields
+        ------
+        bytes
+            Each chunk of output, of at most :attr:`STREAMING_CHUNK_SIZE` bytes
+
+        """
+        async with self._service("{}:{}".format(service, cmd), streaming=True) as conn:
+            while True:
+                chunk = await conn.read_chunk(self.STREAMING_CHUNK_SIZE)
+                if not chunk:
+                    return
+                yield chunk
+
+    async def streaming_shell(self, cmd):
+        """Send a shell command and yield its output one line at a time as it arrives.
+
+        The connection to the ADB server is held until the command exits or the caller stops iterating; it does not
+        count against the client's connection limit.
+
+        Parameters
+        ----------
+        cmd : str
+            The shell command
+
+        Yields
+        ------
+        str
+            Each line of output, without the line ending
+
+        """
+        async with self._service("shell:{}".format(cmd), streaming=True) as conn:
+            while True:
+                line = await conn.readline()
+                if not line:
+                    return
+                yield line.decode("utf-8", "backslashreplace").rstrip("\r\n")
 
 
 # pylint: disable=too-few-public-methods
 class ClientAsync:
-    """An async wrapper for the pure-python-adb ``Client`` class."""
+    """A client for an ADB server that uses ``asyncio`` streams.
+
+    The number of simultaneous socket connections to each ADB server is bounded, so that polling a large number of
+    devices via one ADB server does not exhaust its sockets.  Long-lived streaming connections (e.g.,
+    :meth:`DeviceAsync.streaming_shell`) do not count against this limit, so that they cannot starve the commands.
+
+    Parameters
+    ----------
+    host : str
+        The IP address of the ADB server
+    port : int
+        The port for the ADB server
+    max_connections : int
+        The maximum number of simultaneous socket connections to the ADB server (per event loop)
+
+    """
 
-    def __init__(self, host, port):
-        self._client = Client(host, port)
+    #: The connection limits, keyed by event loop and then by ``(host, port)``
+    _semaphores = weakref.WeakKeyDictionary()
+
+    def __init__(self, host, port, max_connections=DEFAULT_ADB_SERVER_MAX_CONNECTIONS):
+        self.host = host
+        self.port = port
+        self.max_connections = max_connections
+
+    def _get_semaphore(self):
+        """Get the semaphore that limits the connections to this ADB server from the running event loop."""
+        semaphores = self._semaphores.setdefault(asyncio.get_running_loop(), {})
+        if (self.host, self.port) not in semaphores:
+            semaphores[(self.host, self.port)] = asyncio.Semaphore(self.max_connections)
+        return semaphores[(self.host, self.port)]
+
+    @asynccontextmanager
+    async def connection(self, streaming=False):
+        """Open a socket connection to the ADB server.
+
+        Parameters
+        ----------
+        streaming : bool
+            Whether the connection will be held open for a stream, in which case it does not count against
+            :attr:`max_connections`
+
+        Yields
+        ------
+        _AdbServerConnectionAsync
+            The connection, which is closed afterwards
+
+        """
+        if streaming:
+            async with await _AdbServerConnectionAsync.open(self.host, self.port) as conn:
+                yield conn
+            return
+
+        async with self._get_semaphore():
+            async with await _AdbServerConnectionAsync.open(self.host, self.port) as conn:
+                yield conn
+
+    async def devices(self):
+        """Get the devices that are connected to the ADB server.
+
+        Returns
+        -------
+        list[DeviceAsync]
+            The connected devices
+
+        """
+        async with self.connection() as conn:
+            await conn.send("host:devices")
+            result = await conn.receive()
+
+        devices = []
+        for line in result.split("\n"):
+            if not line:
+                break
+            devices.append(DeviceAsync(self, line.split()[0]))
+
+        return devices
 
     async def device(self, serial):
-        """Get a ``DeviceAsync`` instance."""
-        dev = await asyncio.get_running_loop().run_in_executor(None, self._client.device, serial)
-        if dev:
-            return DeviceAsync(dev)
+        """Get a ``DeviceAsync`` instance.
+
+        Parameters
+        ----------
+        serial : str
+            The serial of the device, e.g. ``'192.168.0.111:5555'``
+
+        Returns
+        -------
+        DeviceAsync, None
+            The device, or ``None`` if it is not connected to the ADB server
+
+        """
+        for dev in await self.devices():
+            if dev.serial == serial:
+                return dev
         return None
 
 
+class PersistentShellAsync:
+    """A long-lived ``sh`` stream that is used to send shell commands to a device.
+
+    Instead of opening a new ``shell:`` stream for every command, the commands are written to a single ``sh`` process on
+    the device and the end of each response is marked by a unique sentinel.  If the stream is closed, a new one will be
+    opened when the next command is sent.
+
+    Before Android 7, ``adbd`` runs ``sh`` in a PTY, so it is interactive: it prints prompts, the input is echoed, and
+    ``"\n"`` is output as ``"\r\n"``.  When the stream is opened, :attr:`SETUP` turns these off where the device
+    supports it; otherwise, the echoed command is removed from each response and ``"\r\n"`` is converted back to
+    ``"\n"``.
+
+    .. note::
+
+       This uses private methods of the adb-shell ``AdbDeviceAsync`` class.
+
+    Parameters
+    ----------
+    adb : adb_shell.adb_device_async.AdbDeviceAsync
+        The adb-shell device that will be used to open the stream
+    read_timeout_s : float
+        The total time in seconds to wait for a response from the device
+
+    """
+
+    #: The script that is run when a stream is opened, which turns off the echo, the ``"\n"`` -> ``"\r\n"``
+    #: conversion, line editing, and the prompts of a shell that runs in a PTY
+    SETUP = "stty -echo -onlcr 2>/dev/null ; command set +o emacs +o vi 2>/dev/null ; PS1= ; PS2="
+
+    def __init__(self, adb, read_timeout_s=DEFAULT_READ_TIMEOUT_S):
+        self._adb = adb
+        self._read_timeout_s = read_timeout_s
+        self._adb_info = None
+        self._token = uuid.uuid4().hex[:8]
+        self._count = 0
+
+    @property
+    def is_open(self):
+        """Whether or not the ``sh`` stream is open."""
+        return self._adb_info is not None
+
+    def reset(self):
+        """Forget the current stream (e.g., because the ADB connection was closed)."""
+        self._adb_info = None
+
+    async def close(self):
+        """Close the ``sh`` stream, if it is open."""
+        adb_info = self._adb_info
+        self._adb_info = None
+
+        if adb_info and self._adb.available:
+            try:
+                # pylint: disable=protected-access
+                await self._adb._io_manager.send(AdbMessage(CLSE, adb_info.local_id, adb_info.remote_id), adb_info)
+            except Exception:  # pylint: disable=broad-except
+                pass
+
+    def _frame(self, script):
+        """Append a unique sentinel to a script.
+
+        The sentinel is printed via ``printf '%s'``, so that it does not appear in the echoed script.
+
+        Parameters
+        ----------
+        script : str
+            The script
+
+        Returns
+        -------
+        script : bytes
+            The text that will be written to the ``sh`` stream
+        sentinel : re.Pattern
+            Matches the line that marks the end of the script's output, which ends with ``"\n"`` or ``"\r\n"``
+
+        """
+        self._count += 1
+        marker = "{}-{}".format(self._token, self._count)
+        script = "{} ; printf '__ANDROIDTV_EOC_%s__\\n' '{}'\n".format(script, marker)
+        return script.encode("utf8"), re.compile(
+            re.escape("__ANDROIDTV_EOC_{}__".format(marker).encode("utf8")) + b"\r?\n"
+        )
+
+    async def _open(self):
+        """Open a new ``sh`` stream and run :attr:`SETUP`.
+
+        Raises
+        ------
+        ConnectionResetError
+            The stream was closed by the device before it was set up
+
+        """
+        # pylint: disable=protected-access
+        self._adb_info = await self._adb._open(b"shell:sh", None, self._read_timeout_s, None)
+
+        # Discard the prompts and the echo that precede the setup
+        script, sentinel = self._frame(self.SETUP)
+        await self._read(await self._write(script), sentinel)
+        if not self._adb_info:
+            raise ConnectionResetError("The persistent shell stream was closed by the device")
+
+    async def _read(self, output, sentinel):
+        """Read from the ``sh`` stream until the sentinel is received.
+
+        Parameters
+        ----------
+        output : bytearray
+            The output that has already been received
+        sentinel : re.Pattern
+            Matches the line that marks the end of the output (see :meth:`_frame`)
+
+        Returns
+        -------
+        output : bytes
+            The output that precedes the sentinel, or all of the output if the stream was closed first
+        crlf : bool
+            Whether the sentinel ended with ``"\r\n"``, i.e., the shell runs in a PTY
+
+        """
+        # pylint: disable=protected-access
+        match = sentinel.search(output)
+        while not match:
+            cmd, received = await self._adb._read_until([WRTE, CLSE], self._adb_info)
+            if cmd == CLSE:
+                # The `sh` process exited, so return what we have and open a new stream next time
+                self._adb_info = None
+                return bytes(output), False
+
+            # Only search the new data (and the end of the previous data, in case the sentinel spans two messages)
+            start = max(len(output) - len(sentinel.pattern), 0)
+            output += received
+            match = sentinel.search(output, start)
+
+        return bytes(output[: match.start()]), match.group().endswith(b"\r\n")
+
+    async def _write(self, data):
+        """Write data to the ``sh`` stream and wait for the device to acknowledge it.
+
+        Parameters
+        ----------
+        data : bytes
+            The data to be written
+
+        Returns
+        -------
+        bytearray
+            Any output that was received while waiting for the acknowledgements
+
+        Raises
+        ------
+        ConnectionResetError
+            The stream was closed by the device before the data was acknowledged
+
+        """
+        # pylint: disable=protected-access
+        output = bytearray()
+        chunk_size = self._adb.max_chunk_size
+
+        for i in range(0, len(data), chunk_size):
+            msg = AdbMessage(WRTE, self._adb_info.local_id, self._adb_info.remote_id, data[i : i + chunk_size])
+            await self._adb._io_manager.send(msg, self._adb_info)
+
+            while True:
+                cmd, received = await self._adb._read_until([OKAY, WRTE, CLSE], self._adb_info)
+                if cmd == OKAY:
+                    break
+                if cmd == CLSE:
+                    raise ConnectionResetError("The persistent shell stream was closed by the device")
+                output += received
+
+        return output
+
+    async def shell(self, cmd, decode=True):
+        """Send a shell command via the ``sh`` stream.
+
+        Parameters
+        ----------
+        cmd : str
+            The shell command
+        decode : bool
+            Whether to decode the output to utf8 before returning
+
+        Returns
+        -------
+        str, bytes
+            The output of the command
+
+        """
+        # The command is run in a subshell with `stdin` redirected from `/dev/null`, so that it cannot exit the `sh`
+        # process or consume the commands that follow it
+        script, sentinel = self._frame("( eval '{}' ) </dev/null".format(cmd.replace("'", "'\\''")))
+
+        try:
+            # If the stream died while it was idle, the command will not have been run, so it is safe to reopen it
+            for attempt in range(2):
+                try:
+                    if not self._adb_info:
+                        await self._open()
+                    output = await self._write(script)
+                    break
+                except ConnectionResetError:
+                    self._adb_info = None
+                    if attempt:
+                        raise
+
+            output, crlf = await self._read(output, sentinel)
+
+        except Exception:
+            await self.close()
+            raise
+
+        # The device does not support turning off the PTY's echo and "\n" -> "\r\n" conversion
+        if crlf:
+            echo = script.replace(b"\n", b"\r\n")
+            if output.startswith(echo):
+                output = output[len(echo) :]
+            output = output.replace(b"\r\n", b"\n")
+        if decode:
+            return output.decode("utf8", "backslashreplace")
+        return output
+
+
+class SingleFlightAsync:
+    """Share the result of a coroutine function among concurrent callers with the same key.
+
+    The first caller for a key starts the call, and callers that arrive while it is in flight wait for the same
+    result (or exception) instead of starting their own call.  Optionally, the result is also reused for ``ttl_s``
+    seconds after the call completes.
+
+    The call runs in its own task, so it is not interrupted if a waiting caller is cancelled.
+
+    Parameters
+    ----------
+    ttl_s : float
+        How long (in s) a result is reused after the call completes; if this is ``0``, the result is only shared with
+        callers that arrived while the call was in flight
+
+    """
+
+    def __init__(self, ttl_s=DEFAULT_SINGLE_FLIGHT_TTL_S):
+        self.ttl_s = ttl_s
+
+        # The in-flight calls, keyed by the key
+        self._calls = {}
+
+        # `(expiration time, result)` tuples, keyed by the key
+        self._results = {}
+
+    def forget(self, key=None):
+        """Discard a result so that the next call for its key is not answered from the cache.
+
+        A call for the key that is in flight is also forgotten: later callers will not wait for it, and its result will
+        not be stored.
+
+        Parameters
+        ----------
+        key : object, None
+            The key, or ``None`` to discard all results
+
+        """
+        if key is None:
+            self._results.clear()
+            self._calls.clear()
+        else:
+            self._results.pop(key, None)
+            self._calls.pop(key, None)
+
+    async def run(self, key, func, *args):
+        """Call ``func(*args)``, unless a call with the same key is in flight or its result is still fresh.
+
+        Parameters
+        ----------
+        key : object
+            The key that identifies identical calls
+        func : function
+            The coroutine function
+        *args
+            The arguments for ``func``
+
+        Returns
+        -------
+        object
+            The result of ``func(*args)``
+
+        """
+        loop = asyncio.get_running_loop()
+
+        if key in self._results:
+            expires, result = self._results[key]
+            if loop.time() < expires:
+                return result
+            del self._results[key]
+
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(func(*args))
+            task.add_done_callback(lambda task: self._done(key, task, loop.time()))
+            self._calls[key] = task
+
+        return await asyncio.shield(task)
+
+    def _done(self, key, task, now):
+        """Remove a call that completed and store its result if ``ttl_s > 0``.
+
+        Parameters
+        ----------
+        key : object
+            The key of the call
+        task : asyncio.Task
+            The task of the call
+        now : float
+            The time at which the call completed, from the event loop's clock
+
+        """
+        # If the call is no longer registered, it was forgotten while it was in flight
+        current = self._calls.get(key) is task
+        if current:
+            del self._calls[key]
+
+        # Retrieve the exception so that it is not logged as "never retrieved" if all the callers were cancelled
+        if task.cancelled() or task.exception() is not None:
+            return
+
+        if current and self.ttl_s > 0:
+            self._results[key] = (now + self.ttl_s, task.result())
+
+
+async def _split_lines(chunks):
+    """Split the chunks of output from a streaming command into lines.
+
+    Parameters
+    ----------
+    chunks : async_generator
+        The chunks of output, as ``str`` objects
+
+    Yields
+    ------
+    str
+        Each line of output, without the line ending
+
+    """
+    buffer = ""
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split("\n")
+        for line in lines:
+            yield line.rstrip("\r")
+
+    if buffer:
+        yield buffer.rstrip("\r")
+
+
+class PriorityLockAsync:
+    """An ``asyncio`` lock that is granted to the waiting task with the highest priority.
+
+    Waiters with the same priority are served in the order in which they called :meth:`acquire`.  The lock is handed
+    directly to the next waiter when it is released, so a new caller cannot jump the queue.  A waiter that is cancelled
+    (e.g., because it timed out) is removed from the queue.
+
+    """
+
+    def __init__(self):
+        self._locked = False
+
+        # A heap of `(priority, sequence number, future)` tuples
+        self._waiters = []
+        self._sequence = itertools.count()
+
+    def locked(self):
+        """Check whether the lock is held.
+
+        Returns
+        -------
+        bool
+            Whether the lock is held
+
+        """
+        return self._locked
+
+    async def acquire(self, priority=PRIORITY_POLL):
+        """Acquire the lock.
+
+        Parameters
+        ----------
+        priority : int
+            The priority; lower values are served first (see :py:const:`~androidtv.constants.PRIORITY_INTERACTIVE`)
+
+        Returns
+        -------
+        bool
+            ``True``
+
+        """
+        if not self._locked:
+            self._locked = True
+            return True
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._sequence), future))
+
+        try:
+            await future
+        except asyncio.CancelledError:
+            # The lock was handed to this waiter just before it was cancelled
+            if future.done() and not future.cancelled():
+                self.release()
+            raise
+
+        return True
+
+    def release(self):
+        """Release the lock and hand it to the waiter with the highest priority, if any."""
+        if not self._locked:
+            raise RuntimeError("Lock is not acquired")
+
+        self._locked = False
+        while self._waiters:
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                self._locked = True
+                future.set_result(True)
+                break
+
+
+def _priority(cmd):
+    """Get the priority of an ADB shell command from its type (see :py:const:`~androidtv.constants.COMMAND_PRIORITIES`).
+
+    Parameters
+    ----------
+    cmd : str
+        The ADB shell command
+
+    Returns
+    -------
+    int
+        The priority of the command
+
+    """
+    return COMMAND_PRIORITIES.get(command_name(cmd), PRIORITY_POLL)
+
+
 @asynccontextmanager
-async def _acquire(lock, timeout=DEFAULT_LOCK_TIMEOUT_S):
+async def _acquire(lock, timeout=None, measurement=None, priority=None):
     """Handle acquisition and release of an ``asyncio.Lock`` object with a timeout.
 
+    If ``priority`` is provided, ``lock`` must be a :class:`PriorityLockAsync`.
+
     Parameters
     ----------
-    lock : asyncio.Lock
+    lock : asyncio.Lock, PriorityLockAsync
         The lock that we will try to acquire
-    timeout : float
-        The timeout in seconds
+    timeout : float, None
+        The timeout in seconds; the default is looked up from ``priority`` in
+        :py:const:`~androidtv.constants.DEFAULT_LOCK_TIMEOUTS_S`
+    measurement : androidtv.metrics.Measurement, None
+        The measurement of the command, which will record when the lock was acquired
+    priority : int, None
+        The priority of the command
 
     Yields
     ------
@@ -164,10 +1055,15 @@ async def _acquire(lock, timeout=DEFAULT_LOCK_TIMEOUT_S):
     try:
         acquired = False
         try:
+            if timeout is None:
+                timeout = DEFAULT_LOCK_TIMEOUTS_S.get(priority, DEFAULT_LOCK_TIMEOUT_S)
+
             async with async_timeout.timeout(timeout):
-                acquired = await lock.acquire()
+                acquired = await (lock.acquire() if priority is None else lock.acquire(priority))
             if not acquired:
                 raise LockNotAcquiredException
+            if measurement is not None:
+                measurement.acquired()
             yield acquired
 
         except asyncio.TimeoutError as exc:
@@ -191,10 +1087,21 @@ class ADBPythonAsync(object):
         The path to the ``adbkey`` file for ADB authentication
     signer : PythonRSASigner, None
         The signer for the ADB keys, as loaded by :meth:`ADBPythonAsync.load_adbkey`
+    persistent_shell : bool
+        Whether to send shell commands via a single long-lived ``sh`` stream (see :class:`PersistentShellAsync`) instead
+        of opening a new stream for each command; this is only supported for network connections
+
+    """
+
+    #: The maximum number of ADB authentication handshakes that are in progress at the same time, across all devices and
+    #: including the separate connections for streaming commands.  The RSA signing still blocks the event loop while it
+    #: runs; this only bounds how many handshakes can pile up at once, e.g., when many devices reconnect.
+    max_concurrent_handshakes = DEFAULT_MAX_CONCURRENT_HANDSHAKES
 
-    """
+    #: The handshake limits, keyed by event loop and then by ``max_concurrent_handshakes``
+    _handshake_semaphores = weakref.WeakKeyDictionary()
 
-    def __init__(self, host, port, adbkey="", signer=None):
+    def __init__(self, host, port, adbkey="", signer=None, persistent_shell=False):
         self.host = host
         self.port = int(port)
         self.adbkey = adbkey
@@ -208,8 +1115,20 @@ class ADBPythonAsync(object):
 
         self._signer = signer
 
-        # use a lock to make sure that ADB commands don't overlap
-        self._adb_lock = asyncio.Lock()
+        # the long-lived `sh` stream, if enabled
+        self._persistent_shell = PersistentShellAsync(self._adb) if persistent_shell and host else None
+
+        # use a lock to make sure that ADB commands don't overlap and that the most urgent ones are sent first
+        self._adb_lock = PriorityLockAsync()
+
+        #: The hook that records metrics for each ADB command (see :mod:`androidtv.metrics`), or ``None``
+        self.metrics = None
+
+        #: Identical polling commands that are sent concurrently share a single response (see :class:`SingleFlightAsync`)
+        self.single_flight = SingleFlightAsync()
+
+        #: Whether the device supports the ``exec:`` service, or ``None`` if this has not been detected yet
+        self.exec_out_supported = None
 
     @property
     def available(self):
@@ -225,8 +1144,22 @@ class ADBPythonAsync(object):
 
     async def close(self):
         """Close the ADB socket connection."""
+        if self._persistent_shell:
+            self._persistent_shell.reset()
+
+        self.single_flight.forget()
+        self.exec_out_supported = None
+
         await self._adb.close()
 
+    @classmethod
+    def _get_handshake_semaphore(cls):
+        """Get the semaphore that limits the authentication handshakes in the running event loop."""
+        semaphores = cls._handshake_semaphores.setdefault(asyncio.get_running_loop(), {})
+        if cls.max_concurrent_handshakes not in semaphores:
+            semaphores[cls.max_concurrent_handshakes] = asyncio.Semaphore(cls.max_concurrent_handshakes)
+        return semaphores[cls.max_concurrent_handshakes]
+
     async def connect(
         self,
         log_errors=True,
@@ -251,7 +1184,11 @@ class ADBPythonAsync(object):
 
         """
         try:
-            async with _acquire(self._adb_lock):
+            async with _acquire(self._adb_lock, priority=PRIORITY_CONTROL):
+                # Any existing stream is invalidated by a new connection
+                if self._persistent_shell:
+                    self._persistent_shell.reset()
+
                 # Catch exceptions
                 try:
                     # Connect with authentication
@@ -259,11 +1196,14 @@ class ADBPythonAsync(object):
                         if not self._signer:
                             self._signer = await self.load_adbkey(self.adbkey)
 
-                        await self._adb.connect(
-                            rsa_keys=[self._signer],
-                            transport_timeout_s=transport_timeout_s,
-                            auth_timeout_s=auth_timeout_s,
-                        )
+                        # adb-shell signs the token synchronously, so the number of handshakes that are in progress
+                        # at once is bounded; this does not stop each signature from blocking the event loop
+                        async with self._get_handshake_semaphore():
+                            await self._adb.connect(
+                                rsa_keys=[self._signer],
+                                transport_timeout_s=transport_timeout_s,
+                                auth_timeout_s=auth_timeout_s,
+                            )
 
                     # Connect without authentication
                     else:
@@ -308,6 +1248,9 @@ class ADBPythonAsync(object):
     async def load_adbkey(adbkey):
         """Load the ADB keys.
 
+        The signer is cached, so that it is only loaded once for all of the devices that use the same ``adbkey`` file
+        (unless the file is modified).  The keys are parsed in an executor, since this is slow.
+
         Parameters
         ----------
         adbkey : str
@@ -319,6 +1262,14 @@ class ADBPythonAsync(object):
             The ``PythonRSASigner`` with the key files loaded
 
         """
+        try:
+            mtime = os.path.getmtime(adbkey)
+        except OSError:
+            mtime = None
+
+        if mtime is not None and _SIGNERS.get(adbkey, (None, None))[0] == mtime:
+            return _SIGNERS[adbkey][1]
+
         # private key
         async with aiofiles.open(adbkey) as f:
             priv = await f.read()
@@ -330,7 +1281,112 @@ class ADBPythonAsync(object):
         except FileNotFoundError:
             pub = ""
 
-        return PythonRSASigner(pub, priv)
+        signer = await asyncio.get_running_loop().run_in_executor(None, PythonRSASigner, pub, priv)
+        if mtime is not None:
+            _SIGNERS[adbkey] = (mtime, signer)
+
+        return signer
+
+    async def _detect_exec_out(self):
+        """Detect whether the device supports the ``exec:`` service, if this has not been detected yet.
+
+        Unsupported services are not rejected by the device, so this sends :py:const:`~androidtv.constants.CMD_EXEC_OUT_PROBE`
+        and waits up to :py:const:`~androidtv.constants.DEFAULT_EXEC_OUT_PROBE_TIMEOUT_S` seconds for each transport read
+        and for the whole response, which must be the expected output.  The ADB lock must be held.
+
+        Returns
+        -------
+        bool
+            Whether the device supports the ``exec:`` service
+
+        """
+        if self.exec_out_supported is None:
+            try:
+                response = await self._adb.exec_out(
+                    CMD_EXEC_OUT_PROBE,
+                    transport_timeout_s=DEFAULT_EXEC_OUT_PROBE_TIMEOUT_S,
+                    read_timeout_s=DEFAULT_EXEC_OUT_PROBE_TIMEOUT_S,
+                )
+                if response != "\n":
+                    raise ValueError("unexpected response {}".format(repr(response)))
+                self.exec_out_supported = True
+            except Exception as exc:  # pylint: disable=broad-except
+                _LOGGER.debug(
+                    "%s:%d does not support the `exec:` service, so `shell:` will be used instead.  %s: %s",
+                    self.host,
+                    self.port,
+                    exc.__class__.__name__,
+                    exc,
+                )
+                self.exec_out_supported = False
+
+        return self.exec_out_supported
+
+    async def _exec_out(self, cmd, decode):
+        """Send an ADB command via the ``exec:`` service if the device supports it, or else via ``shell:``.
+
+        The ADB lock must be held.
+
+        Parameters
+        ----------
+        cmd : str
+            The ADB command to be sent
+        decode : bool
+            Whether to decode the output to a string
+
+        Returns
+        -------
+        bytes, str, None
+            The response from the device, if there is a response
+
+        """
+        if await self._detect_exec_out():
+            _LOGGER.debug("Sending command to %s:%d via adb-shell `exec:`: %s", self.host, self.port, cmd)
+            return await self._adb.exec_out(cmd, decode=decode)
+
+        _LOGGER.debug("Sending command to %s:%d via adb-shell: %s", self.host, self.port, cmd)
+        return await self._adb.shell(cmd, decode=decode)
+
+    async def exec_out(self, cmd, decode=True, priority=None):
+        """Send an ADB command via the binary-safe ``exec:`` service using the Python ADB implementation.
+
+        Unlike ``shell:``, ``exec:`` does not use a PTY, so older devices do not turn ``"\\n"`` into ``"\\r\\n"`` in
+        the output.  This is intended for large or binary output, e.g., ``dumpsys`` or ``cat`` of a file.  Whether the
+        device supports ``exec:`` is detected the first time (see :attr:`exec_out_supported`); if not, the command is
+        sent via ``shell:``.
+
+        Parameters
+        ----------
+        cmd : str
+            The ADB command to be sent
+        decode : bool
+            Whether to decode the output to a string
+        priority : int, None
+            The priority of the command (see :py:const:`~androidtv.constants.PRIORITY_INTERACTIVE`); by default, it is
+            determined from the type of command (see :py:const:`~androidtv.constants.COMMAND_PRIORITIES`)
+
+        Returns
+        -------
+        bytes, str, None
+            The response from the device, if there is a response
+
+        """
+        if not self.available:
+            _LOGGER.debug(
+                "ADB command not sent to %s:%d because adb-shell connection is not established: %s",
+                self.host,
+                self.port,
+                cmd,
+            )
+            return None
+
+        if priority is None:
+            priority = _priority(cmd)
+
+        with measure(self.metrics, self.host, self.port, cmd) as measurement:
+            async with _acquire(self._adb_lock, measurement=measurement, priority=priority):
+                measurement.response = await self._exec_out(cmd, decode)
+                return measurement.response
 
     async def pull(self, local_path, device_path):
         """Pull a file from the device using the Python ADB implementation.
@@ -353,12 +1409,17 @@ class ADBPythonAsync(object):
             )
             return
 
-        async with _acquire(self._adb_lock):
-            _LOGGER.debug(
-                "Sending command to %s:%d via adb-shell: pull(%s, %s)", self.host, self.port, local_path, device_path
-            )
-            await self._adb.pull(device_path, local_path)
-            return
+        with measure(self.metrics, self.host, self.port, name="pull") as measurement:
+            async with _acquire(self._adb_lock, measurement=measurement, priority=PRIORITY_BULK):
+                _LOGGER.debug(
+                    "Sending command to %s:%d via adb-shell: pull(%s, %s)",
+                    self.host,
+                    self.port,
+                    local_path,
+                    device_path,
+                )
+                await self._adb.pull(device_path, local_path)
+                return
 
     async def push(self, local_path, device_path):
         """Push a file to the device using the Python ADB implementation.
@@ -381,20 +1442,30 @@ class ADBPythonAsync(object):
             )
             return
 
-        async with _acquire(self._adb_lock):
-            _LOGGER.debug(
-                "Sending command to %s:%d via adb-shell: push(%s, %s)", self.host, self.port, local_path, device_path
-            )
-            await self._adb.push(local_path, device_path)
-            return
-
-    async def screencap(self):
+        with measure(self.metrics, self.host, self.port, name="push") as measurement:
+            async with _acquire(self._adb_lock, measurement=measurement, priority=PRIORITY_BULK):
+                _LOGGER.debug(
+                    "Sending command to %s:%d via adb-shell: push(%s, %s)",
+                    self.host,
+                    self.port,
+                    local_path,
+                    device_path,
+                )
+                await self._adb.push(local_path, device_path)
+                return
+
+    async def screencap(self, raw=False):
         """Take a screenshot using the Python ADB implementation.
 
+        Parameters
+        ----------
+        raw : bool
+            Whether to get the raw framebuffer (see :mod:`androidtv.screencap`) instead of a .png image
+
         Returns
         -------
         bytes
-            The screencap as a binary .png image
+            The screencap as a binary .png image or the raw framebuffer
 
         """
         if not self.available:
@@ -405,20 +1476,27 @@ class ADBPythonAsync(object):
             )
             return None
 
-        async with _acquire(self._adb_lock):
-            _LOGGER.debug("Taking screencap from %s:%d via adb-shell", self.host, self.port)
-            result = await self._adb.shell("screencap -p", decode=False)
-            if result and result[5:6] == b"\r":
-                return result.replace(b"\r\n", b"\n")
-            return result
+        with measure(self.metrics, self.host, self.port, name="screencap") as measurement:
+            async with _acquire(self._adb_lock, measurement=measurement, priority=PRIORITY_BULK):
+                _LOGGER.debug("Taking screencap from %s:%d via adb-shell", self.host, self.port)
+                result = await self._exec_out("screencap" if raw else "screencap -p", False)
+                measurement.response = result
+
+                # The `shell:` service on older devices turns "\n" into "\r\n"
+                if not raw and result and result[5:6] == b"\r":
+                    return result.replace(b"\r\n", b"\n")
+                return result
 
-    async def shell(self, cmd):
+    async def shell(self, cmd, priority=None):
         """Send an ADB command using the Python ADB implementation.
 
         Parameters
         ----------
         cmd : str
             The ADB command to be sent
+        priority : int, None
+            The priority of the command (see :py:const:`~androidtv.constants.PRIORITY_INTERACTIVE`); by default, it is
+            determined from the type of command (see :py:const:`~androidtv.constants.COMMAND_PRIORITIES`)
 
         Returns
         -------
@@ -435,9 +1513,144 @@ class ADBPythonAsync(object):
             )
             return None
 
+        if priority is None:
+            priority = _priority(cmd)
+
+        # Identical read-only polling commands that are sent concurrently share a single response
+        if priority == PRIORITY_POLL and command_name(cmd) in SINGLE_FLIGHT_COMMANDS:
+            return await self.single_flight.run(cmd, self._shell, cmd, priority)
+
+        # Other commands (e.g., launching an app) may change the state, so the shared responses are no longer valid
+        self.single_flight.forget()
+        return await self._shell(cmd, priority)
+
+    async def _shell(self, cmd, priority):
+        """Send an ADB command using the Python ADB implementation.
+
+        Parameters
+        ----------
+        cmd : str
+            The ADB command to be sent
+        priority : int
+            The priority of the command
+
+        Returns
+        -------
+        str, None
+            The response from the device, if there is a response
+
+        """
+        with measure(self.metrics, self.host, self.port, cmd) as measurement:
+            async with _acquire(self._adb_lock, measurement=measurement, priority=priority):
+                _LOGGER.debug("Sending command to %s:%d via adb-shell: %s", self.host, self.port, cmd)
+                if self._persistent_shell:
+                    measurement.response = await self._persistent_shell.shell(cmd)
+                else:
+                    measurement.response = await self._adb.shell(cmd)
+                return measurement.response
+
+    async def streaming_shell(self, cmd):
+        """Send an ADB command and yield its output one line at a time as it arrives.
+
+        This is intended for long-lived commands like ``logcat``, so the command is sent over a separate ADB connection
+        that does not time out while waiting for output.  Otherwise, the other ADB commands would be blocked until the
+        command exits.  This is only supported for network connections.
+
+        Parameters
+        ----------
+        cmd : str
+            The ADB command to be sent
+
+        Yields
+        ------
+        str
+            Each line of output, without the line ending
+
+        """
+        if not self.available or not self.host:
+            _LOGGER.debug(
+                "ADB streaming command not sent to %s:%d because adb-shell connection is not established or is not a network connection: %s",
+                self.host,
+                self.port,
+                cmd,
+            )
+            return
+
+        async with self._streaming_connection() as adb:
+            _LOGGER.debug("Sending streaming command to %s:%d via adb-shell: %s", self.host, self.port, cmd)
+            async for line in _split_lines(adb.streaming_shell(cmd, read_timeout_s=float("inf"))):
+                yield line
+
+    async def streaming_exec_out(self, cmd):
+        """Send an ADB command via the binary-safe ``exec:`` service and yield its output in chunks as it arrives.
+
+        This is intended for long-lived commands with binary output, like ``screenrecord``, so the command is sent over
+        a separate ADB connection, as in :meth:`streaming_shell`.  If the device does not support ``exec:`` (see
+        :attr:`exec_out_supported`, which is detected first if necessary), the command is sent via ``shell:``.  This is
+        only supported for network connections.
+
+        Parameters
+        ----------
+        cmd : str
+            The ADB command to be sent
+
+        Yields
+        ------
+        bytes
+            Each chunk of output, in the sizes in which it is received
+
+        """
+        if not self.available or not self.host:
+            _LOGGER.debug(
+                "ADB streaming command not sent to %s:%d because adb-shell connection is not established or is not a network connection: %s",
+                self.host,
+                self.port,
+                cmd,
+            )
+            return
+
+        # The device does not reject an unsupported service, so an `exec:` stream would wait for output forever
         async with _acquire(self._adb_lock):
-            _LOGGER.debug("Sending command to %s:%d via adb-shell: %s", self.host, self.port, cmd)
-            return await self._adb.shell(cmd)
+            service = b"exec" if await self._detect_exec_out() else b"shell"
+
+        async with self._streaming_connection() as adb:
+            _LOGGER.debug(
+                "Sending streaming command to %s:%d via adb-shell `%s:`: %s",
+                self.host,
+                self.port,
+                service.decode("utf-8"),
+                cmd,
+            )
+            # pylint: disable=protected-access
+            async for chunk in adb._streaming_service(
+                service, cmd.encode("utf-8"), read_timeout_s=float("inf"), decode=False
+            ):
+                yield chunk
+
+    @asynccontextmanager
+    async def _streaming_connection(self):
+        """Open a separate ADB connection to the device for a streaming command.
+
+        Yields
+        ------
+        AdbDeviceTcpAsync
+            The connection, which does not time out while waiting for output and is closed afterwards
+
+        """
+        adb = AdbDeviceTcpAsync(host=self.host, port=self.port, default_transport_timeout_s=None)
+
+        try:
+            # This is a full authentication handshake, so it counts towards `max_concurrent_handshakes`
+            async with self._get_handshake_semaphore():
+                await adb.connect(
+                    rsa_keys=[self._signer] if self._signer else None,
+                    transport_timeout_s=DEFAULT_TRANSPORT_TIMEOUT_S,
+                    auth_timeout_s=DEFAULT_AUTH_TIMEOUT_S,
+                )
+            yield adb
+
+        finally:
+            await adb.close()
 
 
 class ADBServerAsync(object):
@@ -467,8 +1680,17 @@ class ADBServerAsync(object):
         # keep track of whether the ADB connection is intact
         self._available = False
 
-        # use a lock to make sure that ADB commands don't overlap
-        self._adb_lock = asyncio.Lock()
+        # use a lock to make sure that ADB commands don't overlap and that the most urgent ones are sent first
+        self._adb_lock = PriorityLockAsync()
+
+        #: The hook that records metrics for each ADB command (see :mod:`androidtv.metrics`), or ``None``
+        self.metrics = None
+
+        #: Identical polling commands that are sent concurrently share a single response (see :class:`SingleFlightAsync`)
+        self.single_flight = SingleFlightAsync()
+
+        #: Whether the device supports the ``exec:`` service, or ``None`` if this has not been detected yet
+        self.exec_out_supported = None
 
     @property
     def available(self):
@@ -488,10 +1710,12 @@ class ADBServerAsync(object):
     async def close(self):
         """Close the ADB server socket connection.
 
-        Currently, this doesn't do anything except set ``self._available = False``.
+        Currently, this doesn't do anything except set ``self._available = False`` and discard any cached responses.
 
         """
         self._available = False
+        self.single_flight.forget()
+        self.exec_out_supported = None
 
     async def connect(self, log_errors=True):
         """Connect to an Android TV / Fire TV device.
@@ -508,7 +1732,7 @@ class ADBServerAsync(object):
 
         """
         try:
-            async with _acquire(self._adb_lock):
+            async with _acquire(self._adb_lock, priority=PRIORITY_CONTROL):
                 # Catch exceptions
                 try:
                     self._adb_client = ClientAsync(host=self.adb_server_ip, port=self.adb_server_port)
@@ -558,7 +1782,7 @@ class ADBServerAsync(object):
 
         except LockNotAcquiredException:
             _LOGGER.warning(
-                "Couldn't connect to %s:%d via ADB server %s:%d because pure-python-adb lock not acquired.",
+                "Couldn't connect to %s:%d via ADB server %s:%d because ADB server client lock not acquired.",
                 self.host,
                 self.port,
                 self.adb_server_ip,
@@ -568,56 +1792,130 @@ class ADBServerAsync(object):
             self._available = False
             return False
 
-    async def pull(self, local_path, device_path):
-        """Pull a file from the device using an ADB server.
+    async def _detect_exec_out(self):
+        """Detect whether the device supports the ``exec:`` service, if this has not been detected yet.
+
+        The ADB server rejects the service if the device does not support it; the response to
+        :py:const:`~androidtv.constants.CMD_EXEC_OUT_PROBE` must also be the expected output.  The ADB lock must be held.
+
+        Returns
+        -------
+        bool
+            Whether the device supports the ``exec:`` service
+
+        """
+        if self.exec_out_supported is None:
+            try:
+                response = await self._adb_device.exec_out(CMD_EXEC_OUT_PROBE)
+                if response != b"\n":
+                    raise ValueError("unexpected response {}".format(repr(response)))
+                self.exec_out_supported = True
+            except Exception as exc:  # noqa pylint: disable=broad-except
+                _LOGGER.debug(
+                    "%s:%d does not support the `exec:` service, so `shell:` will be used instead.  %s: %s",
+                    self.host,
+                    self.port,
+                    exc.__class__.__name__,
+                    exc,
+                )
+                self.exec_out_supported = False
+
+        return self.exec_out_supported
+
+    async def _exec_out(self, cmd, decode):
+        """Send an ADB command via the ``exec:`` service if the device supports it, or else via ``shell:``.
+
+        The ADB lock must be held.
 
         Parameters
         ----------
-        local_path : str
-            The path where the file will be saved
-        device_path : str
-            The file on the device that will be pulled
+        cmd : str
+            The ADB command to be sent
+        decode : bool
+            Whether to decode the output to a string
+
+        Returns
+        -------
+        bytes, str, None
+            The response from the device, if there is a response
 
         """
-        if not self.available:
+        if await self._detect_exec_out():
             _LOGGER.debug(
-                "ADB command not sent to %s:%d via ADB server %s:%d because pure-python-adb connection is not established: pull(%s, %s)",
+                "Sending command to %s:%d via ADB server %s:%d `exec:`: %s",
                 self.host,
                 self.port,
                 self.adb_server_ip,
                 self.adb_server_port,
-                local_path,
-                device_path,
+                cmd,
             )
-            return
+            result = await self._adb_device.exec_out(cmd)
+            return result.decode("utf-8") if decode else result
+
+        _LOGGER.debug(
+            "Sending command to %s:%d via ADB server %s:%d: %s",
+            self.host,
+            self.port,
+            self.adb_server_ip,
+            self.adb_server_port,
+            cmd,
+        )
+        return await self._adb_device.shell(cmd, decode=decode)
 
-        async with _acquire(self._adb_lock):
+    async def exec_out(self, cmd, decode=True, priority=None):
+        """Send an ADB command via the binary-safe ``exec:`` service using an ADB server.
+
+        See :meth:`ADBPythonAsync.exec_out`.
+
+        Parameters
+        ----------
+        cmd : str
+            The ADB command to be sent
+        decode : bool
+            Whether to decode the output to a string
+        priority : int, None
+            The priority of the command (see :py:const:`~androidtv.constants.PRIORITY_INTERACTIVE`); by default, it is
+            determined from the type of command (see :py:const:`~androidtv.constants.COMMAND_PRIORITIES`)
+
+        Returns
+        -------
+        bytes, str, None
+            The response from the device, if there is a response
+
+        """
+        if not self.available:
             _LOGGER.debug(
-                "Sending command to %s:%d via ADB server %s:%d: pull(%s, %s)",
+                "ADB command not sent to %s:%d via ADB server %s:%d because ADB server connection is not established: %s",
                 self.host,
                 self.port,
                 self.adb_server_ip,
                 self.adb_server_port,
-                local_path,
-                device_path,
+                cmd,
             )
-            await self._adb_device.pull(device_path, local_path)
-            return
+            return None
 
-    async def push(self, local_path, device_path):
-        """Push a file to the device using an ADB server.
+        if priority is None:
+            priority = _priority(cmd)
+
+        with measure(self.metrics, self.host, self.port, cmd) as measurement:
+            async with _acquire(self._adb_lock, measurement=measurement, priority=priority):
+                measurement.response = await self._exec_out(cmd, decode)
+                return measurement.response
+
+    async def pull(self, local_path, device_path):
+        """Pull a file from the device using an ADB server.
 
         Parameters
         ----------
         local_path : str
-            The file that will be pushed to the device
+            The path where the file will be saved
         device_path : str
-            The path where the file will be saved on the device
+            The file on the device that will be pulled
 
         """
         if not self.available:
             _LOGGER.debug(
-                "ADB command not sent to %s:%d via ADB server %s:%d because pure-python-adb connection is not established: push(%s, %s)",
+                "ADB command not sent to %s:%d via ADB server %s:%d because ADB server connection is not established: pull(%s, %s)",
                 self.host,
                 self.port,
                 self.adb_server_ip,
@@ -627,9 +1925,34 @@ class ADBServerAsync(object):
             )
             return
 
-        async with _acquire(self._adb_lock):
+        with measure(self.metrics, self.host, self.port, name="pull") as measurement:
+            async with _acquire(self._adb_lock, measurement=measurement, priority=PRIORITY_BULK):
+                _LOGGER.debug(
+                    "Sending command to %s:%d via ADB server %s:%d: pull(%s, %s)",
+                    self.host,
+                    self.port,
+                    self.adb_server_ip,
+                    self.adb_server_port,
+                    local_path,
+                    device_path,
+                )
+                await self._adb_device.pull(device_path, local_path)
+                return
+
+    async def push(self, local_path, device_path):
+        """Push a file to the device using an ADB server.
+
+        Parameters
+        ----------
+        local_path : str
+            The file that will be pushed to the device
+        device_path : str
+            The path where the file will be saved on the device
+
+        """
+        if not self.available:
             _LOGGER.debug(
-                "Sending command to %s:%d via ADB server %s:%d: push(%s, %s)",
+                "ADB command not sent to %s:%d via ADB server %s:%d because ADB server connection is not established: push(%s, %s)",
                 self.host,
                 self.port,
                 self.adb_server_ip,
@@ -637,21 +1960,40 @@ class ADBServerAsync(object):
                 local_path,
                 device_path,
             )
-            await self._adb_device.push(local_path, device_path)
             return
 
-    async def screencap(self):
+        with measure(self.metrics, self.host, self.port, name="push") as measurement:
+            async with _acquire(self._adb_lock, measurement=measurement, priority=PRIORITY_BULK):
+                _LOGGER.debug(
+                    "Sending command to %s:%d via ADB server %s:%d: push(%s, %s)",
+                    self.host,
+                    self.port,
+                    self.adb_server_ip,
+                    self.adb_server_port,
+                    local_path,
+                    device_path,
+                )
+                await self._adb_device.push(local_path, device_path)
+                return
+
+    async def screencap(self, raw=False):
         """Take a screenshot using an ADB server.
 
+        Parameters
+        ----------
+        raw : bool
+            Whether to get the raw framebuffer (see :mod:`androidtv.screencap`) instead of a .png image
+
         Returns
         -------
         bytes, None
-            The screencap as a binary .png image, or ``None`` if there was an ``IndexError`` exception
+            The screencap as a binary .png image or the raw framebuffer, or ``None`` if there was an ``IndexError``
+            exception
 
         """
         if not self.available:
             _LOGGER.debug(
-                "ADB screencap not taken from %s:%d via ADB server %s:%d because pure-python-adb connection is not established",
+                "ADB screencap not taken from %s:%d via ADB server %s:%d because ADB server connection is not established",
                 self.host,
                 self.port,
                 self.adb_server_ip,
@@ -659,48 +2001,169 @@ class ADBServerAsync(object):
             )
             return None
 
-        async with _acquire(self._adb_lock):
+        with measure(self.metrics, self.host, self.port, name="screencap") as measurement:
+            async with _acquire(self._adb_lock, measurement=measurement, priority=PRIORITY_BULK):
+                _LOGGER.debug(
+                    "Taking screencap from %s:%d via ADB server %s:%d",
+                    self.host,
+                    self.port,
+                    self.adb_server_ip,
+                    self.adb_server_port,
+                )
+                if await self._detect_exec_out():
+                    measurement.response = await self._adb_device.exec_out("screencap" if raw else "screencap -p")
+                else:
+                    measurement.response = await self._adb_device.screencap(raw)
+                return measurement.response
+
+    async def shell(self, cmd, priority=None):
+        """Send an ADB command using an ADB server.
+
+        Parameters
+        ----------
+        cmd : str
+            The ADB command to be sent
+        priority : int, None
+            The priority of the command (see :py:const:`~androidtv.constants.PRIORITY_INTERACTIVE`); by default, it is
+            determined from the type of command (see :py:const:`~androidtv.constants.COMMAND_PRIORITIES`)
+
+        Returns
+        -------
+        str, None
+            The response from the device, if there is a response
+
+        """
+        if not self.available:
             _LOGGER.debug(
-                "Taking screencap from %s:%d via ADB server %s:%d",
+                "ADB command not sent to %s:%d via ADB server %s:%d because ADB server connection is not established: %s",
                 self.host,
                 self.port,
                 self.adb_server_ip,
                 self.adb_server_port,
+                cmd,
             )
-            return await self._adb_device.screencap()
+            return None
+
+        if priority is None:
+            priority = _priority(cmd)
+
+        # Identical read-only polling commands that are sent concurrently share a single response
+        if priority == PRIORITY_POLL and command_name(cmd) in SINGLE_FLIGHT_COMMANDS:
+            return await self.single_flight.run(cmd, self._shell, cmd, priority)
+
+        # Other commands (e.g., launching an app) may change the state, so the shared responses are no longer valid
+        self.single_flight.forget()
+        return await self._shell(cmd, priority)
 
-    async def shell(self, cmd):
+    async def _shell(self, cmd, priority):
         """Send an ADB command using an ADB server.
 
         Parameters
         ----------
         cmd : str
             The ADB command to be sent
+        priority : int
+            The priority of the command
 
         Returns
         -------
         str, None
             The response from the device, if there is a response
 
+        """
+        with measure(self.metrics, self.host, self.port, cmd) as measurement:
+            async with _acquire(self._adb_lock, measurement=measurement, priority=priority):
+                _LOGGER.debug(
+                    "Sending command to %s:%d via ADB server %s:%d: %s",
+                    self.host,
+                    self.port,
+                    self.adb_server_ip,
+                    self.adb_server_port,
+                    cmd,
+                )
+                measurement.response = await self._adb_device.shell(cmd)
+                return measurement.response
+
+    async def streaming_shell(self, cmd):
+        """Send an ADB command using an ADB server and yield its output one line at a time as it arrives.
+
+        This is intended for long-lived commands like ``logcat``, so the lock is not held while the command runs; the
+        ADB server gives each command its own connection, which does not count against the limit on connections used
+        by other commands (see :class:`ClientAsync`).
+
+        Parameters
+        ----------
+        cmd : str
+            The ADB command to be sent
+
+        Yields
+        ------
+        str
+            Each line of output, without the line ending
+
         """
         if not self.available:
             _LOGGER.debug(
-                "ADB command not sent to %s:%d via ADB server %s:%d because pure-python-adb connection is not established: %s",
+                "ADB streaming command not sent to %s:%d via ADB server %s:%d because ADB server connection is not established: %s",
                 self.host,
                 self.port,
                 self.adb_server_ip,
                 self.adb_server_port,
                 cmd,
             )
-            return None
+            return
 
-        async with _acquire(self._adb_lock):
+        _LOGGER.debug(
+            "Sending streaming command to %s:%d via ADB server %s:%d: %s",
+            self.host,
+            self.port,
+            self.adb_server_ip,
+            self.adb_server_port,
+            cmd,
+        )
+        async for line in self._adb_device.streaming_shell(cmd):
+            yield line
+
+    async def streaming_exec_out(self, cmd):
+        """Send an ADB command via the binary-safe ``exec:`` service using an ADB server and yield its output in chunks.
+
+        As in :meth:`streaming_shell`, the lock is not held while the command runs and the connection does not count
+        against the ADB server connection limit.  If the device does not support ``exec:`` (see
+        :attr:`exec_out_supported`, which is detected first if necessary), the command is sent via ``shell:``.
+
+        Parameters
+        ----------
+        cmd : str
+            The ADB command to be sent
+
+        Yields
+        ------
+        bytes
+            Each chunk of output, in the sizes in which it is received
+
+        """
+        if not self.available:
             _LOGGER.debug(
-                "Sending command to %s:%d via ADB server %s:%d: %s",
+                "ADB streaming command not sent to %s:%d via ADB server %s:%d because ADB server connection is not established: %s",
                 self.host,
                 self.port,
                 self.adb_server_ip,
                 self.adb_server_port,
                 cmd,
             )
-            return await self._adb_device.shell(cmd)
+            return
+
+        async with _acquire(self._adb_lock):
+            service = "exec" if await self._detect_exec_out() else "shell"
+
+        _LOGGER.debug(
+            "Sending streaming command to %s:%d via ADB server %s:%d `%s:`: %s",
+            self.host,
+            self.port,
+            self.adb_server_ip,
+            self.adb_server_port,
+            service,
+            cmd,
+        )
+        async for chunk in self._adb_device.streaming_exec_out(cmd, service):
+            yield chunk
@@ -6,21 +6,32 @@
 """
 
 from contextlib import contextmanager
+import heapq
+import itertools
 import logging
 import sys
 import threading
+import time
 
 from adb_shell.adb_device import AdbDeviceTcp, AdbDeviceUsb
 from adb_shell.auth.sign_pythonrsa import PythonRSASigner
 from ppadb.client import Client
 
 from ..constants import (
+    CMD_EXEC_OUT_PROBE,
+    COMMAND_PRIORITIES,
     DEFAULT_ADB_TIMEOUT_S,
     DEFAULT_AUTH_TIMEOUT_S,
+    DEFAULT_EXEC_OUT_PROBE_TIMEOUT_S,
     DEFAULT_LOCK_TIMEOUT_S,
+    DEFAULT_LOCK_TIMEOUTS_S,
     DEFAULT_TRANSPORT_TIMEOUT_S,
+    PRIORITY_BULK,
+    PRIORITY_CONTROL,
+    PRIORITY_POLL,
 )
 from ..exceptions import LockNotAcquiredException
+from ..metrics import command_name, measure
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -29,16 +40,140 @@ LOCK_KWARGS = {"timeout": DEFAULT_LOCK_TIMEOUT_S} if sys.version_info[0] > 2 and
 
 if sys.version_info[0] == 2:  # pragma: no cover
     FileNotFoundError = IOError  # pylint: disable=redefined-builtin
+    monotonic = time.time
+else:
+    monotonic = time.monotonic
+
+
+class PriorityLockSync(object):
+    """A lock that is granted to the waiting thread with the highest priority.
+
+    Waiters with the same priority are served in the order in which they called :meth:`acquire`.  The lock is handed
+    directly to the next waiter when it is released, so a new caller cannot jump the queue.
+
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition(threading.Lock())
+        self._locked = False
+
+        # A heap of `[priority, sequence number, granted]` lists, where `granted` is `None` while waiting, `True` once
+        # the lock has been handed to the waiter, and `False` if the waiter timed out
+        self._waiters = []
+        self._sequence = itertools.count()
+
+    def locked(self):
+        """Check whether the lock is held.
+
+        Returns
+        -------
+        bool
+            Whether the lock is held
+
+        """
+        return self._locked
+
+    def acquire(self, priority=PRIORITY_POLL, timeout=-1):
+        """Acquire the lock.
+
+        Parameters
+        ----------
+        priority : int
+            The priority; lower values are served first (see :py:const:`~androidtv.constants.PRIORITY_INTERACTIVE`)
+        timeout : float
+            The maximum time (in s) to wait for the lock, or a negative number to wait indefinitely
+
+        Returns
+        -------
+        bool
+            Whether the lock was acquired
+
+        """
+        with self._condition:
+            if not self._locked:
+                self._locked = True
+                return True
+
+            waiter = [priority, next(self._sequence), None]
+            heapq.heappush(self._waiters, waiter)
+            deadline = monotonic() + timeout if timeout >= 0 else None
+
+            while waiter[2] is None:
+                remaining = deadline - monotonic() if deadline is not None else None
+                if remaining is not None and remaining <= 0:
+                    waiter[2] = False
+                    return False
+                self._condition.wait(remaining)
+
+            return True
+
+    def release(self):
+        """Release the lock and hand it to the waiter with the highest priority, if any."""
+        with self._condition:
+            if not self._locked:
+                raise RuntimeError("Lock is not acquired")
+
+            self._locked = False
+            while self._waiters:
+                waiter = heapq.heappop(self._waiters)
+                if waiter[2] is None:
+                    waiter[2] = True
+                    self._locked = True
+                    self._condition.notify_all()
+                    break
+
+
+def _read_all(conn):
+    """Read the entire binary output of a ``ppadb`` shell command and close the connection.
+
+    Parameters
+    ----------
+    conn : ppadb.connection.Connection
+        The connection on which the shell command was sent
+
+    Returns
+    -------
+    bytes
+        The output of the command
+
+    """
+    result = conn.read_all()
+    conn.close()
+    return result
+
+
+def _priority(cmd):
+    """Get the priority of an ADB shell command from its type (see :py:const:`~androidtv.constants.COMMAND_PRIORITIES`).
+
+    Parameters
+    ----------
+    cmd : str
+        The ADB shell command
+
+    Returns
+    -------
+    int
+        The priority of the command
+
+    """
+    return COMMAND_PRIORITIES.get(command_name(cmd), PRIORITY_POLL)
 
 
 @contextmanager
-def _acquire(lock):
+def _acquire(lock, measurement=None, priority=None):
     """Handle acquisition and release of a ``threading.Lock`` object with ``LOCK_KWARGS`` keyword arguments.
 
+    If ``priority`` is provided, ``lock`` must be a :class:`PriorityLockSync` and the timeout is looked up in
+    :py:const:`~androidtv.constants.DEFAULT_LOCK_TIMEOUTS_S`.
+
     Parameters
     ----------
-    lock : threading.Lock
+    lock : threading.Lock, PriorityLockSync
         The lock that we will try to acquire
+    measurement : androidtv.metrics.Measurement, None
+        The measurement of the command, which will record when the lock was acquired
+    priority : int, None
+        The priority of the command
 
     Yields
     ------
@@ -52,9 +187,15 @@ def _acquire(lock):
 
     """
     try:
-        acquired = lock.acquire(**LOCK_KWARGS)
+        acquired = False
+        if priority is None:
+            acquired = lock.acquire(**LOCK_KWARGS)
+        else:
+            acquired = lock.acquire(priority, timeout=DEFAULT_LOCK_TIMEOUTS_S[priority])
         if not acquired:
             raise LockNotAcquiredException
+        if measurement is not None:
+            measurement.acquired()
         yield acquired
 
     finally:
@@ -90,8 +231,14 @@ class ADBPythonSync(object):
 
         self._signer = signer
 
-        # use a lock to make sure that ADB commands don't overlap
-        self._adb_lock = threading.Lock()
+        # use a lock to make sure that ADB commands don't overlap and that the most urgent ones are sent first
+        self._adb_lock = PriorityLockSync()
+
+        #: The hook that records metrics for each ADB command (see :mod:`androidtv.metrics`), or ``None``
+        self.metrics = None
+
+        #: Whether the device supports the ``exec:`` service, or ``None`` if this has not been detected yet
+        self.exec_out_supported = None
 
     @property
     def available(self):
@@ -107,6 +254,7 @@ class ADBPythonSync(object):
 
     def close(self):
         """Close the ADB socket connection."""
+        self.exec_out_supported = None
         self._adb.close()
 
     def connect(
@@ -133,7 +281,7 @@ class ADBPythonSync(object):
 
         """
         try:
-            with _acquire(self._adb_lock):
+            with _acquire(self._adb_lock, priority=PRIORITY_CONTROL):
                 # Catch exceptions
                 try:
                     # Connect with authentication
@@ -186,6 +334,107 @@ class ADBPythonSync(object):
             self.close()
             return False
 
+    def _detect_exec_out(self):
+        """Detect whether the device supports the ``exec:`` service, if this has not been detected yet.
+
+        Unsupported services are not rejected by the device, so this sends :py:const:`~androidtv.constants.CMD_EXEC_OUT_PROBE`
+        and waits up to :py:const:`~androidtv.constants.DEFAULT_EXEC_OUT_PROBE_TIMEOUT_S` seconds for each transport read
+        and for the whole response, which must be the expected output.  The ADB lock must be held.
+
+        Returns
+        -------
+        bool
+            Whether the device supports the ``exec:`` service
+
+        """
+        if self.exec_out_supported is None:
+            try:
+                response = self._adb.exec_out(
+                    CMD_EXEC_OUT_PROBE,
+                    transport_timeout_s=DEFAULT_EXEC_OUT_PROBE_TIMEOUT_S,
+                    read_timeout_s=DEFAULT_EXEC_OUT_PROBE_TIMEOUT_S,
+                )
+                if response != "\n":
+                    raise ValueError("unexpected response {}".format(repr(response)))
+                self.exec_out_supported = True
+            except Exception as exc:  # pylint: disable=broad-except
+                _LOGGER.debug(
+                    "%s:%d does not support the `exec:` service, so `shell:` will be used instead.  %s: %s",
+                    self.host,
+                    self.port,
+                    exc.__class__.__name__,
+                    exc,
+                )
+                self.exec_out_supported = False
+
+        return self.exec_out_supported
+
+    def _exec_out(self, cmd, decode):
+        """Send an ADB command via the ``exec:`` service if the device supports it, or else via ``shell:``.
+
+        The ADB lock must be held.
+
+        Parameters
+        ----------
+        cmd : str
+            The ADB command to be sent
+        decode : bool
+            Whether to decode the output to a string
+
+        Returns
+        -------
+        bytes, str, None
+            The response from the device, if there is a response
+
+        """
+        if self._detect_exec_out():
+            _LOGGER.debug("Sending command to %s:%d via adb-shell `exec:`: %s", self.host, self.port, cmd)
+            return self._adb.exec_out(cmd, decode=decode)
+
+        _LOGGER.debug("Sending command to %s:%d via adb-shell: %s", self.host, self.port, cmd)
+        return self._adb.shell(cmd, decode=decode)
+
+    def exec_out(self, cmd, decode=True, priority=None):
+        """Send an ADB command via the binary-safe ``exec:`` service using the Python ADB implementation.
+
+        Unlike ``shell:``, ``exec:`` does not use a PTY, so older devices do not turn ``"\\n"`` into ``"\\r\\n"`` in
+        the output.  This is intended for large or binary output, e.g., ``dumpsys`` or ``cat`` of a file.  Whether the
+        device supports ``exec:`` is detected the first time (see :attr:`exec_out_supported`); if not, the command is
+        sent via ``shell:``.
+
+        Parameters
+        ----------
+        cmd : str
+            The ADB command to be sent
+        decode : bool
+            Whether to decode the output to a string
+        priority : int, None
+            The priority of the command (see :py:const:`~androidtv.constants.PRIORITY_INTERACTIVE`); by default, it is
+            determined from the type of command (see :py:const:`~androidtv.constants.COMMAND_PRIORITIES`)
+
+        Returns
+        -------
+        bytes, str, None
+            The response from the device, if there is a response
+
+        """
+        if not self.available:
+            _LOGGER.debug(
+                "ADB command not sent to %s:%d because adb-shell connection is not established: %s",
+                self.host,
+                self.port,
+                cmd,
+            )
+            return None
+
+        if priority is None:
+            priority = _priority(cmd)
+
+        with measure(self.metrics, self.host, self.port, cmd) as measurement:
+            with _acquire(self._adb_lock, measurement=measurement, priority=priority):
+                measurement.response = self._exec_out(cmd, decode)
+                return measurement.response
+
     @staticmethod
     def load_adbkey(adbkey):
         """Load the ADB keys.
@@ -235,12 +484,17 @@ class ADBPythonSync(object):
             )
             return
 
-        with _acquire(self._adb_lock):
-            _LOGGER.debug(
-                "Sending command to %s:%d via adb-shell: pull(%s, %s)", self.host, self.port, local_path, device_path
-            )
-            self._adb.pull(device_path, local_path)
-            return
+        with measure(self.metrics, self.host, self.port, name="pull") as measurement:
+            with _acquire(self._adb_lock, measurement=measurement, priority=PRIORITY_BULK):
+                _LOGGER.debug(
+                    "Sending command to %s:%d via adb-shell: pull(%s, %s)",
+                    self.host,
+                    self.port,
+                    local_path,
+                    device_path,
+                )
+                self._adb.pull(device_path, local_path)
+                return
 
     def push(self, local_path, device_path):
         """Push a file to the device using the Python ADB implementation.
@@ -263,20 +517,30 @@ class ADBPythonSync(object):
             )
             return
 
-        with _acquire(self._adb_lock):
-            _LOGGER.debug(
-                "Sending command to %s:%d via adb-shell: push(%s, %s)", self.host, self.port, local_path, device_path
-            )
-            self._adb.push(local_path, device_path)
-            return
-
-    def screencap(self):
+        with measure(self.metrics, self.host, self.port, name="push") as measurement:
+            with _acquire(self._adb_lock, measurement=measurement, priority=PRIORITY_BULK):
+                _LOGGER.debug(
+                    "Sending command to %s:%d via adb-shell: push(%s, %s)",
+                    self.host,
+                    self.port,
+                    local_path,
+                    device_path,
+                )
+                self._adb.push(local_path, device_path)
+                return
+
+    def screencap(self, raw=False):
         """Take a screenshot using the Python ADB implementation.
 
+        Parameters
+        ----------
+        raw : bool
+            Whether to get the raw framebuffer (see :mod:`androidtv.screencap`) instead of a .png image
+
         Returns
         -------
         bytes
-            The screencap as a binary .png image
+            The screencap as a binary .png image or the raw framebuffer
 
         """
         if not self.available:
@@ -287,20 +551,27 @@ class ADBPythonSync(object):
             )
             return None
 
-        with _acquire(self._adb_lock):
-            _LOGGER.debug("Taking screencap from %s:%d via adb-shell", self.host, self.port)
-            result = self._adb.shell("screencap -p", decode=False)
-            if result and result[5:6] == b"\r":
-                return result.replace(b"\r\n", b"\n")
-            return result
+        with measure(self.metrics, self.host, self.port, name="screencap") as measurement:
+            with _acquire(self._adb_lock, measurement=measurement, priority=PRIORITY_BULK):
+                _LOGGER.debug("Taking screencap from %s:%d via adb-shell", self.host, self.port)
+                result = self._exec_out("screencap" if raw else "screencap -p", False)
+                measurement.response = result
 
-    def shell(self, cmd):
+                # The `shell:` service on older devices turns "\n" into "\r\n"
+                if not raw and result and result[5:6] == b"\r":
+                    return result.replace(b"\r\n", b"\n")
+                return result
+
+    def shell(self, cmd, priority=None):
         """Send an ADB command using the Python ADB implementation.
 
         Parameters
         ----------
         cmd : str
             The ADB command to be sent
+        priority : int, None
+            The priority of the command (see :py:const:`~androidtv.constants.PRIORITY_INTERACTIVE`); by default, it is
+            determined from the type of command (see :py:const:`~androidtv.constants.COMMAND_PRIORITIES`)
 
         Returns
         -------
@@ -317,9 +588,14 @@ class ADBPythonSync(object):
             )
             return None
 
-        with _acquire(self._adb_lock):
-            _LOGGER.debug("Sending command to %s:%d via adb-shell: %s", self.host, self.port, cmd)
-            return self._adb.shell(cmd)
+        if priority is None:
+            priority = _priority(cmd)
+
+        with measure(self.metrics, self.host, self.port, cmd) as measurement:
+            with _acquire(self._adb_lock, measurement=measurement, priority=priority):
+                _LOGGER.debug("Sending command to %s:%d via adb-shell: %s", self.host, self.port, cmd)
+                measurement.response = self._adb.shell(cmd)
+                return measurement.response
 
 
 class ADBServerSync(object):
@@ -349,8 +625,14 @@ class ADBServerSync(object):
         # keep track of whether the ADB connection is intact
         self._available = False
 
-        # use a lock to make sure that ADB commands don't overlap
-        self._adb_lock = threading.Lock()
+        # use a lock to make sure that ADB commands don't overlap and that the most urgent ones are sent first
+        self._adb_lock = PriorityLockSync()
+
+        #: The hook that records metrics for each ADB command (see :mod:`androidtv.metrics`), or ``None``
+        self.metrics = None
+
+        #: Whether the device supports the ``exec:`` service, or ``None`` if this has not been detected yet
+        self.exec_out_supported = None
 
     @property
     def available(self):
@@ -373,6 +655,7 @@ class ADBServerSync(object):
         Currently, this doesn't do anything except set ``self._available = False``.
 
         """
+        self.exec_out_supported = None
         self._available = False
 
     def connect(self, log_errors=True):
@@ -390,7 +673,7 @@ class ADBServerSync(object):
 
         """
         try:
-            with _acquire(self._adb_lock):
+            with _acquire(self._adb_lock, priority=PRIORITY_CONTROL):
                 # Catch exceptions
                 try:
                     self._adb_client = Client(host=self.adb_server_ip, port=self.adb_server_port)
@@ -450,56 +733,154 @@ class ADBServerSync(object):
             self._available = False
             return False
 
-    def pull(self, local_path, device_path):
-        """Pull a file from the device using an ADB server.
+    def _exec(self, cmd):
+        """Send an ADB command via the ``exec:`` service of the ADB server.
 
         Parameters
         ----------
-        local_path : str
-            The path where the file will be saved
-        device_path : str
-            The file on the device that will be pulled
+        cmd : str
+            The ADB command to be sent
+
+        Returns
+        -------
+        bytes
+            The response from the device
 
         """
-        if not self.available:
+        conn = self._adb_device.create_connection()
+        conn.send("exec:{}".format(cmd))
+        return _read_all(conn)
+
+    def _detect_exec_out(self):
+        """Detect whether the device supports the ``exec:`` service, if this has not been detected yet.
+
+        The ADB server rejects the service if the device does not support it; the response to
+        :py:const:`~androidtv.constants.CMD_EXEC_OUT_PROBE` must also be the expected output.  The ADB lock must be held.
+
+        Returns
+        -------
+        bool
+            Whether the device supports the ``exec:`` service
+
+        """
+        if self.exec_out_supported is None:
+            try:
+                response = self._exec(CMD_EXEC_OUT_PROBE)
+                if response != b"\n":
+                    raise ValueError("unexpected response {}".format(repr(response)))
+                self.exec_out_supported = True
+            except Exception as exc:  # noqa pylint: disable=broad-except
+                _LOGGER.debug(
+                    "%s:%d does not support the `exec:` service, so `shell:` will be used instead.  %s: %s",
+                    self.host,
+                    self.port,
+                    exc.__class__.__name__,
+                    exc,
+                )
+                self.exec_out_supported = False
+
+        return self.exec_out_supported
+
+    def _exec_out(self, cmd, decode):
+        """Send an ADB command via the ``exec:`` service if the device supports it, or else via ``shell:``.
+
+        The ADB lock must be held.
+
+        Parameters
+        ----------
+        cmd : str
+            The ADB command to be sent
+        decode : bool
+            Whether to decode the output to a string
+
+        Returns
+        -------
+        bytes, str, None
+            The response from the device, if there is a response
+
+        """
+        if self._detect_exec_out():
             _LOGGER.debug(
-                "ADB command not sent to %s:%d via ADB server %s:%d because pure-python-adb connection is not established: pull(%s, %s)",
+                "Sending command to %s:%d via ADB server %s:%d `exec:`: %s",
                 self.host,
                 self.port,
                 self.adb_server_ip,
                 self.adb_server_port,
-                local_path,
-                device_path,
+                cmd,
             )
-            return
+            result = self._exec(cmd)
+            return result.decode("utf-8") if decode else result
+
+        _LOGGER.debug(
+            "Sending command to %s:%d via ADB server %s:%d: %s",
+            self.host,
+            self.port,
+            self.adb_server_ip,
+            self.adb_server_port,
+            cmd,
+        )
+        if decode:
+            return self._adb_device.shell(cmd)
 
-        with _acquire(self._adb_lock):
+        # `ppadb` decodes the output of shell commands unless a handler reads it
+        responses = []
+        self._adb_device.shell(cmd, handler=lambda conn: responses.append(_read_all(conn)))
+        return responses[0]
+
+    def exec_out(self, cmd, decode=True, priority=None):
+        """Send an ADB command via the binary-safe ``exec:`` service using an ADB server.
+
+        See :meth:`ADBPythonSync.exec_out`.
+
+        Parameters
+        ----------
+        cmd : str
+            The ADB command to be sent
+        decode : bool
+            Whether to decode the output to a string
+        priority : int, None
+            The priority of the command (see :py:const:`~androidtv.constants.PRIORITY_INTERACTIVE`); by default, it is
+            determined from the type of command (see :py:const:`~androidtv.constants.COMMAND_PRIORITIES`)
+
+        Returns
+        -------
+        bytes, str, None
+            The response from the device, if there is a response
+
+        """
+        if not self.available:
             _LOGGER.debug(
-                "Sending command to %s:%d via ADB server %s:%d: pull(%s, %s)",
+                "ADB command not sent to %s:%d via ADB server %s:%d because pure-python-adb connection is not established: %s",
                 self.host,
                 self.port,
                 self.adb_server_ip,
                 self.adb_server_port,
-                local_path,
-                device_path,
+                cmd,
             )
-            self._adb_device.pull(device_path, local_path)
-            return
+            return None
 
-    def push(self, local_path, device_path):
-        """Push a file to the device using an ADB server.
+        if priority is None:
+            priority = _priority(cmd)
+
+        with measure(self.metrics, self.host, self.port, cmd) as measurement:
+            with _acquire(self._adb_lock, measurement=measurement, priority=priority):
+                measurement.response = self._exec_out(cmd, decode)
+                return measurement.response
+
+    def pull(self, local_path, device_path):
+        """Pull a file from the device using an ADB server.
 
         Parameters
         ----------
         local_path : str
-            The file that will be pushed to the device
+            The path where the file will be saved
         device_path : str
-            The path where the file will be saved on the device
+            The file on the device that will be pulled
 
         """
         if not self.available:
             _LOGGER.debug(
-                "ADB command not sent to %s:%d via ADB server %s:%d because pure-python-adb connection is not established: push(%s, %s)",
+                "ADB command not sent to %s:%d via ADB server %s:%d because pure-python-adb connection is not established: pull(%s, %s)",
                 self.host,
                 self.port,
                 self.adb_server_ip,
@@ -509,9 +890,34 @@ class ADBServerSync(object):
             )
             return
 
-        with _acquire(self._adb_lock):
+        with measure(self.metrics, self.host, self.port, name="pull") as measurement:
+            with _acquire(self._adb_lock, measurement=measurement, priority=PRIORITY_BULK):
+                _LOGGER.debug(
+                    "Sending command to %s:%d via ADB server %s:%d: pull(%s, %s)",
+                    self.host,
+                    self.port,
+                    self.adb_server_ip,
+                    self.adb_server_port,
+                    local_path,
+                    device_path,
+                )
+                self._adb_device.pull(device_path, local_path)
+                return
+
+    def push(self, local_path, device_path):
+        """Push a file to the device using an ADB server.
+
+        Parameters
+        ----------
+        local_path : str
+            The file that will be pushed to the device
+        device_path : str
+            The path where the file will be saved on the device
+
+        """
+        if not self.available:
             _LOGGER.debug(
-                "Sending command to %s:%d via ADB server %s:%d: push(%s, %s)",
+                "ADB command not sent to %s:%d via ADB server %s:%d because pure-python-adb connection is not established: push(%s, %s)",
                 self.host,
                 self.port,
                 self.adb_server_ip,
@@ -519,16 +925,35 @@ class ADBServerSync(object):
                 local_path,
                 device_path,
             )
-            self._adb_device.push(local_path, device_path)
             return
 
-    def screencap(self):
+        with measure(self.metrics, self.host, self.port, name="push") as measurement:
+            with _acquire(self._adb_lock, measurement=measurement, priority=PRIORITY_BULK):
+                _LOGGER.debug(
+                    "Sending command to %s:%d via ADB server %s:%d: push(%s, %s)",
+                    self.host,
+                    self.port,
+                    self.adb_server_ip,
+                    self.adb_server_port,
+                    local_path,
+                    device_path,
+                )
+                self._adb_device.push(local_path, device_path)
+                return
+
+    def screencap(self, raw=False):
         """Take a screenshot using an ADB server.
 
+        Parameters
+        ----------
+        raw : bool
+            Whether to get the raw framebuffer (see :mod:`androidtv.screencap`) instead of a .png image
+
         Returns
         -------
         bytes, None
-            The screencap as a binary .png image, or ``None`` if there was an ``IndexError`` exception
+            The screencap as a binary .png image or the raw framebuffer, or ``None`` if there was an ``IndexError``
+            exception
 
         """
         if not self.available:
@@ -541,23 +966,31 @@ class ADBServerSync(object):
             )
             return None
 
-        with _acquire(self._adb_lock):
-            _LOGGER.debug(
-                "Taking screencap from %s:%d via ADB server %s:%d",
-                self.host,
-                self.port,
-                self.adb_server_ip,
-                self.adb_server_port,
-            )
-            return self._adb_device.screencap()
-
-    def shell(self, cmd):
+        with measure(self.metrics, self.host, self.port, name="screencap") as measurement:
+            with _acquire(self._adb_lock, measurement=measurement, priority=PRIORITY_BULK):
+                _LOGGER.debug(
+                    "Taking screencap from %s:%d via ADB server %s:%d",
+                    self.host,
+                    self.port,
+                    self.adb_server_ip,
+                    self.adb_server_port,
+                )
+                if raw or self._detect_exec_out():
+                    measurement.response = self._exec_out("screencap" if raw else "screencap -p", False)
+                else:
+                    measurement.response = self._adb_device.screencap()
+                return measurement.response
+
+    def shell(self, cmd, priority=None):
         """Send an ADB command using an ADB server.
 
         Parameters
         ----------
         cmd : str
             The ADB command to be sent
+        priority : int, None
+            The priority of the command (see :py:const:`~androidtv.constants.PRIORITY_INTERACTIVE`); by default, it is
+            determined from the type of command (see :py:const:`~androidtv.constants.COMMAND_PRIORITIES`)
 
         Returns
         -------
@@ -576,13 +1009,18 @@ class ADBServerSync(object):
             )
             return None
 
-        with _acquire(self._adb_lock):
-            _LOGGER.debug(
-                "Sending command to %s:%d via ADB server %s:%d: %s",
-                self.host,
-                self.port,
-                self.adb_server_ip,
-                self.adb_server_port,
-                cmd,
-            )
-            return self._adb_device.shell(cmd)
+        if priority is None:
+            priority = _priority(cmd)
+
+        with measure(self.metrics, self.host, self.port, cmd) as measurement:
+            with _acquire(self._adb_lock, measurement=measurement, priority=priority):
+                _LOGGER.debug(
+                    "Sending command to %s:%d via ADB server %s:%d: %s",
+                    self.host,
+                    self.port,
+                    self.adb_server_ip,
+                    self.adb_server_port,
+                    cmd,
+                )
+                measurement.response = self._adb_device.shell(cmd)
+                return measurement.response
@@ -73,6 +73,7 @@ class AndroidTVSync(BaseTVSync, BaseAndroidTV):
         atv.device_properties = base_tv.device_properties
         atv.installed_apps = base_tv.installed_apps
         atv.max_volume = base_tv.max_volume
+        atv._device_fingerprint = base_tv._device_fingerprint
         return atv
 
     # ======================================================================= #
@@ -80,7 +81,7 @@ class AndroidTVSync(BaseTVSync, BaseAndroidTV):
     #                          Home Assistant Update                          #
     #                                                                         #
     # ======================================================================= #
-    def update(self, get_running_apps=True, lazy=True):
+    def update(self, get_running_apps=True, lazy=True, fused=False):
         """Get the info needed for a Home Assistant update.
 
         Parameters
@@ -89,6 +90,8 @@ class AndroidTVSync(BaseTVSync, BaseAndroidTV):
             Whether or not to get the :meth:`~androidtv.androidtv.androidtv_sync.AndroidTVSync.running_apps` property
         lazy : bool
             Whether or not to continue retrieving properties if the device is off or the screensaver is running
+        fused : bool
+            Whether or not to retrieve all of the properties via a single ADB shell command
 
         Returns
         -------
@@ -121,7 +124,7 @@ class AndroidTVSync(BaseTVSync, BaseAndroidTV):
             volume,
             running_apps,
             hdmi_input,
-        ) = self.get_properties(get_running_apps=get_running_apps, lazy=lazy)
+        ) = self.get_properties(get_running_apps=get_running_apps, lazy=lazy, fused=fused)
 
         return self._update(
             screen_on,
@@ -142,7 +145,7 @@ class AndroidTVSync(BaseTVSync, BaseAndroidTV):
     #                               Properties                                #
     #                                                                         #
     # ======================================================================= #
-    def get_properties(self, get_running_apps=True, lazy=False):
+    def get_properties(self, get_running_apps=True, lazy=False, fused=False):
         """Get the properties needed for Home Assistant updates.
 
         Parameters
@@ -151,6 +154,8 @@ class AndroidTVSync(BaseTVSync, BaseAndroidTV):
             Whether or not to get the :meth:`~androidtv.androidtv.androidtv_sync.AndroidTVSync.running_apps` property
         lazy : bool
             Whether or not to continue retrieving properties if the device is off or the screensaver is running
+        fused : bool
+            Whether or not to retrieve all of the properties via a single ADB shell command
 
         Returns
         -------
@@ -178,6 +183,13 @@ class AndroidTVSync(BaseTVSync, BaseAndroidTV):
             The HDMI input, or ``None`` if it could not be determined
 
         """
+        if self._reconnect_supervisor is not None:
+            self.reconnect()
+
+        if fused:
+            fused_response = self._fused_shell(self._cmd_fused_properties(get_running_apps, lazy))
+            return self._parse_fused_properties(fused_response, get_running_apps, lazy)
+
         screen_on, awake, wake_lock_size = self.screen_on_awake_wake_lock_size()
 
         if lazy and not (screen_on and awake):
@@ -208,7 +220,7 @@ class AndroidTVSync(BaseTVSync, BaseAndroidTV):
             hdmi_input,
         )
 
-    def get_properties_dict(self, get_running_apps=True, lazy=True):
+    def get_properties_dict(self, get_running_apps=True, lazy=True, fused=False):
         """Get the properties needed for Home Assistant updates and return them as a dictionary.
 
         Parameters
@@ -217,6 +229,8 @@ class AndroidTVSync(BaseTVSync, BaseAndroidTV):
             Whether or not to get the :meth:`~androidtv.androidtv.androidtv_sync.AndroidTVSync.running_apps` property
         lazy : bool
             Whether or not to continue retrieving properties if the device is off or the screensaver is running
+        fused : bool
+            Whether or not to retrieve all of the properties via a single ADB shell command
 
         Returns
         -------
@@ -237,7 +251,7 @@ class AndroidTVSync(BaseTVSync, BaseAndroidTV):
             volume,
             running_apps,
             hdmi_input,
-        ) = self.get_properties(get_running_apps=get_running_apps, lazy=lazy)
+        ) = self.get_properties(get_running_apps=get_running_apps, lazy=lazy, fused=fused)
 
         return {
             "screen_on": screen_on,
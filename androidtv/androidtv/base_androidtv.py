@@ -34,6 +34,45 @@ class BaseAndroidTV(BaseTV):  # pylint: disable=too-few-public-methods
     DEVICE_CLASS = "androidtv"
     DEVICE_ENUM = constants.DeviceEnum.ANDROIDTV
 
+    #: The names of the values returned by the ``update()`` method
+    UPDATE_FIELDS = (
+        "state",
+        "current_app",
+        "running_apps",
+        "audio_output_device",
+        "is_volume_muted",
+        "volume_level",
+        "hdmi_input",
+    )
+
+    #: The rules for determining the state of apps with known behavior (see :class:`~androidtv.basetv.basetv.BaseTV`);
+    #: these are used if the ``state_detection_rules`` do not determine the state
+    APP_STATE_DETECTION_RULES = {
+        None: [constants.STATE_IDLE],
+        constants.APP_ATV_LAUNCHER: [constants.STATE_IDLE],
+        constants.APP_BELL_FIBE: ["audio_state"],
+        constants.APP_NETFLIX: ["media_session_state", constants.STATE_IDLE],
+        constants.APP_NLZIET: [
+            {constants.STATE_PAUSED: {"wake_lock_size": 1}},
+            {constants.STATE_PLAYING: {"wake_lock_size": 2}},
+        ],
+        constants.APP_PLEX: [
+            {constants.STATE_PAUSED: {"media_session_state": 3, "wake_lock_size": 1}},
+            {constants.STATE_PLAYING: {"media_session_state": 3}},
+            constants.STATE_IDLE,
+        ],
+        constants.APP_TVHEADEND: [
+            {constants.STATE_PAUSED: {"wake_lock_size": 5}},
+            {constants.STATE_PLAYING: {"wake_lock_size": 6}},
+            constants.STATE_IDLE,
+        ],
+        constants.APP_VLC: ["media_session_state", constants.STATE_IDLE],
+        constants.APP_VRV: ["audio_state"],
+        constants.APP_YOUTUBE: ["media_session_state", constants.STATE_IDLE],
+    }
+
+    _APP_STATE_DETECTION_TABLE = BaseTV._compile_state_detection_rules(APP_STATE_DETECTION_RULES)
+
     def __init__(self, host, port=5555, adbkey="", adb_server_ip="", adb_server_port=5037, state_detection_rules=None):
         BaseTV.__init__(self, None, host, port, adbkey, adb_server_ip, adb_server_port, state_detection_rules)
 
@@ -131,69 +170,10 @@ class BaseAndroidTV(BaseTV):  # pylint: disable=too-few-public-methods
             if state:
                 return state, current_app, running_apps, audio_output_device, is_volume_muted, volume_level, hdmi_input
 
-            # ATV Launcher
-            if current_app in [constants.APP_ATV_LAUNCHER, None]:
-                state = constants.STATE_IDLE
-
-            # BELL Fibe
-            elif current_app == constants.APP_BELL_FIBE:
-                state = audio_state
-
-            # Netflix
-            elif current_app == constants.APP_NETFLIX:
-                if media_session_state == 2:
-                    state = constants.STATE_PAUSED
-                elif media_session_state == 3:
-                    state = constants.STATE_PLAYING
-                else:
-                    state = constants.STATE_IDLE
-
-            # NLZIET
-            elif current_app == constants.APP_NLZIET:
-                if wake_lock_size == 1:
-                    state = constants.STATE_PAUSED
-                elif wake_lock_size == 2:
-                    state = constants.STATE_PLAYING
-            # Plex
-            elif current_app == constants.APP_PLEX:
-                if media_session_state == 3:
-                    if wake_lock_size == 1:
-                        state = constants.STATE_PAUSED
-                    else:
-                        state = constants.STATE_PLAYING
-                else:
-                    state = constants.STATE_IDLE
-
-            # TVheadend
-            elif current_app == constants.APP_TVHEADEND:
-                if wake_lock_size == 5:
-                    state = constants.STATE_PAUSED
-                elif wake_lock_size == 6:
-                    state = constants.STATE_PLAYING
-                else:
-                    state = constants.STATE_IDLE
-
-            # VLC
-            elif current_app == constants.APP_VLC:
-                if media_session_state == 2:
-                    state = constants.STATE_PAUSED
-                elif media_session_state == 3:
-                    state = constants.STATE_PLAYING
-                else:
-                    state = constants.STATE_IDLE
-
-            # VRV
-            elif current_app == constants.APP_VRV:
-                state = audio_state
-
-            # YouTube
-            elif current_app == constants.APP_YOUTUBE:
-                if media_session_state == 2:
-                    state = constants.STATE_PAUSED
-                elif media_session_state == 3:
-                    state = constants.STATE_PLAYING
-                else:
-                    state = constants.STATE_IDLE
+            # Apps with known behavior
+            rules = self._APP_STATE_DETECTION_TABLE.get(current_app)
+            if rules is not None:
+                state = self._evaluate_state_detection_rules(rules, media_session_state, wake_lock_size, audio_state)
 
             # Get the state from `media_session_state`
             elif media_session_state:
@@ -218,3 +198,96 @@ class BaseAndroidTV(BaseTV):  # pylint: disable=too-few-public-methods
                     state = constants.STATE_IDLE
 
         return state, current_app, running_apps, audio_output_device, is_volume_muted, volume_level, hdmi_input
+
+    # ======================================================================= #
+    #                                                                         #
+    #                            Fused properties                             #
+    #                                                                         #
+    # ======================================================================= #
+    def _cmd_fused_properties(self, get_running_apps=True, lazy=False):
+        """Get the single ADB shell command used to retrieve all of the properties needed for a Home Assistant update.
+
+        Parameters
+        ----------
+        get_running_apps : bool
+            Whether or not to get the running apps
+        lazy : bool
+            Whether or not to continue retrieving properties if the device is off or the screensaver is running
+
+        Returns
+        -------
+        str
+            The fused ADB shell command (see :meth:`~androidtv.basetv.basetv.BaseTV._cmd_fused`)
+
+        """
+        commands = [
+            ("screen_on_awake_wake_lock_size", constants.CMD_SCREEN_ON_AWAKE_WAKE_LOCK_SIZE),
+            ("audio_state", self._cmd_audio_state()),
+            ("current_app_media_session_state", self._cmd_current_app_media_session_state()),
+            ("stream_music", constants.CMD_STREAM_MUSIC),
+        ]
+
+        if get_running_apps:
+            commands.append(("running_apps", self._cmd_running_apps()))
+
+        commands.append(("hdmi_input", self._cmd_hdmi_input()))
+
+        return self._cmd_fused(commands, lazy)
+
+    def _parse_fused_properties(self, fused_response, get_running_apps=True, lazy=False):
+        """Parse the output of :meth:`_cmd_fused_properties` into the properties needed for a Home Assistant update.
+
+        Parameters
+        ----------
+        fused_response : str, None
+            The output of the ADB shell command :meth:`_cmd_fused_properties`
+        get_running_apps : bool
+            Whether or not the running apps were retrieved
+        lazy : bool
+            Whether or not the remaining properties were skipped if the device is off or the screensaver is running
+
+        Returns
+        -------
+        tuple
+            The same properties as :meth:`~androidtv.androidtv.androidtv_sync.AndroidTVSync.get_properties`
+
+        """
+        sections = self._parse_fused(fused_response)
+
+        screen_on, awake, wake_lock_size = self._screen_on_awake_wake_lock_size(
+            sections.get("screen_on_awake_wake_lock_size")
+        )
+
+        if lazy and not (screen_on and awake):
+            return screen_on, awake, None, wake_lock_size, None, None, None, None, None, None, None
+
+        audio_state = self._audio_state(sections.get("audio_state"))
+        current_app, media_session_state = self._current_app_media_session_state(
+            sections.get("current_app_media_session_state")
+        )
+
+        stream_music = self._parse_stream_music(sections.get("stream_music"))
+        audio_output_device = stream_music.audio_output_device
+        volume = self._volume(stream_music)
+        is_volume_muted = stream_music.is_volume_muted
+
+        if get_running_apps:
+            running_apps = self._running_apps(sections.get("running_apps"))
+        else:
+            running_apps = [current_app] if current_app else None
+
+        hdmi_input = self._get_hdmi_input(sections.get("hdmi_input"))
+
+        return (
+            screen_on,
+            awake,
+            audio_state,
+            wake_lock_size,
+            current_app,
+            media_session_state,
+            audio_output_device,
+            is_volume_muted,
+            volume,
+            running_apps,
+            hdmi_input,
+        )
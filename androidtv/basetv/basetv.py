@@ -3,14 +3,27 @@
 ADB Debugging must be enabled.
 """
 
+from collections import namedtuple
 import logging
 import re
 
 from .. import constants
+from ..command_profiles import CommandProfile
+from ..property_cache import PropertyCache
+from ..reconnect import ReconnectSupervisor
 
 _LOGGER = logging.getLogger(__name__)
 
 
+#: The properties in the ``STREAM_MUSIC`` block from ``dumpsys audio`` (see :meth:`BaseTV._parse_stream_music`)
+#:
+#: * ``audio_output_device`` -- the current audio playback device, or ``None`` if it could not be determined
+#: * ``is_volume_muted`` -- whether or not the volume is muted, or ``None`` if it could not be determined
+#: * ``max_volume`` -- the maximum volume level, or ``None`` if it could not be determined
+#: * ``volumes`` -- a dictionary whose keys are the audio devices and whose values are their absolute volume levels
+StreamMusic = namedtuple("StreamMusic", ["audio_output_device", "is_volume_muted", "max_volume", "volumes"])
+
+
 class BaseTV(object):  # pylint: disable=too-few-public-methods
     """Base class for representing an Android TV / Fire TV device.
 
@@ -67,6 +80,9 @@ class BaseTV(object):  # pylint: disable=too-few-public-methods
 
     DEVICE_ENUM = constants.DeviceEnum.BASETV
 
+    #: The names of the values returned by the ``update()`` method
+    UPDATE_FIELDS = ()
+
     def __init__(
         self,
         adb,
@@ -83,23 +99,250 @@ class BaseTV(object):  # pylint: disable=too-few-public-methods
         self.adbkey = adbkey
         self.adb_server_ip = adb_server_ip
         self.adb_server_port = adb_server_port
-        self._state_detection_rules = state_detection_rules
         self.device_properties = {}
         self.installed_apps = []
 
         # make sure the rules are valid
-        if self._state_detection_rules:
-            for app_id, rules in self._state_detection_rules.items():
+        if state_detection_rules:
+            for app_id, rules in state_detection_rules.items():
                 if not isinstance(app_id, str):
                     raise TypeError("{0} is of type {1}, not str".format(app_id, type(app_id).__name__))
                 state_detection_rules_validator(rules)
 
+        # the rules are compiled when they are set
+        self._state_detection_rules = state_detection_rules
+
         # the max volume level (determined when first getting the volume level)
         self.max_volume = None
 
         # Customizable commands
         self._custom_commands = {}
 
+        # Functions that are called whenever a control command is sent (see `add_command_listener`)
+        self._command_listeners = []
+
+        # The optional cache of device properties (see `enable_property_cache`)
+        self._property_cache = None
+        self._detach_property_cache = None
+
+        # The output of `constants.CMD_DEVICE_FINGERPRINT` (see `get_device_profile`)
+        self._device_fingerprint = None
+
+        # The optional supervisor for reconnects (see `enable_reconnect`)
+        self._reconnect_supervisor = None
+
+        # The geometry of the raw framebuffer (see `adb_screencap_geometry`)
+        self._screencap_geometry = None
+
+    # ======================================================================= #
+    #                                                                         #
+    #                            Command listeners                            #
+    #                                                                         #
+    # ======================================================================= #
+    def add_command_listener(self, listener):
+        """Register a function that will be called whenever a control command is sent to the device.
+
+        Control commands are those that change the state of the device, such as key presses, launching or stopping an
+        app, turning the device on or off, and setting the volume.  The listener is called with the name of the type of
+        command that was sent: ``'key'``, ``'launch_app'``, ``'stop_app'``, ``'start_intent'``, ``'send_intent'``,
+        ``'turn_on'``, ``'turn_off'``, or ``'set_volume_level'``.
+
+        Parameters
+        ----------
+        listener : function
+            A function that takes the name of the type of command as its only argument
+
+        Returns
+        -------
+        function
+            A function that unregisters the listener
+
+        """
+        self._command_listeners.append(listener)
+
+        def remove():
+            """Unregister the listener."""
+            if listener in self._command_listeners:
+                self._command_listeners.remove(listener)
+
+        return remove
+
+    def _notify_command(self, command):
+        """Call the command listeners after a control command was sent.
+
+        Parameters
+        ----------
+        command : str
+            The name of the type of command that was sent
+
+        """
+        for listener in list(self._command_listeners):
+            listener(command)
+
+    # ======================================================================= #
+    #                                                                         #
+    #                             Property cache                              #
+    #                                                                         #
+    # ======================================================================= #
+    def enable_property_cache(self, ttls_s=None):
+        """Cache the screen state, current app, ``STREAM_MUSIC`` block, running apps, and HDMI input for a short time.
+
+        The cache is cleared whenever a control command is sent.  After a volume command, the new volume is stored in
+        the cache, so that a rapid series of volume commands only needs to retrieve the volume once.
+
+        Parameters
+        ----------
+        ttls_s : dict, None
+            The time (in s) for which each property is cached; the default is
+            :const:`~androidtv.constants.DEFAULT_PROPERTY_CACHE_TTLS_S`
+
+        Returns
+        -------
+        PropertyCache
+            The cache
+
+        """
+        self.disable_property_cache()
+        self._property_cache = PropertyCache(ttls_s)
+        self._detach_property_cache = self._property_cache.attach(self)
+        return self._property_cache
+
+    def disable_property_cache(self):
+        """Stop caching device properties (see :meth:`enable_property_cache`)."""
+        if self._detach_property_cache:
+            self._detach_property_cache()
+
+        self._property_cache = None
+        self._detach_property_cache = None
+
+    def _cached(self, name):
+        """Get a property from the cache, if it is enabled.
+
+        Parameters
+        ----------
+        name : str
+            The name of the property
+
+        Returns
+        -------
+        object, None
+            The cached value, or ``None`` if it is not cached
+
+        """
+        if self._property_cache is None:
+            return None
+
+        return self._property_cache.get(name)
+
+    def _cache(self, name, value, response):
+        """Store a property in the cache, if it is enabled and the ADB response was received.
+
+        Parameters
+        ----------
+        name : str
+            The name of the property
+        value : object
+            The value of the property
+        response : str, None
+            The ADB response from which the value was determined; if it is ``None``, the value is not cached
+
+        Returns
+        -------
+        object
+            The value of the property
+
+        """
+        if self._property_cache is not None and response is not None:
+            self._property_cache.set(name, value)
+
+        return value
+
+    def _cache_volume(self, stream_music, volume):
+        """Update the cached ``STREAM_MUSIC`` block after the volume was changed.
+
+        Parameters
+        ----------
+        stream_music : StreamMusic, None
+            The ``STREAM_MUSIC`` block from before the volume was changed
+        volume : int
+            The new absolute volume level
+
+        """
+        if self._property_cache is None or stream_music is None or stream_music.audio_output_device is None:
+            return
+
+        volumes = dict(stream_music.volumes)
+        volumes[stream_music.audio_output_device] = volume
+        self._property_cache.set("stream_music", stream_music._replace(volumes=volumes))
+
+    # ======================================================================= #
+    #                                                                         #
+    #                                Reconnects                               #
+    #                                                                         #
+    # ======================================================================= #
+    def enable_reconnect(self, **kwargs):
+        """Reconnect automatically when the device is unavailable, with an exponential backoff and a circuit breaker.
+
+        Once this is enabled, ``get_properties()`` (and thus ``update()``) calls ``reconnect()`` first, and
+        ``reconnect()`` only attempts to connect when the supervisor allows it.
+
+        Parameters
+        ----------
+        **kwargs
+            Keyword arguments for :class:`~androidtv.reconnect.ReconnectSupervisor`
+
+        Returns
+        -------
+        ReconnectSupervisor
+            The supervisor
+
+        """
+        self._reconnect_supervisor = ReconnectSupervisor(**kwargs)
+        return self._reconnect_supervisor
+
+    def disable_reconnect(self):
+        """Stop reconnecting automatically (see :meth:`enable_reconnect`)."""
+        self._reconnect_supervisor = None
+
+    @property
+    def health(self):
+        """The health of the connection to the device.
+
+        Returns
+        -------
+        str
+            :py:const:`~androidtv.constants.HEALTH_CONNECTED` if the device is available,
+            :py:const:`~androidtv.constants.HEALTH_DISCONNECTED` if it is not and reconnects are not enabled, and
+            otherwise :py:const:`~androidtv.constants.HEALTH_RECONNECTING` or
+            :py:const:`~androidtv.constants.HEALTH_CIRCUIT_OPEN`
+
+        """
+        if self.available:
+            return constants.HEALTH_CONNECTED
+
+        if self._reconnect_supervisor is None:
+            return constants.HEALTH_DISCONNECTED
+
+        return self._reconnect_supervisor.health
+
+    # ======================================================================= #
+    #                                                                         #
+    #                                 Metrics                                 #
+    #                                                                         #
+    # ======================================================================= #
+    def set_metrics(self, metrics):
+        """Record the lock wait time, transport time, response size, and failures of each ADB command.
+
+        The same hook can be shared by several devices, since the measurements are labeled with the device.
+
+        Parameters
+        ----------
+        metrics : androidtv.metrics.CommandMetrics, None
+            The metrics hook (see :mod:`androidtv.metrics`), or ``None`` to stop recording metrics
+
+        """
+        self._adb.metrics = metrics
+
     # ======================================================================= #
     #                                                                         #
     #                      Device-specific ADB commands                       #
@@ -122,6 +365,49 @@ class BaseTV(object):  # pylint: disable=too-few-public-methods
             elif custom_command in self._custom_commands:
                 del self._custom_commands[custom_command]
 
+            self._command_profile = None
+
+    @property
+    def command_profile(self):
+        """The commands for this device, which are resolved when they are first needed.
+
+        They are resolved again after a command is customized or ``device_properties`` is assigned a new value.
+
+        Returns
+        -------
+        CommandProfile
+            The resolved commands (see :mod:`androidtv.command_profiles`)
+
+        """
+        if self._command_profile is None:
+            self._command_profile = CommandProfile(self.DEVICE_ENUM, self.device_properties, self._custom_commands)
+        return self._command_profile
+
+    @property
+    def device_properties(self):
+        """The device properties (see ``get_device_properties()``).
+
+        Returns
+        -------
+        dict
+            The device properties
+
+        """
+        return self._device_properties
+
+    @device_properties.setter
+    def device_properties(self, device_properties):
+        """Set the device properties and discard the resolved commands, which depend on them.
+
+        Parameters
+        ----------
+        device_properties : dict
+            The device properties
+
+        """
+        self._device_properties = device_properties
+        self._command_profile = None
+
     def _cmd_audio_state(self):
         """Get the command used to retrieve the current audio state for this device.
 
@@ -131,19 +417,7 @@ class BaseTV(object):  # pylint: disable=too-few-public-methods
             The device-specific ADB shell command used to determine the current audio state
 
         """
-        if constants.CUSTOM_AUDIO_STATE in self._custom_commands:
-            return self._custom_commands[constants.CUSTOM_AUDIO_STATE]
-
-        # Is this an Android 11-14 device?
-        if self.DEVICE_ENUM == constants.DeviceEnum.ANDROIDTV and self.device_properties.get("sw_version", "") in [
-            "11",
-            "12",
-            "13",
-            "14",
-        ]:
-            return constants.CMD_AUDIO_STATE11
-
-        return constants.CMD_AUDIO_STATE
+        return self.command_profile.commands["audio_state"]
 
     def _cmd_current_app(self):
         """Get the command used to retrieve the current app for this device.
@@ -154,41 +428,7 @@ class BaseTV(object):  # pylint: disable=too-few-public-methods
             The device-specific ADB shell command used to determine the current app
 
         """
-        if constants.CUSTOM_CURRENT_APP in self._custom_commands:
-            return self._custom_commands[constants.CUSTOM_CURRENT_APP]
-
-        # Is this a Google Chromecast Android TV?
-        if (
-            self.DEVICE_ENUM == constants.DeviceEnum.ANDROIDTV
-            and "Google" in self.device_properties.get("manufacturer", "")
-            and "Chromecast" in self.device_properties.get("model", "")
-        ):
-            return constants.CMD_CURRENT_APP_GOOGLE_TV
-
-        # Is this an Askey STI6130 Device?
-        if (
-            self.DEVICE_ENUM == constants.DeviceEnum.ANDROIDTV
-            and "askey" in self.device_properties.get("manufacturer", "")
-            and "sti6130" in self.device_properties.get("product_id", "")
-        ):
-            return constants.CMD_CURRENT_APP_ASKEY_STI6130
-
-        # Is this an Android 11 device?
-        if self.DEVICE_ENUM == constants.DeviceEnum.ANDROIDTV and self.device_properties.get("sw_version", "") == "11":
-            return constants.CMD_CURRENT_APP11
-
-        # Is this an Android 12 device?
-        if self.DEVICE_ENUM == constants.DeviceEnum.ANDROIDTV and self.device_properties.get("sw_version", "") == "12":
-            return constants.CMD_CURRENT_APP12
-
-        # Is this an Android 13/14 device?
-        if self.DEVICE_ENUM == constants.DeviceEnum.ANDROIDTV and self.device_properties.get("sw_version", "") in [
-            "13",
-            "14",
-        ]:
-            return constants.CMD_CURRENT_APP13
-
-        return constants.CMD_CURRENT_APP
+        return self.command_profile.commands["current_app"]
 
     def _cmd_current_app_media_session_state(self):
         """Get the command used to retrieve the current app and media session state for this device.
@@ -199,41 +439,7 @@ class BaseTV(object):  # pylint: disable=too-few-public-methods
             The device-specific ADB shell command used to determine the current app and media session state
 
         """
-        if constants.CUSTOM_CURRENT_APP_MEDIA_SESSION_STATE in self._custom_commands:
-            return self._custom_commands[constants.CUSTOM_CURRENT_APP_MEDIA_SESSION_STATE]
-
-        # Is this an Askey STI6130 Device?
-        if (
-            self.DEVICE_ENUM == constants.DeviceEnum.ANDROIDTV
-            and "askey" in self.device_properties.get("manufacturer", "")
-            and "sti6130" in self.device_properties.get("product_id", "")
-        ):
-            return constants.CMD_CURRENT_APP_MEDIA_SESSION_STATE_ASKEY_STI6130
-
-        # Is this a Google Chromecast Android TV?
-        if (
-            self.DEVICE_ENUM == constants.DeviceEnum.ANDROIDTV
-            and "Google" in self.device_properties.get("manufacturer", "")
-            and "Chromecast" in self.device_properties.get("model", "")
-        ):
-            return constants.CMD_CURRENT_APP_MEDIA_SESSION_STATE_GOOGLE_TV
-
-        # Is this an Android 11 device?
-        if self.DEVICE_ENUM == constants.DeviceEnum.ANDROIDTV and self.device_properties.get("sw_version", "") == "11":
-            return constants.CMD_CURRENT_APP_MEDIA_SESSION_STATE11
-
-        # Is this an Android 12 device?
-        if self.DEVICE_ENUM == constants.DeviceEnum.ANDROIDTV and self.device_properties.get("sw_version", "") == "12":
-            return constants.CMD_CURRENT_APP_MEDIA_SESSION_STATE12
-
-        # Is this an Android 13/14 device?
-        if self.DEVICE_ENUM == constants.DeviceEnum.ANDROIDTV and self.device_properties.get("sw_version", "") in [
-            "13",
-            "14",
-        ]:
-            return constants.CMD_CURRENT_APP_MEDIA_SESSION_STATE13
-
-        return constants.CMD_CURRENT_APP_MEDIA_SESSION_STATE
+        return self.command_profile.commands["current_app_media_session_state"]
 
     def _cmd_hdmi_input(self):
         """Get the command used to retrieve the current HDMI input for this device.
@@ -244,19 +450,7 @@ class BaseTV(object):  # pylint: disable=too-few-public-methods
             The device-specific ADB shell command used to determine the current HDMI input
 
         """
-        if constants.CUSTOM_HDMI_INPUT in self._custom_commands:
-            return self._custom_commands[constants.CUSTOM_HDMI_INPUT]
-
-        # Is this an Android 11-14 device?
-        if self.DEVICE_ENUM == constants.DeviceEnum.ANDROIDTV and self.device_properties.get("sw_version", "") in [
-            "11",
-            "12",
-            "13",
-            "14",
-        ]:
-            return constants.CMD_HDMI_INPUT11
-
-        return constants.CMD_HDMI_INPUT
+        return self.command_profile.commands["hdmi_input"]
 
     def _cmd_volume_set(self, new_volume):
         """Get the command used to set volume for this device.
@@ -272,16 +466,7 @@ class BaseTV(object):  # pylint: disable=too-few-public-methods
             The device-specific ADB shell command used to set volume
 
         """
-        # Is this an Android 11-14 device?
-        if self.DEVICE_ENUM == constants.DeviceEnum.ANDROIDTV and self.device_properties.get("sw_version", "") in [
-            "11",
-            "12",
-            "13",
-            "14",
-        ]:
-            return constants.CMD_VOLUME_SET_COMMAND11.format(new_volume)
-
-        return constants.CMD_VOLUME_SET_COMMAND.format(new_volume)
+        return self.command_profile.commands["volume_set"].format(new_volume)
 
     def _cmd_launch_app(self, app):
         """Get the command to launch the specified app for this device.
@@ -297,36 +482,7 @@ class BaseTV(object):  # pylint: disable=too-few-public-methods
             The device-specific command to launch the app
 
         """
-        if constants.CUSTOM_LAUNCH_APP in self._custom_commands:
-            return self._custom_commands[constants.CUSTOM_LAUNCH_APP].format(app)
-
-        # Is this a Google Chromecast Android TV?
-        if (
-            self.DEVICE_ENUM == constants.DeviceEnum.ANDROIDTV
-            and "Google" in self.device_properties.get("manufacturer", "")
-            and "Chromecast" in self.device_properties.get("model", "")
-        ):
-            return constants.CMD_LAUNCH_APP_GOOGLE_TV.format(app)
-
-        if self.DEVICE_ENUM == constants.DeviceEnum.FIRETV:
-            return constants.CMD_LAUNCH_APP_FIRETV.format(app)
-
-        # Is this an Android 11 device?
-        if self.DEVICE_ENUM == constants.DeviceEnum.ANDROIDTV and self.device_properties.get("sw_version", "") == "11":
-            return constants.CMD_LAUNCH_APP11.format(app)
-
-        # Is this an Android 12 device?
-        if self.DEVICE_ENUM == constants.DeviceEnum.ANDROIDTV and self.device_properties.get("sw_version", "") == "12":
-            return constants.CMD_LAUNCH_APP12.format(app)
-
-        # Is this an Android 13-14 device?
-        if self.DEVICE_ENUM == constants.DeviceEnum.ANDROIDTV and self.device_properties.get("sw_version", "") in [
-            "13",
-            "14",
-        ]:
-            return constants.CMD_LAUNCH_APP13.format(app)
-
-        return constants.CMD_LAUNCH_APP.format(app)
+        return self.command_profile.commands["launch_app"].format(app)
 
     def _cmd_running_apps(self):
         """Get the command used to retrieve the running apps for this device.
@@ -337,10 +493,7 @@ class BaseTV(object):  # pylint: disable=too-few-public-methods
             The device-specific ADB shell command used to determine the running apps
 
         """
-        if constants.CUSTOM_RUNNING_APPS in self._custom_commands:
-            return self._custom_commands[constants.CUSTOM_RUNNING_APPS]
-
-        return constants.CMD_RUNNING_APPS
+        return self.command_profile.commands["running_apps"]
 
     def _cmd_turn_off(self):
         """Get the command used to turn off this device.
@@ -351,13 +504,7 @@ class BaseTV(object):  # pylint: disable=too-few-public-methods
             The device-specific ADB shell command used to turn off the device
 
         """
-        if constants.CUSTOM_TURN_OFF in self._custom_commands:
-            return self._custom_commands[constants.CUSTOM_TURN_OFF]
-
-        if self.DEVICE_ENUM == constants.DeviceEnum.FIRETV:
-            return constants.CMD_TURN_OFF_FIRETV
-
-        return constants.CMD_TURN_OFF_ANDROIDTV
+        return self.command_profile.commands["turn_off"]
 
     def _cmd_turn_on(self):
         """Get the command used to turn on this device.
@@ -368,13 +515,82 @@ class BaseTV(object):  # pylint: disable=too-few-public-methods
             The device-specific ADB shell command used to turn on the device
 
         """
-        if constants.CUSTOM_TURN_ON in self._custom_commands:
-            return self._custom_commands[constants.CUSTOM_TURN_ON]
+        return self.command_profile.commands["turn_on"]
+
+    # ======================================================================= #
+    #                                                                         #
+    #                             Fused commands                              #
+    #                                                                         #
+    # ======================================================================= #
+    @staticmethod
+    def _cmd_fused(commands, lazy=False):
+        """Combine several ADB shell commands into a single command whose output is split into sections.
+
+        The output of each command is preceded by a line containing :py:const:`~androidtv.constants.FUSED_DELIMITER`
+        and the name of the command, and it is followed by a newline.  Each command is run in a subshell so that
+        variables such as ``CURRENT_APP`` do not leak between them.
+
+        Parameters
+        ----------
+        commands : list
+            A list of ``(name, cmd)`` tuples; the first command must be :py:const:`~androidtv.constants.CMD_SCREEN_ON_AWAKE_WAKE_LOCK_SIZE`
+        lazy : bool
+            Whether or not to skip the remaining commands if the device is off or the screensaver is running
+
+        Returns
+        -------
+        str
+            The fused ADB shell command
+
+        """
+        sections = [
+            "echo '{0}{1}' ; ( {2} ) ; echo".format(constants.FUSED_DELIMITER, name, cmd) for name, cmd in commands
+        ]
+
+        if not lazy:
+            return " ; ".join(sections)
+
+        # Only run the remaining commands if the output of the first command starts with "11" (i.e., screen on and awake)
+        name, cmd = commands[0]
+        gate = "echo '{0}{1}' ; SCREEN_ON_AWAKE=$({2}) ; echo \"$SCREEN_ON_AWAKE\"".format(
+            constants.FUSED_DELIMITER, name, cmd
+        )
+        if len(sections) == 1:
+            return gate
+
+        return gate + ' ; case "$SCREEN_ON_AWAKE" in 11*) ' + " ; ".join(sections[1:]) + " ;; esac"
+
+    @staticmethod
+    def _parse_fused(fused_response):
+        """Split the output of a command built by :meth:`_cmd_fused` into the outputs of the individual commands.
+
+        Parameters
+        ----------
+        fused_response : str, None
+            The output of the fused ADB shell command
+
+        Returns
+        -------
+        dict
+            A dictionary whose keys are the names of the commands that were run and whose values are their outputs
+
+        """
+        if fused_response is None:
+            return {}
+
+        sections = {}
+        for section in fused_response.split(constants.FUSED_DELIMITER)[1:]:
+            name, _, output = section.partition("\n")
+
+            # Remove the newline that was appended after the command's output
+            if output.endswith("\r\n"):
+                output = output[:-2]
+            elif output.endswith("\n"):
+                output = output[:-1]
 
-        if self.DEVICE_ENUM == constants.DeviceEnum.FIRETV:
-            return constants.CMD_TURN_ON_FIRETV
+            sections[name.strip()] = output
 
-        return constants.CMD_TURN_ON_ANDROIDTV
+        return sections
 
     # ======================================================================= #
     #                                                                         #
@@ -488,76 +704,120 @@ class BaseTV(object):  # pylint: disable=too-few-public-methods
 
     # ======================================================================= #
     #                                                                         #
-    #                         Custom state detection                          #
+    #                             Device profile                              #
     #                                                                         #
     # ======================================================================= #
-    def _custom_state_detection(
-        self,
-        current_app=None,
-        media_session_state=None,
-        wake_lock_size=None,
-        audio_state=None,
-    ):
-        """Use the rules in ``self._state_detection_rules`` to determine the state.
+    def save_device_profile(self, profile_cache, save=True):
+        """Store the device properties, installed apps, and max volume in a profile cache.
+
+        This is done automatically by ``get_device_profile()``, but it can be called again later, e.g., once
+        ``max_volume`` has been determined.
 
         Parameters
         ----------
-        current_app : str, None
-            The :meth:`current_app` property
-        media_session_state : int, None
-            The :meth:`media_session_state` property
-        wake_lock_size : int, None
-            The :meth:`wake_lock_size` property
-        audio_state : str, None
-            The :meth:`audio_state` property
+        profile_cache : androidtv.profile_cache.ProfileCache
+            The profile cache
+        save : bool
+            Whether to write the profile cache to its file; with async devices, use ``False`` and then write it in an
+            executor (see :meth:`androidtv.profile_cache.ProfileCache.dump`)
 
         Returns
         -------
-        str, None
-            The state, if it could be determined using the rules in ``self._state_detection_rules``; otherwise, ``None``
+        bool
+            Whether the profile was stored; it is not stored if the device properties, the installed apps, or the
+            device fingerprint could not be determined
 
         """
-        if not self._state_detection_rules or current_app is None or current_app not in self._state_detection_rules:
+        profile = self._dump_profile()
+        if not self._device_fingerprint or profile is None:
+            return False
+
+        profile_cache.set(profile_cache.key(self.host, self.port), self._device_fingerprint, profile, save)
+        return True
+
+    def _dump_profile(self):
+        """Get the properties of the device that are stored in a profile cache.
+
+        Returns
+        -------
+        dict, None
+            The profile, or ``None`` if the device properties or the installed apps have not been determined
+
+        """
+        if not self.device_properties.get("manufacturer") or self.installed_apps is None:
             return None
 
-        rules = self._state_detection_rules[current_app]
+        return {
+            "device_properties": self.device_properties,
+            "installed_apps": self.installed_apps,
+            "max_volume": self.max_volume,
+        }
 
-        for rule in rules:
-            # The state is always the same for this app
-            if rule in constants.VALID_STATES:
-                return rule
-
-            # Use the `media_session_state` property
-            if rule == "media_session_state":
-                if media_session_state == 2:
-                    return constants.STATE_PAUSED
-                if media_session_state == 3:
-                    return constants.STATE_PLAYING
-                if media_session_state is not None:
-                    return constants.STATE_IDLE
-
-            # Use the `audio_state` property
-            if rule == "audio_state" and audio_state in constants.VALID_STATES:
-                return audio_state
-
-            # Check conditions and if they are true, return the specified state
-            if isinstance(rule, dict):
-                for state, conditions in rule.items():
-                    if state in constants.VALID_STATES and self._conditions_are_true(
-                        conditions, media_session_state, wake_lock_size, audio_state
-                    ):
-                        return state
+    def _load_profile(self, profile):
+        """Restore the properties of the device from a profile cache.
 
-        return None
+        Parameters
+        ----------
+        profile : dict
+            The profile, as returned by :meth:`_dump_profile`
+
+        """
+        self.device_properties = dict(profile["device_properties"])
+        self.installed_apps = list(profile["installed_apps"])
+        if profile.get("max_volume"):
+            self.max_volume = profile["max_volume"]
+
+    # ======================================================================= #
+    #                                                                         #
+    #                         Custom state detection                          #
+    #                                                                         #
+    # ======================================================================= #
+    @property
+    def _state_detection_rules(self):
+        """The ``state_detection_rules`` (see :class:`~androidtv.basetv.basetv.BaseTV`).
+
+        Setting this property compiles the rules via :meth:`_compile_state_detection_rules`.
+
+        """
+        return self._raw_state_detection_rules
+
+    @_state_detection_rules.setter
+    def _state_detection_rules(self, state_detection_rules):
+        self._raw_state_detection_rules = state_detection_rules
+        self._state_detection_table = self._compile_state_detection_rules(state_detection_rules)
+
+    @staticmethod
+    def _compile_state_detection_rules(state_detection_rules):
+        """Compile ``state_detection_rules`` into a table that can be evaluated quickly.
+
+        Each rule is converted into a function of the ``media_session_state``, ``wake_lock_size``, and ``audio_state``
+        properties that returns a state or ``None``.  Rules that can never be satisfied are dropped, as are the rules
+        that follow a rule that is always satisfied (e.g., ``'idle'``).
+
+        Parameters
+        ----------
+        state_detection_rules : dict, None
+            A dictionary of rules for determining the state (see :class:`~androidtv.basetv.basetv.BaseTV`)
+
+        Returns
+        -------
+        dict
+            A dictionary whose keys are the app IDs and whose values are tuples of the compiled rules
+
+        """
+        if not state_detection_rules:
+            return {}
+
+        return {app_id: _compile_rules(rules) for app_id, rules in state_detection_rules.items()}
 
     @staticmethod
-    def _conditions_are_true(conditions, media_session_state=None, wake_lock_size=None, audio_state=None):
-        """Check whether the conditions in ``conditions`` are true.
+    def _evaluate_state_detection_rules(rules, media_session_state=None, wake_lock_size=None, audio_state=None):
+        """Determine the state using compiled rules (see :meth:`_compile_state_detection_rules`).
 
         Parameters
         ----------
-        conditions : dict
-            A dictionary of conditions to be checked (see the ``state_detection_rules`` parameter in :class:`~androidtv.basetv.basetv.BaseTV`)
+        rules : tuple
+            The compiled rules for the current app
         media_session_state : int, None
             The :meth:`media_session_state` property
         wake_lock_size : int, None
@@ -567,58 +827,57 @@ class BaseTV(object):  # pylint: disable=too-few-public-methods
 
         Returns
         -------
-        bool
-            Whether or not all the conditions in ``conditions`` are true
+        str, None
+            The state determined by the first rule that is satisfied, or ``None`` if none of them are satisfied
 
         """
-        for key, val in conditions.items():
-            if key == "media_session_state":
-                if media_session_state is None or media_session_state != val:
-                    return False
-
-            elif key == "wake_lock_size":
-                if wake_lock_size is None or wake_lock_size != val:
-                    return False
-
-            elif key == "audio_state":
-                if audio_state is None or audio_state != val:
-                    return False
-
-            # key is invalid
-            else:
-                return False
+        for rule in rules:
+            state = rule(media_session_state, wake_lock_size, audio_state)
+            if state:
+                return state
 
-        return True
+        return None
 
-    # ======================================================================= #
-    #                                                                         #
-    #                            Parse properties                             #
-    #                                                                         #
-    # ======================================================================= #
-    @staticmethod
-    def _audio_output_device(stream_music):
-        """Get the current audio playback device from the ``STREAM_MUSIC`` block from ``adb shell dumpsys audio``.
+    def _custom_state_detection(
+        self,
+        current_app=None,
+        media_session_state=None,
+        wake_lock_size=None,
+        audio_state=None,
+    ):
+        """Use the rules in ``self._state_detection_rules`` to determine the state.
 
         Parameters
         ----------
-        stream_music : str, None
-            The ``STREAM_MUSIC`` block from ``adb shell dumpsys audio``
+        current_app : str, None
+            The :meth:`current_app` property
+        media_session_state : int, None
+            The :meth:`media_session_state` property
+        wake_lock_size : int, None
+            The :meth:`wake_lock_size` property
+        audio_state : str, None
+            The :meth:`audio_state` property
 
         Returns
         -------
         str, None
-            The current audio playback device, or ``None`` if it could not be determined
+            The state, if it could be determined using the rules in ``self._state_detection_rules``; otherwise, ``None``
 
         """
-        if not stream_music:
+        if current_app is None:
             return None
 
-        matches = re.findall(constants.DEVICE_REGEX_PATTERN, stream_music, re.DOTALL | re.MULTILINE)
-        if matches:
-            return matches[0]
+        rules = self._state_detection_table.get(current_app)
+        if not rules:
+            return None
 
-        return None
+        return self._evaluate_state_detection_rules(rules, media_session_state, wake_lock_size, audio_state)
 
+    # ======================================================================= #
+    #                                                                         #
+    #                            Parse properties                             #
+    #                                                                         #
+    # ======================================================================= #
     @staticmethod
     def _audio_state(audio_state_response):
         """Parse the :meth:`audio_state` property from the ADB shell output.
@@ -731,33 +990,11 @@ class BaseTV(object):  # pylint: disable=too-few-public-methods
 
         return None
 
-    @staticmethod
-    def _is_volume_muted(stream_music):
-        """Determine whether or not the volume is muted from the ``STREAM_MUSIC`` block from ``adb shell dumpsys audio``.
-
-        Parameters
-        ----------
-        stream_music : str, None
-            The ``STREAM_MUSIC`` block from ``adb shell dumpsys audio``
-
-        Returns
-        -------
-        bool, None
-            Whether or not the volume is muted, or ``None`` if it could not be determined
-
-        """
-        if not stream_music:
-            return None
-
-        matches = re.findall(constants.MUTED_REGEX_PATTERN, stream_music, re.DOTALL | re.MULTILINE)
-        if matches:
-            return matches[0] == "true"
-
-        return None
-
     @staticmethod
     def _parse_stream_music(stream_music_raw):
-        """Parse the output of the command :py:const:`androidtv.constants.CMD_STREAM_MUSIC`.
+        """Parse the ``STREAM_MUSIC`` block from the output of the command :py:const:`androidtv.constants.CMD_STREAM_MUSIC`.
+
+        All of the properties are extracted in a single pass over the lines of the block.
 
         Parameters
         ----------
@@ -766,22 +1003,47 @@ class BaseTV(object):  # pylint: disable=too-few-public-methods
 
         Returns
         -------
-        str, None
-            The ``STREAM_MUSIC`` block from the output of :py:const:`androidtv.constants.CMD_STREAM_MUSIC`, or ``None`` if it could not be determined
+        StreamMusic
+            The properties from the ``STREAM_MUSIC`` block; they are ``None`` (or empty) if they could not be determined
 
         """
-        if not stream_music_raw:
-            return None
-
-        matches = re.findall(
-            constants.STREAM_MUSIC_REGEX_PATTERN,
-            stream_music_raw,
-            re.DOTALL | re.MULTILINE,
-        )
-        if matches:
-            return matches[0]
-
-        return None
+        audio_output_device = None
+        is_volume_muted = None
+        max_volume = None
+        volumes = {}
+
+        # The block is the text between "STREAM_MUSIC" and the header of the next stream
+        start = stream_music_raw.find("STREAM_MUSIC") if stream_music_raw else -1
+        end = stream_music_raw.find("- STREAM", start + 12) if start >= 0 else -1
+        if end < 0:
+            return StreamMusic(None, None, None, volumes)
+
+        for line in stream_music_raw[start + 12 : end].splitlines():
+            key, _, value = line.lstrip().partition(": ")
+
+            # e.g., "Muted: false"
+            if key == "Muted" and is_volume_muted is None:
+                is_volume_muted = constants.REGEX_WORD.match(value).group() == "true"
+
+            # e.g., "Max: 60"
+            elif key == "Max" and max_volume is None:
+                digits = constants.REGEX_DIGITS.match(value).group()
+                if digits:
+                    max_volume = int(digits)
+
+            # e.g., "Current: 2 (speaker): 20, 40000 (hmdi_arc): 27, 40000000 (default): 15"
+            elif key == "Current":
+                for entry in value.split(", "):
+                    device, sep, volume = entry.partition("): ")
+                    digits = constants.REGEX_DIGITS.match(volume).group()
+                    if sep and digits:
+                        volumes.setdefault(device.rpartition("(")[2], int(digits))
+
+            # e.g., "Devices: hmdi_arc"
+            elif key == "Devices" and audio_output_device is None:
+                audio_output_device = constants.REGEX_WORD.match(value).group()
+
+        return StreamMusic(audio_output_device, is_volume_muted, max_volume, volumes)
 
     @staticmethod
     def _running_apps(running_apps_response):
@@ -834,15 +1096,15 @@ class BaseTV(object):  # pylint: disable=too-few-public-methods
 
         return screen_on, awake, wake_lock_size
 
-    def _volume(self, stream_music, audio_output_device):
+    def _volume(self, stream_music):
         """Get the absolute volume level from the ``STREAM_MUSIC`` block from ``adb shell dumpsys audio``.
 
+        If ``self.max_volume`` has not been determined yet, it is set from ``stream_music``.
+
         Parameters
         ----------
-        stream_music : str, None
-            The ``STREAM_MUSIC`` block from ``adb shell dumpsys audio``
-        audio_output_device : str, None
-            The current audio playback device
+        stream_music : StreamMusic
+            The properties from the ``STREAM_MUSIC`` block, as returned by :meth:`_parse_stream_music`
 
         Returns
         -------
@@ -850,30 +1112,13 @@ class BaseTV(object):  # pylint: disable=too-few-public-methods
             The absolute volume level, or ``None`` if it could not be determined
 
         """
-        if not stream_music:
-            return None
-
-        if not self.max_volume:
-            max_volume_matches = re.findall(
-                constants.MAX_VOLUME_REGEX_PATTERN,
-                stream_music,
-                re.DOTALL | re.MULTILINE,
-            )
-            if max_volume_matches:
-                self.max_volume = float(max_volume_matches[0])
+        if not self.max_volume and stream_music.max_volume is not None:
+            self.max_volume = float(stream_music.max_volume)
 
-        if not audio_output_device:
+        if not stream_music.audio_output_device:
             return None
 
-        volume_matches = re.findall(
-            audio_output_device + constants.VOLUME_REGEX_PATTERN,
-            stream_music,
-            re.DOTALL | re.MULTILINE,
-        )
-        if volume_matches:
-            return int(volume_matches[0])
-
-        return None
+        return stream_music.volumes.get(stream_music.audio_output_device)
 
     def _volume_level(self, volume):
         """Get the relative volume level from the absolute volume level.
@@ -916,6 +1161,38 @@ class BaseTV(object):  # pylint: disable=too-few-public-methods
 
         return None
 
+    @staticmethod
+    def _parse_event(line):
+        """Get the properties that are revealed by a line of output from :py:const:`androidtv.constants.CMD_WATCH_EVENTS`.
+
+        Parameters
+        ----------
+        line : str
+            A line of output from :py:const:`androidtv.constants.CMD_WATCH_EVENTS`
+
+        Returns
+        -------
+        dict
+            The properties (using the names of the ``_update()`` parameters) and their new values; this is empty if the
+            line could not be parsed
+
+        """
+        event_matches = constants.REGEX_EVENT.match(line.strip())
+        if not event_matches:
+            return {}
+
+        # e.g., "I/screen_toggled( 1234): 0"
+        if event_matches.group("tag") == "screen_toggled":
+            screen_on = event_matches.group("message").strip() != "0"
+            return {"screen_on": screen_on, "awake": screen_on}
+
+        # e.g., "I/am_set_resumed_activity( 1234): [0,com.netflix.ninja/.MainActivity,resumeTopActivity]"
+        component_matches = constants.REGEX_EVENT_COMPONENT.search(event_matches.group("message"))
+        if component_matches:
+            return {"current_app": component_matches.group("package")}
+
+        return {}
+
     @staticmethod
     def _parse_getevent_line(line):
         """Parse a line of the output received in ``learn_sendevent``.
@@ -936,6 +1213,113 @@ class BaseTV(object):  # pylint: disable=too-few-public-methods
         return "sendevent {} {} {} {}".format(device_name, *integers)
 
 
+# ======================================================================= #
+#                                                                         #
+#                    Compile the state detection rules                    #
+#                                                                         #
+# ======================================================================= #
+#: The position of each property in the arguments of a compiled rule (see :meth:`BaseTV._compile_state_detection_rules`)
+_RULE_PROPERTY_INDEX = {"media_session_state": 0, "wake_lock_size": 1, "audio_state": 2}
+
+
+def _media_session_state_rule(media_session_state, wake_lock_size, audio_state):  # pylint: disable=unused-argument
+    """Determine the state from the ``media_session_state`` property (i.e., the ``'media_session_state'`` rule)."""
+    if media_session_state == 2:
+        return constants.STATE_PAUSED
+    if media_session_state == 3:
+        return constants.STATE_PLAYING
+    if media_session_state is not None:
+        return constants.STATE_IDLE
+    return None
+
+
+def _audio_state_rule(media_session_state, wake_lock_size, audio_state):  # pylint: disable=unused-argument
+    """Determine the state from the ``audio_state`` property (i.e., the ``'audio_state'`` rule)."""
+    if audio_state in constants.VALID_STATES:
+        return audio_state
+    return None
+
+
+def _compile_state_rule(state):
+    """Compile a rule that always returns ``state``."""
+
+    def rule(media_session_state, wake_lock_size, audio_state):  # pylint: disable=unused-argument
+        return state
+
+    return rule
+
+
+def _compile_conditions_rule(state, conditions):
+    """Compile a rule that returns ``state`` if all of the ``conditions`` are satisfied.
+
+    Parameters
+    ----------
+    state : str
+        The state
+    conditions : dict
+        A dictionary whose keys are properties and whose values are the values that they must have
+
+    Returns
+    -------
+    function, None
+        The compiled rule, or ``None`` if the conditions can never be satisfied
+
+    """
+    if any(prop not in _RULE_PROPERTY_INDEX or value is None for prop, value in conditions.items()):
+        return None
+
+    if not conditions:
+        return _compile_state_rule(state)
+
+    expected = tuple((_RULE_PROPERTY_INDEX[prop], value) for prop, value in conditions.items())
+
+    def rule(*properties):
+        for index, value in expected:
+            if properties[index] != value:
+                return None
+        return state
+
+    return rule
+
+
+def _compile_rules(rules):
+    """Compile the rules for a single app (see :meth:`BaseTV._compile_state_detection_rules`).
+
+    Parameters
+    ----------
+    rules : list
+        The rules for the app, which are evaluated in order
+
+    Returns
+    -------
+    tuple
+        The compiled rules
+
+    """
+    compiled = []
+
+    for rule in rules:
+        if isinstance(rule, dict):
+            for state, conditions in rule.items():
+                if state in constants.VALID_STATES and isinstance(conditions, dict):
+                    compiled_rule = _compile_conditions_rule(state, conditions)
+                    if compiled_rule:
+                        compiled.append(compiled_rule)
+
+        elif rule in constants.VALID_STATES:
+            # This rule is always satisfied, so the rules that follow it will never be used
+            compiled.append(_compile_state_rule(rule))
+            break
+
+        elif rule == "media_session_state":
+            compiled.append(_media_session_state_rule)
+
+        elif rule == "audio_state":
+            compiled.append(_audio_state_rule)
+
+    return tuple(compiled)
+
+
 # ======================================================================= #
 #                                                                         #
 #                    Validate the state detection rules                   #
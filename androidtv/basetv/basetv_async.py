@@ -3,11 +3,25 @@
 ADB Debugging must be enabled.
 """
 
+import asyncio
 import logging
+import math
+import time
 
 from .basetv import BaseTV
 from .. import constants
-from ..adb_manager.adb_manager_async import ADBPythonAsync, ADBServerAsync
+from ..adb_manager.adb_manager_async import ADBPythonAsync, ADBServerAsync, SingleFlightAsync
+from ..screencap import (
+    Screencap,
+    crop_region,
+    encode_png,
+    parse_raw_screencap,
+    parse_screencap_geometry,
+    pixel_ranges,
+    ranges_cmd,
+    region_ranges,
+    screencap_hash,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -63,6 +77,9 @@ class BaseTVAsync(BaseTV):
         A dictionary of rules for determining the state (see above)
     signer : PythonRSASigner, None
         The signer for the ADB keys, as loaded by :meth:`androidtv.adb_manager.adb_manager_async.ADBPythonAsync.load_adbkey`
+    persistent_shell : bool
+        Whether to send shell commands via a single long-lived ``sh`` stream (see :class:`~androidtv.adb_manager.adb_manager_async.PersistentShellAsync`);
+        this only applies when using the Python ADB implementation
 
     """
 
@@ -75,17 +92,34 @@ class BaseTVAsync(BaseTV):
         adb_server_port=5037,
         state_detection_rules=None,
         signer=None,
+        persistent_shell=False,
     ):
         # the handler for ADB commands
         if not adb_server_ip:
             # python-adb
-            adb = ADBPythonAsync(host, port, adbkey, signer)
+            adb = ADBPythonAsync(host, port, adbkey, signer, persistent_shell)
         else:
             # pure-python-adb
             adb = ADBServerAsync(host, port, adb_server_ip, adb_server_port)
 
         BaseTV.__init__(self, adb, host, port, adbkey, adb_server_ip, adb_server_port, state_detection_rules)
 
+        # the subscribers to changes and the poll loop that serves them (see `changes()`)
+        self._subscribers = []
+        self._poll_task = None
+        self._poll_update_kwargs = None
+        self._poll_values = None
+
+        #: An optional :class:`~androidtv.scheduler.AdaptivePollScheduler` that determines the time between polls
+        self.poll_scheduler = None
+
+        #: Whether the :meth:`changes` poll loop follows the device's event log (see :meth:`events`)
+        self.watch_events = False
+        self._poll_properties = None
+
+        # concurrent calls to `get_screencap` share a single screencap, which is reused for a while
+        self._screencaps = SingleFlightAsync(constants.DEFAULT_SCREENCAP_MAX_AGE_S)
+
     # ======================================================================= #
     #                                                                         #
     #                               ADB methods                               #
@@ -142,19 +176,271 @@ class BaseTVAsync(BaseTV):
         """
         return await self._adb.push(local_path, device_path)
 
-    async def adb_screencap(self):
+    async def adb_exec_out(self, cmd, decode=True):
+        """Send an ADB command via the binary-safe ``exec:`` service, e.g., ``dumpsys`` or ``cat`` of a file.
+
+        This calls :py:meth:`androidtv.adb_manager.adb_manager_async.ADBPythonAsync.exec_out` or :py:meth:`androidtv.adb_manager.adb_manager_async.ADBServerAsync.exec_out`,
+        depending on whether the Python ADB implementation or an ADB server is used for communicating with the device.
+
+        Parameters
+        ----------
+        cmd : str
+            The ADB command to be sent
+        decode : bool
+            Whether to decode the output to a string
+
+        Returns
+        -------
+        bytes, str, None
+            The response from the device, if there is a response
+
+        """
+        return await self._adb.exec_out(cmd, decode)
+
+    async def adb_screencap(self, raw=False, scale=1):
         """Take a screencap.
 
         This calls :py:meth:`androidtv.adb_manager.adb_manager_async.ADBPythonAsync.screencap` or :py:meth:`androidtv.adb_manager.adb_manager_async.ADBServerAsync.screencap`,
         depending on whether the Python ADB implementation or an ADB server is used for communicating with the device.
 
+        Parameters
+        ----------
+        raw : bool
+            Whether to get the raw framebuffer from the device and encode it as a PNG image on the host, rather than
+            having the device encode it (see :mod:`androidtv.screencap`).  The encoding runs in the
+            event loop's default executor.
+        scale : int
+            If ``raw`` is ``True``, downscale the image by this factor (see :func:`~androidtv.screencap.encode_png`)
+
         Returns
         -------
-        bytes
-            The screencap as a binary .png image
+        bytes, None
+            The screencap as a binary .png image, or ``None`` if ``raw`` is ``True`` and the raw screencap could not be
+            parsed
+
+        """
+        if not raw:
+            return await self._adb.screencap()
+
+        screencap = await self.adb_screencap_raw()
+        if screencap is None:
+            return None
+
+        return await asyncio.get_running_loop().run_in_executor(None, encode_png, screencap, scale)
+
+    async def adb_screencap_raw(self):
+        """Take a screencap without encoding it as a PNG image.
+
+        Returns
+        -------
+        RawScreencap, None
+            The raw framebuffer (see :func:`~androidtv.screencap.parse_raw_screencap`), or ``None`` if it could not be
+            parsed
+
+        """
+        return parse_raw_screencap(await self._adb.screencap(raw=True))
+
+    async def adb_screencap_geometry(self, refresh=False):
+        """Get the geometry of the raw framebuffer, which is needed to sample pixels and regions of the screen.
+
+        The geometry is only determined once, since that takes two screencaps; if the resolution changes, use
+        ``refresh=True``.
+
+        Parameters
+        ----------
+        refresh : bool
+            Whether to determine the geometry again
+
+        Returns
+        -------
+        ScreencapGeometry, None
+            The geometry of the framebuffer (see :func:`~androidtv.screencap.parse_screencap_geometry`), or ``None`` if
+            it could not be determined
+
+        """
+        if self._screencap_geometry is None or refresh:
+            self._screencap_geometry = parse_screencap_geometry(
+                await self._adb.exec_out(constants.CMD_SCREENCAP_GEOMETRY.format(constants.SCREENCAP_RANGES_PATH))
+            )
+
+        return self._screencap_geometry
+
+    async def _adb_screencap_ranges(self, ranges):
+        """Take a raw screencap on the device and get only the given byte ranges.
+
+        Parameters
+        ----------
+        ranges : list
+            The ``(offset, length)`` byte ranges (see :func:`~androidtv.screencap.ranges_cmd`)
+
+        Returns
+        -------
+        bytes, None
+            The concatenated byte ranges, or ``None`` if they could not be extracted
+
+        """
+        data = await self._adb.exec_out(ranges_cmd(ranges), decode=False)
+        if not data or len(data) != sum(length for _, length in ranges):
+            return None
+
+        return data
+
+    async def adb_screencap_pixels(self, pixels):
+        """Get the values of a few pixels of the screen, without transferring a full screencap.
+
+        Parameters
+        ----------
+        pixels : list
+            The ``(x, y)`` coordinates of the pixels
+
+        Returns
+        -------
+        list, None
+            The raw value of each pixel as ``bytes`` (in the pixel format of the framebuffer), or ``None`` if the pixels
+            could not be sampled
+
+        Raises
+        ------
+        ValueError
+            A pixel is outside of the frame
+
+        """
+        geometry = await self.adb_screencap_geometry()
+        if geometry is None:
+            return None
+
+        ranges = pixel_ranges(geometry, pixels)
+        data = await self._adb_screencap_ranges(ranges)
+        if data is None:
+            return None
+
+        bytes_per_pixel = constants.SCREENCAP_PIXEL_FORMAT_SIZES[geometry.pixel_format]
+        return [data[i : i + bytes_per_pixel] for i in range(0, len(data), bytes_per_pixel)]
+
+    async def adb_screencap_region(self, x, y, width, height):
+        """Get a rectangular region of the screen, without transferring a full screencap.
+
+        Parameters
+        ----------
+        x : int
+            The left edge of the region
+        y : int
+            The top edge of the region
+        width : int
+            The width of the region
+        height : int
+            The height of the region
+
+        Returns
+        -------
+        RawScreencap, None
+            The region, which can be encoded via :func:`~androidtv.screencap.encode_png`, or ``None`` if it could not
+            be extracted
+
+        Raises
+        ------
+        ValueError
+            The region is not inside the frame
 
         """
-        return await self._adb.screencap()
+        geometry = await self.adb_screencap_geometry()
+        if geometry is None:
+            return None
+
+        data = await self._adb_screencap_ranges(region_ranges(geometry, x, y, width, height))
+        if data is None:
+            return None
+
+        return crop_region(geometry, width, height, data)
+
+    async def get_screencap(self, if_changed_since=None, raw=False, scale=1):
+        """Get a screencap, sharing it with concurrent callers and reusing it for a while.
+
+        Callers that arrive while a screencap is being taken wait for it instead of taking their own, and the
+        screencap is reused for :py:const:`~androidtv.constants.DEFAULT_SCREENCAP_MAX_AGE_S` seconds (see
+        :meth:`set_screencap_max_age`).  A caller that only needs a new image if the screen changed can pass the hash of
+        the image that it already has, similar to an HTTP ETag.
+
+        .. code-block:: python
+
+           screencap = await atv.get_screencap(if_changed_since=last_hash)
+           if screencap and screencap.image is not None:
+               last_hash = screencap.hash
+               show(screencap.image)
+
+        Parameters
+        ----------
+        if_changed_since : str, None
+            The hash of the image that the caller already has (see :func:`~androidtv.screencap.screencap_hash`)
+        raw : bool
+            Whether to take a raw screencap and encode it on the host (see :meth:`adb_screencap`)
+        scale : int
+            If ``raw`` is ``True``, downscale the image by this factor
+
+        Returns
+        -------
+        Screencap, None
+            The screencap, whose ``image`` is ``None`` if its hash is ``if_changed_since``, or ``None`` if the
+            screencap could not be taken
+
+        """
+        screencap = await self._screencaps.run((raw, scale), self._take_screencap, raw, scale)
+        if screencap is not None and screencap.hash == if_changed_since:
+            return screencap._replace(image=None)
+
+        return screencap
+
+    async def _take_screencap(self, raw, scale):
+        """Take a screencap for :meth:`get_screencap`.
+
+        Parameters
+        ----------
+        raw : bool
+            Whether to take a raw screencap and encode it on the host
+        scale : int
+            If ``raw`` is ``True``, downscale the image by this factor
+
+        Returns
+        -------
+        Screencap, None
+            The screencap, or ``None`` if it could not be taken
+
+        """
+        image = await self.adb_screencap(raw=raw, scale=scale)
+        if not image:
+            return None
+
+        return Screencap(image, screencap_hash(image), time.time())
+
+    def set_screencap_max_age(self, max_age_s):
+        """Set how long :meth:`get_screencap` reuses a screencap.
+
+        Parameters
+        ----------
+        max_age_s : float
+            How long (in s) a screencap is reused after it is taken, or ``0`` to only share in-flight screencaps
+
+        """
+        self._screencaps.ttl_s = max_age_s
+        self._screencaps.forget()
+
+    def set_single_flight_ttl(self, ttl_s):
+        """Reuse the response to a polling command for identical commands sent within ``ttl_s`` seconds.
+
+        Identical polling commands that are sent while one is in flight (e.g., two concurrent calls to :meth:`volume`)
+        always share its response; this extends the sharing to commands that are sent shortly afterwards.  Only the
+        read-only commands in :py:const:`~androidtv.constants.SINGLE_FLIGHT_COMMANDS` are shared; other commands (e.g.,
+        :meth:`launch_app` or :meth:`adb_shell`) are always sent, and they discard the shared responses, since they may
+        change the state.  See :class:`~androidtv.adb_manager.adb_manager_async.SingleFlightAsync`.
+
+        Parameters
+        ----------
+        ttl_s : float
+            How long (in s) a response is reused after it is received, or ``0`` to only share in-flight responses
+
+        """
+        self._adb.single_flight.ttl_s = ttl_s
+        self._adb.single_flight.forget()
 
     async def adb_connect(
         self,
@@ -183,6 +469,48 @@ class BaseTVAsync(BaseTV):
             return await self._adb.connect(log_errors, auth_timeout_s, transport_timeout_s)
         return await self._adb.connect(log_errors)
 
+    async def reconnect(self):
+        """Reconnect to the device if it is unavailable and the reconnect supervisor allows it.
+
+        See :meth:`~androidtv.basetv.basetv.BaseTV.enable_reconnect`.  If reconnects are not enabled, this simply
+        reconnects if the device is unavailable.
+
+        Returns
+        -------
+        bool
+            Whether the device is available
+
+        """
+        supervisor = self._reconnect_supervisor
+
+        if self.available:
+            if supervisor is not None:
+                supervisor.record_success()
+            return True
+
+        if supervisor is None:
+            return await self.adb_connect()
+
+        if not supervisor.allow_attempt():
+            return False
+
+        # Only log the errors from the first failed attempt
+        if await self.adb_connect(log_errors=not supervisor.failures):
+            supervisor.record_success()
+            return True
+
+        delay_s = supervisor.record_failure()
+        if supervisor.failures == supervisor.failure_threshold:
+            _LOGGER.warning(
+                "Could not reconnect to %s:%d after %d attempts; waiting %.0f seconds before trying again",
+                self.host,
+                self.port,
+                supervisor.failures,
+                delay_s,
+            )
+
+        return False
+
     async def adb_close(self):
         """Close the ADB connection.
 
@@ -190,6 +518,7 @@ class BaseTVAsync(BaseTV):
         For the ADB server approach, this doesn't do anything (see :meth:`androidtv.adb_manager.adb_manager_async.ADBServer.close`).
 
         """
+        self._screencaps.forget()
         await self._adb.close()
 
     # ======================================================================= #
@@ -217,6 +546,55 @@ class BaseTVAsync(BaseTV):
 
         return self.device_properties
 
+    async def get_device_profile(self, profile_cache, save=True):
+        """Get the device properties and installed apps from a profile cache, or retrieve them and store them in the cache.
+
+        The cached profile is only used if the output of :py:const:`androidtv.constants.CMD_DEVICE_FINGERPRINT` has not
+        changed, which is much faster than retrieving the device properties and the installed apps.  The cache file is
+        read and written in an executor.
+
+        Parameters
+        ----------
+        profile_cache : androidtv.profile_cache.ProfileCache
+            The profile cache
+        save : bool
+            Whether to write the profile cache to its file if the profile is stored in it; if ``False``, the caller is
+            responsible for writing it (see :meth:`save_profile_cache`)
+
+        Returns
+        -------
+        bool
+            Whether the profile was loaded from the cache
+
+        """
+        self._device_fingerprint = await self._adb.shell(constants.CMD_DEVICE_FINGERPRINT)
+
+        await asyncio.get_running_loop().run_in_executor(None, profile_cache.load)
+        profile = profile_cache.get(profile_cache.key(self.host, self.port), self._device_fingerprint)
+        if profile is not None:
+            self._load_profile(profile)
+            return True
+
+        await self.get_device_properties()
+        await self.get_installed_apps()
+        if self.save_device_profile(profile_cache, save=False) and save:
+            await self.save_profile_cache(profile_cache)
+
+        return False
+
+    @staticmethod
+    async def save_profile_cache(profile_cache):
+        """Write a profile cache to its file in an executor, if it has unsaved changes.
+
+        Parameters
+        ----------
+        profile_cache : androidtv.profile_cache.ProfileCache
+            The profile cache
+
+        """
+        if profile_cache.unsaved:
+            await asyncio.get_running_loop().run_in_executor(None, profile_cache.write, profile_cache.dump())
+
     # ======================================================================= #
     #                                                                         #
     #                               Properties                                #
@@ -233,7 +611,7 @@ class BaseTVAsync(BaseTV):
         """
         stream_music = await self._get_stream_music()
 
-        return self._audio_output_device(stream_music)
+        return stream_music.audio_output_device
 
     async def audio_state(self):
         """Check if audio is playing, paused, or idle.
@@ -267,9 +645,13 @@ class BaseTVAsync(BaseTV):
             The ID of the current app, or ``None`` if it could not be determined
 
         """
+        current_app = self._cached("current_app")
+        if current_app is not None:
+            return current_app
+
         current_app_response = await self._adb.shell(self._cmd_current_app())
 
-        return self._current_app(current_app_response)
+        return self._cache("current_app", self._current_app(current_app_response), current_app_response)
 
     async def current_app_media_session_state(self):
         """Get the current app and the state from the output of ``dumpsys media_session``.
@@ -295,8 +677,12 @@ class BaseTVAsync(BaseTV):
             The HDMI input, or ``None`` if it could not be determined
 
         """
+        hdmi_input = self._cached("hdmi_input")
+        if hdmi_input is not None:
+            return hdmi_input
+
         hdmi_input_response = await self._adb.shell(self._cmd_hdmi_input())
-        return self._get_hdmi_input(hdmi_input_response)
+        return self._cache("hdmi_input", self._get_hdmi_input(hdmi_input_response), hdmi_input_response)
 
     async def get_installed_apps(self):
         """Return a list of installed applications.
@@ -307,7 +693,7 @@ class BaseTVAsync(BaseTV):
             A list of the installed apps, or ``None`` if it could not be determined
 
         """
-        installed_apps_response = await self._adb.shell(constants.CMD_INSTALLED_APPS)
+        installed_apps_response = await self._adb.exec_out(constants.CMD_INSTALLED_APPS)
         self.installed_apps = self._get_installed_apps(installed_apps_response)
         return self.installed_apps
 
@@ -322,7 +708,7 @@ class BaseTVAsync(BaseTV):
         """
         stream_music = await self._get_stream_music()
 
-        return self._is_volume_muted(stream_music)
+        return stream_music.is_volume_muted
 
     async def media_session_state(self):
         """Get the state from the output of ``dumpsys media_session``.
@@ -346,9 +732,13 @@ class BaseTVAsync(BaseTV):
             A list of the running apps
 
         """
+        running_apps = self._cached("running_apps")
+        if running_apps is not None:
+            return running_apps
+
         running_apps_response = await self._adb.shell(self._cmd_running_apps())
 
-        return self._running_apps(running_apps_response)
+        return self._cache("running_apps", self._running_apps(running_apps_response), running_apps_response)
 
     async def screen_on(self):
         """Check if the screen is on.
@@ -359,7 +749,13 @@ class BaseTVAsync(BaseTV):
             Whether or not the device is on
 
         """
-        return await self._adb.shell(constants.CMD_SCREEN_ON + constants.CMD_SUCCESS1_FAILURE0) == "1"
+        screen_on = self._cached("screen_on")
+        if screen_on is not None:
+            return screen_on
+
+        screen_on_response = await self._adb.shell(constants.CMD_SCREEN_ON + constants.CMD_SUCCESS1_FAILURE0)
+
+        return self._cache("screen_on", screen_on_response == "1", screen_on_response)
 
     async def screen_on_awake_wake_lock_size(self):
         """Check if the screen is on and the device is awake, and get the wake lock size.
@@ -401,12 +797,10 @@ class BaseTVAsync(BaseTV):
 
         """
         stream_music = await self._get_stream_music()
-        audio_output_device = self._audio_output_device(stream_music)
-        volume = self._volume(stream_music, audio_output_device)
+        volume = self._volume(stream_music)
         volume_level = self._volume_level(volume)
-        is_volume_muted = self._is_volume_muted(stream_music)
 
-        return audio_output_device, is_volume_muted, volume, volume_level
+        return stream_music.audio_output_device, stream_music.is_volume_muted, volume, volume_level
 
     async def volume(self):
         """Get the absolute volume level.
@@ -418,9 +812,8 @@ class BaseTVAsync(BaseTV):
 
         """
         stream_music = await self._get_stream_music()
-        audio_output_device = self._audio_output_device(stream_music)
 
-        return self._volume(stream_music, audio_output_device)
+        return self._volume(stream_music)
 
     async def volume_level(self):
         """Get the relative volume level.
@@ -454,7 +847,7 @@ class BaseTVAsync(BaseTV):
     #                                                                         #
     # ======================================================================= #
     async def _get_stream_music(self, stream_music_raw=None):
-        """Get the ``STREAM_MUSIC`` block from the output of the command :py:const:`androidtv.constants.CMD_STREAM_MUSIC`.
+        """Get the properties from the ``STREAM_MUSIC`` block from the output of the command :py:const:`androidtv.constants.CMD_STREAM_MUSIC`.
 
         Parameters
         ----------
@@ -463,14 +856,43 @@ class BaseTVAsync(BaseTV):
 
         Returns
         -------
-        str, None
-            The ``STREAM_MUSIC`` block from the output of :py:const:`androidtv.constants.CMD_STREAM_MUSIC`, or ``None`` if it could not be determined
+        StreamMusic
+            The properties from the ``STREAM_MUSIC`` block (see :meth:`~androidtv.basetv.basetv.BaseTV._parse_stream_music`)
 
         """
         if not stream_music_raw:
+            stream_music = self._cached("stream_music")
+            if stream_music is not None:
+                return stream_music
+
             stream_music_raw = await self._adb.shell(constants.CMD_STREAM_MUSIC)
 
-        return self._parse_stream_music(stream_music_raw)
+        return self._cache("stream_music", self._parse_stream_music(stream_music_raw), stream_music_raw)
+
+    async def _fused_shell(self, cmd):
+        """Send a fused ADB shell command (see :meth:`~androidtv.basetv.basetv.BaseTV._cmd_fused`).
+
+        Parameters
+        ----------
+        cmd : str
+            The fused ADB shell command
+
+        Returns
+        -------
+        str, None
+            The response from the device, if there is a response
+
+        """
+        output = await self._adb.shell(cmd)
+
+        # Power service might sometimes reply with "Failed to write while dumping service". If this happens,
+        # retry the request, up to three times.
+        retries_left = 3
+        while output is not None and "Failed to write while dumping service" in output and retries_left > 0:
+            output = await self._adb.shell(cmd)
+            retries_left -= 1
+
+        return output
 
     # ======================================================================= #
     #                                                                         #
@@ -500,6 +922,7 @@ class BaseTVAsync(BaseTV):
         # adb shell outputs in weird format, so we cut it into lines,
         # separate the retcode and return info to the user
         res = await self._adb.shell(cmd)
+        self._notify_command("send_intent")
         if res is None:
             return {}
 
@@ -519,6 +942,7 @@ class BaseTVAsync(BaseTV):
 
         """
         await self._adb.shell(self._cmd_launch_app(app))
+        self._notify_command("launch_app")
 
     async def stop_app(self, app):
         """Stop an app.
@@ -534,7 +958,9 @@ class BaseTVAsync(BaseTV):
             The output of the ``am force-stop`` ADB shell command, or ``None`` if the device is unavailable
 
         """
-        return await self._adb.shell("am force-stop {0}".format(app))
+        output = await self._adb.shell("am force-stop {0}".format(app))
+        self._notify_command("stop_app")
+        return output
 
     async def start_intent(self, uri):
         """Start an intent on the device.
@@ -546,6 +972,7 @@ class BaseTVAsync(BaseTV):
 
         """
         await self._adb.shell("am start -a android.intent.action.VIEW -d {}".format(uri))
+        self._notify_command("start_intent")
 
     # ======================================================================= #
     #                                                                         #
@@ -562,6 +989,7 @@ class BaseTVAsync(BaseTV):
 
         """
         await self._adb.shell("input keyevent {0}".format(key))
+        self._notify_command("key")
 
     async def power(self):
         """Send power action."""
@@ -644,10 +1072,12 @@ class BaseTVAsync(BaseTV):
     async def turn_on(self):
         """Turn on the device."""
         await self._adb.shell(self._cmd_turn_on())
+        self._notify_command("turn_on")
 
     async def turn_off(self):
         """Turn off the device."""
         await self._adb.shell(self._cmd_turn_off())
+        self._notify_command("turn_off")
 
     # ======================================================================= #
     #                                                                         #
@@ -829,7 +1259,10 @@ class BaseTVAsync(BaseTV):
 
         new_volume = int(min(max(round(self.max_volume * volume_level), 0.0), self.max_volume))
 
+        stream_music = self._cached("stream_music")
         await self._adb.shell(self._cmd_volume_set(new_volume))
+        self._notify_command("set_volume_level")
+        self._cache_volume(stream_music, new_volume)
 
         # return the new volume level
         return new_volume / self.max_volume
@@ -854,6 +1287,7 @@ class BaseTVAsync(BaseTV):
             current_volume = round(self.max_volume * current_volume_level)
 
         # send the volume up command
+        stream_music = self._cached("stream_music")
         await self._key(constants.KEY_VOLUME_UP)
 
         # if `self.max_volume` or `current_volume` could not be determined, return `None` as the new `volume_level`
@@ -861,7 +1295,9 @@ class BaseTVAsync(BaseTV):
             return None
 
         # return the new volume level
-        return min(current_volume + 1, self.max_volume) / self.max_volume
+        new_volume = min(current_volume + 1, self.max_volume)
+        self._cache_volume(stream_music, new_volume)
+        return new_volume / self.max_volume
 
     async def volume_down(self, current_volume_level=None):
         """Send volume down action.
@@ -883,6 +1319,7 @@ class BaseTVAsync(BaseTV):
             current_volume = round(self.max_volume * current_volume_level)
 
         # send the volume down command
+        stream_music = self._cached("stream_music")
         await self._key(constants.KEY_VOLUME_DOWN)
 
         # if `self.max_volume` or `current_volume` could not be determined, return `None` as the new `volume_level`
@@ -890,7 +1327,395 @@ class BaseTVAsync(BaseTV):
             return None
 
         # return the new volume level
-        return max(current_volume - 1, 0.0) / self.max_volume
+        new_volume = max(current_volume - 1, 0)
+        self._cache_volume(stream_music, new_volume)
+        return new_volume / self.max_volume
+
+    # ======================================================================= #
+    #                                                                         #
+    #                           Change notifications                          #
+    #                                                                         #
+    # ======================================================================= #
+    async def changes(self, fields=None, interval_s=constants.DEFAULT_POLL_INTERVAL_S, **update_kwargs):
+        """Poll the device and yield the fields of the ``update()`` result that have changed.
+
+        All of the subscribers for a device share a single poll loop, which runs while there is at least one subscriber
+        and updates the device every ``interval_s`` seconds (the smallest interval requested by any subscriber), or as
+        determined by :attr:`poll_scheduler` if it is set.  The first value that is yielded contains all of the
+        requested fields.
+
+        If :attr:`watch_events` is True, the poll loop also follows the device's event log (see :meth:`events`) and
+        applies the changes that it reveals right away, without running the ``dumpsys`` commands.  A full update is run
+        whenever the event stream is lost, and every ``interval_s`` seconds in order to pick up the changes that are
+        not logged (e.g., playback being paused), so ``interval_s`` can be much larger in this case.
+
+        If the subscriber falls behind, the changes are coalesced so that it gets the latest value of each field that
+        changed since it last received an update; the poll loop never waits for a subscriber.
+
+        .. code-block:: python
+
+           async for changes in atv.changes(fields=["state", "current_app"]):
+               print(changes)  # e.g., {"state": "playing"}
+
+        Parameters
+        ----------
+        fields : list[str], None
+            The fields that will be monitored (see ``UPDATE_FIELDS``); the default is all of them
+        interval_s : float
+            The time (in seconds) between updates
+        **update_kwargs
+            Keyword arguments for the ``update()`` method; these must be the same for all subscribers
+
+        Yields
+        ------
+        dict
+            The fields that changed and their new values
+
+        """
+        subscriber = self._add_subscriber(fields, interval_s, update_kwargs)
+
+        try:
+            while True:
+                yield await subscriber.get()
+
+        finally:
+            await self._remove_subscriber(subscriber)
+
+    def subscribe(self, callback, fields=None, interval_s=constants.DEFAULT_POLL_INTERVAL_S, **update_kwargs):
+        """Call ``callback`` with the fields of the ``update()`` result that have changed.
+
+        This is a callback-based interface to :meth:`changes`.  If the callback is a coroutine function, it is
+        awaited, and changes that occur in the meantime are coalesced.
+
+        Parameters
+        ----------
+        callback : function
+            A function or coroutine function that takes a ``dict`` of the fields that changed and their new values
+        fields : list[str], None
+            The fields that will be monitored (see ``UPDATE_FIELDS``); the default is all of them
+        interval_s : float
+            The time (in seconds) between updates
+        **update_kwargs
+            Keyword arguments for the ``update()`` method; these must be the same for all subscribers
+
+        Returns
+        -------
+        function
+            A coroutine function that cancels the subscription
+
+        """
+        # Register the subscriber now so that argument errors are raised here
+        subscriber = self._add_subscriber(fields, interval_s, update_kwargs)
+
+        async def consume():
+            """Pass changes to the callback."""
+            try:
+                while True:
+                    ret = callback(await subscriber.get())
+                    if asyncio.iscoroutine(ret):
+                        await ret
+            finally:
+                await self._remove_subscriber(subscriber)
+
+        task = asyncio.ensure_future(consume())
+
+        async def unsubscribe():
+            """Cancel the subscription."""
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+        return unsubscribe
+
+    def _add_subscriber(self, fields, interval_s, update_kwargs):
+        """Register a subscriber and start the poll loop, if necessary.
+
+        Parameters
+        ----------
+        fields : list[str], None
+            The fields that will be monitored; the default is all of them
+        interval_s : float
+            The time (in seconds) between updates
+        update_kwargs : dict
+            Keyword arguments for the ``update()`` method
+
+        Returns
+        -------
+        _Subscriber
+            The new subscriber
+
+        """
+        if not self.UPDATE_FIELDS:
+            raise TypeError("{} does not have an `update()` method".format(self.__class__.__name__))
+
+        if fields is not None:
+            unknown = set(fields) - set(self.UPDATE_FIELDS)
+            if unknown:
+                raise ValueError("Unknown update fields: {}".format(", ".join(sorted(unknown))))
+
+        if self._subscribers and update_kwargs != self._poll_update_kwargs:
+            raise ValueError(
+                "The `update()` arguments must match those of the existing subscribers: {}".format(
+                    self._poll_update_kwargs
+                )
+            )
+
+        subscriber = _Subscriber(fields, interval_s)
+        self._subscribers.append(subscriber)
+
+        # A new subscriber gets the latest values right away
+        if self._poll_values is not None:
+            subscriber.publish(self._poll_values)
+
+        if self._poll_task is None:
+            self._poll_update_kwargs = update_kwargs
+            self._poll_task = asyncio.ensure_future(self._poll_loop())
+
+        return subscriber
+
+    async def _remove_subscriber(self, subscriber):
+        """Unregister a subscriber and stop the poll loop if there are no subscribers left.
+
+        Parameters
+        ----------
+        subscriber : _Subscriber
+            The subscriber that will be removed
+
+        """
+        self._subscribers.remove(subscriber)
+
+        if not self._subscribers and self._poll_task is not None:
+            task = self._poll_task
+            self._poll_task = None
+            self._poll_values = None
+            self._poll_properties = None
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+    async def _poll_loop(self):
+        """Update the device and publish the changes to the subscribers until there are no subscribers left."""
+        watcher = None
+
+        try:
+            while self._subscribers:
+                if self.watch_events and watcher is None:
+                    watcher = asyncio.ensure_future(self._watch_events())
+
+                await self._poll()
+                interval_s = min(subscriber.interval_s for subscriber in self._subscribers)
+
+                # If the event stream was lost, wait for the next poll before restarting it
+                if watcher is None or watcher.done():
+                    watcher = None
+                    await self.wait_for_next_poll(interval_s)
+                    continue
+
+                # Run a full update right away if the event stream is lost
+                waiter = asyncio.ensure_future(self.wait_for_next_poll(interval_s))
+                try:
+                    await asyncio.wait([waiter, watcher], return_when=asyncio.FIRST_COMPLETED)
+                finally:
+                    waiter.cancel()
+                    await asyncio.gather(waiter, return_exceptions=True)
+
+        finally:
+            if watcher is not None:
+                watcher.cancel()
+                await asyncio.gather(watcher, return_exceptions=True)
+
+    async def _poll(self):
+        """Update the device and publish the changes to the subscribers."""
+        try:
+            if self.watch_events:
+                # Keep the properties so that they can be updated from the event log
+                self._poll_properties = await self.get_properties_dict(**self._poll_update_kwargs)
+                result = self._update(**self._poll_properties)
+            else:
+                result = await self.update(**self._poll_update_kwargs)
+
+        except asyncio.CancelledError:  # pylint: disable=try-except-raise
+            raise
+
+        except Exception as exc:  # pylint: disable=broad-except
+            _LOGGER.warning(
+                "Update of %s:%d failed while polling for changes.  %s: %s",
+                self.host,
+                self.port,
+                exc.__class__.__name__,
+                exc,
+            )
+            if self.poll_scheduler:
+                self.poll_scheduler.record_update(None)
+
+        else:
+            self._publish(dict(zip(self.UPDATE_FIELDS, result)))
+
+    def _publish(self, values):
+        """Publish the values that changed since the last update to the subscribers.
+
+        Parameters
+        ----------
+        values : dict
+            The result of the update, keyed by the names in ``UPDATE_FIELDS``
+
+        """
+        if self.poll_scheduler:
+            self.poll_scheduler.record_update(values["state"])
+
+        previous = self._poll_values or {}
+        changes = {key: val for key, val in values.items() if key not in previous or previous[key] != val}
+        self._poll_values = values
+        if changes:
+            for subscriber in self._subscribers:
+                subscriber.publish(changes)
+
+    async def _watch_events(self):
+        """Apply the changes from the device's event log to the last properties and publish the result."""
+        try:
+            async for properties in self.events():
+                if self._poll_properties is None:
+                    continue
+
+                self._poll_properties.update(properties)
+                self._publish(dict(zip(self.UPDATE_FIELDS, self._update(**self._poll_properties))))
+
+            _LOGGER.debug("Event stream for %s:%d ended", self.host, self.port)
+
+        except asyncio.CancelledError:  # pylint: disable=try-except-raise
+            raise
+
+        except Exception as exc:  # pylint: disable=broad-except
+            _LOGGER.debug("Event stream for %s:%d was lost.  %s: %s", self.host, self.port, exc.__class__.__name__, exc)
+
+    async def events(self):
+        """Follow the device's event log and yield the properties that it reveals.
+
+        This is a cheap alternative to the ``dumpsys`` commands that are run by ``update()``: the output of
+        :py:const:`~androidtv.constants.CMD_WATCH_EVENTS` is read from a long-lived ADB stream, and each event is
+        converted into the properties that it reveals (the current app and whether the screen is on).  The stream ends
+        if the connection is lost.
+
+        .. code-block:: python
+
+           async for properties in atv.events():
+               print(properties)  # e.g., {"current_app": "com.netflix.ninja"}
+
+        Yields
+        ------
+        dict
+            The properties (using the names of the ``_update()`` parameters) and their new values
+
+        """
+        async for line in self._adb.streaming_shell(constants.CMD_WATCH_EVENTS):
+            properties = self._parse_event(line)
+            if properties:
+                yield properties
+
+    async def stream_screen(self, bitrate=constants.DEFAULT_SCREENRECORD_BITRATE, size=None, time_limit=None):
+        """Record the screen and yield the raw H.264 stream in chunks as it arrives.
+
+        The output of :py:const:`~androidtv.constants.CMD_SCREENRECORD` is read from a long-lived ADB stream, without
+        buffering the whole recording.  ``screenrecord`` exits after at most
+        :py:const:`~androidtv.constants.SCREENRECORD_MAX_TIME_LIMIT_S` seconds, so it is restarted until ``time_limit``
+        is reached; each restart begins a new H.264 stream (with its own SPS and PPS NAL units).  The stream ends if
+        the connection is lost, if ``screenrecord`` fails (e.g., because the screen shows secure content), or if it
+        exits after less than half of its time limit, so that a device that cannot record is not reconnected to over
+        and over.
+
+        .. code-block:: python
+
+           async for chunk in atv.stream_screen(size="1280x720"):
+               decoder.feed(chunk)
+
+        Parameters
+        ----------
+        bitrate : int
+            The bit rate (in bit/s) of the stream
+        size : str, None
+            The size of the video, e.g. ``'1280x720'``, or ``None`` to use the size of the screen
+        time_limit : float, None
+            How long (in s) to record the screen, or ``None`` to record it until the caller stops iterating
+
+        Yields
+        ------
+        bytes
+            Each chunk of the H.264 stream; the chunks are not aligned with the NAL units
+
+        """
+        size_option = " --size {}".format(size) if size else ""
+        end = None if time_limit is None else time.monotonic() + time_limit
+
+        while True:
+            start = time.monotonic()
+            segment_s = constants.SCREENRECORD_MAX_TIME_LIMIT_S
+            if end is not None:
+                segment_s = min(segment_s, math.ceil(end - start))
+                if segment_s <= 0:
+                    return
+
+            # The output is only passed on once it is known to be H.264 rather than an error message
+            header = b""
+            stream = self._adb.streaming_exec_out(constants.CMD_SCREENRECORD.format(bitrate, segment_s, size_option))
+            try:
+                async for chunk in stream:
+                    if header is not None:
+                        header += chunk
+                        if len(header) < len(constants.SCREENRECORD_H264_START_CODE):
+                            continue
+                        if not header.startswith(constants.SCREENRECORD_H264_START_CODE):
+                            _LOGGER.warning(
+                                "Screen recording on %s:%d failed: %s",
+                                self.host,
+                                self.port,
+                                header[:200].decode("utf-8", "backslashreplace").strip(),
+                            )
+                            return
+                        chunk, header = header, None
+
+                    yield chunk
+
+            finally:
+                await stream.aclose()
+
+            # The recorder did not start or the connection was lost
+            if header is not None or not self.available:
+                _LOGGER.debug("Screen stream for %s:%d ended", self.host, self.port)
+                return
+
+            # The recorder stopped early (e.g., because the screen was turned off)
+            if time.monotonic() - start < segment_s / 2:
+                _LOGGER.debug(
+                    "Screen stream for %s:%d ended because `screenrecord` exited before its %d s time limit",
+                    self.host,
+                    self.port,
+                    segment_s,
+                )
+                return
+
+    async def wait_for_next_poll(self, interval_s):
+        """Wait until it is time to poll the device again.
+
+        If :attr:`poll_scheduler` is set, its interval is used instead of ``interval_s`` and the wait ends early when
+        a control command is sent, so that the burst of updates starts right away.
+
+        Parameters
+        ----------
+        interval_s : float
+            The time (in seconds) to wait if :attr:`poll_scheduler` is not set
+
+        """
+        if not self.poll_scheduler:
+            await asyncio.sleep(interval_s)
+            return
+
+        command_sent = asyncio.Event()
+        remove_listener = self.add_command_listener(lambda command: command_sent.set())
+
+        try:
+            await asyncio.wait_for(command_sent.wait(), self.poll_scheduler.interval_s)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            remove_listener()
 
     # ======================================================================= #
     #                                                                         #
@@ -925,3 +1750,63 @@ class BaseTVAsync(BaseTV):
         return " && ".join(
             [self._parse_getevent_line(line) for line in getevent.splitlines() if line.startswith("/") and ":" in line]
         )
+
+
+class _Subscriber:
+    """A subscriber to the changes in a device's ``update()`` result (see :meth:`BaseTVAsync.changes`).
+
+    Parameters
+    ----------
+    fields : list[str], None
+        The fields that will be monitored; ``None`` means all of them
+    interval_s : float
+        The requested time (in seconds) between updates
+
+    """
+
+    def __init__(self, fields, interval_s):
+        self.fields = fields
+        self.interval_s = interval_s
+        self._pending = {}
+        self._delivered = {}
+        self._event = asyncio.Event()
+
+    def publish(self, changes):
+        """Merge changes into the pending changes, replacing any older values.
+
+        Parameters
+        ----------
+        changes : dict
+            The fields that changed and their new values
+
+        """
+        for key, val in changes.items():
+            if self.fields is None or key in self.fields:
+                self._pending[key] = val
+                self._event.set()
+
+    async def get(self):
+        """Wait for changes.
+
+        Fields that changed and then changed back before the subscriber received them are not reported.
+
+        Returns
+        -------
+        dict
+            The fields that changed and their new values
+
+        """
+        while True:
+            await self._event.wait()
+            self._event.clear()
+
+            changes = {
+                key: val
+                for key, val in self._pending.items()
+                if key not in self._delivered or self._delivered[key] != val
+            }
+            self._pending = {}
+
+            if changes:
+                self._delivered.update(changes)
+                return changes
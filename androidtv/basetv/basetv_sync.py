@@ -8,6 +8,15 @@ import logging
 from .basetv import BaseTV
 from .. import constants
 from ..adb_manager.adb_manager_sync import ADBPythonSync, ADBServerSync
+from ..screencap import (
+    crop_region,
+    encode_png,
+    parse_raw_screencap,
+    parse_screencap_geometry,
+    pixel_ranges,
+    ranges_cmd,
+    region_ranges,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -142,19 +151,181 @@ class BaseTVSync(BaseTV):
         """
         return self._adb.push(local_path, device_path)
 
-    def adb_screencap(self):
+    def adb_exec_out(self, cmd, decode=True):
+        """Send an ADB command via the binary-safe ``exec:`` service, e.g., ``dumpsys`` or ``cat`` of a file.
+
+        This calls :py:meth:`androidtv.adb_manager.adb_manager_sync.ADBPythonSync.exec_out` or :py:meth:`androidtv.adb_manager.adb_manager_sync.ADBServerSync.exec_out`,
+        depending on whether the Python ADB implementation or an ADB server is used for communicating with the device.
+
+        Parameters
+        ----------
+        cmd : str
+            The ADB command to be sent
+        decode : bool
+            Whether to decode the output to a string
+
+        Returns
+        -------
+        bytes, str, None
+            The response from the device, if there is a response
+
+        """
+        return self._adb.exec_out(cmd, decode)
+
+    def adb_screencap(self, raw=False, scale=1):
         """Take a screencap.
 
         This calls :py:meth:`androidtv.adb_manager.adb_manager_sync.ADBPythonSync.screencap` or :py:meth:`androidtv.adb_manager.adb_manager_sync.ADBServerSync.screencap`,
         depending on whether the Python ADB implementation or an ADB server is used for communicating with the device.
 
+        Parameters
+        ----------
+        raw : bool
+            Whether to get the raw framebuffer from the device and encode it as a PNG image on the host, rather than
+            having the device encode it (see :mod:`androidtv.screencap`).
+        scale : int
+            If ``raw`` is ``True``, downscale the image by this factor (see :func:`~androidtv.screencap.encode_png`)
+
         Returns
         -------
-        bytes
-            The screencap as a binary .png image
+        bytes, None
+            The screencap as a binary .png image, or ``None`` if ``raw`` is ``True`` and the raw screencap could not be
+            parsed
 
         """
-        return self._adb.screencap()
+        if not raw:
+            return self._adb.screencap()
+
+        screencap = self.adb_screencap_raw()
+        if screencap is None:
+            return None
+
+        return encode_png(screencap, scale)
+
+    def adb_screencap_raw(self):
+        """Take a screencap without encoding it as a PNG image.
+
+        Returns
+        -------
+        RawScreencap, None
+            The raw framebuffer (see :func:`~androidtv.screencap.parse_raw_screencap`), or ``None`` if it could not be
+            parsed
+
+        """
+        return parse_raw_screencap(self._adb.screencap(raw=True))
+
+    def adb_screencap_geometry(self, refresh=False):
+        """Get the geometry of the raw framebuffer, which is needed to sample pixels and regions of the screen.
+
+        The geometry is only determined once, since that takes two screencaps; if the resolution changes, use
+        ``refresh=True``.
+
+        Parameters
+        ----------
+        refresh : bool
+            Whether to determine the geometry again
+
+        Returns
+        -------
+        ScreencapGeometry, None
+            The geometry of the framebuffer (see :func:`~androidtv.screencap.parse_screencap_geometry`), or ``None`` if
+            it could not be determined
+
+        """
+        if self._screencap_geometry is None or refresh:
+            self._screencap_geometry = parse_screencap_geometry(
+                self._adb.exec_out(constants.CMD_SCREENCAP_GEOMETRY.format(constants.SCREENCAP_RANGES_PATH))
+            )
+
+        return self._screencap_geometry
+
+    def _adb_screencap_ranges(self, ranges):
+        """Take a raw screencap on the device and get only the given byte ranges.
+
+        Parameters
+        ----------
+        ranges : list
+            The ``(offset, length)`` byte ranges (see :func:`~androidtv.screencap.ranges_cmd`)
+
+        Returns
+        -------
+        bytes, None
+            The concatenated byte ranges, or ``None`` if they could not be extracted
+
+        """
+        data = self._adb.exec_out(ranges_cmd(ranges), decode=False)
+        if not data or len(data) != sum(length for _, length in ranges):
+            return None
+
+        return data
+
+    def adb_screencap_pixels(self, pixels):
+        """Get the values of a few pixels of the screen, without transferring a full screencap.
+
+        Parameters
+        ----------
+        pixels : list
+            The ``(x, y)`` coordinates of the pixels
+
+        Returns
+        -------
+        list, None
+            The raw value of each pixel as ``bytes`` (in the pixel format of the framebuffer), or ``None`` if the pixels
+            could not be sampled
+
+        Raises
+        ------
+        ValueError
+            A pixel is outside of the frame
+
+        """
+        geometry = self.adb_screencap_geometry()
+        if geometry is None:
+            return None
+
+        ranges = pixel_ranges(geometry, pixels)
+        data = self._adb_screencap_ranges(ranges)
+        if data is None:
+            return None
+
+        bytes_per_pixel = constants.SCREENCAP_PIXEL_FORMAT_SIZES[geometry.pixel_format]
+        return [data[i : i + bytes_per_pixel] for i in range(0, len(data), bytes_per_pixel)]
+
+    def adb_screencap_region(self, x, y, width, height):
+        """Get a rectangular region of the screen, without transferring a full screencap.
+
+        Parameters
+        ----------
+        x : int
+            The left edge of the region
+        y : int
+            The top edge of the region
+        width : int
+            The width of the region
+        height : int
+            The height of the region
+
+        Returns
+        -------
+        RawScreencap, None
+            The region, which can be encoded via :func:`~androidtv.screencap.encode_png`, or ``None`` if it could not
+            be extracted
+
+        Raises
+        ------
+        ValueError
+            The region is not inside the frame
+
+        """
+        geometry = self.adb_screencap_geometry()
+        if geometry is None:
+            return None
+
+        data = self._adb_screencap_ranges(region_ranges(geometry, x, y, width, height))
+        if data is None:
+            return None
+
+        return crop_region(geometry, width, height, data)
 
     def adb_connect(
         self,
@@ -183,6 +354,48 @@ class BaseTVSync(BaseTV):
             return self._adb.connect(log_errors, auth_timeout_s, transport_timeout_s)
         return self._adb.connect(log_errors)
 
+    def reconnect(self):
+        """Reconnect to the device if it is unavailable and the reconnect supervisor allows it.
+
+        See :meth:`~androidtv.basetv.basetv.BaseTV.enable_reconnect`.  If reconnects are not enabled, this simply
+        reconnects if the device is unavailable.
+
+        Returns
+        -------
+        bool
+            Whether the device is available
+
+        """
+        supervisor = self._reconnect_supervisor
+
+        if self.available:
+            if supervisor is not None:
+                supervisor.record_success()
+            return True
+
+        if supervisor is None:
+            return self.adb_connect()
+
+        if not supervisor.allow_attempt():
+            return False
+
+        # Only log the errors from the first failed attempt
+        if self.adb_connect(log_errors=not supervisor.failures):
+            supervisor.record_success()
+            return True
+
+        delay_s = supervisor.record_failure()
+        if supervisor.failures == supervisor.failure_threshold:
+            _LOGGER.warning(
+                "Could not reconnect to %s:%d after %d attempts; waiting %.0f seconds before trying again",
+                self.host,
+                self.port,
+                supervisor.failures,
+                delay_s,
+            )
+
+        return False
+
     def adb_close(self):
         """Close the ADB connection.
 
@@ -217,6 +430,35 @@ class BaseTVSync(BaseTV):
 
         return self.device_properties
 
+    def get_device_profile(self, profile_cache):
+        """Get the device properties and installed apps from a profile cache, or retrieve them and store them in the cache.
+
+        The cached profile is only used if the output of :py:const:`androidtv.constants.CMD_DEVICE_FINGERPRINT` has not
+        changed, which is much faster than retrieving the device properties and the installed apps.
+
+        Parameters
+        ----------
+        profile_cache : androidtv.profile_cache.ProfileCache
+            The profile cache
+
+        Returns
+        -------
+        bool
+            Whether the profile was loaded from the cache
+
+        """
+        self._device_fingerprint = self._adb.shell(constants.CMD_DEVICE_FINGERPRINT)
+
+        profile = profile_cache.get(profile_cache.key(self.host, self.port), self._device_fingerprint)
+        if profile is not None:
+            self._load_profile(profile)
+            return True
+
+        self.get_device_properties()
+        self.get_installed_apps()
+        self.save_device_profile(profile_cache)
+        return False
+
     # ======================================================================= #
     #                                                                         #
     #                               Properties                                #
@@ -233,7 +475,7 @@ class BaseTVSync(BaseTV):
         """
         stream_music = self._get_stream_music()
 
-        return self._audio_output_device(stream_music)
+        return stream_music.audio_output_device
 
     def audio_state(self):
         """Check if audio is playing, paused, or idle.
@@ -267,9 +509,13 @@ class BaseTVSync(BaseTV):
             The ID of the current app, or ``None`` if it could not be determined
 
         """
+        current_app = self._cached("current_app")
+        if current_app is not None:
+            return current_app
+
         current_app_response = self._adb.shell(self._cmd_current_app())
 
-        return self._current_app(current_app_response)
+        return self._cache("current_app", self._current_app(current_app_response), current_app_response)
 
     def current_app_media_session_state(self):
         """Get the current app and the state from the output of ``dumpsys media_session``.
@@ -295,8 +541,12 @@ class BaseTVSync(BaseTV):
             The HDMI input, or ``None`` if it could not be determined
 
         """
+        hdmi_input = self._cached("hdmi_input")
+        if hdmi_input is not None:
+            return hdmi_input
+
         hdmi_input_response = self._adb.shell(self._cmd_hdmi_input())
-        return self._get_hdmi_input(hdmi_input_response)
+        return self._cache("hdmi_input", self._get_hdmi_input(hdmi_input_response), hdmi_input_response)
 
     def get_installed_apps(self):
         """Return a list of installed applications.
@@ -307,7 +557,7 @@ class BaseTVSync(BaseTV):
             A list of the installed apps, or ``None`` if it could not be determined
 
         """
-        installed_apps_response = self._adb.shell(constants.CMD_INSTALLED_APPS)
+        installed_apps_response = self._adb.exec_out(constants.CMD_INSTALLED_APPS)
         self.installed_apps = self._get_installed_apps(installed_apps_response)
         return self.installed_apps
 
@@ -322,7 +572,7 @@ class BaseTVSync(BaseTV):
         """
         stream_music = self._get_stream_music()
 
-        return self._is_volume_muted(stream_music)
+        return stream_music.is_volume_muted
 
     def media_session_state(self):
         """Get the state from the output of ``dumpsys media_session``.
@@ -346,9 +596,13 @@ class BaseTVSync(BaseTV):
             A list of the running apps
 
         """
+        running_apps = self._cached("running_apps")
+        if running_apps is not None:
+            return running_apps
+
         running_apps_response = self._adb.shell(self._cmd_running_apps())
 
-        return self._running_apps(running_apps_response)
+        return self._cache("running_apps", self._running_apps(running_apps_response), running_apps_response)
 
     def screen_on(self):
         """Check if the screen is on.
@@ -359,7 +613,13 @@ class BaseTVSync(BaseTV):
             Whether or not the device is on
 
         """
-        return self._adb.shell(constants.CMD_SCREEN_ON + constants.CMD_SUCCESS1_FAILURE0) == "1"
+        screen_on = self._cached("screen_on")
+        if screen_on is not None:
+            return screen_on
+
+        screen_on_response = self._adb.shell(constants.CMD_SCREEN_ON + constants.CMD_SUCCESS1_FAILURE0)
+
+        return self._cache("screen_on", screen_on_response == "1", screen_on_response)
 
     def screen_on_awake_wake_lock_size(self):
         """Check if the screen is on and the device is awake, and get the wake lock size.
@@ -401,12 +661,10 @@ class BaseTVSync(BaseTV):
 
         """
         stream_music = self._get_stream_music()
-        audio_output_device = self._audio_output_device(stream_music)
-        volume = self._volume(stream_music, audio_output_device)
+        volume = self._volume(stream_music)
         volume_level = self._volume_level(volume)
-        is_volume_muted = self._is_volume_muted(stream_music)
 
-        return audio_output_device, is_volume_muted, volume, volume_level
+        return stream_music.audio_output_device, stream_music.is_volume_muted, volume, volume_level
 
     def volume(self):
         """Get the absolute volume level.
@@ -418,9 +676,8 @@ class BaseTVSync(BaseTV):
 
         """
         stream_music = self._get_stream_music()
-        audio_output_device = self._audio_output_device(stream_music)
 
-        return self._volume(stream_music, audio_output_device)
+        return self._volume(stream_music)
 
     def volume_level(self):
         """Get the relative volume level.
@@ -454,7 +711,7 @@ class BaseTVSync(BaseTV):
     #                                                                         #
     # ======================================================================= #
     def _get_stream_music(self, stream_music_raw=None):
-        """Get the ``STREAM_MUSIC`` block from the output of the command :py:const:`androidtv.constants.CMD_STREAM_MUSIC`.
+        """Get the properties from the ``STREAM_MUSIC`` block from the output of the command :py:const:`androidtv.constants.CMD_STREAM_MUSIC`.
 
         Parameters
         ----------
@@ -463,14 +720,43 @@ class BaseTVSync(BaseTV):
 
         Returns
         -------
-        str, None
-            The ``STREAM_MUSIC`` block from the output of :py:const:`androidtv.constants.CMD_STREAM_MUSIC`, or ``None`` if it could not be determined
+        StreamMusic
+            The properties from the ``STREAM_MUSIC`` block (see :meth:`~androidtv.basetv.basetv.BaseTV._parse_stream_music`)
 
         """
         if not stream_music_raw:
+            stream_music = self._cached("stream_music")
+            if stream_music is not None:
+                return stream_music
+
             stream_music_raw = self._adb.shell(constants.CMD_STREAM_MUSIC)
 
-        return self._parse_stream_music(stream_music_raw)
+        return self._cache("stream_music", self._parse_stream_music(stream_music_raw), stream_music_raw)
+
+    def _fused_shell(self, cmd):
+        """Send a fused ADB shell command (see :meth:`~androidtv.basetv.basetv.BaseTV._cmd_fused`).
+
+        Parameters
+        ----------
+        cmd : str
+            The fused ADB shell command
+
+        Returns
+        -------
+        str, None
+            The response from the device, if there is a response
+
+        """
+        output = self._adb.shell(cmd)
+
+        # Power service might sometimes reply with "Failed to write while dumping service". If this happens,
+        # retry the request, up to three times.
+        retries_left = 3
+        while output is not None and "Failed to write while dumping service" in output and retries_left > 0:
+            output = self._adb.shell(cmd)
+            retries_left -= 1
+
+        return output
 
     # ======================================================================= #
     #                                                                         #
@@ -500,6 +786,7 @@ class BaseTVSync(BaseTV):
         # adb shell outputs in weird format, so we cut it into lines,
         # separate the retcode and return info to the user
         res = self._adb.shell(cmd)
+        self._notify_command("send_intent")
         if res is None:
             return {}
 
@@ -519,6 +806,7 @@ class BaseTVSync(BaseTV):
 
         """
         self._adb.shell(self._cmd_launch_app(app))
+        self._notify_command("launch_app")
 
     def stop_app(self, app):
         """Stop an app.
@@ -534,7 +822,9 @@ class BaseTVSync(BaseTV):
             The output of the ``am force-stop`` ADB shell command, or ``None`` if the device is unavailable
 
         """
-        return self._adb.shell("am force-stop {0}".format(app))
+        output = self._adb.shell("am force-stop {0}".format(app))
+        self._notify_command("stop_app")
+        return output
 
     def start_intent(self, uri):
         """Start an intent on the device.
@@ -546,6 +836,7 @@ class BaseTVSync(BaseTV):
 
         """
         self._adb.shell("am start -a android.intent.action.VIEW -d {}".format(uri))
+        self._notify_command("start_intent")
 
     # ======================================================================= #
     #                                                                         #
@@ -562,6 +853,7 @@ class BaseTVSync(BaseTV):
 
         """
         self._adb.shell("input keyevent {0}".format(key))
+        self._notify_command("key")
 
     def power(self):
         """Send power action."""
@@ -644,10 +936,12 @@ class BaseTVSync(BaseTV):
     def turn_on(self):
         """Turn on the device."""
         self._adb.shell(self._cmd_turn_on())
+        self._notify_command("turn_on")
 
     def turn_off(self):
         """Turn off the device."""
         self._adb.shell(self._cmd_turn_off())
+        self._notify_command("turn_off")
 
     # ======================================================================= #
     #                                                                         #
@@ -829,7 +1123,10 @@ class BaseTVSync(BaseTV):
 
         new_volume = int(min(max(round(self.max_volume * volume_level), 0.0), self.max_volume))
 
+        stream_music = self._cached("stream_music")
         self._adb.shell(self._cmd_volume_set(new_volume))
+        self._notify_command("set_volume_level")
+        self._cache_volume(stream_music, new_volume)
 
         # return the new volume level
         return new_volume / self.max_volume
@@ -854,6 +1151,7 @@ class BaseTVSync(BaseTV):
             current_volume = round(self.max_volume * current_volume_level)
 
         # send the volume up command
+        stream_music = self._cached("stream_music")
         self._key(constants.KEY_VOLUME_UP)
 
         # if `self.max_volume` or `current_volume` could not be determined, return `None` as the new `volume_level`
@@ -861,7 +1159,9 @@ class BaseTVSync(BaseTV):
             return None
 
         # return the new volume level
-        return min(current_volume + 1, self.max_volume) / self.max_volume
+        new_volume = min(current_volume + 1, self.max_volume)
+        self._cache_volume(stream_music, new_volume)
+        return new_volume / self.max_volume
 
     def volume_down(self, current_volume_level=None):
         """Send volume down action.
@@ -883,6 +1183,7 @@ class BaseTVSync(BaseTV):
             current_volume = round(self.max_volume * current_volume_level)
 
         # send the volume down command
+        stream_music = self._cached("stream_music")
         self._key(constants.KEY_VOLUME_DOWN)
 
         # if `self.max_volume` or `current_volume` could not be determined, return `None` as the new `volume_level`
@@ -890,7 +1191,9 @@ class BaseTVSync(BaseTV):
             return None
 
         # return the new volume level
-        return max(current_volume - 1, 0.0) / self.max_volume
+        new_volume = max(current_volume - 1, 0)
+        self._cache_volume(stream_music, new_volume)
+        return new_volume / self.max_volume
 
     # ======================================================================= #
     #                                                                         #
@@ -0,0 +1,220 @@
+"""Resolve the device-specific ADB shell commands once per device, rather than each time a command is sent.
+
+The commands that are used for a device depend on its type (Android TV or Fire TV), its
+:attr:`~androidtv.basetv.basetv.BaseTV.device_properties`, and its custom commands (see
+:meth:`~androidtv.basetv.basetv.BaseTV.customize_command`).  The device families that need different commands are
+listed in :data:`DEVICE_FAMILIES`; for each command, the first family that matches the device and provides the command
+wins, and otherwise the command from :data:`DEFAULT_COMMANDS` is used.  A new device family can be supported via
+:func:`register_device_family`.
+
+"""
+
+from . import constants
+
+
+#: The commands that are used if no device family provides them; ``launch_app`` and ``volume_set`` are templates
+DEFAULT_COMMANDS = {
+    "audio_state": constants.CMD_AUDIO_STATE,
+    "current_app": constants.CMD_CURRENT_APP,
+    "current_app_media_session_state": constants.CMD_CURRENT_APP_MEDIA_SESSION_STATE,
+    "hdmi_input": constants.CMD_HDMI_INPUT,
+    "launch_app": constants.CMD_LAUNCH_APP,
+    "running_apps": constants.CMD_RUNNING_APPS,
+    "turn_off": constants.CMD_TURN_OFF_ANDROIDTV,
+    "turn_on": constants.CMD_TURN_ON_ANDROIDTV,
+    "volume_set": constants.CMD_VOLUME_SET_COMMAND,
+}
+
+
+class DeviceFamily(object):
+    """A family of devices that uses different commands than the defaults.
+
+    A device belongs to the family if it matches all of the criteria that are not ``None``.
+
+    Parameters
+    ----------
+    name : str
+        The name of the family
+    commands : dict
+        The commands that are used for this family, keyed by the names in :data:`DEFAULT_COMMANDS`
+    device_enum : constants.DeviceEnum, None
+        The type of device (see :attr:`~androidtv.basetv.basetv.BaseTV.DEVICE_ENUM`)
+    manufacturer : str, None
+        A substring of the ``'manufacturer'`` device property
+    model : str, None
+        A substring of the ``'model'`` device property
+    product_id : str, None
+        A substring of the ``'product_id'`` device property
+    sw_versions : list, None
+        The possible values of the ``'sw_version'`` device property
+
+    """
+
+    def __init__(
+        self, name, commands, device_enum=None, manufacturer=None, model=None, product_id=None, sw_versions=None
+    ):
+        self.name = name
+        self.commands = commands
+        self.device_enum = device_enum
+        self.manufacturer = manufacturer
+        self.model = model
+        self.product_id = product_id
+        self.sw_versions = sw_versions
+
+    def __repr__(self):
+        return "DeviceFamily({!r})".format(self.name)
+
+    def matches(self, device_enum, device_properties):
+        """Determine whether a device belongs to this family.
+
+        Parameters
+        ----------
+        device_enum : constants.DeviceEnum
+            The type of device
+        device_properties : dict
+            The device properties (see :meth:`~androidtv.basetv.basetv_sync.BaseTVSync.get_device_properties`)
+
+        Returns
+        -------
+        bool
+            Whether the device belongs to this family
+
+        """
+        if self.device_enum is not None and device_enum != self.device_enum:
+            return False
+
+        for key in ("manufacturer", "model", "product_id"):
+            substring = getattr(self, key)
+            if substring is not None and substring not in (device_properties.get(key) or ""):
+                return False
+
+        return self.sw_versions is None or device_properties.get("sw_version", "") in self.sw_versions
+
+
+#: The commands that are used for Android 11-14 devices, in addition to the version-specific ones
+_ANDROIDTV11_COMMANDS = {
+    "audio_state": constants.CMD_AUDIO_STATE11,
+    "hdmi_input": constants.CMD_HDMI_INPUT11,
+    "volume_set": constants.CMD_VOLUME_SET_COMMAND11,
+}
+
+#: The device families that use different commands than the defaults, in order of precedence
+DEVICE_FAMILIES = [
+    DeviceFamily(
+        "google_tv",
+        {
+            "current_app": constants.CMD_CURRENT_APP_GOOGLE_TV,
+            "current_app_media_session_state": constants.CMD_CURRENT_APP_MEDIA_SESSION_STATE_GOOGLE_TV,
+            "launch_app": constants.CMD_LAUNCH_APP_GOOGLE_TV,
+        },
+        device_enum=constants.DeviceEnum.ANDROIDTV,
+        manufacturer="Google",
+        model="Chromecast",
+    ),
+    DeviceFamily(
+        "askey_sti6130",
+        {
+            "current_app": constants.CMD_CURRENT_APP_ASKEY_STI6130,
+            "current_app_media_session_state": constants.CMD_CURRENT_APP_MEDIA_SESSION_STATE_ASKEY_STI6130,
+        },
+        device_enum=constants.DeviceEnum.ANDROIDTV,
+        manufacturer="askey",
+        product_id="sti6130",
+    ),
+    DeviceFamily(
+        "firetv",
+        {
+            "launch_app": constants.CMD_LAUNCH_APP_FIRETV,
+            "turn_off": constants.CMD_TURN_OFF_FIRETV,
+            "turn_on": constants.CMD_TURN_ON_FIRETV,
+        },
+        device_enum=constants.DeviceEnum.FIRETV,
+    ),
+    DeviceFamily(
+        "android11",
+        dict(
+            _ANDROIDTV11_COMMANDS,
+            current_app=constants.CMD_CURRENT_APP11,
+            current_app_media_session_state=constants.CMD_CURRENT_APP_MEDIA_SESSION_STATE11,
+            launch_app=constants.CMD_LAUNCH_APP11,
+        ),
+        device_enum=constants.DeviceEnum.ANDROIDTV,
+        sw_versions=["11"],
+    ),
+    DeviceFamily(
+        "android12",
+        dict(
+            _ANDROIDTV11_COMMANDS,
+            current_app=constants.CMD_CURRENT_APP12,
+            current_app_media_session_state=constants.CMD_CURRENT_APP_MEDIA_SESSION_STATE12,
+            launch_app=constants.CMD_LAUNCH_APP12,
+        ),
+        device_enum=constants.DeviceEnum.ANDROIDTV,
+        sw_versions=["12"],
+    ),
+    DeviceFamily(
+        "android13",
+        dict(
+            _ANDROIDTV11_COMMANDS,
+            current_app=constants.CMD_CURRENT_APP13,
+            current_app_media_session_state=constants.CMD_CURRENT_APP_MEDIA_SESSION_STATE13,
+            launch_app=constants.CMD_LAUNCH_APP13,
+        ),
+        device_enum=constants.DeviceEnum.ANDROIDTV,
+        sw_versions=["13", "14"],
+    ),
+]
+
+
+def register_device_family(family, index=0):
+    """Add a device family to :data:`DEVICE_FAMILIES`.
+
+    Families should be registered before any devices are set up, since the commands are only resolved once per device.
+
+    Parameters
+    ----------
+    family : DeviceFamily
+        The device family
+    index : int
+        The position in :data:`DEVICE_FAMILIES`; by default, the new family takes precedence over all the others
+
+    """
+    DEVICE_FAMILIES.insert(index, family)
+
+
+class CommandProfile(object):
+    """The resolved commands for a device.
+
+    Parameters
+    ----------
+    device_enum : constants.DeviceEnum
+        The type of device
+    device_properties : dict
+        The device properties
+    custom_commands : dict, None
+        Custom commands, which take precedence over all device families (see
+        :meth:`~androidtv.basetv.basetv.BaseTV.customize_command`)
+
+    Attributes
+    ----------
+    commands : dict
+        The resolved commands, keyed by the names in :data:`DEFAULT_COMMANDS`
+    sources : dict
+        The name of the device family that provided each command, or ``'custom'`` or ``'default'``
+
+    """
+
+    def __init__(self, device_enum, device_properties, custom_commands=None):
+        self.commands = dict(DEFAULT_COMMANDS)
+        self.sources = dict.fromkeys(DEFAULT_COMMANDS, "default")
+
+        # Apply the families in reverse order of precedence, so that the first matching family wins
+        for family in reversed(
+            [family for family in DEVICE_FAMILIES if family.matches(device_enum, device_properties)]
+        ):
+            self.commands.update(family.commands)
+            self.sources.update(dict.fromkeys(family.commands, family.name))
+
+        for name, cmd in (custom_commands or {}).items():
+            self.commands[name] = cmd
+            self.sources[name] = "custom"
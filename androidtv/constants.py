@@ -222,6 +222,9 @@ CMD_CURRENT_APP_MEDIA_SESSION_STATE_GOOGLE_TV = CMD_CURRENT_APP_GOOGLE_TV + " &&
 #: Get the running apps for an Android/Fire TV device
 CMD_RUNNING_APPS = "ps -A | grep u0_a"
 
+#: A cheap command that is sent via the ``exec:`` service to detect whether the device supports it
+CMD_EXEC_OUT_PROBE = "echo"
+
 #: Get installed apps
 CMD_INSTALLED_APPS = "pm list packages"
 
@@ -251,12 +254,28 @@ CMD_SCREEN_ON_AWAKE_WAKE_LOCK_SIZE = (
     CMD_SCREEN_ON + CMD_SUCCESS1_FAILURE0 + " && " + CMD_AWAKE + CMD_SUCCESS1_FAILURE0 + " && " + CMD_WAKE_LOCK_SIZE
 )
 
+#: Record the screen as a raw H.264 stream on stdout; the parameters are the bit rate (in bit/s), the time limit (in s), and the size option (e.g., ``" --size 1280x720"`` or ``""``)
+CMD_SCREENRECORD = "screenrecord --output-format=h264 --bit-rate {} --time-limit {}{} -"
+
+#: Save a raw screencap to a file (the parameter) and get its header (as unsigned 32-bit integers) and its size (see :func:`~androidtv.screencap.parse_screencap_geometry`), so that the screen is only captured once
+CMD_SCREENCAP_GEOMETRY = "screencap {0} && head -c 16 {0} | od -An -tu4 && wc -c < {0} ; rm -f {0}"
+
+#: Save a raw screencap to a file (the first parameter), run the commands that extract byte ranges from it (the second parameter), and delete it
+CMD_SCREENCAP_RANGES = "screencap {0} && {{ {1} ; }} ; rm -f {0}"
+
+#: Extract a byte range from a file; the parameters are the offset plus 1 (``tail`` counts from 1), the file, and the length
+CMD_BYTE_RANGE = "tail -c +{} {} | head -c {}"
+
+#: Follow the ``logcat`` events that reveal the current app and whether the screen is on, starting with the most recent one
+CMD_WATCH_EVENTS = "logcat -b events -v brief -T 1 -s am_focused_activity:I am_set_resumed_activity:I wm_set_resumed_activity:I screen_toggled:I"
+
 # `getprop` commands
 CMD_MANUFACTURER = "getprop ro.product.manufacturer"
 CMD_MODEL = "getprop ro.product.model"
 CMD_SERIALNO = "getprop ro.serialno"
 CMD_VERSION = "getprop ro.build.version.release"
 CMD_PRODUCT_ID = "getprop ro.product.vendor.device"
+CMD_BUILD_FINGERPRINT = "getprop ro.build.fingerprint"
 
 # Commands for getting the MAC address
 CMD_MAC_WLAN0 = "ip addr show wlan0 | grep -m 1 ether"
@@ -267,6 +286,12 @@ CMD_DEVICE_PROPERTIES = (
     CMD_MANUFACTURER + " && " + CMD_MODEL + " && " + CMD_SERIALNO + " && " + CMD_VERSION + " && " + CMD_PRODUCT_ID
 )
 
+#: The command used for checking whether a cached device profile is still valid (see :class:`~androidtv.profile_cache.ProfileCache`)
+CMD_DEVICE_FINGERPRINT = CMD_SERIALNO + " && " + CMD_BUILD_FINGERPRINT
+
+#: Precedes the output of each command in a fused command (see :meth:`~androidtv.basetv.basetv.BaseTV._cmd_fused`)
+FUSED_DELIMITER = "__ANDROIDTV_FUSED__:"
+
 
 # ADB key event codes
 # https://developer.android.com/reference/android/view/KeyEvent
@@ -443,6 +468,82 @@ VALID_PROPERTIES_TYPES = {
 #: States for the :attr:`~androidtv.basetv.basetv.BaseTV.media_session_state` property
 MEDIA_SESSION_STATES = {0: None, 1: STATE_STOPPED, 2: STATE_PAUSED, 3: STATE_PLAYING}
 
+# Health of the connection to a device (see :attr:`~androidtv.basetv.basetv.BaseTV.health`)
+HEALTH_CONNECTED = "connected"
+HEALTH_DISCONNECTED = "disconnected"
+HEALTH_RECONNECTING = "reconnecting"
+HEALTH_CIRCUIT_OPEN = "circuit_open"
+
+# Android pixel formats in the header of a raw screencap (see :mod:`androidtv.screencap`)
+SCREENCAP_PIXEL_FORMAT_RGBA_8888 = 1
+SCREENCAP_PIXEL_FORMAT_RGBX_8888 = 2
+SCREENCAP_PIXEL_FORMAT_RGB_888 = 3
+SCREENCAP_PIXEL_FORMAT_RGB_565 = 4
+SCREENCAP_PIXEL_FORMAT_BGRA_8888 = 5
+
+#: The number of bytes per pixel for each pixel format
+SCREENCAP_PIXEL_FORMAT_SIZES = {
+    SCREENCAP_PIXEL_FORMAT_RGBA_8888: 4,
+    SCREENCAP_PIXEL_FORMAT_RGBX_8888: 4,
+    SCREENCAP_PIXEL_FORMAT_RGB_888: 3,
+    SCREENCAP_PIXEL_FORMAT_RGB_565: 2,
+    SCREENCAP_PIXEL_FORMAT_BGRA_8888: 4,
+}
+
+#: The PNG color type to which each pixel format is converted (6 = RGBA, 2 = RGB)
+SCREENCAP_PNG_COLOR_TYPES = {
+    SCREENCAP_PIXEL_FORMAT_RGBA_8888: 6,
+    SCREENCAP_PIXEL_FORMAT_RGBX_8888: 2,
+    SCREENCAP_PIXEL_FORMAT_RGB_888: 2,
+    SCREENCAP_PIXEL_FORMAT_RGB_565: 2,
+    SCREENCAP_PIXEL_FORMAT_BGRA_8888: 6,
+}
+
+# Priorities of ADB commands (lower values are sent first; see :class:`~androidtv.adb_manager.adb_manager_async.PriorityLockAsync`)
+PRIORITY_INTERACTIVE = 0
+PRIORITY_CONTROL = 1
+PRIORITY_POLL = 2
+PRIORITY_BULK = 3
+
+#: The priority of each type of ADB shell command (see :func:`~androidtv.metrics.command_name`); other commands have priority :py:const:`PRIORITY_POLL`
+COMMAND_PRIORITIES = {
+    "key": PRIORITY_INTERACTIVE,
+    "launch_app": PRIORITY_CONTROL,
+    "send_intent": PRIORITY_CONTROL,
+    "start_intent": PRIORITY_CONTROL,
+    "stop_app": PRIORITY_CONTROL,
+    "turn_off": PRIORITY_CONTROL,
+    "turn_on": PRIORITY_CONTROL,
+    "volume_set": PRIORITY_CONTROL,
+}
+
+#: The types of read-only ADB shell commands (see :func:`~androidtv.metrics.command_name`) whose responses may be shared by identical commands; other commands are always sent
+SINGLE_FLIGHT_COMMANDS = {
+    "audio_state",
+    "awake",
+    "build_fingerprint",
+    "current_app",
+    "current_app_media_session_state",
+    "device_fingerprint",
+    "device_properties",
+    "fused",
+    "hdmi_input",
+    "installed_apps",
+    "mac_eth0",
+    "mac_wlan0",
+    "manufacturer",
+    "media_session_state",
+    "model",
+    "product_id",
+    "running_apps",
+    "screen_on",
+    "screen_on_awake_wake_lock_size",
+    "serialno",
+    "stream_music",
+    "version",
+    "wake_lock_size",
+}
+
 
 # Apps
 APP_AE_TV = "com.aetn.aetv.watch"
@@ -667,7 +768,11 @@ APPS = {
 
 # Regular expressions
 REGEX_MEDIA_SESSION_STATE = re.compile(r"state=(?P<state>[0-9]+)", re.MULTILINE)
+REGEX_DIGITS = re.compile(r"[0-9]*")
 REGEX_WAKE_LOCK_SIZE = re.compile(r"size=(?P<size>[0-9]+)")
+REGEX_WORD = re.compile(r"\w*")
+REGEX_EVENT = re.compile(r"^\w/(?P<tag>\w+)\s*\(\s*\d+\):\s*(?P<message>.*)$")
+REGEX_EVENT_COMPONENT = re.compile(r"(?P<package>[\w.]+)/[\w.$]+")
 
 # Regular expression patterns
 DEVICE_REGEX_PATTERN = r"Devices: (.*?)\W"
@@ -688,3 +793,112 @@ DEFAULT_ADB_TIMEOUT_S = 9.0
 
 #: Default timeout for acquiring the lock that protects ADB commands
 DEFAULT_LOCK_TIMEOUT_S = 3.0
+
+#: Default timeout (in s) for acquiring the lock that protects ADB commands, for each priority; polling commands that cannot be sent within their timeout are stale and are dropped
+DEFAULT_LOCK_TIMEOUTS_S = {
+    PRIORITY_INTERACTIVE: 10.0,
+    PRIORITY_CONTROL: 10.0,
+    PRIORITY_POLL: DEFAULT_LOCK_TIMEOUT_S,
+    PRIORITY_BULK: 30.0,
+}
+
+#: Default time (in s) for which the response to a polling command is reused by identical commands (see :class:`~androidtv.adb_manager.adb_manager_async.SingleFlightAsync`)
+DEFAULT_SINGLE_FLIGHT_TTL_S = 0.0
+
+#: Default maximum number of simultaneous socket connections to an ADB server (see :class:`~androidtv.adb_manager.adb_manager_async.ClientAsync`)
+DEFAULT_ADB_SERVER_MAX_CONNECTIONS = 32
+
+#: Default timeout (in s) for the response to :py:const:`CMD_EXEC_OUT_PROBE` before concluding that the device does not support the ``exec:`` service
+DEFAULT_EXEC_OUT_PROBE_TIMEOUT_S = 2.0
+
+#: Default maximum number of ADB authentication handshakes that are in progress at the same time; this bounds the concurrency, but each RSA signature still blocks the event loop (see :class:`~androidtv.adb_manager.adb_manager_async.ADBPythonAsync`)
+DEFAULT_MAX_CONCURRENT_HANDSHAKES = 10
+
+#: Default bit rate (in bit/s) of the H.264 stream from :meth:`~androidtv.basetv.basetv_async.BaseTVAsync.stream_screen`
+DEFAULT_SCREENRECORD_BITRATE = 4000000
+
+#: The longest time (in s) for which ``screenrecord`` runs before it exits on its own
+SCREENRECORD_MAX_TIME_LIMIT_S = 180
+
+#: The start code that precedes each NAL unit in the H.264 stream from ``screenrecord``; other output is an error message
+SCREENRECORD_H264_START_CODE = b"\x00\x00\x00\x01"
+
+#: Default interval (in s) between updates when subscribed to changes (see :meth:`~androidtv.basetv.basetv_async.BaseTVAsync.changes`)
+DEFAULT_POLL_INTERVAL_S = 5.0
+
+#: Default poll intervals (in s) for each state (see :class:`~androidtv.scheduler.AdaptivePollScheduler`)
+DEFAULT_POLL_STATE_INTERVALS_S = {
+    STATE_PLAYING: 2.0,
+    STATE_PAUSED: 5.0,
+    STATE_IDLE: 10.0,
+    STATE_STANDBY: 30.0,
+    STATE_OFF: 60.0,
+}
+
+#: Default bounds (in s) on the poll interval (see :class:`~androidtv.scheduler.AdaptivePollScheduler`)
+DEFAULT_POLL_MIN_INTERVAL_S = 1.0
+DEFAULT_POLL_MAX_INTERVAL_S = 300.0
+
+#: Default poll interval (in s) and duration (in s) of a burst of polls after a control command is sent (see :class:`~androidtv.scheduler.AdaptivePollScheduler`)
+DEFAULT_POLL_BURST_INTERVAL_S = 1.0
+DEFAULT_POLL_BURST_DURATION_S = 10.0
+
+#: Default poll interval (in s) after the first failed update and the factor by which it grows with each subsequent failure (see :class:`~androidtv.scheduler.AdaptivePollScheduler`)
+DEFAULT_POLL_UNAVAILABLE_INTERVAL_S = 5.0
+DEFAULT_POLL_BACKOFF_FACTOR = 2.0
+
+#: Default time (in s) for which each property is cached (see :class:`~androidtv.property_cache.PropertyCache`)
+DEFAULT_PROPERTY_CACHE_TTLS_S = {
+    "current_app": 1.0,
+    "hdmi_input": 10.0,
+    "running_apps": 10.0,
+    "screen_on": 1.0,
+    "stream_music": 5.0,
+}
+
+#: The version of the format of the device profile cache file; cache files with a different version are ignored (see :class:`~androidtv.profile_cache.ProfileCache`)
+PROFILE_CACHE_VERSION = 1
+
+#: Default delay (in s) after the first failed reconnect and the factor by which it grows with each subsequent failure (see :class:`~androidtv.reconnect.ReconnectSupervisor`)
+DEFAULT_RECONNECT_INITIAL_DELAY_S = DEFAULT_POLL_UNAVAILABLE_INTERVAL_S
+DEFAULT_RECONNECT_BACKOFF_FACTOR = DEFAULT_POLL_BACKOFF_FACTOR
+
+#: Default maximum delay (in s) between reconnects (see :class:`~androidtv.reconnect.ReconnectSupervisor`)
+DEFAULT_RECONNECT_MAX_DELAY_S = DEFAULT_POLL_MAX_INTERVAL_S
+
+#: Default fraction by which each reconnect delay is randomly lengthened or shortened (see :class:`~androidtv.reconnect.ReconnectSupervisor`)
+DEFAULT_RECONNECT_JITTER = 0.1
+
+#: Default number of consecutive failed reconnects after which the circuit opens and how long (in s) it stays open (see :class:`~androidtv.reconnect.ReconnectSupervisor`)
+DEFAULT_RECONNECT_FAILURE_THRESHOLD = 5
+DEFAULT_RECONNECT_OPEN_DURATION_S = 900.0
+
+#: Default time (in s) for which a screencap is reused by :meth:`~androidtv.basetv.basetv_async.BaseTVAsync.get_screencap`
+DEFAULT_SCREENCAP_MAX_AGE_S = 1.0
+
+#: The file on the device to which a raw screencap is saved while byte ranges are extracted from it (see :py:const:`CMD_SCREENCAP_GEOMETRY` and :py:const:`CMD_SCREENCAP_RANGES`); the shell expands ``$$`` to its process ID, so concurrent commands use different files
+SCREENCAP_RANGES_PATH = "/data/local/tmp/androidtv_screencap_$$.raw"
+
+#: Default ``zlib`` compression level for encoding raw screencaps as PNG images (see :func:`~androidtv.screencap.encode_png`)
+DEFAULT_SCREENCAP_PNG_COMPRESSION_LEVEL = 1
+
+#: Default maximum number of devices that :func:`~androidtv.setup_async.setup_many` will connect to (and authenticate with) at the same time
+DEFAULT_SETUP_MAX_CONNECTS = 10
+
+#: Default maximum number of devices whose properties :func:`~androidtv.setup_async.setup_many` will retrieve at the same time
+DEFAULT_SETUP_MAX_DISCOVERIES = 50
+
+#: Default maximum number of devices that :class:`~androidtv.fleet_async.FleetAsync` will update at the same time
+DEFAULT_FLEET_MAX_CONCURRENCY = 50
+
+#: Default timeout (in s) for updating a single device in a :class:`~androidtv.fleet_async.FleetAsync`
+DEFAULT_FLEET_TIMEOUT_S = 10.0
+
+#: Default maximum random delay (in s) before updating a device in a :class:`~androidtv.fleet_async.FleetAsync`
+DEFAULT_FLEET_JITTER_S = 0.5
+
+#: Default upper bounds (in s) of the histogram buckets for the latency of ADB commands (see :class:`~androidtv.metrics.CommandMetrics`)
+DEFAULT_METRICS_LATENCY_BUCKETS_S = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+#: Default upper bounds of the histogram buckets for the length of the responses to ADB commands (see :class:`~androidtv.metrics.CommandMetrics`)
+DEFAULT_METRICS_SIZE_BUCKETS = (16, 64, 256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
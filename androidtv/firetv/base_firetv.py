@@ -34,6 +34,56 @@ class BaseFireTV(BaseTV):  # pylint: disable=too-few-public-methods
     DEVICE_CLASS = "firetv"
     DEVICE_ENUM = constants.DeviceEnum.FIRETV
 
+    #: The names of the values returned by the ``update()`` method
+    UPDATE_FIELDS = ("state", "current_app", "running_apps", "hdmi_input")
+
+    #: The rules for determining the state of apps with known behavior (see :class:`~androidtv.basetv.basetv.BaseTV`);
+    #: these are used if the ``state_detection_rules`` do not determine the state
+    APP_STATE_DETECTION_RULES = {
+        None: [constants.STATE_IDLE],
+        constants.APP_FIRETV_PACKAGE_LAUNCHER: [constants.STATE_IDLE],
+        constants.APP_FIRETV_PACKAGE_SETTINGS: [constants.STATE_IDLE],
+        constants.APP_AMAZON_VIDEO: ["media_session_state", constants.STATE_IDLE],
+        constants.APP_FIREFOX: [{constants.STATE_PLAYING: {"wake_lock_size": 3}}, constants.STATE_IDLE],
+        constants.APP_HULU: [
+            {constants.STATE_PLAYING: {"wake_lock_size": 4}},
+            {constants.STATE_PAUSED: {"wake_lock_size": 2}},
+            constants.STATE_IDLE,
+        ],
+        constants.APP_JELLYFIN_TV: [{constants.STATE_PLAYING: {"wake_lock_size": 2}}, constants.STATE_PAUSED],
+        constants.APP_NETFLIX: ["media_session_state", constants.STATE_IDLE],
+        constants.APP_PLEX: [
+            {constants.STATE_PAUSED: {"media_session_state": 3, "wake_lock_size": 2}},
+            {constants.STATE_PLAYING: {"media_session_state": 3}},
+            constants.STATE_IDLE,
+        ],
+        constants.APP_SPORT1: [
+            {constants.STATE_PAUSED: {"wake_lock_size": 2}},
+            {constants.STATE_PLAYING: {"wake_lock_size": 3}},
+            constants.STATE_IDLE,
+        ],
+        constants.APP_SPOTIFY: ["media_session_state", constants.STATE_IDLE],
+        constants.APP_TVNOW: [
+            {constants.STATE_PAUSED: {"wake_lock_size": 3}},
+            {constants.STATE_PLAYING: {"wake_lock_size": 4}},
+            {constants.STATE_PLAYING: {"wake_lock_size": 5}},
+            constants.STATE_IDLE,
+        ],
+        constants.APP_TWITCH_FIRETV: [
+            {constants.STATE_PAUSED: {"wake_lock_size": 2}},
+            {constants.STATE_PLAYING: {"media_session_state": 3}},
+            {constants.STATE_PLAYING: {"media_session_state": 4}},
+            constants.STATE_IDLE,
+        ],
+        constants.APP_WAIPU_TV: [
+            {constants.STATE_PAUSED: {"wake_lock_size": 2}},
+            {constants.STATE_PLAYING: {"wake_lock_size": 3}},
+            constants.STATE_IDLE,
+        ],
+    }
+
+    _APP_STATE_DETECTION_TABLE = BaseTV._compile_state_detection_rules(APP_STATE_DETECTION_RULES)
+
     def __init__(self, host, port=5555, adbkey="", adb_server_ip="", adb_server_port=5037, state_detection_rules=None):
         BaseTV.__init__(self, None, host, port, adbkey, adb_server_ip, adb_server_port, state_detection_rules)
 
@@ -104,12 +154,13 @@ class BaseFireTV(BaseTV):  # pylint: disable=too-few-public-methods
             if state:
                 return state, current_app, running_apps, hdmi_input
 
-            # Determine the state based on the `current_app`
-            if current_app in [constants.APP_FIRETV_PACKAGE_LAUNCHER, constants.APP_FIRETV_PACKAGE_SETTINGS, None]:
-                state = constants.STATE_IDLE
+            # Apps with known behavior
+            rules = self._APP_STATE_DETECTION_TABLE.get(current_app)
+            if rules is not None:
+                state = self._evaluate_state_detection_rules(rules, media_session_state, wake_lock_size)
 
-            # Amazon Video
-            elif current_app == constants.APP_AMAZON_VIDEO:
+            # Get the state from `media_session_state`
+            elif media_session_state:
                 if media_session_state == 2:
                     state = constants.STATE_PAUSED
                 elif media_session_state == 3:
@@ -117,111 +168,84 @@ class BaseFireTV(BaseTV):  # pylint: disable=too-few-public-methods
                 else:
                     state = constants.STATE_IDLE
 
-            # Firefox
-            elif current_app == constants.APP_FIREFOX:
-                if wake_lock_size == 3:
+            # Get the state from `wake_lock_size`
+            else:
+                if wake_lock_size == 1:
                     state = constants.STATE_PLAYING
                 else:
-                    state = constants.STATE_IDLE
-
-            # Hulu
-            elif current_app == constants.APP_HULU:
-                if wake_lock_size == 4:
-                    state = constants.STATE_PLAYING
-                elif wake_lock_size == 2:
                     state = constants.STATE_PAUSED
-                else:
-                    state = constants.STATE_IDLE
 
-            # Jellyfin
-            elif current_app == constants.APP_JELLYFIN_TV:
-                if wake_lock_size == 2:
-                    state = constants.STATE_PLAYING
-                else:
-                    state = constants.STATE_PAUSED
+        return state, current_app, running_apps, hdmi_input
 
-            # Netflix
-            elif current_app == constants.APP_NETFLIX:
-                if media_session_state == 2:
-                    state = constants.STATE_PAUSED
-                elif media_session_state == 3:
-                    state = constants.STATE_PLAYING
-                else:
-                    state = constants.STATE_IDLE
+    # ======================================================================= #
+    #                                                                         #
+    #                            Fused properties                             #
+    #                                                                         #
+    # ======================================================================= #
+    def _cmd_fused_properties(self, get_running_apps=True, lazy=False):
+        """Get the single ADB shell command used to retrieve all of the properties needed for a Home Assistant update.
 
-            # Plex
-            elif current_app == constants.APP_PLEX:
-                if media_session_state == 3:
-                    if wake_lock_size == 2:
-                        state = constants.STATE_PAUSED
-                    else:
-                        state = constants.STATE_PLAYING
-                else:
-                    state = constants.STATE_IDLE
+        Parameters
+        ----------
+        get_running_apps : bool
+            Whether or not to get the running apps
+        lazy : bool
+            Whether or not to continue retrieving properties if the device is off or the screensaver is running
 
-            # Sport 1
-            elif current_app == constants.APP_SPORT1:
-                if wake_lock_size == 2:
-                    state = constants.STATE_PAUSED
-                elif wake_lock_size == 3:
-                    state = constants.STATE_PLAYING
-                else:
-                    state = constants.STATE_IDLE
+        Returns
+        -------
+        str
+            The fused ADB shell command (see :meth:`~androidtv.basetv.basetv.BaseTV._cmd_fused`)
 
-            # Spotify
-            elif current_app == constants.APP_SPOTIFY:
-                if media_session_state == 2:
-                    state = constants.STATE_PAUSED
-                elif media_session_state == 3:
-                    state = constants.STATE_PLAYING
-                else:
-                    state = constants.STATE_IDLE
+        """
+        commands = [
+            ("screen_on_awake_wake_lock_size", constants.CMD_SCREEN_ON_AWAKE_WAKE_LOCK_SIZE),
+            ("current_app_media_session_state", self._cmd_current_app_media_session_state()),
+        ]
 
-            # RTL Plus (Germany)
-            elif current_app == constants.APP_TVNOW:
-                if wake_lock_size == 3:
-                    state = constants.STATE_PAUSED
-                elif wake_lock_size == 4:
-                    state = constants.STATE_PLAYING
-                elif wake_lock_size == 5:
-                    state = constants.STATE_PLAYING
-                else:
-                    state = constants.STATE_IDLE
+        if get_running_apps:
+            commands.append(("running_apps", self._cmd_running_apps()))
 
-            # Twitch
-            elif current_app == constants.APP_TWITCH_FIRETV:
-                if wake_lock_size == 2:
-                    state = constants.STATE_PAUSED
-                elif media_session_state == 3:
-                    state = constants.STATE_PLAYING
-                elif media_session_state == 4:
-                    state = constants.STATE_PLAYING
-                else:
-                    state = constants.STATE_IDLE
+        commands.append(("hdmi_input", self._cmd_hdmi_input()))
 
-            # Waipu TV
-            elif current_app == constants.APP_WAIPU_TV:
-                if wake_lock_size == 2:
-                    state = constants.STATE_PAUSED
-                elif wake_lock_size == 3:
-                    state = constants.STATE_PLAYING
-                else:
-                    state = constants.STATE_IDLE
+        return self._cmd_fused(commands, lazy)
 
-            # Get the state from `media_session_state`
-            elif media_session_state:
-                if media_session_state == 2:
-                    state = constants.STATE_PAUSED
-                elif media_session_state == 3:
-                    state = constants.STATE_PLAYING
-                else:
-                    state = constants.STATE_IDLE
+    def _parse_fused_properties(self, fused_response, get_running_apps=True, lazy=False):
+        """Parse the output of :meth:`_cmd_fused_properties` into the properties needed for a Home Assistant update.
 
-            # Get the state from `wake_lock_size`
-            else:
-                if wake_lock_size == 1:
-                    state = constants.STATE_PLAYING
-                else:
-                    state = constants.STATE_PAUSED
+        Parameters
+        ----------
+        fused_response : str, None
+            The output of the ADB shell command :meth:`_cmd_fused_properties`
+        get_running_apps : bool
+            Whether or not the running apps were retrieved
+        lazy : bool
+            Whether or not the remaining properties were skipped if the device is off or the screensaver is running
 
-        return state, current_app, running_apps, hdmi_input
+        Returns
+        -------
+        tuple
+            The same properties as :meth:`~androidtv.firetv.firetv_sync.FireTVSync.get_properties`
+
+        """
+        sections = self._parse_fused(fused_response)
+
+        screen_on, awake, wake_lock_size = self._screen_on_awake_wake_lock_size(
+            sections.get("screen_on_awake_wake_lock_size")
+        )
+
+        if lazy and not (screen_on and awake):
+            return screen_on, awake, wake_lock_size, None, None, None, None
+
+        current_app, media_session_state = self._current_app_media_session_state(
+            sections.get("current_app_media_session_state")
+        )
+
+        if get_running_apps:
+            running_apps = self._running_apps(sections.get("running_apps"))
+        else:
+            running_apps = None
+
+        hdmi_input = self._get_hdmi_input(sections.get("hdmi_input"))
+
+        return screen_on, awake, wake_lock_size, current_app, media_session_state, running_apps, hdmi_input
@@ -30,6 +30,9 @@ class FireTVAsync(BaseTVAsync, BaseFireTV):
         A dictionary of rules for determining the state (see :class:`~androidtv.basetv.basetv.BaseTV`)
     signer : PythonRSASigner, None
         The signer for the ADB keys, as loaded by :meth:`androidtv.adb_manager.adb_manager_async.ADBPythonAsync.load_adbkey`
+    persistent_shell : bool
+        Whether to send shell commands via a single long-lived ``sh`` stream (see :class:`~androidtv.adb_manager.adb_manager_async.PersistentShellAsync`);
+        this only applies when using the Python ADB implementation
 
     """
 
@@ -42,8 +45,19 @@ class FireTVAsync(BaseTVAsync, BaseFireTV):
         adb_server_port=5037,
         state_detection_rules=None,
         signer=None,
+        persistent_shell=False,
     ):  # pylint: disable=super-init-not-called
-        BaseTVAsync.__init__(self, host, port, adbkey, adb_server_ip, adb_server_port, state_detection_rules, signer)
+        BaseTVAsync.__init__(
+            self,
+            host,
+            port,
+            adbkey,
+            adb_server_ip,
+            adb_server_port,
+            state_detection_rules,
+            signer,
+            persistent_shell,
+        )
 
     @classmethod
     def from_base(cls, base_tv):
@@ -73,6 +87,7 @@ class FireTVAsync(BaseTVAsync, BaseFireTV):
         ftv.device_properties = base_tv.device_properties
         ftv.installed_apps = base_tv.installed_apps
         ftv.max_volume = base_tv.max_volume
+        ftv._device_fingerprint = base_tv._device_fingerprint
         return ftv
 
     # ======================================================================= #
@@ -80,7 +95,7 @@ class FireTVAsync(BaseTVAsync, BaseFireTV):
     #                          Home Assistant Update                          #
     #                                                                         #
     # ======================================================================= #
-    async def update(self, get_running_apps=True, lazy=True):
+    async def update(self, get_running_apps=True, lazy=True, fused=False):
         """Get the info needed for a Home Assistant update.
 
         Parameters
@@ -89,6 +104,8 @@ class FireTVAsync(BaseTVAsync, BaseFireTV):
             Whether or not to get the :meth:`~androidtv.firetv.firetv_sync.FireTVSync.running_apps` property
         lazy : bool
             Whether or not to continue retrieving properties if the device is off or the screensaver is running
+        fused : bool
+            Whether or not to retrieve all of the properties via a single ADB shell command
 
         Returns
         -------
@@ -111,7 +128,7 @@ class FireTVAsync(BaseTVAsync, BaseFireTV):
             media_session_state,
             running_apps,
             hdmi_input,
-        ) = await self.get_properties(get_running_apps=get_running_apps, lazy=lazy)
+        ) = await self.get_properties(get_running_apps=get_running_apps, lazy=lazy, fused=fused)
 
         return self._update(
             screen_on, awake, wake_lock_size, current_app, media_session_state, running_apps, hdmi_input
@@ -122,7 +139,7 @@ class FireTVAsync(BaseTVAsync, BaseFireTV):
     #                               Properties                                #
     #                                                                         #
     # ======================================================================= #
-    async def get_properties(self, get_running_apps=True, lazy=False):
+    async def get_properties(self, get_running_apps=True, lazy=False, fused=False):
         """Get the properties needed for Home Assistant updates.
 
         Parameters
@@ -131,6 +148,8 @@ class FireTVAsync(BaseTVAsync, BaseFireTV):
             Whether or not to get the :meth:`~androidtv.firetv.firetv_async.FireTVAsync.running_apps` property
         lazy : bool
             Whether or not to continue retrieving properties if the device is off or the screensaver is running
+        fused : bool
+            Whether or not to retrieve all of the properties via a single ADB shell command
 
         Returns
         -------
@@ -150,6 +169,13 @@ class FireTVAsync(BaseTVAsync, BaseFireTV):
             The HDMI input, or ``None`` if it could not be determined
 
         """
+        if self._reconnect_supervisor is not None:
+            await self.reconnect()
+
+        if fused:
+            fused_response = await self._fused_shell(self._cmd_fused_properties(get_running_apps, lazy))
+            return self._parse_fused_properties(fused_response, get_running_apps, lazy)
+
         screen_on, awake, wake_lock_size = await self.screen_on_awake_wake_lock_size()
         if lazy and not (screen_on and awake):
             return screen_on, awake, wake_lock_size, None, None, None, None
@@ -165,7 +191,7 @@ class FireTVAsync(BaseTVAsync, BaseFireTV):
 
         return screen_on, awake, wake_lock_size, current_app, media_session_state, running_apps, hdmi_input
 
-    async def get_properties_dict(self, get_running_apps=True, lazy=True):
+    async def get_properties_dict(self, get_running_apps=True, lazy=True, fused=False):
         """Get the properties needed for Home Assistant updates and return them as a dictionary.
 
         Parameters
@@ -174,6 +200,8 @@ class FireTVAsync(BaseTVAsync, BaseFireTV):
             Whether or not to get the :meth:`~androidtv.firetv.firetv_async.FireTVAsync.running_apps` property
         lazy : bool
             Whether or not to continue retrieving properties if the device is off or the screensaver is running
+        fused : bool
+            Whether or not to retrieve all of the properties via a single ADB shell command
 
         Returns
         -------
@@ -190,7 +218,7 @@ class FireTVAsync(BaseTVAsync, BaseFireTV):
             media_session_state,
             running_apps,
             hdmi_input,
-        ) = await self.get_properties(get_running_apps=get_running_apps, lazy=lazy)
+        ) = await self.get_properties(get_running_apps=get_running_apps, lazy=lazy, fused=fused)
 
         return {
             "screen_on": screen_on,
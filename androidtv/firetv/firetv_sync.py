@@ -73,6 +73,7 @@ class FireTVSync(BaseTVSync, BaseFireTV):
         ftv.device_properties = base_tv.device_properties
         ftv.installed_apps = base_tv.installed_apps
         ftv.max_volume = base_tv.max_volume
+        ftv._device_fingerprint = base_tv._device_fingerprint
         return ftv
 
     # ======================================================================= #
@@ -80,7 +81,7 @@ class FireTVSync(BaseTVSync, BaseFireTV):
     #                          Home Assistant Update                          #
     #                                                                         #
     # ======================================================================= #
-    def update(self, get_running_apps=True, lazy=True):
+    def update(self, get_running_apps=True, lazy=True, fused=False):
         """Get the info needed for a Home Assistant update.
 
         Parameters
@@ -89,6 +90,8 @@ class FireTVSync(BaseTVSync, BaseFireTV):
             Whether or not to get the :meth:`~androidtv.firetv.firetv_sync.FireTVSync.running_apps` property
         lazy : bool
             Whether or not to continue retrieving properties if the device is off or the screensaver is running
+        fused : bool
+            Whether or not to retrieve all of the properties via a single ADB shell command
 
         Returns
         -------
@@ -111,7 +114,7 @@ class FireTVSync(BaseTVSync, BaseFireTV):
             media_session_state,
             running_apps,
             hdmi_input,
-        ) = self.get_properties(get_running_apps=get_running_apps, lazy=lazy)
+        ) = self.get_properties(get_running_apps=get_running_apps, lazy=lazy, fused=fused)
 
         return self._update(
             screen_on, awake, wake_lock_size, current_app, media_session_state, running_apps, hdmi_input
@@ -122,7 +125,7 @@ class FireTVSync(BaseTVSync, BaseFireTV):
     #                               Properties                                #
     #                                                                         #
     # ======================================================================= #
-    def get_properties(self, get_running_apps=True, lazy=False):
+    def get_properties(self, get_running_apps=True, lazy=False, fused=False):
         """Get the properties needed for Home Assistant updates.
 
         Parameters
@@ -131,6 +134,8 @@ class FireTVSync(BaseTVSync, BaseFireTV):
             Whether or not to get the :meth:`~androidtv.firetv.firetv_sync.FireTVSync.running_apps` property
         lazy : bool
             Whether or not to continue retrieving properties if the device is off or the screensaver is running
+        fused : bool
+            Whether or not to retrieve all of the properties via a single ADB shell command
 
         Returns
         -------
@@ -150,6 +155,13 @@ class FireTVSync(BaseTVSync, BaseFireTV):
             The HDMI input, or ``None`` if it could not be determined
 
         """
+        if self._reconnect_supervisor is not None:
+            self.reconnect()
+
+        if fused:
+            fused_response = self._fused_shell(self._cmd_fused_properties(get_running_apps, lazy))
+            return self._parse_fused_properties(fused_response, get_running_apps, lazy)
+
         screen_on, awake, wake_lock_size = self.screen_on_awake_wake_lock_size()
         if lazy and not (screen_on and awake):
             return screen_on, awake, wake_lock_size, None, None, None, None
@@ -165,7 +177,7 @@ class FireTVSync(BaseTVSync, BaseFireTV):
 
         return screen_on, awake, wake_lock_size, current_app, media_session_state, running_apps, hdmi_input
 
-    def get_properties_dict(self, get_running_apps=True, lazy=True):
+    def get_properties_dict(self, get_running_apps=True, lazy=True, fused=False):
         """Get the properties needed for Home Assistant updates and return them as a dictionary.
 
         Parameters
@@ -174,6 +186,8 @@ class FireTVSync(BaseTVSync, BaseFireTV):
             Whether or not to get the :meth:`~androidtv.firetv.firetv_sync.FireTVSync.running_apps` property
         lazy : bool
             Whether or not to continue retrieving properties if the device is off or the screensaver is running
+        fused : bool
+            Whether or not to retrieve all of the properties via a single ADB shell command
 
         Returns
         -------
@@ -190,7 +204,7 @@ class FireTVSync(BaseTVSync, BaseFireTV):
             media_session_state,
             running_apps,
             hdmi_input,
-        ) = self.get_properties(get_running_apps=get_running_apps, lazy=lazy)
+        ) = self.get_properties(get_running_apps=get_running_apps, lazy=lazy, fused=fused)
 
         return {
             "screen_on": screen_on,
@@ -0,0 +1,312 @@
+"""Manage and poll many Android TV / Fire TV devices concurrently.
+
+ADB Debugging must be enabled.
+"""
+
+import asyncio
+from collections import namedtuple
+import logging
+import random
+
+import async_timeout
+
+from .constants import DEFAULT_FLEET_JITTER_S, DEFAULT_FLEET_MAX_CONCURRENCY, DEFAULT_FLEET_TIMEOUT_S
+from .setup_async import setup
+
+_LOGGER = logging.getLogger(__name__)
+
+
+#: The outcome of updating one device in a :class:`FleetAsync`
+#:
+#: * ``name`` -- the name of the device in the fleet
+#: * ``device`` -- the :class:`~androidtv.androidtv.androidtv_async.AndroidTVAsync` or :class:`~androidtv.firetv.firetv_async.FireTVAsync` object
+#: * ``result`` -- the value returned by the device's ``update()`` method, or ``None`` if it failed
+#: * ``exception`` -- the exception that was raised, or ``None`` if the update succeeded
+FleetUpdate = namedtuple("FleetUpdate", ["name", "device", "result", "exception"])
+
+
+class FleetAsync:
+    """A collection of devices that are updated concurrently.
+
+    Updates are run with at most ``max_concurrency`` devices in flight at once, each update must finish within
+    ``timeout_s`` seconds, and each update is delayed by a random amount of up to ``jitter_s`` seconds so that the
+    devices are not all polled at the same instant.
+
+    .. code-block:: python
+
+       fleet = FleetAsync(max_concurrency=20)
+       await fleet.setup("192.168.0.111", adbkey="adbkey")
+       await fleet.setup("192.168.0.112", adbkey="adbkey")
+
+       async for update in fleet.update():
+           if update.exception is None:
+               print(update.name, update.result)
+
+    Parameters
+    ----------
+    max_concurrency : int
+        The maximum number of devices that will be updated at the same time
+    timeout_s : float, None
+        The maximum time (in seconds) for a single device's update, or ``None`` for no limit
+    jitter_s : float
+        The maximum random delay (in seconds) before each device's update
+
+    """
+
+    def __init__(
+        self,
+        max_concurrency=DEFAULT_FLEET_MAX_CONCURRENCY,
+        timeout_s=DEFAULT_FLEET_TIMEOUT_S,
+        jitter_s=DEFAULT_FLEET_JITTER_S,
+    ):
+        self.max_concurrency = max_concurrency
+        self.timeout_s = timeout_s
+        self.jitter_s = jitter_s
+
+        #: The devices in the fleet, keyed by name
+        self.devices = {}
+
+        self._semaphore = None
+
+    def __len__(self):
+        return len(self.devices)
+
+    def __contains__(self, name):
+        return name in self.devices
+
+    # ======================================================================= #
+    #                                                                         #
+    #                               Membership                                #
+    #                                                                         #
+    # ======================================================================= #
+    def add(self, device, name=None):
+        """Add a device to the fleet.
+
+        Parameters
+        ----------
+        device : AndroidTVAsync, FireTVAsync
+            The device
+        name : str, None
+            The name of the device in the fleet; the default is ``'<host>:<port>'``
+
+        Returns
+        -------
+        str
+            The name of the device in the fleet
+
+        """
+        if name is None:
+            name = "{}:{}".format(device.host, device.port)
+
+        if name in self.devices:
+            raise ValueError("A device named '{}' is already in the fleet".format(name))
+
+        self.devices[name] = device
+        return name
+
+    def remove(self, name):
+        """Remove a device from the fleet.
+
+        Parameters
+        ----------
+        name : str
+            The name of the device in the fleet
+
+        Returns
+        -------
+        AndroidTVAsync, FireTVAsync
+            The device that was removed
+
+        """
+        return self.devices.pop(name)
+
+    async def setup(self, host, port=5555, name=None, **kwargs):
+        """Connect to a device via :func:`androidtv.setup_async.setup` and add it to the fleet.
+
+        Parameters
+        ----------
+        host : str
+            The address of the device; may be an IP address or a host name
+        port : int
+            The device port to which we are connecting (default is 5555)
+        name : str, None
+            The name of the device in the fleet; the default is ``'<host>:<port>'``
+        **kwargs
+            Keyword arguments that will be passed to :func:`androidtv.setup_async.setup`
+
+        Returns
+        -------
+        AndroidTVAsync, FireTVAsync
+            The device
+
+        """
+        async with self._get_semaphore():
+            device = await setup(host, port, **kwargs)
+
+        self.add(device, name)
+        return device
+
+    async def close(self):
+        """Close the ADB connections to all of the devices in the fleet."""
+        await asyncio.gather(*[device.adb_close() for device in self.devices.values()])
+
+    # ======================================================================= #
+    #                                                                         #
+    #                                 Updates                                 #
+    #                                                                         #
+    # ======================================================================= #
+    def _get_semaphore(self):
+        """Get the semaphore that bounds the number of concurrent updates.
+
+        This is created lazily so that the fleet can be constructed outside of a running event loop.
+
+        """
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    async def update_device(self, name, jitter_s=None, **kwargs):
+        """Update a single device in the fleet.
+
+        Exceptions are not raised; instead, they are stored in the ``exception`` field of the returned object.
+
+        Parameters
+        ----------
+        name : str
+            The name of the device in the fleet
+        jitter_s : float, None
+            The maximum random delay (in seconds) before the update; the default is ``self.jitter_s``
+        **kwargs
+            Keyword arguments that will be passed to the device's ``update()`` method
+
+        Returns
+        -------
+        FleetUpdate
+            The outcome of the update
+
+        """
+        device = self.devices[name]
+        jitter_s = self.jitter_s if jitter_s is None else jitter_s
+
+        if jitter_s > 0:
+            await asyncio.sleep(random.uniform(0, jitter_s))
+
+        try:
+            async with self._get_semaphore():
+                async with async_timeout.timeout(self.timeout_s):
+                    result = await device.update(**kwargs)
+
+        except asyncio.TimeoutError as exc:
+            _LOGGER.debug("Update of device '%s' did not complete within %s seconds", name, self.timeout_s)
+            return FleetUpdate(name, device, None, exc)
+
+        except Exception as exc:  # pylint: disable=broad-except
+            _LOGGER.debug("Update of device '%s' failed: %s: %s", name, exc.__class__.__name__, exc)
+            return FleetUpdate(name, device, None, exc)
+
+        return FleetUpdate(name, device, result, None)
+
+    async def update(self, names=None, **kwargs):
+        """Update the devices in the fleet, yielding the results as they complete.
+
+        If the caller stops iterating early, the remaining updates are cancelled.
+
+        Parameters
+        ----------
+        names : list[str], None
+            The names of the devices that will be updated; the default is all of them
+        **kwargs
+            Keyword arguments that will be passed to each device's ``update()`` method
+
+        Yields
+        ------
+        FleetUpdate
+            The outcome of each device's update, in the order in which they complete
+
+        """
+        names = list(self.devices) if names is None else names
+        tasks = [asyncio.ensure_future(self.update_device(name, **kwargs)) for name in names]
+
+        try:
+            for task in asyncio.as_completed(tasks):
+                yield await task
+
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def update_all(self, names=None, **kwargs):
+        """Update the devices in the fleet and wait for all of them to complete.
+
+        Parameters
+        ----------
+        names : list[str], None
+            The names of the devices that will be updated; the default is all of them
+        **kwargs
+            Keyword arguments that will be passed to each device's ``update()`` method
+
+        Returns
+        -------
+        dict[str, FleetUpdate]
+            The outcome of each device's update, keyed by name
+
+        """
+        return {update.name: update async for update in self.update(names, **kwargs)}
+
+    async def poll(self, interval_s, names=None, **kwargs):
+        """Update the devices repeatedly, yielding the results as they complete.
+
+        Each device is polled on its own schedule: after an update completes, the next one for that device starts
+        ``interval_s`` seconds later, plus a random delay of up to ``self.jitter_s`` seconds.  If a device has a
+        ``poll_scheduler`` (see :class:`~androidtv.scheduler.AdaptivePollScheduler`), it determines the interval for
+        that device instead.  Polling stops when the caller stops iterating.
+
+        Parameters
+        ----------
+        interval_s : float
+            The time (in seconds) between the end of one update and the start of the next for devices without a
+            ``poll_scheduler``
+        names : list[str], None
+            The names of the devices that will be polled; the default is all of them
+        **kwargs
+            Keyword arguments that will be passed to each device's ``update()`` method
+
+        Yields
+        ------
+        FleetUpdate
+            The outcome of each update, in the order in which they complete
+
+        """
+        names = list(self.devices) if names is None else names
+
+        # If the caller falls behind, the devices wait for it instead of queueing up results
+        queue = asyncio.Queue(maxsize=max(len(names), 1))
+
+        async def poll_device(name):
+            """Poll one device until cancelled."""
+            device = self.devices[name]
+            scheduler = getattr(device, "poll_scheduler", None)
+
+            while True:
+                update = await self.update_device(name, **kwargs)
+                if scheduler:
+                    scheduler.record_update(update.result[0] if update.exception is None else None)
+
+                await queue.put(update)
+
+                if scheduler:
+                    await device.wait_for_next_poll(interval_s)
+                else:
+                    await asyncio.sleep(interval_s)
+
+        tasks = [asyncio.ensure_future(poll_device(name)) for name in names]
+
+        try:
+            while True:
+                yield await queue.get()
+
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
@@ -0,0 +1,504 @@
+"""Record the latency, lock contention, and response size of ADB commands.
+
+The ADB managers (e.g., :class:`~androidtv.adb_manager.adb_manager_async.ADBPythonAsync`) measure each command that
+they send and pass the measurements to their ``metrics`` hook, if one is set.  :class:`CommandMetrics` is a hook that
+aggregates the measurements into histograms and exports them as a dictionary or in the Prometheus text format.
+
+.. code-block:: python
+
+   metrics = CommandMetrics()
+   atv.set_metrics(metrics)
+
+   await atv.update()
+   print(metrics.prometheus())
+
+Any object with an ``observe()`` method that has the same signature as :meth:`CommandMetrics.observe` can be used as a
+hook.
+
+"""
+
+from bisect import bisect_left
+from contextlib import contextmanager
+import re
+from string import Formatter
+import sys
+import threading
+
+from . import constants
+
+if sys.version_info[0] == 2:  # pragma: no cover
+    from time import time as perf_counter
+else:
+    from time import perf_counter
+
+#: Suffixes (mostly device-specific) that are removed from the names of the ``CMD_*`` constants to get the command names
+REGEX_COMMAND_SUFFIX = re.compile(r"(_command)?(1\d|_androidtv|_firetv|_google_tv|_askey_sti6130)?$")
+
+#: The names of commands that are not built from a ``CMD_*`` constant, keyed by the start of the command
+COMMAND_PREFIXES = (
+    ("input keyevent ", "key"),
+    ("am force-stop ", "stop_app"),
+    ("am start -a android.intent.action.VIEW ", "start_intent"),
+    ("monkey -p ", "send_intent"),
+    ("( getevent )", "learn_sendevent"),
+)
+
+#: The name that is used for commands that cannot be identified
+COMMAND_OTHER = "other"
+
+
+def _command_table():
+    """Build the tables that map the ``CMD_*`` constants to command names.
+
+    Returns
+    -------
+    names : dict
+        The command names, keyed by the commands
+    templates : list
+        ``(pattern, name)`` tuples for the commands that are formatted with an argument (e.g., the app to launch)
+
+    """
+    names = {}
+    templates = []
+    for key, value in sorted(vars(constants).items()):
+        if not key.startswith("CMD_") or not isinstance(value, str):
+            continue
+
+        name = REGEX_COMMAND_SUFFIX.sub("", key[4:].lower())
+        if "{0}" in value or "{}" in value:
+            pattern = "".join(
+                re.escape(literal) + (".*?" if field is not None else "")
+                for literal, field, _, _ in Formatter().parse(value)
+            )
+            templates.append((re.compile(pattern + r"\Z", re.DOTALL), name))
+        else:
+            names.setdefault(value, name)
+
+    return names, templates
+
+
+COMMAND_NAMES, COMMAND_TEMPLATES = _command_table()
+
+#: The maximum number of commands whose names are cached by :func:`command_name`
+COMMAND_NAME_CACHE_SIZE = 256
+
+# The names of the commands that :func:`command_name` has looked up, keyed by the commands
+_COMMAND_NAME_CACHE = {}
+
+
+def command_name(cmd):
+    """Get the name of the type of an ADB shell command, for use as a metrics label.
+
+    The name is derived from the ``CMD_*`` constant from which the command was built (e.g., ``'screen_on'`` for
+    :py:const:`~androidtv.constants.CMD_SCREEN_ON`), without any device-specific suffix.
+
+    Parameters
+    ----------
+    cmd : str
+        The ADB shell command
+
+    Returns
+    -------
+    str
+        The name of the type of command, or :py:const:`COMMAND_OTHER` if it could not be determined
+
+    """
+    name = _COMMAND_NAME_CACHE.get(cmd)
+    if name is None:
+        name = _lookup_command_name(cmd)
+        if len(_COMMAND_NAME_CACHE) < COMMAND_NAME_CACHE_SIZE:
+            _COMMAND_NAME_CACHE[cmd] = name
+
+    return name
+
+
+def _lookup_command_name(cmd):
+    """Determine the name of the type of an ADB shell command (see :func:`command_name`).
+
+    Parameters
+    ----------
+    cmd : str
+        The ADB shell command
+
+    Returns
+    -------
+    str
+        The name of the type of command, or :py:const:`COMMAND_OTHER` if it could not be determined
+
+    """
+    if constants.FUSED_DELIMITER in cmd:
+        return "fused"
+
+    for suffix in (constants.CMD_SUCCESS1_FAILURE0, constants.CMD_SUCCESS1):
+        if cmd.endswith(suffix) and cmd != suffix:
+            cmd = cmd[: -len(suffix)]
+            break
+
+    if cmd in COMMAND_NAMES:
+        return COMMAND_NAMES[cmd]
+
+    for prefix, name in COMMAND_PREFIXES:
+        if cmd.startswith(prefix):
+            return name
+
+    for pattern, name in COMMAND_TEMPLATES:
+        if pattern.match(cmd):
+            return name
+
+    return COMMAND_OTHER
+
+
+# ======================================================================= #
+#                                                                         #
+#                              Measurements                               #
+#                                                                         #
+# ======================================================================= #
+class Measurement(object):
+    """The timings of a single ADB command.
+
+    Parameters
+    ----------
+    metrics : CommandMetrics, None
+        The hook to which the measurement will be passed, or ``None`` if the command is not being measured
+    device : str
+        The device, as ``'<host>:<port>'``
+    command : str
+        The name of the type of command
+
+    """
+
+    __slots__ = ("metrics", "device", "command", "start", "acquired_at", "response")
+
+    def __init__(self, metrics, device, command):
+        self.metrics = metrics
+        self.device = device
+        self.command = command
+
+        #: When the command was requested (from ``time.perf_counter()``)
+        self.start = perf_counter()
+
+        #: When the lock was acquired and the command was sent (from ``time.perf_counter()``)
+        self.acquired_at = None
+
+        #: The response from the device, if any
+        self.response = None
+
+    def acquired(self):
+        """Record that the lock was acquired, i.e., the command is about to be sent."""
+        self.acquired_at = perf_counter()
+
+    def finish(self, failed):
+        """Pass the measurement to the metrics hook.
+
+        Parameters
+        ----------
+        failed : bool
+            Whether the lock could not be acquired or the command raised an exception
+
+        """
+        end = perf_counter()
+        if self.acquired_at is None:
+            lock_wait_s, transport_s = end - self.start, None
+        else:
+            lock_wait_s, transport_s = self.acquired_at - self.start, end - self.acquired_at
+
+        response_size = len(self.response) if self.response is not None else None
+        self.metrics.observe(self.device, self.command, lock_wait_s, transport_s, response_size, failed)
+
+
+@contextmanager
+def measure(metrics, host, port, cmd=None, name=None):
+    """Measure an ADB command and pass the measurement to a metrics hook.
+
+    The caller must call :meth:`Measurement.acquired` once the lock has been acquired and should set
+    :attr:`Measurement.response`.  If ``metrics`` is ``None``, nothing is recorded.
+
+    Parameters
+    ----------
+    metrics : CommandMetrics, None
+        The metrics hook
+    host : str
+        The address of the device
+    port : int
+        The port of the device
+    cmd : str, None
+        The ADB shell command, from which the name of the type of command is determined via :func:`command_name`
+    name : str, None
+        The name of the type of command, if ``cmd`` is not a shell command (e.g., ``'pull'``)
+
+    Yields
+    ------
+    Measurement
+        The measurement
+
+    """
+    if metrics is None:
+        yield Measurement(None, None, None)
+        return
+
+    measurement = Measurement(metrics, "{}:{}".format(host, port), name or command_name(cmd))
+    try:
+        yield measurement
+    except BaseException:
+        measurement.finish(True)
+        raise
+
+    measurement.finish(False)
+
+
+# ======================================================================= #
+#                                                                         #
+#                               Histograms                                #
+#                                                                         #
+# ======================================================================= #
+class Histogram(object):
+    """A histogram with fixed buckets, like a Prometheus histogram.
+
+    Parameters
+    ----------
+    buckets : tuple
+        The upper bounds of the buckets, in increasing order; an implicit ``+Inf`` bucket is always included
+
+    """
+
+    __slots__ = ("buckets", "counts", "count", "sum")
+
+    def __init__(self, buckets):
+        self.buckets = tuple(buckets)
+
+        #: The number of observations in each bucket (not cumulative); the last entry is for the ``+Inf`` bucket
+        self.counts = [0] * (len(self.buckets) + 1)
+
+        #: The total number of observations
+        self.count = 0
+
+        #: The sum of the observations
+        self.sum = 0.0
+
+    def observe(self, value):
+        """Add an observation.
+
+        Parameters
+        ----------
+        value : float
+            The observed value
+
+        """
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def cumulative(self):
+        """Get the cumulative counts for each bucket.
+
+        Returns
+        -------
+        list
+            ``(upper_bound, count)`` tuples, where the last upper bound is ``float("inf")``
+
+        """
+        ret = []
+        total = 0
+        for upper_bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            total += count
+            ret.append((upper_bound, total))
+
+        return ret
+
+    def as_dict(self):
+        """Get the histogram as a dictionary.
+
+        Returns
+        -------
+        dict
+            A dictionary with keys ``'buckets'`` (the cumulative count for each upper bound), ``'count'``, and ``'sum'``
+
+        """
+        return {"buckets": dict(self.cumulative()), "count": self.count, "sum": self.sum}
+
+
+def _escape_label(value):
+    """Escape a label value for the Prometheus text format.
+
+    Parameters
+    ----------
+    value : str
+        The label value
+
+    Returns
+    -------
+    str
+        The escaped label value
+
+    """
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_float(value):
+    """Format a number for the Prometheus text format.
+
+    Parameters
+    ----------
+    value : float
+        The number
+
+    Returns
+    -------
+    str
+        The formatted number
+
+    """
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value))
+
+
+class CommandMetrics(object):
+    """A metrics hook that aggregates measurements per device and per type of command.
+
+    For each device and type of command (see :func:`command_name`), the following are recorded:
+
+    * ``lock_wait_s`` -- a histogram of the time (in s) spent waiting for the ADB lock
+    * ``transport_s`` -- a histogram of the time (in s) from acquiring the lock until the response was received
+    * ``response_size`` -- a histogram of the length of the responses
+    * ``failures`` -- the number of commands for which the lock was not acquired or an exception was raised
+
+    A slow ``lock_wait_s`` indicates contention between commands to the same device, while a slow ``transport_s``
+    indicates a slow network or a slow command on the device.
+
+    Parameters
+    ----------
+    latency_buckets_s : tuple
+        The upper bounds (in s) of the buckets for the ``lock_wait_s`` and ``transport_s`` histograms
+    size_buckets : tuple
+        The upper bounds of the buckets for the ``response_size`` histogram
+    prefix : str
+        The prefix for the metric names in :meth:`prometheus`
+
+    """
+
+    def __init__(
+        self,
+        latency_buckets_s=constants.DEFAULT_METRICS_LATENCY_BUCKETS_S,
+        size_buckets=constants.DEFAULT_METRICS_SIZE_BUCKETS,
+        prefix="androidtv_adb",
+    ):
+        self.latency_buckets_s = tuple(latency_buckets_s)
+        self.size_buckets = tuple(size_buckets)
+        self.prefix = prefix
+
+        # The metrics, keyed by `(device, command)`
+        self._metrics = {}
+
+        # The sync ADB managers may be used from several threads
+        self._lock = threading.Lock()
+
+    def observe(self, device, command, lock_wait_s, transport_s, response_size, failed):
+        """Record the measurement of an ADB command.
+
+        Parameters
+        ----------
+        device : str
+            The device, as ``'<host>:<port>'``
+        command : str
+            The name of the type of command (see :func:`command_name`)
+        lock_wait_s : float
+            The time (in s) spent waiting for the ADB lock
+        transport_s : float, None
+            The time (in s) from acquiring the lock until the response was received, or ``None`` if the lock was not
+            acquired
+        response_size : int, None
+            The length of the response, or ``None`` if there was no response
+        failed : bool
+            Whether the lock could not be acquired or the command raised an exception
+
+        """
+        with self._lock:
+            key = (device, command)
+            if key not in self._metrics:
+                self._metrics[key] = {
+                    "lock_wait_s": Histogram(self.latency_buckets_s),
+                    "transport_s": Histogram(self.latency_buckets_s),
+                    "response_size": Histogram(self.size_buckets),
+                    "failures": 0,
+                }
+
+            metrics = self._metrics[key]
+            metrics["lock_wait_s"].observe(lock_wait_s)
+            if transport_s is not None:
+                metrics["transport_s"].observe(transport_s)
+            if response_size is not None:
+                metrics["response_size"].observe(response_size)
+            if failed:
+                metrics["failures"] += 1
+
+    def reset(self):
+        """Discard all recorded measurements."""
+        with self._lock:
+            self._metrics.clear()
+
+    def as_dict(self):
+        """Export the metrics as a dictionary.
+
+        Returns
+        -------
+        dict
+            A dictionary of the form ``{device: {command: metrics}}``, where ``metrics`` is a dictionary with keys
+            ``'lock_wait_s'``, ``'transport_s'``, and ``'response_size'`` (see :meth:`Histogram.as_dict`) and
+            ``'failures'``
+
+        """
+        ret = {}
+        with self._lock:
+            for (device, command), metrics in sorted(self._metrics.items()):
+                ret.setdefault(device, {})[command] = {
+                    "lock_wait_s": metrics["lock_wait_s"].as_dict(),
+                    "transport_s": metrics["transport_s"].as_dict(),
+                    "response_size": metrics["response_size"].as_dict(),
+                    "failures": metrics["failures"],
+                }
+
+        return ret
+
+    def prometheus(self):
+        """Export the metrics in the Prometheus text format.
+
+        Returns
+        -------
+        str
+            The metrics in the Prometheus text exposition format
+
+        """
+        histograms = (
+            ("lock_wait_s", "lock_wait_seconds", "Time spent waiting for the ADB lock."),
+            ("transport_s", "transport_seconds", "Time from acquiring the ADB lock until the response was received."),
+            ("response_size", "response_size", "Length of the responses to ADB commands."),
+        )
+
+        lines = []
+        with self._lock:
+            items = sorted(self._metrics.items())
+
+            for key, metric, description in histograms:
+                name = "{}_{}".format(self.prefix, metric)
+                lines.append("# HELP {} {}".format(name, description))
+                lines.append("# TYPE {} histogram".format(name))
+
+                for (device, command), metrics in items:
+                    labels = 'device="{}",command="{}"'.format(_escape_label(device), _escape_label(command))
+                    histogram = metrics[key]
+                    for upper_bound, count in histogram.cumulative():
+                        lines.append(
+                            '{}_bucket{{{},le="{}"}} {}'.format(name, labels, _format_float(upper_bound), count)
+                        )
+                    lines.append("{}_sum{{{}}} {}".format(name, labels, _format_float(histogram.sum)))
+                    lines.append("{}_count{{{}}} {}".format(name, labels, histogram.count))
+
+            name = "{}_failures_total".format(self.prefix)
+            lines.append("# HELP {} ADB commands that failed.".format(name))
+            lines.append("# TYPE {} counter".format(name))
+            for (device, command), metrics in items:
+                labels = 'device="{}",command="{}"'.format(_escape_label(device), _escape_label(command))
+                lines.append("{}{{{}}} {}".format(name, labels, metrics["failures"]))
+
+        return "\n".join(lines) + "\n"
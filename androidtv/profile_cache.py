@@ -0,0 +1,242 @@
+"""Store the properties of devices on disk so that they don't need to be discovered each time a device is set up.
+
+Setting up a device (see :func:`androidtv.setup` and :func:`androidtv.setup_async.setup`) retrieves the device
+properties, the MAC addresses, and the installed apps.  With a :class:`ProfileCache`, these are instead loaded from a
+file, as long as the output of :py:const:`~androidtv.constants.CMD_DEVICE_FINGERPRINT` (the serial number and the build
+fingerprint) has not changed.  The commands that are used for a device depend on its properties, so they are also
+restored from the cache.
+
+The async setup functions read and write the file in an executor, so that the event loop is not blocked.  When many
+devices are set up at once (see :func:`androidtv.setup_async.setup_many`), the file is only written once at the end.
+
+"""
+
+import json
+import logging
+import os
+import sys
+import threading
+
+from . import constants
+
+if sys.version_info[0] == 2:  # pragma: no cover
+    _replace = os.rename
+else:
+    _replace = os.replace
+
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class ProfileCache(object):
+    """A file that stores the properties of devices, keyed by ``host:port``.
+
+    .. code-block:: python
+
+       profile_cache = ProfileCache("/path/to/androidtv_profiles.json")
+       atv = setup("192.168.0.222", 5555, profile_cache=profile_cache)
+
+    Parameters
+    ----------
+    path : str
+        The path to the JSON file in which the profiles are stored
+
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._profiles = None
+
+        # The file may be read and written in an executor (see :meth:`dump`)
+        self._lock = threading.Lock()
+
+        # The number of changes to the profiles, and how many of them have been written to the file
+        self._changes = 0
+        self._saved_changes = 0
+
+    @property
+    def unsaved(self):
+        """Whether there are changes to the profiles that have not been written to the file.
+
+        Returns
+        -------
+        bool
+            Whether there are unsaved changes
+
+        """
+        return self._changes != self._saved_changes
+
+    @staticmethod
+    def key(host, port):
+        """Get the key under which the profile for a device is stored.
+
+        Parameters
+        ----------
+        host : str
+            The address of the device
+        port : int
+            The device port
+
+        Returns
+        -------
+        str
+            The key for the device
+
+        """
+        return "{}:{}".format(host, port)
+
+    def get(self, key, fingerprint):
+        """Get the profile for a device.
+
+        Parameters
+        ----------
+        key : str
+            The key for the device (see :meth:`key`)
+        fingerprint : str, None
+            The output of :py:const:`~androidtv.constants.CMD_DEVICE_FINGERPRINT`
+
+        Returns
+        -------
+        dict, None
+            The profile, or ``None`` if there is no profile for the device or its fingerprint does not match
+
+        """
+        if not fingerprint:
+            return None
+
+        profile = self.load().get(key)
+        if not profile or profile.get("fingerprint") != fingerprint:
+            return None
+
+        return profile
+
+    def invalidate(self, key=None, save=True):
+        """Remove a profile from the cache.
+
+        Parameters
+        ----------
+        key : str, None
+            The key for the device (see :meth:`key`), or ``None`` to remove all profiles
+        save : bool
+            Whether to write the cache to the file
+
+        """
+        if key is None:
+            self._profiles = {}
+        else:
+            self.load().pop(key, None)
+
+        self._changes += 1
+        if save:
+            self.save()
+
+    def load(self):
+        """Load the profiles from the file, if they have not been loaded already.
+
+        A missing, unreadable, or outdated file is treated as an empty cache.
+
+        Returns
+        -------
+        dict
+            The profiles, keyed by ``host:port``
+
+        """
+        if self._profiles is None:
+            with self._lock:
+                if self._profiles is None:
+                    self._profiles = self._read()
+
+        return self._profiles
+
+    def _read(self):
+        """Read the profiles from the file.
+
+        Returns
+        -------
+        dict
+            The profiles, keyed by ``host:port``
+
+        """
+        if not os.path.exists(self.path):
+            return {}
+
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except (OSError, ValueError) as exc:
+            _LOGGER.warning("Could not load the device profile cache '%s': %s", self.path, exc)
+            return {}
+
+        if isinstance(data, dict) and data.get("version") == constants.PROFILE_CACHE_VERSION:
+            return data.get("profiles", {})
+
+        return {}
+
+    def dump(self):
+        """Serialize the profiles so that they can be written to the file by :meth:`write`.
+
+        This must be called from the same thread as :meth:`set`, but :meth:`write` can then be run in an executor.
+
+        Returns
+        -------
+        changes : int
+            The number of changes to the profiles that are included
+        text : str
+            The contents of the file
+
+        """
+        data = {"version": constants.PROFILE_CACHE_VERSION, "profiles": self.load()}
+        return self._changes, json.dumps(data, indent=2, sort_keys=True)
+
+    def save(self):
+        """Write the profiles to the file."""
+        self.write(self.dump())
+
+    def write(self, dump):
+        """Write serialized profiles to the file.
+
+        The file is replaced atomically, so that it is never left half-written.  If the file already contains the same
+        or newer changes (e.g., because another write that was run in an executor finished first), it is not written.
+
+        Parameters
+        ----------
+        dump : tuple
+            The output of :meth:`dump`
+
+        """
+        changes, text = dump
+
+        tmp_path = self.path + ".tmp"
+        with self._lock:
+            if changes <= self._saved_changes:
+                return
+
+            try:
+                with open(tmp_path, "w") as f:
+                    f.write(text)
+                _replace(tmp_path, self.path)
+            except OSError as exc:
+                _LOGGER.warning("Could not save the device profile cache '%s': %s", self.path, exc)
+                return
+
+            self._saved_changes = changes
+
+    def set(self, key, fingerprint, profile, save=True):
+        """Store the profile for a device and write the cache to the file.
+
+        Parameters
+        ----------
+        key : str
+            The key for the device (see :meth:`key`)
+        fingerprint : str
+            The output of :py:const:`~androidtv.constants.CMD_DEVICE_FINGERPRINT`
+        profile : dict
+            The profile, as returned by :meth:`~androidtv.basetv.basetv.BaseTV._dump_profile`
+        save : bool
+            Whether to write the cache to the file
+
+        """
+        self.load()[key] = dict(profile, fingerprint=fingerprint)
+        self._changes += 1
+        if save:
+            self.save()
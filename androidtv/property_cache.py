@@ -0,0 +1,125 @@
+"""Cache device properties for a short time so that they are not retrieved via ADB again and again.
+
+For example, each call to :meth:`~androidtv.basetv.basetv_async.BaseTVAsync.volume_up` without a
+``current_volume_level`` runs :py:const:`~androidtv.constants.CMD_STREAM_MUSIC` to get the current volume before it
+sends the key press.  With a cache, a rapid series of presses only needs to run it once.
+
+"""
+
+import sys
+
+from . import constants
+
+if sys.version_info[0] == 2:  # pragma: no cover
+    from time import time as monotonic
+else:
+    from time import monotonic
+
+
+class PropertyCache(object):
+    """A cache of device properties, each with its own time to live.
+
+    The cache is cleared whenever a control command is sent to the device (see :meth:`attach`), since the command
+    might change any of the properties.
+
+    .. code-block:: python
+
+       cache = PropertyCache()
+       cache.attach(atv)
+
+    Usually, the cache is created via :meth:`~androidtv.basetv.basetv.BaseTV.enable_property_cache`.
+
+    Parameters
+    ----------
+    ttls_s : dict, None
+        The time (in s) for which each property is cached; properties that are not in this dictionary are not cached.
+        The default is :const:`~androidtv.constants.DEFAULT_PROPERTY_CACHE_TTLS_S`.
+
+    """
+
+    def __init__(self, ttls_s=None):
+        self.ttls_s = dict(constants.DEFAULT_PROPERTY_CACHE_TTLS_S if ttls_s is None else ttls_s)
+
+        # `(expiration time, value)` tuples, keyed by the name of the property
+        self._values = {}
+
+    def attach(self, device):
+        """Clear the cache whenever a control command is sent to ``device``.
+
+        Parameters
+        ----------
+        device : BaseTV
+            The device
+
+        Returns
+        -------
+        function
+            A function that detaches the cache from the device
+
+        """
+        return device.add_command_listener(self.record_command)
+
+    def get(self, name):
+        """Get a property from the cache.
+
+        Parameters
+        ----------
+        name : str
+            The name of the property
+
+        Returns
+        -------
+        object, None
+            The cached value, or ``None`` if it is not cached or it has expired
+
+        """
+        entry = self._values.get(name)
+        if entry is None:
+            return None
+
+        expires, value = entry
+        if monotonic() >= expires:
+            del self._values[name]
+            return None
+
+        return value
+
+    def invalidate(self, name=None):
+        """Remove a property from the cache.
+
+        Parameters
+        ----------
+        name : str, None
+            The name of the property, or ``None`` to clear the cache
+
+        """
+        if name is None:
+            self._values.clear()
+        else:
+            self._values.pop(name, None)
+
+    def record_command(self, command=None):  # pylint: disable=unused-argument
+        """Clear the cache because a control command was sent.
+
+        Parameters
+        ----------
+        command : str, None
+            The name of the type of command (see :meth:`~androidtv.basetv.basetv.BaseTV.add_command_listener`)
+
+        """
+        self._values.clear()
+
+    def set(self, name, value):
+        """Store a property in the cache.
+
+        Parameters
+        ----------
+        name : str
+            The name of the property
+        value : object
+            The value; ``None`` is not cached
+
+        """
+        ttl_s = self.ttls_s.get(name)
+        if ttl_s and value is not None:
+            self._values[name] = (monotonic() + ttl_s, value)
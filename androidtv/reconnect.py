@@ -0,0 +1,128 @@
+"""Decide when to try to reconnect to a device that is unavailable.
+
+Retrying the connection to every unavailable device on every update wastes sockets and time on devices that are
+unplugged.  A :class:`ReconnectSupervisor` spaces out the attempts with an exponential backoff, and after too many
+consecutive failures it opens a circuit breaker that suspends the attempts for a longer period.
+
+"""
+
+import random
+import sys
+
+from . import constants
+
+if sys.version_info[0] == 2:  # pragma: no cover
+    from time import time as monotonic
+else:
+    from time import monotonic
+
+
+class ReconnectSupervisor(object):
+    """Decide whether it is time to try to reconnect to a device.
+
+    After ``n`` consecutive failed reconnects, the next attempt is allowed after
+    ``initial_delay_s * backoff_factor ** (n - 1)`` seconds (at most ``max_delay_s``), randomly lengthened or shortened
+    by up to the fraction ``jitter``.  Once ``n`` reaches ``failure_threshold``, the circuit opens and the next attempt is
+    only allowed after ``open_duration_s`` seconds; if that attempt fails, the circuit opens again.
+
+    Usually, the supervisor is created via :meth:`~androidtv.basetv.basetv.BaseTV.enable_reconnect`, and then the
+    device's ``reconnect()`` method uses it.
+
+    Parameters
+    ----------
+    initial_delay_s : float
+        The delay (in s) after the first failed reconnect
+    backoff_factor : float
+        The factor by which the delay grows with each consecutive failed reconnect
+    max_delay_s : float
+        The maximum delay (in s) while the circuit is closed
+    jitter : float
+        The fraction by which each delay is randomly lengthened or shortened, so that many devices do not retry at once
+    failure_threshold : int
+        The number of consecutive failed reconnects after which the circuit opens
+    open_duration_s : float
+        How long (in s) the circuit stays open
+
+    """
+
+    def __init__(
+        self,
+        initial_delay_s=constants.DEFAULT_RECONNECT_INITIAL_DELAY_S,
+        backoff_factor=constants.DEFAULT_RECONNECT_BACKOFF_FACTOR,
+        max_delay_s=constants.DEFAULT_RECONNECT_MAX_DELAY_S,
+        jitter=constants.DEFAULT_RECONNECT_JITTER,
+        failure_threshold=constants.DEFAULT_RECONNECT_FAILURE_THRESHOLD,
+        open_duration_s=constants.DEFAULT_RECONNECT_OPEN_DURATION_S,
+    ):
+        self.initial_delay_s = initial_delay_s
+        self.backoff_factor = backoff_factor
+        self.max_delay_s = max_delay_s
+        self.jitter = jitter
+        self.failure_threshold = failure_threshold
+        self.open_duration_s = open_duration_s
+
+        #: The number of consecutive failed reconnects
+        self.failures = 0
+
+        #: The time (from :func:`time.monotonic`) before which no reconnect should be attempted
+        self.next_attempt = None
+
+    @property
+    def circuit_open(self):
+        """Whether the circuit is open, i.e., there have been at least ``failure_threshold`` consecutive failures.
+
+        Returns
+        -------
+        bool
+            Whether the circuit is open
+
+        """
+        return self.failures >= self.failure_threshold
+
+    @property
+    def health(self):
+        """The health of the connection, assuming that the device is currently unavailable.
+
+        Returns
+        -------
+        str
+            :py:const:`~androidtv.constants.HEALTH_CIRCUIT_OPEN` or :py:const:`~androidtv.constants.HEALTH_RECONNECTING`
+
+        """
+        return constants.HEALTH_CIRCUIT_OPEN if self.circuit_open else constants.HEALTH_RECONNECTING
+
+    def allow_attempt(self):
+        """Determine whether it is time to try to reconnect.
+
+        Returns
+        -------
+        bool
+            Whether a reconnect should be attempted now
+
+        """
+        return self.next_attempt is None or monotonic() >= self.next_attempt
+
+    def record_failure(self):
+        """Record a failed reconnect and schedule the next attempt.
+
+        Returns
+        -------
+        float
+            The time (in s) until the next attempt
+
+        """
+        self.failures += 1
+
+        if self.circuit_open:
+            delay_s = self.open_duration_s
+        else:
+            delay_s = min(self.initial_delay_s * self.backoff_factor ** (self.failures - 1), self.max_delay_s)
+
+        delay_s *= 1 + random.uniform(-self.jitter, self.jitter)
+        self.next_attempt = monotonic() + delay_s
+        return delay_s
+
+    def record_success(self):
+        """Record that the device is connected, which closes the circuit."""
+        self.failures = 0
+        self.next_attempt = None
@@ -0,0 +1,149 @@
+"""Adapt the interval between updates of a device to its state.
+
+A device that is off does not need to be polled as often as one that is playing, and a device that was just sent a
+command should be polled frequently for a short while so that the change is picked up quickly.
+
+"""
+
+import time
+
+from . import constants
+
+
+class AdaptivePollScheduler(object):
+    """Determine how long to wait before the next update of a device.
+
+    The interval is determined as follows:
+
+    1. If the last ``n`` updates failed (i.e., the state was ``None`` because the device was unavailable), the interval
+       is ``unavailable_interval_s * backoff_factor ** (n - 1)``
+    2. If a control command was sent within the last ``burst_duration_s`` seconds, the interval is ``burst_interval_s``
+    3. Otherwise, the interval is looked up from the last state in ``state_intervals_s``
+
+    The result is always between ``min_interval_s`` and ``max_interval_s``.
+
+    .. code-block:: python
+
+       scheduler = AdaptivePollScheduler()
+       scheduler.attach(atv)
+
+       while True:
+           state = atv.update()[0]
+           scheduler.record_update(state)
+           time.sleep(scheduler.interval_s)
+
+    Parameters
+    ----------
+    state_intervals_s : dict, None
+        The interval (in s) for each state; the default is :const:`~androidtv.constants.DEFAULT_POLL_STATE_INTERVALS_S`
+    default_interval_s : float
+        The interval (in s) for states that are not in ``state_intervals_s``
+    min_interval_s : float
+        The minimum interval (in s)
+    max_interval_s : float
+        The maximum interval (in s)
+    burst_interval_s : float
+        The interval (in s) after a control command was sent
+    burst_duration_s : float
+        How long (in s) to use ``burst_interval_s`` after a control command was sent
+    unavailable_interval_s : float
+        The interval (in s) after an update failed
+    backoff_factor : float
+        The factor by which the interval grows with each consecutive failed update
+
+    """
+
+    def __init__(
+        self,
+        state_intervals_s=None,
+        default_interval_s=constants.DEFAULT_POLL_INTERVAL_S,
+        min_interval_s=constants.DEFAULT_POLL_MIN_INTERVAL_S,
+        max_interval_s=constants.DEFAULT_POLL_MAX_INTERVAL_S,
+        burst_interval_s=constants.DEFAULT_POLL_BURST_INTERVAL_S,
+        burst_duration_s=constants.DEFAULT_POLL_BURST_DURATION_S,
+        unavailable_interval_s=constants.DEFAULT_POLL_UNAVAILABLE_INTERVAL_S,
+        backoff_factor=constants.DEFAULT_POLL_BACKOFF_FACTOR,
+    ):
+        self.state_intervals_s = dict(
+            constants.DEFAULT_POLL_STATE_INTERVALS_S if state_intervals_s is None else state_intervals_s
+        )
+        self.default_interval_s = default_interval_s
+        self.min_interval_s = min_interval_s
+        self.max_interval_s = max_interval_s
+        self.burst_interval_s = burst_interval_s
+        self.burst_duration_s = burst_duration_s
+        self.unavailable_interval_s = unavailable_interval_s
+        self.backoff_factor = backoff_factor
+
+        #: The state from the last successful update
+        self.state = None
+
+        #: The number of consecutive failed updates
+        self.failures = 0
+
+        self._burst_until = None
+
+    @property
+    def interval_s(self):
+        """The time (in s) to wait before the next update.
+
+        Returns
+        -------
+        float
+            The time (in s) to wait before the next update
+
+        """
+        if self.failures:
+            try:
+                interval_s = self.unavailable_interval_s * self.backoff_factor ** (self.failures - 1)
+            except OverflowError:
+                # The device has been unavailable for so long that the interval is far beyond `max_interval_s`
+                interval_s = self.max_interval_s
+        elif self._burst_until is not None and time.time() < self._burst_until:
+            interval_s = self.burst_interval_s
+        else:
+            interval_s = self.state_intervals_s.get(self.state, self.default_interval_s)
+
+        return min(max(interval_s, self.min_interval_s), self.max_interval_s)
+
+    def attach(self, device):
+        """Start a burst of updates whenever a control command is sent to ``device``.
+
+        Parameters
+        ----------
+        device : BaseTV
+            The device
+
+        Returns
+        -------
+        function
+            A function that detaches the scheduler from the device
+
+        """
+        return device.add_command_listener(self.record_command)
+
+    def record_command(self, command=None):  # pylint: disable=unused-argument
+        """Start a burst of updates because a control command was sent.
+
+        Parameters
+        ----------
+        command : str, None
+            The name of the type of command (see :meth:`~androidtv.basetv.basetv.BaseTV.add_command_listener`)
+
+        """
+        self._burst_until = time.time() + self.burst_duration_s
+
+    def record_update(self, state):
+        """Record the state from an update.
+
+        Parameters
+        ----------
+        state : str, None
+            The state from the update, or ``None`` if the update failed
+
+        """
+        if state is None:
+            self.failures += 1
+        else:
+            self.failures = 0
+            self.state = state
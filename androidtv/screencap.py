@@ -0,0 +1,413 @@
+"""Parse raw framebuffer screencaps and encode them as PNG images on the host.
+
+``screencap -p`` makes the device compress the frame to PNG, which can take hundreds of milliseconds or more for a 4K
+frame on a TV's CPU.  Plain ``screencap`` outputs the raw framebuffer instead: a header with the width, height, and
+pixel format (and, since Android 8, the color space), followed by the pixels.  Transferring it is larger, but it is
+much cheaper for the device, and the PNG encoding (and optional downscaling) can be done on the host.
+
+Often, only a few pixels are needed, e.g., to detect a black screen.  Once the geometry of the framebuffer is known (see
+:func:`parse_screencap_geometry`), the device can extract just those bytes from a raw screencap (see
+:func:`ranges_cmd`), so that only a few hundred bytes are transferred.
+
+"""
+
+from collections import namedtuple
+import hashlib
+import struct
+import sys
+import zlib
+
+from . import constants
+
+#: A raw screencap
+#:
+#: * ``width`` -- the width of the frame (in pixels)
+#: * ``height`` -- the height of the frame (in pixels)
+#: * ``pixel_format`` -- the Android pixel format (see :py:const:`~androidtv.constants.SCREENCAP_PIXEL_FORMAT_SIZES`)
+#: * ``pixels`` -- a ``memoryview`` of the pixels, row by row, without copying the response
+RawScreencap = namedtuple("RawScreencap", ["width", "height", "pixel_format", "pixels"])
+
+#: A screencap from the cache (see :meth:`~androidtv.basetv.basetv_async.BaseTVAsync.get_screencap`)
+#:
+#: * ``image`` -- the PNG image, or ``None`` if it has not changed since the hash that the caller already has
+#: * ``hash`` -- the hash of the image (see :func:`screencap_hash`), which identifies its content
+#: * ``timestamp`` -- the time (from :func:`time.time`) at which the screencap was taken
+Screencap = namedtuple("Screencap", ["image", "hash", "timestamp"])
+
+#: The geometry of the raw framebuffer
+#:
+#: * ``width`` -- the width of the frame (in pixels)
+#: * ``height`` -- the height of the frame (in pixels)
+#: * ``pixel_format`` -- the Android pixel format (see :py:const:`~androidtv.constants.SCREENCAP_PIXEL_FORMAT_SIZES`)
+#: * ``header_size`` -- the size of the header (in bytes) that precedes the pixels
+ScreencapGeometry = namedtuple("ScreencapGeometry", ["width", "height", "pixel_format", "header_size"])
+
+# The byte within each pixel of each output channel for the pixel formats that are converted by reordering bytes
+_PNG_CHANNELS = {
+    constants.SCREENCAP_PIXEL_FORMAT_RGBA_8888: (0, 1, 2, 3),
+    constants.SCREENCAP_PIXEL_FORMAT_RGBX_8888: (0, 1, 2),
+    constants.SCREENCAP_PIXEL_FORMAT_RGB_888: (0, 1, 2),
+    constants.SCREENCAP_PIXEL_FORMAT_BGRA_8888: (2, 1, 0, 3),
+}
+
+
+def parse_raw_screencap(data):
+    """Parse the output of the ``screencap`` command (without ``-p``).
+
+    Parameters
+    ----------
+    data : bytes, None
+        The output of ``screencap``
+
+    Returns
+    -------
+    RawScreencap, None
+        The parsed screencap, or ``None`` if the output is not a valid raw screencap
+
+    """
+    if not data or len(data) < 12:
+        return None
+
+    width, height, pixel_format = struct.unpack_from("<III", data)
+    if pixel_format not in constants.SCREENCAP_PIXEL_FORMAT_SIZES:
+        return None
+
+    size = width * height * constants.SCREENCAP_PIXEL_FORMAT_SIZES[pixel_format]
+
+    # The header is 16 bytes (including the color space) on Android 8+ and 12 bytes on older versions
+    header_size = len(data) - size
+    if header_size not in (12, 16):
+        # The `shell:` service on older devices turns "\n" into "\r\n"
+        if b"\r\n" not in data:
+            return None
+        return parse_raw_screencap(data.replace(b"\r\n", b"\n"))
+
+    return RawScreencap(width, height, pixel_format, memoryview(data)[header_size:])
+
+
+def encode_png(screencap, scale=1, compression_level=constants.DEFAULT_SCREENCAP_PNG_COMPRESSION_LEVEL):
+    """Encode a raw screencap as a PNG image.
+
+    The pixels are converted to RGBA or RGB (see :py:const:`~androidtv.constants.SCREENCAP_PNG_COLOR_TYPES`); the
+    padding byte of ``RGBX_8888`` pixels is dropped.  This is CPU-bound, but ``zlib`` releases the GIL while it
+    compresses, so it can be run in an executor.
+
+    Parameters
+    ----------
+    screencap : RawScreencap
+        The raw screencap
+    scale : int
+        Only every ``scale``-th pixel in each direction is kept, i.e., the image is downscaled by this factor
+    compression_level : int
+        The ``zlib`` compression level, from 0 (none) to 9 (smallest)
+
+    Returns
+    -------
+    bytes
+        The PNG image
+
+    Raises
+    ------
+    ValueError
+        The pixel format is not supported
+
+    """
+    if screencap.pixel_format not in constants.SCREENCAP_PNG_COLOR_TYPES:
+        raise ValueError("Pixel format {} cannot be encoded as a PNG image".format(screencap.pixel_format))
+
+    bytes_per_pixel = constants.SCREENCAP_PIXEL_FORMAT_SIZES[screencap.pixel_format]
+    stride = screencap.width * bytes_per_pixel
+    width = (screencap.width + scale - 1) // scale
+    height = (screencap.height + scale - 1) // scale
+
+    # Each row is preceded by its filter type (0 = none)
+    rows = []
+    for y in range(0, screencap.height, scale):
+        rows.append(b"\x00")
+        rows.append(_convert_row(screencap.pixels[y * stride : (y + 1) * stride], screencap.pixel_format, scale))
+
+    header = struct.pack(
+        ">IIBBBBB", width, height, 8, constants.SCREENCAP_PNG_COLOR_TYPES[screencap.pixel_format], 0, 0, 0
+    )
+    return b"".join(
+        [
+            b"\x89PNG\r\n\x1a\n",
+            _png_chunk(b"IHDR", header),
+            _png_chunk(b"IDAT", zlib.compress(_join(rows), compression_level)),
+            _png_chunk(b"IEND", b""),
+        ]
+    )
+
+
+if sys.version_info[0] == 2:  # pragma: no cover
+
+    def _join(chunks):
+        """Concatenate chunks of bytes, which Python 2 cannot do directly for ``bytearray`` and ``memoryview`` objects."""
+        return b"".join([bytes(bytearray(chunk)) for chunk in chunks])
+
+else:
+    _join = b"".join
+
+
+# The RGB value of each ``RGB_565`` pixel value (see :func:`_rgb_565_table`)
+_RGB_565_TABLE = []
+
+
+def _convert_row(row, pixel_format, scale):
+    """Convert a row of a raw screencap to RGBA or RGB pixels, keeping only every ``scale``-th pixel.
+
+    Parameters
+    ----------
+    row : memoryview
+        The row of pixels
+    pixel_format : int
+        The Android pixel format
+    scale : int
+        Only every ``scale``-th pixel is kept
+
+    Returns
+    -------
+    bytes, memoryview
+        The converted row
+
+    """
+    if pixel_format == constants.SCREENCAP_PIXEL_FORMAT_RGBA_8888 and scale == 1:
+        return row
+
+    step = constants.SCREENCAP_PIXEL_FORMAT_SIZES[pixel_format] * scale
+    row = bytearray(row)
+
+    if pixel_format == constants.SCREENCAP_PIXEL_FORMAT_RGB_565:
+        table = _rgb_565_table()
+        return b"".join([table[low | high << 8] for low, high in zip(row[::step], row[1::step])])
+
+    channels = _PNG_CHANNELS[pixel_format]
+    converted = bytearray((len(row) + step - 1) // step * len(channels))
+    for i, channel in enumerate(channels):
+        converted[i :: len(channels)] = row[channel::step]
+
+    return converted
+
+
+def _rgb_565_table():
+    """Get the RGB value of each (little-endian) ``RGB_565`` pixel, with each channel scaled to 8 bits.
+
+    The table is built the first time that it is needed.
+
+    Returns
+    -------
+    list
+        The 3-byte RGB value of each ``RGB_565`` pixel value
+
+    """
+    if not _RGB_565_TABLE:
+        _RGB_565_TABLE[:] = [
+            struct.pack(
+                "BBB",
+                (value >> 11) * 255 // 31,
+                (value >> 5 & 0x3F) * 255 // 63,
+                (value & 0x1F) * 255 // 31,
+            )
+            for value in range(1 << 16)
+        ]
+
+    return _RGB_565_TABLE
+
+
+def _png_chunk(chunk_type, data):
+    """Build a PNG chunk.
+
+    Parameters
+    ----------
+    chunk_type : bytes
+        The type of the chunk, e.g., ``b'IHDR'``
+    data : bytes
+        The data in the chunk
+
+    Returns
+    -------
+    bytes
+        The chunk, including its length and CRC
+
+    """
+    return (
+        struct.pack(">I", len(data)) + chunk_type + data + struct.pack(">I", zlib.crc32(chunk_type + data) & 0xFFFFFFFF)
+    )
+
+
+def parse_screencap_geometry(output):
+    """Parse the output of :py:const:`~androidtv.constants.CMD_SCREENCAP_GEOMETRY`.
+
+    Parameters
+    ----------
+    output : str, None
+        The header of a raw screencap as unsigned 32-bit integers, followed by the size of the raw screencap
+
+    Returns
+    -------
+    ScreencapGeometry, None
+        The geometry of the framebuffer, or ``None`` if it could not be determined
+
+    """
+    try:
+        values = [int(value) for value in output.split()]
+    except (AttributeError, ValueError):
+        return None
+
+    if len(values) < 4 or values[2] not in constants.SCREENCAP_PIXEL_FORMAT_SIZES:
+        return None
+
+    width, height, pixel_format = values[:3]
+    header_size = values[-1] - width * height * constants.SCREENCAP_PIXEL_FORMAT_SIZES[pixel_format]
+    if header_size not in (12, 16):
+        return None
+
+    return ScreencapGeometry(width, height, pixel_format, header_size)
+
+
+def pixel_ranges(geometry, pixels):
+    """Get the byte ranges of pixels in a raw screencap.
+
+    Parameters
+    ----------
+    geometry : ScreencapGeometry
+        The geometry of the framebuffer
+    pixels : list
+        The ``(x, y)`` coordinates of the pixels
+
+    Returns
+    -------
+    list
+        The ``(offset, length)`` byte ranges of the pixels
+
+    Raises
+    ------
+    ValueError
+        A pixel is outside of the frame
+
+    """
+    bytes_per_pixel = constants.SCREENCAP_PIXEL_FORMAT_SIZES[geometry.pixel_format]
+
+    ranges = []
+    for x, y in pixels:
+        if not (0 <= x < geometry.width and 0 <= y < geometry.height):
+            raise ValueError(
+                "Pixel ({}, {}) is outside of the {}x{} frame".format(x, y, geometry.width, geometry.height)
+            )
+        ranges.append((geometry.header_size + (y * geometry.width + x) * bytes_per_pixel, bytes_per_pixel))
+
+    return ranges
+
+
+def region_ranges(geometry, x, y, width, height):
+    """Get the byte ranges of a rectangular region in a raw screencap.
+
+    Parameters
+    ----------
+    geometry : ScreencapGeometry
+        The geometry of the framebuffer
+    x : int
+        The left edge of the region
+    y : int
+        The top edge of the region
+    width : int
+        The width of the region
+    height : int
+        The height of the region
+
+    Returns
+    -------
+    list
+        The ``(offset, length)`` byte range that spans the rows of the region; unless the region spans the full width
+        of the frame, this includes the pixels between the rows, which are removed by :func:`crop_region`
+
+    Raises
+    ------
+    ValueError
+        The region is empty or not entirely inside the frame
+
+    """
+    if width <= 0 or height <= 0 or x < 0 or y < 0 or x + width > geometry.width or y + height > geometry.height:
+        raise ValueError(
+            "Region ({}, {}, {}, {}) is not inside the {}x{} frame".format(
+                x, y, width, height, geometry.width, geometry.height
+            )
+        )
+
+    bytes_per_pixel = constants.SCREENCAP_PIXEL_FORMAT_SIZES[geometry.pixel_format]
+    stride = geometry.width * bytes_per_pixel
+    offset = geometry.header_size + y * stride + x * bytes_per_pixel
+
+    # A single range keeps the command short; extracting each row separately would spawn two processes per row
+    return [(offset, (height - 1) * stride + width * bytes_per_pixel)]
+
+
+def crop_region(geometry, width, height, data):
+    """Remove the pixels between the rows of a region that was extracted via :func:`region_ranges`.
+
+    Parameters
+    ----------
+    geometry : ScreencapGeometry
+        The geometry of the framebuffer
+    width : int
+        The width of the region
+    height : int
+        The height of the region
+    data : bytes
+        The extracted byte range
+
+    Returns
+    -------
+    RawScreencap
+        The region
+
+    """
+    bytes_per_pixel = constants.SCREENCAP_PIXEL_FORMAT_SIZES[geometry.pixel_format]
+    stride = geometry.width * bytes_per_pixel
+    row_size = width * bytes_per_pixel
+
+    pixels = memoryview(data)
+    if row_size != stride:
+        pixels = memoryview(_join([pixels[row * stride : row * stride + row_size] for row in range(height)]))
+
+    return RawScreencap(width, height, geometry.pixel_format, pixels)
+
+
+def ranges_cmd(ranges):
+    """Build the command that extracts byte ranges from a raw screencap on the device.
+
+    Parameters
+    ----------
+    ranges : list
+        The ``(offset, length)`` byte ranges, as returned by :func:`pixel_ranges` or :func:`region_ranges`
+
+    Returns
+    -------
+    str
+        The command, whose output is the concatenation of the byte ranges
+
+    """
+    return constants.CMD_SCREENCAP_RANGES.format(
+        constants.SCREENCAP_RANGES_PATH,
+        " ; ".join(
+            constants.CMD_BYTE_RANGE.format(offset + 1, constants.SCREENCAP_RANGES_PATH, length)
+            for offset, length in ranges
+        ),
+    )
+
+
+def screencap_hash(image):
+    """Compute a short hash that identifies the content of a screencap.
+
+    Parameters
+    ----------
+    image : bytes
+        The image
+
+    Returns
+    -------
+    str
+        The hash, as 16 hexadecimal digits
+
+    """
+    return hashlib.blake2b(image, digest_size=8).hexdigest()
@@ -3,11 +3,31 @@
 ADB Debugging must be enabled.
 """
 
+import asyncio
+from collections import namedtuple
+import logging
+
+from .adb_manager.adb_manager_async import ADBPythonAsync
 from .androidtv.androidtv_async import AndroidTVAsync
 from .basetv.basetv_async import BaseTVAsync
-from .constants import DEFAULT_AUTH_TIMEOUT_S, DEFAULT_TRANSPORT_TIMEOUT_S
+from .constants import (
+    DEFAULT_AUTH_TIMEOUT_S,
+    DEFAULT_SETUP_MAX_CONNECTS,
+    DEFAULT_SETUP_MAX_DISCOVERIES,
+    DEFAULT_TRANSPORT_TIMEOUT_S,
+)
 from .firetv.firetv_async import FireTVAsync
 
+_LOGGER = logging.getLogger(__name__)
+
+
+#: The outcome of setting up one device via :func:`setup_many`
+#:
+#: * ``config`` -- the keyword arguments for the device, as they were passed to :func:`setup_many`
+#: * ``device`` -- the :class:`~androidtv.androidtv.androidtv_async.AndroidTVAsync` or :class:`~androidtv.firetv.firetv_async.FireTVAsync` object, or ``None`` if the setup failed
+#: * ``exception`` -- the exception that was raised, or ``None`` if the setup succeeded
+SetupResult = namedtuple("SetupResult", ["config", "device", "exception"])
+
 
 async def setup(
     host,
@@ -21,6 +41,8 @@ async def setup(
     signer=None,
     transport_timeout_s=DEFAULT_TRANSPORT_TIMEOUT_S,
     log_errors=True,
+    persistent_shell=False,
+    profile_cache=None,
 ):
     """Connect to a device and determine whether it's an Android TV or an Amazon Fire TV.
 
@@ -48,46 +70,211 @@ async def setup(
         Transport timeout (in seconds)
     log_errors: bool
         Whether connection errors should be logged
+    persistent_shell : bool
+        Whether to send shell commands via a single long-lived ``sh`` stream (see :class:`~androidtv.adb_manager.adb_manager_async.PersistentShellAsync`)
+    profile_cache : androidtv.profile_cache.ProfileCache, None
+        If provided, the device properties and installed apps are loaded from this cache when the device has not changed
 
     Returns
     -------
     AndroidTVAsync, FireTVAsync
         The representation of the device
 
+    """
+    aftv = await _connect(
+        host,
+        port,
+        adbkey,
+        adb_server_ip,
+        adb_server_port,
+        state_detection_rules,
+        device_class,
+        auth_timeout_s,
+        signer,
+        transport_timeout_s,
+        log_errors,
+        persistent_shell,
+    )
+
+    return await _discover(aftv, profile_cache)
+
+
+async def setup_many(
+    configs,
+    max_connects=DEFAULT_SETUP_MAX_CONNECTS,
+    max_discoveries=DEFAULT_SETUP_MAX_DISCOVERIES,
+    **kwargs,
+):
+    """Set up many devices concurrently, yielding each one as soon as it is ready.
+
+    Each device goes through two stages, each of which has its own limit on the number of devices in it at once:
+
+    1. Connecting, which includes the ADB authentication (i.e., RSA signing, which is CPU-bound)
+    2. Retrieving the device properties and the installed apps
+
+    A device does not need to wait for the others before moving on to the next stage, so the total time is roughly
+    bounded by the slowest device rather than the sum over all of them.  The ADB keys are only loaded once for each
+    ``adbkey`` file, and the signer is shared by all of the devices that use it.  Likewise, each ``profile_cache`` is
+    only written to its file once, after all of the devices have been set up.
+
+    .. code-block:: python
+
+       configs = [{"host": "192.168.0.111"}, {"host": "192.168.0.112", "device_class": "firetv"}]
+       async for result in setup_many(configs, adbkey="adbkey"):
+           if result.exception is None:
+               devices.append(result.device)
+
+    Parameters
+    ----------
+    configs : list[dict]
+        The keyword arguments for :func:`setup` for each device, e.g., ``{"host": "192.168.0.111", "port": 5555}``
+    max_connects : int
+        The maximum number of devices that will be connecting at the same time
+    max_discoveries : int
+        The maximum number of devices whose properties and installed apps will be retrieved at the same time
+    **kwargs
+        Keyword arguments for :func:`setup` that are shared by all of the devices; they are overridden by ``configs``
+
+    Yields
+    ------
+    SetupResult
+        The outcome for each device, in the order in which they are ready
+
+    """
+    connect_semaphore = asyncio.Semaphore(max_connects)
+    discovery_semaphore = asyncio.Semaphore(max_discoveries)
+
+    # Load each of the ADB keys once; if an ADB key cannot be loaded, the setup fails for each device that uses it
+    signers = {}
+    signer_errors = {}
+    setup_kwargs = []
+    for config in configs:
+        config_kwargs = dict(kwargs, **config)
+        signer_error = None
+        adbkey = config_kwargs.get("adbkey")
+        if adbkey and not config_kwargs.get("adb_server_ip") and config_kwargs.get("signer") is None:
+            if adbkey not in signers and adbkey not in signer_errors:
+                try:
+                    signers[adbkey] = await ADBPythonAsync.load_adbkey(adbkey)
+                except Exception as exc:  # pylint: disable=broad-except
+                    signer_errors[adbkey] = exc
+            config_kwargs["signer"] = signers.get(adbkey)
+            signer_error = signer_errors.get(adbkey)
+        setup_kwargs.append((config_kwargs, signer_error))
+
+    # The profile caches, which are written once all of the devices have been set up
+    profile_caches = []
+
+    async def setup_one(config, config_kwargs, signer_error):
+        """Set up one device, without raising exceptions."""
+        profile_cache = config_kwargs.pop("profile_cache", None)
+        if profile_cache is not None and all(cache is not profile_cache for cache in profile_caches):
+            profile_caches.append(profile_cache)
+
+        if signer_error is not None:
+            _LOGGER.debug("Setup of device %s failed: could not load the ADB key: %s", config, signer_error)
+            return SetupResult(config, None, signer_error)
+
+        try:
+            async with connect_semaphore:
+                aftv = await _connect(**config_kwargs)
+
+            async with discovery_semaphore:
+                device = await _discover(aftv, profile_cache, save_profile=False)
+
+        except Exception as exc:  # pylint: disable=broad-except
+            _LOGGER.debug("Setup of device %s failed: %s: %s", config, exc.__class__.__name__, exc)
+            return SetupResult(config, None, exc)
+
+        return SetupResult(config, device, None)
+
+    tasks = [
+        asyncio.ensure_future(setup_one(config, config_kwargs, signer_error))
+        for config, (config_kwargs, signer_error) in zip(configs, setup_kwargs)
+    ]
+
+    try:
+        for task in asyncio.as_completed(tasks):
+            yield await task
+
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+        for profile_cache in profile_caches:
+            await BaseTVAsync.save_profile_cache(profile_cache)
+
+
+async def _connect(
+    host,
+    port=5555,
+    adbkey="",
+    adb_server_ip="",
+    adb_server_port=5037,
+    state_detection_rules=None,
+    device_class="auto",
+    auth_timeout_s=DEFAULT_AUTH_TIMEOUT_S,
+    signer=None,
+    transport_timeout_s=DEFAULT_TRANSPORT_TIMEOUT_S,
+    log_errors=True,
+    persistent_shell=False,
+):
+    """Create the object for a device and connect to it.
+
+    See :func:`setup` for a description of the parameters.
+
+    Returns
+    -------
+    AndroidTVAsync, FireTVAsync, BaseTVAsync
+        The device; it is a ``BaseTVAsync`` object if ``device_class`` is ``'auto'``
+
     """
     if device_class == "androidtv":
-        atv = AndroidTVAsync(host, port, adbkey, adb_server_ip, adb_server_port, state_detection_rules, signer)
-        await atv.adb_connect(
-            log_errors=log_errors, auth_timeout_s=auth_timeout_s, transport_timeout_s=transport_timeout_s
-        )
-        await atv.get_device_properties()
-        await atv.get_installed_apps()
-        return atv
-
-    if device_class == "firetv":
-        ftv = FireTVAsync(host, port, adbkey, adb_server_ip, adb_server_port, state_detection_rules, signer)
-        await ftv.adb_connect(
-            log_errors=log_errors, auth_timeout_s=auth_timeout_s, transport_timeout_s=transport_timeout_s
-        )
-        await ftv.get_device_properties()
-        await ftv.get_installed_apps()
-        return ftv
-
-    if device_class != "auto":
+        cls = AndroidTVAsync
+    elif device_class == "firetv":
+        cls = FireTVAsync
+    elif device_class == "auto":
+        cls = BaseTVAsync
+    else:
         raise ValueError("`device_class` must be 'androidtv', 'firetv', or 'auto'.")
 
-    aftv = BaseTVAsync(host, port, adbkey, adb_server_ip, adb_server_port, state_detection_rules, signer)
+    aftv = cls(host, port, adbkey, adb_server_ip, adb_server_port, state_detection_rules, signer, persistent_shell)
 
     # establish the ADB connection
     await aftv.adb_connect(
         log_errors=log_errors, auth_timeout_s=auth_timeout_s, transport_timeout_s=transport_timeout_s
     )
 
-    # get device properties
-    await aftv.get_device_properties()
+    return aftv
+
+
+async def _discover(aftv, profile_cache, save_profile=True):
+    """Get the device properties and the installed apps, using the profile cache if one is provided.
+
+    Parameters
+    ----------
+    aftv : AndroidTVAsync, FireTVAsync, BaseTVAsync
+        The device, as returned by :func:`_connect`
+    profile_cache : androidtv.profile_cache.ProfileCache, None
+        The profile cache
+    save_profile : bool
+        Whether to write the profile cache to its file if the device's profile is stored in it
+
+    Returns
+    -------
+    AndroidTVAsync, FireTVAsync
+        The representation of the device
+
+    """
+    if profile_cache is not None:
+        await aftv.get_device_profile(profile_cache, save_profile)
+    else:
+        await aftv.get_device_properties()
+        await aftv.get_installed_apps()
 
-    # get the installed apps
-    await aftv.get_installed_apps()
+    if isinstance(aftv, (AndroidTVAsync, FireTVAsync)):
+        return aftv
 
     # Fire TV
     if aftv.device_properties.get("manufacturer") == "Amazon":
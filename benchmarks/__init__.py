@@ -0,0 +1,23 @@
+"""Benchmarks for the ``androidtv`` package.
+
+The benchmarks replay recorded ADB shell outputs from Android TV (Android 9-14) and Fire TV devices (see
+:mod:`benchmarks.recordings`), so no device is needed.  They are written in the `asv <https://asv.readthedocs.io>`_
+format (``time_*`` methods on classes with ``params``), and they can be run with asv:
+
+.. code-block:: bash
+
+   asv run
+
+or without any additional dependencies:
+
+.. code-block:: bash
+
+   python -m benchmarks
+   python -m benchmarks -k update --json results.json
+
+The ``Time*`` classes measure wall-clock time and the ``Cpu*`` classes measure CPU time.
+
+The benchmarks in :mod:`benchmarks.bench_emulator` connect over TCP to :mod:`benchmarks.emulator`, a local server that
+speaks the ADB protocol and can emulate hundreds of devices, so they also measure the ``adb_shell`` transport.
+
+"""
@@ -0,0 +1,141 @@
+"""Run the benchmarks without asv.
+
+Each benchmark is timed with the class's ``timer`` (like asv, the default is :func:`time.perf_counter`), and the median
+time per call over ``--repeat`` repetitions is reported.
+
+"""
+
+import argparse
+import importlib
+import inspect
+import itertools
+import json
+import os
+import statistics
+import time
+import timeit
+
+
+#: The modules that contain benchmarks
+MODULES = sorted(
+    "benchmarks." + filename[:-3]
+    for filename in os.listdir(os.path.dirname(os.path.abspath(__file__)))
+    if filename.startswith("bench_") and filename.endswith(".py")
+)
+
+
+def iter_benchmarks(pattern=None):
+    """Yield the benchmarks whose names contain ``pattern``.
+
+    Parameters
+    ----------
+    pattern : str, None
+        Only yield benchmarks whose names contain this string
+
+    Yields
+    ------
+    name : str
+        The name of the benchmark, e.g., ``'bench_update.TimeUpdate.time_update_sync'``
+    cls : type
+        The class that contains the benchmark
+    method : str
+        The name of the ``time_*`` method
+
+    """
+    for module_name in MODULES:
+        module = importlib.import_module(module_name)
+        for cls_name, cls in inspect.getmembers(module, inspect.isclass):
+            if cls.__module__ != module.__name__:
+                continue
+
+            for method in sorted(attr for attr in dir(cls) if attr.startswith("time_")):
+                name = "{}.{}.{}".format(module_name.split(".", 1)[1], cls_name, method)
+                if pattern is None or pattern in name:
+                    yield name, cls, method
+
+
+def iter_params(cls):
+    """Yield each combination of the parameters for a benchmark class, as in asv.
+
+    Parameters
+    ----------
+    cls : type
+        The class that contains the benchmark
+
+    Yields
+    ------
+    tuple
+        The arguments for ``setup``, the ``time_*`` method, and ``teardown``
+
+    """
+    params = getattr(cls, "params", [])
+    if not params:
+        yield ()
+        return
+
+    # A single list of parameters is the same as a list containing one list of parameters
+    if len(getattr(cls, "param_names", [])) == 1:
+        params = [params]
+
+    for args in itertools.product(*params):
+        yield args
+
+
+def measure(func, timer, repeat):
+    """Get the median time (in seconds) of one call to ``func``.
+
+    Parameters
+    ----------
+    func : function
+        The function to be timed
+    timer : function
+        The timer to use, e.g., :func:`time.perf_counter` or :func:`time.process_time`
+    repeat : int
+        The number of repetitions
+
+    Returns
+    -------
+    float
+        The median time (in seconds) of one call to ``func``
+
+    """
+    t = timeit.Timer(func, timer=timer)
+    number, _ = t.autorange()
+    return statistics.median(total / number for total in t.repeat(repeat, number))
+
+
+def main(argv=None):
+    """Run the benchmarks and print the results."""
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__.splitlines()[0])
+    parser.add_argument("-k", dest="pattern", help="only run benchmarks whose names contain this string")
+    parser.add_argument("--repeat", type=int, default=5, help="the number of repetitions (default: 5)")
+    parser.add_argument("--json", help="save the results to this file")
+    args = parser.parse_args(argv)
+
+    results = {}
+    for name, cls, method in iter_benchmarks(args.pattern):
+        timer = getattr(cls, "timer", time.perf_counter)
+        unit = "cpu" if timer is time.process_time else "wall"
+
+        for params in iter_params(cls):
+            bench = cls()
+            if hasattr(bench, "setup"):
+                bench.setup(*params)
+
+            try:
+                seconds = measure(lambda: getattr(bench, method)(*params), timer, args.repeat)
+            finally:
+                if hasattr(bench, "teardown"):
+                    bench.teardown(*params)
+
+            key = "{}({})".format(name, ", ".join(str(param) for param in params))
+            results[key] = seconds
+            print("{:<100} {:>4} {:>12.1f} us".format(key, unit, seconds * 1e6))
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+
+
+if __name__ == "__main__":
+    main()
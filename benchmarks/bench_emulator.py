@@ -0,0 +1,58 @@
+"""Benchmark updates over TCP against the ADB protocol emulator in :mod:`benchmarks.emulator`."""
+
+import asyncio
+
+from androidtv import setup
+from androidtv.fleet_async import FleetAsync
+
+from .emulator import AdbEmulatorThread
+
+
+class TimeEmulatedUpdate(object):
+    """The wall-clock time of a single ``update()`` via the real ``adb_shell`` transport."""
+
+    params = ["android9", "android12", "fireos7"]
+    param_names = ["device"]
+
+    def setup(self, device):
+        self.emulator = AdbEmulatorThread(1, device)
+        self.emulator.__enter__()
+        self.tv = setup("127.0.0.1", self.emulator.ports[0])
+
+    def teardown(self, device):
+        self.tv.adb_close()
+        self.emulator.__exit__(None, None, None)
+
+    def time_update(self, device):
+        self.tv.update()
+
+    def time_update_fused(self, device):
+        self.tv.update(fused=True)
+
+
+class TimeFleetUpdate(object):
+    """The wall-clock time to update a fleet of emulated devices with 5 +/- 5 ms of latency per command."""
+
+    params = [10, 100]
+    param_names = ["count"]
+    timeout = 120
+
+    def setup(self, count):
+        self.emulator = AdbEmulatorThread(count, "android12", latency_s=0.005, jitter_s=0.005)
+        self.emulator.__enter__()
+
+        self.loop = asyncio.new_event_loop()
+        self.fleet = FleetAsync(max_concurrency=count, jitter_s=0)
+        for port in self.emulator.ports:
+            self.loop.run_until_complete(self.fleet.setup("127.0.0.1", port))
+
+    def teardown(self, count):
+        self.loop.run_until_complete(self.fleet.close())
+        self.loop.close()
+        self.emulator.__exit__(None, None, None)
+
+    def time_update_all(self, count):
+        self.loop.run_until_complete(self.fleet.update_all())
+
+    def time_update_all_fused(self, count):
+        self.loop.run_until_complete(self.fleet.update_all(fused=True))
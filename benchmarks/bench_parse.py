@@ -0,0 +1,81 @@
+"""Benchmark the parsing and state detection that is done for each update."""
+
+import time
+
+from androidtv import constants
+from androidtv.androidtv.androidtv_sync import AndroidTVSync
+
+from .recordings import RECORDINGS
+from .replay import Replay, patch_replay
+
+
+#: State detection rules like the ones that are configured in Home Assistant
+STATE_DETECTION_RULES = {
+    "com.amazon.tv.launcher": ["idle"],
+    "com.netflix.ninja": ["media_session_state"],
+    "com.plexapp.android": [
+        {"playing": {"media_session_state": 3, "wake_lock_size": 3}},
+        {"paused": {"media_session_state": 3, "wake_lock_size": 1}},
+        "paused",
+    ],
+    "com.google.android.youtube.tv": [
+        {"playing": {"wake_lock_size": 4}},
+        {"paused": {"wake_lock_size": 2}},
+        {"idle": {"audio_state": "idle"}},
+        "media_session_state",
+        "audio_state",
+    ],
+}
+
+
+class TimeParse(object):
+    """The time to retrieve and parse individual properties."""
+
+    params = sorted(name for name, recording in RECORDINGS.items() if recording["device_class"] == "androidtv")
+    param_names = ["device"]
+
+    def setup(self, device):
+        self.replay = Replay(device)
+
+        with patch_replay(self.replay):
+            self.atv = AndroidTVSync("127.0.0.1", state_detection_rules=STATE_DETECTION_RULES)
+
+        self.atv.adb_connect()
+        self.atv.get_device_properties()
+
+        self.fused_response = self.replay.shell(self.atv._cmd_fused_properties())
+
+    def time_stream_music_properties(self, device):
+        self.atv.max_volume = None
+        self.atv.stream_music_properties()
+
+    def time_parse_fused_properties(self, device):
+        self.atv._parse_fused_properties(self.fused_response)
+
+    def time_learn_sendevent(self, device):
+        self.atv.learn_sendevent()
+
+
+class TimeStateDetection(object):
+    """The time to determine the state from the state detection rules."""
+
+    params = [
+        ("com.netflix.ninja", 3, 2, constants.STATE_PLAYING),
+        ("com.plexapp.android", 3, 1, constants.STATE_PAUSED),
+        ("com.google.android.youtube.tv", None, 1, constants.STATE_IDLE),
+        ("com.spotify.tv.android", 3, 2, constants.STATE_PLAYING),
+    ]
+    param_names = ["app_properties"]
+
+    def setup(self, app_properties):
+        self.atv = AndroidTVSync("127.0.0.1", state_detection_rules=STATE_DETECTION_RULES)
+
+    def time_custom_state_detection(self, app_properties):
+        current_app, media_session_state, wake_lock_size, audio_state = app_properties
+        self.atv._custom_state_detection(current_app, media_session_state, wake_lock_size, audio_state)
+
+
+class CpuParse(TimeParse):
+    """The CPU time to retrieve and parse individual properties."""
+
+    timer = time.process_time
@@ -0,0 +1,31 @@
+"""Benchmark connecting to a recorded device and determining its type via ``setup``."""
+
+import asyncio
+
+from androidtv import setup
+from androidtv.setup_async import setup as setup_async
+
+from .recordings import RECORDINGS
+from .replay import Replay, patch_replay
+
+
+class TimeSetup(object):
+    """The time to connect to a device, get its properties, and determine whether it is an Android TV or Fire TV."""
+
+    params = sorted(RECORDINGS)
+    param_names = ["device"]
+
+    def setup(self, device):
+        self.replay = Replay(device)
+        self.loop = asyncio.new_event_loop()
+
+    def teardown(self, device):
+        self.loop.close()
+
+    def time_setup_sync(self, device):
+        with patch_replay(self.replay):
+            setup("127.0.0.1")
+
+    def time_setup_async(self, device):
+        with patch_replay(self.replay):
+            self.loop.run_until_complete(setup_async("127.0.0.1"))
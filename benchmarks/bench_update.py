@@ -0,0 +1,58 @@
+"""Benchmark the ``update`` hot path against recorded devices."""
+
+import asyncio
+import time
+
+from androidtv.androidtv.androidtv_async import AndroidTVAsync
+from androidtv.androidtv.androidtv_sync import AndroidTVSync
+from androidtv.firetv.firetv_async import FireTVAsync
+from androidtv.firetv.firetv_sync import FireTVSync
+
+from .recordings import RECORDINGS
+from .replay import Replay, patch_replay
+
+
+DEVICE_CLASSES = {"androidtv": (AndroidTVSync, AndroidTVAsync), "firetv": (FireTVSync, FireTVAsync)}
+
+
+class TimeUpdate(object):
+    """The wall-clock time of a single ``update()``, excluding network latency."""
+
+    params = sorted(RECORDINGS)
+    param_names = ["device"]
+
+    def setup(self, device):
+        replay = Replay(device)
+        sync_class, async_class = DEVICE_CLASSES[replay.recording["device_class"]]
+
+        with patch_replay(replay):
+            self.tv_sync = sync_class("127.0.0.1")
+            self.tv_async = async_class("127.0.0.1")
+
+        self.tv_sync.adb_connect()
+        self.tv_sync.get_device_properties()
+
+        self.loop = asyncio.new_event_loop()
+        self.loop.run_until_complete(self.tv_async.adb_connect())
+        self.loop.run_until_complete(self.tv_async.get_device_properties())
+
+    def teardown(self, device):
+        self.loop.close()
+
+    def time_update_sync(self, device):
+        self.tv_sync.update()
+
+    def time_update_sync_fused(self, device):
+        self.tv_sync.update(fused=True)
+
+    def time_update_async(self, device):
+        self.loop.run_until_complete(self.tv_async.update())
+
+    def time_update_async_fused(self, device):
+        self.loop.run_until_complete(self.tv_async.update(fused=True))
+
+
+class CpuUpdate(TimeUpdate):
+    """The CPU time of a single ``update()``."""
+
+    timer = time.process_time
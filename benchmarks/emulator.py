@@ -0,0 +1,602 @@
+"""A local server that speaks the ADB wire protocol and emulates many Android TV / Fire TV devices.
+
+Unlike the fakes in :mod:`benchmarks.replay`, the emulator is reached over TCP, so the real ``adb_shell`` transports,
+framing, and locking are exercised.  Each :class:`VirtualDevice` listens on its own port and supports:
+
+* the connection handshake (``CNXN``), optionally with authentication (``AUTH``)
+* ``shell:`` and ``exec:`` streams, including the long-lived ``shell:sh`` stream used by
+  :class:`~androidtv.adb_manager.adb_manager_async.PersistentShellAsync`
+* the ``sync:`` service (``STAT``, ``LIST``, ``RECV``, and ``SEND``), i.e., ``pull`` and ``push``
+* ``screencap -p``
+
+Shell commands are answered by a :class:`~benchmarks.replay.Replay` of a recording, after a configurable latency and
+jitter.
+
+.. code-block:: python
+
+   async with AdbEmulator() as emulator:
+       ports = await emulator.start(200, "android12", latency_s=0.02, jitter_s=0.01)
+       atv = await setup("127.0.0.1", ports[0])
+
+or, from the command line:
+
+.. code-block:: bash
+
+   python -m benchmarks.emulator --count 200 --base-port 6000 --recording android12 --latency 0.02 --jitter 0.01
+
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import re
+import struct
+import threading
+import time
+import zlib
+
+from adb_shell import constants as adb_constants
+from adb_shell.adb_message import AdbMessage, unpack
+
+from .replay import Replay
+
+#: The ADB commands, keyed by their values on the wire
+WIRE_TO_ID = adb_constants.WIRE_TO_ID
+
+#: The FileSync IDs, keyed by their values on the wire
+FILESYNC_WIRE_TO_ID = adb_constants.FILESYNC_WIRE_TO_ID
+
+#: The FileSync IDs, converted to their values on the wire
+FILESYNC_ID_TO_WIRE = adb_constants.FILESYNC_ID_TO_WIRE
+
+#: The FileSync requests that are followed by a path or data of length ``size``
+FILESYNC_REQUESTS_WITH_DATA = (
+    adb_constants.DATA,
+    adb_constants.LIST,
+    adb_constants.RECV,
+    adb_constants.SEND,
+    adb_constants.STAT,
+)
+
+#: Matches a command that was framed by :meth:`androidtv.adb_manager.adb_manager_async.PersistentShellAsync._frame`
+REGEX_PERSISTENT_SHELL = re.compile(r"^(?P<script>.*) ; printf '(?P<format>[^']*)' '(?P<arg>[^']*)'$")
+
+REGEX_PERSISTENT_SHELL_CMD = re.compile(r"^\( eval '(?P<cmd>.*)' \) </dev/null$")
+
+
+def make_png(width=16, height=9, rgb=(0, 0, 0)):
+    """Make a PNG image of a single color.
+
+    Parameters
+    ----------
+    width : int
+        The width of the image
+    height : int
+        The height of the image
+    rgb : tuple
+        The color of the image
+
+    Returns
+    -------
+    bytes
+        The PNG image
+
+    """
+
+    def chunk(chunk_type, data):
+        return struct.pack(">I", len(data)) + chunk_type + data + struct.pack(">I", zlib.crc32(chunk_type + data))
+
+    rows = b"".join(b"\x00" + bytes(rgb) * width for _ in range(height))
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+        + chunk(b"IDAT", zlib.compress(rows))
+        + chunk(b"IEND", b"")
+    )
+
+
+class VirtualDevice(object):
+    """The state and behavior of one emulated device.
+
+    Parameters
+    ----------
+    recording : dict, str
+        A recording from :const:`benchmarks.recordings.RECORDINGS`, or its name
+    latency_s : float
+        The time (in seconds) that the device takes to respond to the handshake and to each shell command
+    jitter_s : float
+        The maximum random time (in seconds) that is added to ``latency_s``
+    auth : bool
+        Whether the device requires authentication; any signature or public key is accepted
+    files : dict, None
+        The files on the device, i.e., a dictionary whose keys are paths and whose values are ``bytes``
+    screencap : bytes, None
+        The response to ``screencap -p``; the default is a small black PNG image
+    maxdata : int
+        The maximum amount of data in an ADB packet that the device will accept
+
+    """
+
+    def __init__(
+        self,
+        recording="android9",
+        latency_s=0.0,
+        jitter_s=0.0,
+        auth=False,
+        files=None,
+        screencap=None,
+        maxdata=adb_constants.MAX_ADB_DATA,
+    ):
+        self.replay = Replay(recording)
+        self.latency_s = latency_s
+        self.jitter_s = jitter_s
+        self.auth = auth
+        self.files = {} if files is None else files
+        self.screencap = make_png() if screencap is None else screencap
+        self.maxdata = maxdata
+
+        #: The number of ADB connections that have been accepted
+        self.connections = 0
+
+        #: The number of streams that have been opened
+        self.streams = 0
+
+    async def delay(self):
+        """Wait for ``latency_s`` plus up to ``jitter_s`` seconds."""
+        delay_s = self.latency_s + (random.uniform(0, self.jitter_s) if self.jitter_s else 0.0)
+        if delay_s:
+            await asyncio.sleep(delay_s)
+
+    async def shell(self, cmd):
+        """Run a shell command.
+
+        Parameters
+        ----------
+        cmd : str
+            The shell command
+
+        Returns
+        -------
+        bytes
+            The output of the command
+
+        """
+        await self.delay()
+
+        if cmd.strip() == "screencap -p":
+            return self.screencap
+
+        return self.replay.shell(cmd).encode("utf-8")
+
+
+class _Stream(object):
+    """A stream that was opened by the client via an ``OPEN`` message."""
+
+    def __init__(self, local_id, remote_id):
+        #: The ID of the stream on the emulator side
+        self.local_id = local_id
+
+        #: The ID of the stream on the client side
+        self.remote_id = remote_id
+
+        #: The ``(command, data)`` packets that were received from the client
+        self.packets = asyncio.Queue()
+
+        #: Data that was received from the client but has not been consumed yet
+        self.buffer = bytearray()
+
+        self.closed = False
+        self.task = None
+
+
+class _Connection(object):
+    """One ADB connection to a :class:`VirtualDevice`."""
+
+    def __init__(self, device, reader, writer):
+        self.device = device
+        self.reader = reader
+        self.writer = writer
+
+        #: The maximum amount of data in a packet that is sent to the client
+        self.maxdata = adb_constants.MAX_LEGACY_ADB_DATA
+
+        self._streams = {}
+        self._last_id = 0
+        self._write_lock = asyncio.Lock()
+        self._token = None
+
+    async def send(self, command, arg0, arg1, data=b""):
+        """Send a message to the client."""
+        msg = AdbMessage(command, arg0, arg1, data)
+        async with self._write_lock:
+            self.writer.write(msg.pack() + data)
+            await self.writer.drain()
+
+    async def run(self):
+        """Read and handle messages from the client until the connection is closed."""
+        try:
+            while True:
+                header = await self.reader.readexactly(adb_constants.MESSAGE_SIZE)
+                cmd, arg0, arg1, data_length, _ = unpack(header)
+                data = await self.reader.readexactly(data_length) if data_length else b""
+                await self.handle(WIRE_TO_ID.get(cmd), arg0, arg1, data)
+
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+
+        finally:
+            for stream in self._streams.values():
+                if stream.task:
+                    stream.task.cancel()
+            self.writer.close()
+
+    async def handle(self, command, arg0, arg1, data):
+        """Handle a message from the client."""
+        if command == adb_constants.CNXN:
+            self.maxdata = min(arg1, self.device.maxdata)
+            await self.device.delay()
+            if self.device.auth:
+                self._token = os.urandom(20)
+                await self.send(adb_constants.AUTH, adb_constants.AUTH_TOKEN, 0, self._token)
+            else:
+                await self.connected()
+
+        elif command == adb_constants.AUTH:
+            # Any signature or public key is accepted
+            await self.connected()
+
+        elif command == adb_constants.OPEN:
+            self._last_id += 1
+            stream = _Stream(self._last_id, arg0)
+            self._streams[stream.local_id] = stream
+            self.device.streams += 1
+
+            await self.send(adb_constants.OKAY, stream.local_id, stream.remote_id)
+            stream.task = asyncio.ensure_future(self.serve(stream, data.rstrip(b"\0").decode("utf-8")))
+
+        elif command in (adb_constants.WRTE, adb_constants.OKAY):
+            stream = self._streams.get(arg1)
+            if stream and not stream.closed:
+                if command == adb_constants.WRTE:
+                    await self.send(adb_constants.OKAY, stream.local_id, stream.remote_id)
+                stream.packets.put_nowait((command, data))
+
+        elif command == adb_constants.CLSE:
+            stream = self._streams.pop(arg1, None)
+            if stream and not stream.closed:
+                stream.closed = True
+                stream.task.cancel()
+                await self.send(adb_constants.CLSE, stream.local_id, stream.remote_id)
+
+    async def connected(self):
+        """Complete the handshake."""
+        self.device.connections += 1
+        banner = b"device::ro.product.name=androidtv;ro.product.model=emulator;ro.product.device=emulator;\0"
+        await self.send(adb_constants.CNXN, adb_constants.VERSION, self.device.maxdata, banner)
+
+    # ======================================================================= #
+    #                                                                         #
+    #                                 Streams                                 #
+    #                                                                         #
+    # ======================================================================= #
+    @staticmethod
+    async def _receive(stream):
+        """Wait for the next packet on a stream and add any data that it contains to ``stream.buffer``."""
+        command, data = await stream.packets.get()
+        stream.buffer += data
+        return command
+
+    async def write(self, stream, data):
+        """Send data on a stream, waiting for the client to acknowledge each packet."""
+        for i in range(0, len(data), self.maxdata):
+            await self.send(adb_constants.WRTE, stream.local_id, stream.remote_id, data[i : i + self.maxdata])
+            while await self._receive(stream) != adb_constants.OKAY:
+                pass
+
+    async def read(self, stream, length):
+        """Read ``length`` bytes that were written to a stream by the client."""
+        while len(stream.buffer) < length:
+            await self._receive(stream)
+
+        data = bytes(stream.buffer[:length])
+        del stream.buffer[:length]
+        return data
+
+    async def readline(self, stream):
+        """Read a line that was written to a stream by the client."""
+        while b"\n" not in stream.buffer:
+            await self._receive(stream)
+
+        line, _, rest = bytes(stream.buffer).partition(b"\n")
+        stream.buffer[:] = rest
+        return line.decode("utf-8")
+
+    async def close(self, stream):
+        """Close a stream from the emulator side."""
+        if not stream.closed:
+            stream.closed = True
+            self._streams.pop(stream.local_id, None)
+            await self.send(adb_constants.CLSE, stream.local_id, stream.remote_id)
+
+    async def serve(self, stream, destination):
+        """Provide the service that was requested in an ``OPEN`` message."""
+        service, _, cmd = destination.partition(":")
+
+        try:
+            if service == "sync":
+                await self.serve_sync(stream)
+
+            elif service == "shell" and cmd in ("", "sh"):
+                await self.serve_persistent_shell(stream)
+
+            elif service in ("shell", "exec"):
+                await self.write(stream, await self.device.shell(cmd))
+
+            await self.close(stream)
+
+        except (asyncio.CancelledError, ConnectionError):
+            pass
+
+    async def serve_persistent_shell(self, stream):
+        """Run the commands that are written to a ``sh`` stream, one per line."""
+        while True:
+            line = await self.readline(stream)
+            if line.strip() == "exit":
+                return
+
+            match = REGEX_PERSISTENT_SHELL.match(line)
+            if match:
+                # The setup script (see `PersistentShellAsync.SETUP`) has no output
+                cmd_match = REGEX_PERSISTENT_SHELL_CMD.match(match.group("script"))
+                output = await self.device.shell(cmd_match.group("cmd").replace("'\\''", "'")) if cmd_match else b""
+                sentinel = match.group("format").replace("\\n", "\n") % match.group("arg")
+                await self.write(stream, output + sentinel.encode("utf-8"))
+            else:
+                await self.write(stream, await self.device.shell(line))
+
+    async def serve_sync(self, stream):
+        """Provide the FileSync service for ``stat``, ``list``, ``pull``, and ``push``."""
+        while True:
+            request, size = struct.unpack("<2I", await self.read(stream, 8))
+            request = FILESYNC_WIRE_TO_ID.get(request)
+            if request == adb_constants.QUIT:
+                return
+
+            path = (await self.read(stream, size)).decode("utf-8") if request in FILESYNC_REQUESTS_WITH_DATA else ""
+            await self.device.delay()
+
+            if request == adb_constants.STAT:
+                data = self.device.files.get(path)
+                mode, size, mtime = (0o100644, len(data), int(time.time())) if data is not None else (0, 0, 0)
+                await self.write(stream, struct.pack("<4I", FILESYNC_ID_TO_WIRE[request], mode, size, mtime))
+
+            elif request == adb_constants.LIST:
+                prefix = path.rstrip("/") + "/"
+                response = b""
+                for file_path, data in sorted(self.device.files.items()):
+                    if file_path.startswith(prefix) and "/" not in file_path[len(prefix) :]:
+                        name = file_path[len(prefix) :].encode("utf-8")
+                        dent = (
+                            FILESYNC_ID_TO_WIRE[adb_constants.DENT],
+                            0o100644,
+                            len(data),
+                            int(time.time()),
+                            len(name),
+                        )
+                        response += struct.pack("<5I", *dent) + name
+                done = (FILESYNC_ID_TO_WIRE[adb_constants.DONE], 0, 0, 0, 0)
+                await self.write(stream, response + struct.pack("<5I", *done))
+
+            elif request == adb_constants.RECV:
+                await self.write(stream, self._recv(path))
+
+            elif request == adb_constants.SEND:
+                await self.write(stream, await self._send(stream, path.rsplit(",", 1)[0]))
+
+    def _recv(self, path):
+        """Get the FileSync response to a ``RECV`` request (i.e., ``pull``)."""
+        data = self.device.files.get(path)
+        if data is None:
+            reason = "No such file or directory".encode("utf-8")
+            return struct.pack("<2I", FILESYNC_ID_TO_WIRE[adb_constants.FAIL], len(reason)) + reason
+
+        response = b""
+        for i in range(0, len(data), adb_constants.MAX_CHUNK_SIZE):
+            chunk = data[i : i + adb_constants.MAX_CHUNK_SIZE]
+            response += struct.pack("<2I", FILESYNC_ID_TO_WIRE[adb_constants.DATA], len(chunk)) + chunk
+
+        return response + struct.pack("<2I", FILESYNC_ID_TO_WIRE[adb_constants.DONE], 0)
+
+    async def _send(self, stream, path):
+        """Receive a file that is sent via a ``SEND`` request (i.e., ``push``) and get the FileSync response."""
+        data = b""
+        while True:
+            request, size = struct.unpack("<2I", await self.read(stream, 8))
+            if FILESYNC_WIRE_TO_ID.get(request) != adb_constants.DATA:
+                break
+            data += await self.read(stream, size)
+
+        self.device.files[path] = data
+        return struct.pack("<2I", FILESYNC_ID_TO_WIRE[adb_constants.OKAY], 0)
+
+
+class AdbEmulator(object):
+    """Serve many :class:`VirtualDevice` objects, each on its own port.
+
+    Parameters
+    ----------
+    host : str
+        The address on which the devices listen
+
+    """
+
+    def __init__(self, host="127.0.0.1"):
+        self.host = host
+
+        #: The devices, keyed by port
+        self.devices = {}
+
+        self._servers = []
+        self._connections = set()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def add(self, device, port=0):
+        """Start serving a device.
+
+        Parameters
+        ----------
+        device : VirtualDevice
+            The device
+        port : int
+            The port on which the device will listen; if this is 0, a free port is chosen
+
+        Returns
+        -------
+        int
+            The port on which the device is listening
+
+        """
+
+        async def handle(reader, writer):
+            task = asyncio.current_task()
+            self._connections.add(task)
+            try:
+                await _Connection(device, reader, writer).run()
+            except asyncio.CancelledError:
+                pass
+            finally:
+                self._connections.discard(task)
+
+        server = await asyncio.start_server(handle, self.host, port)
+        self._servers.append(server)
+
+        port = server.sockets[0].getsockname()[1]
+        self.devices[port] = device
+        return port
+
+    async def start(self, count, recording="android9", base_port=0, **kwargs):
+        """Start serving ``count`` devices.
+
+        Parameters
+        ----------
+        count : int
+            The number of devices
+        recording : dict, str
+            A recording from :const:`benchmarks.recordings.RECORDINGS`, or its name
+        base_port : int
+            The port of the first device; the others use the ports that follow it.  If this is 0, free ports are chosen.
+        **kwargs
+            Keyword arguments that will be passed to the :class:`VirtualDevice` constructor
+
+        Returns
+        -------
+        list[int]
+            The ports on which the devices are listening
+
+        """
+        return [
+            await self.add(VirtualDevice(recording, **kwargs), base_port + i if base_port else 0) for i in range(count)
+        ]
+
+    async def close(self):
+        """Stop serving all of the devices and close their connections."""
+        for server in self._servers:
+            server.close()
+
+        connections = list(self._connections)
+        for task in connections:
+            task.cancel()
+        await asyncio.gather(*connections, return_exceptions=True)
+
+        for server in self._servers:
+            await server.wait_closed()
+
+        self._servers = []
+        self.devices = {}
+
+
+class AdbEmulatorThread(object):
+    """Run an :class:`AdbEmulator` in a background thread, e.g., for clients that use the sync API.
+
+    .. code-block:: python
+
+       with AdbEmulatorThread(10, "fireos7") as emulator:
+           ftv = setup("127.0.0.1", emulator.ports[0])
+
+    Parameters
+    ----------
+    count : int
+        The number of devices
+    recording : dict, str
+        A recording from :const:`benchmarks.recordings.RECORDINGS`, or its name
+    host : str
+        The address on which the devices listen
+    **kwargs
+        Keyword arguments that will be passed to the :class:`VirtualDevice` constructor
+
+    """
+
+    def __init__(self, count=1, recording="android9", host="127.0.0.1", **kwargs):
+        self.emulator = AdbEmulator(host)
+        self.ports = []
+
+        self._count = count
+        self._recording = recording
+        self._kwargs = kwargs
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        self.ports = asyncio.run_coroutine_threadsafe(
+            self.emulator.start(self._count, self._recording, **self._kwargs), self._loop
+        ).result()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        asyncio.run_coroutine_threadsafe(self.emulator.close(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+
+async def _serve(args):
+    """Serve devices until interrupted."""
+    async with AdbEmulator(args.host) as emulator:
+        ports = await emulator.start(
+            args.count, args.recording, args.base_port, latency_s=args.latency, jitter_s=args.jitter, auth=args.auth
+        )
+        print(
+            "Serving {} '{}' devices on {}, ports {}-{}".format(
+                args.count, args.recording, args.host, ports[0], ports[-1]
+            )
+        )
+        await asyncio.Event().wait()
+
+
+def main(argv=None):
+    """Run the emulator from the command line."""
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.emulator", description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1", help="the address on which to listen (default: 127.0.0.1)")
+    parser.add_argument("--count", type=int, default=1, help="the number of devices (default: 1)")
+    parser.add_argument("--base-port", type=int, default=5555, help="the port of the first device (default: 5555)")
+    parser.add_argument("--recording", default="android9", help="the recording to replay (default: android9)")
+    parser.add_argument("--latency", type=float, default=0.0, help="the latency in seconds (default: 0)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="the maximum jitter in seconds (default: 0)")
+    parser.add_argument("--auth", action="store_true", help="require authentication")
+    args = parser.parse_args(argv)
+
+    try:
+        asyncio.run(_serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+"""Recorded ADB shell outputs that are replayed by :mod:`benchmarks.replay`.
+
+Each recording is a dictionary whose keys are the names of the sections in the fused update command (see
+:meth:`androidtv.basetv.basetv.BaseTV._cmd_fused`) plus the outputs of the commands that are sent during setup.  The
+outputs are in the formats reported by these devices, with placeholder serial numbers and MAC addresses.
+
+"""
+
+
+# Shared outputs
+ETHMAC = "    link/ether ab:cd:ef:gh:ij:kl brd ff:ff:ff:ff:ff:ff"
+WIFIMAC = "    link/ether 11:22:33:44:55:66 brd ff:ff:ff:ff:ff:ff"
+
+GETEVENT = """add device 1: /dev/input/event4
+  name:     "gpio_keys"
+add device 2: /dev/input/event3
+  name:     "Amazon Fire TV Remote"
+/dev/input/event4: 0001 0072 00000001
+/dev/input/event4: 0000 0000 00000000
+/dev/input/event4: 0001 0072 00000000
+/dev/input/event4: 0000 0000 00000000
+/dev/input/event3: 0004 0004 000c0041
+/dev/input/event3: 0001 0160 00000001
+/dev/input/event3: 0000 0000 00000000
+/dev/input/event3: 0004 0004 000c0041
+/dev/input/event3: 0001 0160 00000000
+/dev/input/event3: 0000 0000 00000000
+your command was interrupted"""
+
+INSTALLED_APPS_ANDROIDTV = """package:com.android.providers.tv
+package:com.google.android.youtube.tv
+package:com.netflix.ninja
+package:com.plexapp.android
+package:com.amazon.amazonvideo.livingroom
+package:com.disney.disneyplus
+package:com.google.android.tvlauncher
+package:com.google.android.apps.tv.launcherx
+package:com.android.tv.settings
+package:com.spotify.tv.android
+package:com.google.android.katniss
+package:com.google.android.tv.remote.service"""
+
+INSTALLED_APPS_FIRETV = """package:com.amazon.tv.launcher
+package:com.amazon.avod
+package:com.amazon.firetv.youtube
+package:com.netflix.ninja
+package:com.plexapp.android
+package:com.amazon.tv.settings.v2
+package:com.amazon.device.controllermanager
+package:com.amazon.vizzini
+package:com.spotify.tv.android
+package:com.disney.disneyplus"""
+
+RUNNING_APPS_ANDROIDTV = """u0_a11        1843   271 1287344 110540 SyS_epoll_wait      0 S com.google.android.tvlauncher
+u0_a18        2065   271 1247960  80212 SyS_epoll_wait      0 S com.google.android.katniss:interactor
+u0_a7         2113   271 1201252  62596 SyS_epoll_wait      0 S com.android.providers.tv
+u0_a55        5210   271 1603644 212816 SyS_epoll_wait      0 S com.netflix.ninja
+u0_a36        6521   271 1335244 131804 SyS_epoll_wait      0 S com.google.android.youtube.tv
+u0_a23        7722   271 1192892  59244 SyS_epoll_wait      0 S com.google.android.tv.remote.service"""
+
+RUNNING_APPS_FIRETV = """u0_a2     15121 197   998628 24628 ffffffff 00000000 S com.amazon.device.controllermanager
+u0_a18    316   197   1189204 115000 ffffffff 00000000 S com.netflix.ninja
+u0_a40    1337  197   1038564 63800 ffffffff 00000000 S com.amazon.tv.launcher
+u0_a24    2002  197   1002784 43100 ffffffff 00000000 S com.amazon.vizzini"""
+
+STREAM_MUSIC_LEGACY = """- STREAM_MUSIC:
+   Muted: false
+   Min: 0
+   Max: 15
+   Current: 2 (speaker): 11, 4 (headset): 10, 8 (headphone): 10, 400 (hdmi): 6, 40000000 (default): 11
+   Devices: hdmi
+- STREAM_ALARM:
+   Muted: false
+   Min: 0
+   Max: 7
+   Current: 2 (speaker): 6, 4 (headset): 5, 8 (headphone): 5, 400 (hdmi): 4, 40000000 (default): 6
+   Devices: speaker"""
+
+STREAM_MUSIC_ANDROID12 = """- STREAM_MUSIC:
+      Muted: false
+      Muted Internally: false
+      Min: 0
+      Max: 25
+      streamVolume:9
+      Current: 2 (speaker): 9, 400 (hdmi): 9, 40000 (hmdi_arc): 12, 40000000 (default): 9
+      Devices: hmdi_arc
+      Volume Group: AUDIO_STREAM_MUSIC
+- STREAM_ALARM:
+      Muted: false
+      Muted Internally: false"""
+
+MEDIA_SESSION_STATE = "state=PlaybackState {state=3, position=1063, buffered position=0, speed=1.0, updated=1625541, actions=847, custom actions=[], active item id=-1, error=null}"
+
+
+#: The recorded outputs, keyed by the name of the device
+RECORDINGS = {
+    "android9": {
+        "device_class": "androidtv",
+        "device_properties": "NVIDIA\nSHIELD Android TV\n0123456789ab\n9\nfoster_e\n",
+        "ethmac": ETHMAC,
+        "wifimac": WIFIMAC,
+        "installed_apps": INSTALLED_APPS_ANDROIDTV,
+        "screen_on_awake_wake_lock_size": "11Wake Locks: size=2",
+        "audio_state": "2",
+        "current_app_media_session_state": "com.netflix.ninja\n" + MEDIA_SESSION_STATE,
+        "stream_music": STREAM_MUSIC_LEGACY,
+        "running_apps": RUNNING_APPS_ANDROIDTV,
+        "hdmi_input": "",
+        "getevent": GETEVENT,
+    },
+    "android10": {
+        "device_class": "androidtv",
+        "device_properties": "Xiaomi\nMIBOX4\n0123456789ab\n10\nmitv_box4\n",
+        "ethmac": ETHMAC,
+        "wifimac": WIFIMAC,
+        "installed_apps": INSTALLED_APPS_ANDROIDTV,
+        "screen_on_awake_wake_lock_size": "11Wake Locks: size=1",
+        "audio_state": "2",
+        "current_app_media_session_state": "com.google.android.youtube.tv\n" + MEDIA_SESSION_STATE,
+        "stream_music": STREAM_MUSIC_LEGACY,
+        "running_apps": RUNNING_APPS_ANDROIDTV,
+        "hdmi_input": "",
+        "getevent": GETEVENT,
+    },
+    "android11": {
+        "device_class": "androidtv",
+        "device_properties": "NVIDIA\nSHIELD Android TV\n0123456789ab\n11\nmdarcy\n",
+        "ethmac": ETHMAC,
+        "wifimac": WIFIMAC,
+        "installed_apps": INSTALLED_APPS_ANDROIDTV,
+        "screen_on_awake_wake_lock_size": "11Wake Locks: size=3",
+        "audio_state": "1",
+        "current_app_media_session_state": "com.plexapp.android\n" + MEDIA_SESSION_STATE.replace("state=3", "state=2"),
+        "stream_music": STREAM_MUSIC_LEGACY,
+        "running_apps": RUNNING_APPS_ANDROIDTV,
+        "hdmi_input": "",
+        "getevent": GETEVENT,
+    },
+    "android12": {
+        "device_class": "androidtv",
+        "device_properties": "Google\nChromecast\n0123456789ab\n12\nsabrina\n",
+        "ethmac": ETHMAC,
+        "wifimac": WIFIMAC,
+        "installed_apps": INSTALLED_APPS_ANDROIDTV,
+        "screen_on_awake_wake_lock_size": "11Wake Locks: size=2",
+        "audio_state": "2",
+        "current_app_media_session_state": "com.disney.disneyplus\n" + MEDIA_SESSION_STATE,
+        "stream_music": STREAM_MUSIC_ANDROID12,
+        "running_apps": RUNNING_APPS_ANDROIDTV,
+        "hdmi_input": "",
+        "getevent": GETEVENT,
+    },
+    "android13": {
+        "device_class": "androidtv",
+        "device_properties": "Sony\nBRAVIA 4K VH2\n0123456789ab\n13\nBRAVIA_VH2_EU\n",
+        "ethmac": ETHMAC,
+        "wifimac": WIFIMAC,
+        "installed_apps": INSTALLED_APPS_ANDROIDTV,
+        "screen_on_awake_wake_lock_size": "11Wake Locks: size=2",
+        "audio_state": "0",
+        "current_app_media_session_state": "com.google.android.tvlauncher",
+        "stream_music": STREAM_MUSIC_ANDROID12,
+        "running_apps": RUNNING_APPS_ANDROIDTV,
+        "hdmi_input": "HW2",
+        "getevent": GETEVENT,
+    },
+    "android14": {
+        "device_class": "androidtv",
+        "device_properties": "Google\nGoogle TV Streamer\n0123456789ab\n14\nkirkwood\n",
+        "ethmac": ETHMAC,
+        "wifimac": WIFIMAC,
+        "installed_apps": INSTALLED_APPS_ANDROIDTV,
+        "screen_on_awake_wake_lock_size": "11Wake Locks: size=2",
+        "audio_state": "2",
+        "current_app_media_session_state": "com.spotify.tv.android\n" + MEDIA_SESSION_STATE,
+        "stream_music": STREAM_MUSIC_ANDROID12,
+        "running_apps": RUNNING_APPS_ANDROIDTV,
+        "hdmi_input": "",
+        "getevent": GETEVENT,
+    },
+    "fireos5": {
+        "device_class": "firetv",
+        "device_properties": "Amazon\nAFTT\n0123456789ab\n5.1.1\nsloane\n",
+        "ethmac": ETHMAC,
+        "wifimac": WIFIMAC,
+        "installed_apps": INSTALLED_APPS_FIRETV,
+        "screen_on_awake_wake_lock_size": "11Wake Locks: size=3",
+        "current_app_media_session_state": "com.netflix.ninja\n" + MEDIA_SESSION_STATE,
+        "stream_music": STREAM_MUSIC_LEGACY,
+        "running_apps": RUNNING_APPS_FIRETV,
+        "hdmi_input": "",
+        "getevent": GETEVENT,
+    },
+    "fireos7": {
+        "device_class": "firetv",
+        "device_properties": "Amazon\nAFTKA\n0123456789ab\n9\nkara\n",
+        "ethmac": ETHMAC,
+        "wifimac": WIFIMAC,
+        "installed_apps": INSTALLED_APPS_FIRETV,
+        "screen_on_awake_wake_lock_size": "11Wake Locks: size=2",
+        "current_app_media_session_state": "com.amazon.avod\n" + MEDIA_SESSION_STATE,
+        "stream_music": STREAM_MUSIC_LEGACY,
+        "running_apps": RUNNING_APPS_FIRETV,
+        "hdmi_input": "",
+        "getevent": GETEVENT,
+    },
+}
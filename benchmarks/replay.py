@@ -0,0 +1,198 @@
+"""Fake ADB devices that replay the recorded outputs in :mod:`benchmarks.recordings`.
+
+These replace :class:`adb_shell.adb_device.AdbDeviceTcp` and :class:`adb_shell.adb_device_async.AdbDeviceTcpAsync` so
+that everything above the transport (locking, fused commands, parsing, state detection) is exercised without a device.
+
+"""
+
+import asyncio
+from contextlib import contextmanager
+import re
+import time
+from unittest.mock import patch
+
+from androidtv import constants
+
+from .recordings import RECORDINGS
+
+
+#: Matches the name of each section in a fused command
+REGEX_FUSED_SECTION = re.compile(r"echo '" + re.escape(constants.FUSED_DELIMITER) + r"(?P<name>\w+)'")
+
+#: The commands that are sent individually when ``fused=False``, keyed by the name of their section in a fused command
+SECTION_COMMANDS = {
+    "screen_on_awake_wake_lock_size": [constants.CMD_SCREEN_ON_AWAKE_WAKE_LOCK_SIZE],
+    "audio_state": [constants.CMD_AUDIO_STATE, constants.CMD_AUDIO_STATE11],
+    "current_app_media_session_state": [
+        constants.CMD_CURRENT_APP_MEDIA_SESSION_STATE,
+        constants.CMD_CURRENT_APP_MEDIA_SESSION_STATE11,
+        constants.CMD_CURRENT_APP_MEDIA_SESSION_STATE12,
+        constants.CMD_CURRENT_APP_MEDIA_SESSION_STATE13,
+        constants.CMD_CURRENT_APP_MEDIA_SESSION_STATE_ASKEY_STI6130,
+        constants.CMD_CURRENT_APP_MEDIA_SESSION_STATE_GOOGLE_TV,
+    ],
+    "stream_music": [constants.CMD_STREAM_MUSIC],
+    "running_apps": [constants.CMD_RUNNING_APPS],
+    "hdmi_input": [constants.CMD_HDMI_INPUT, constants.CMD_HDMI_INPUT11],
+}
+
+
+class Replay(object):
+    """Respond to ADB shell commands with the outputs from a recording.
+
+    Parameters
+    ----------
+    recording : dict, str
+        A recording from :const:`benchmarks.recordings.RECORDINGS`, or its name
+    latency_s : float
+        The simulated round trip time (in seconds) of each shell command
+
+    """
+
+    def __init__(self, recording, latency_s=0.0):
+        self.recording = RECORDINGS[recording] if isinstance(recording, str) else recording
+        self.latency_s = latency_s
+
+        #: The outputs of the commands that are not fused, keyed by command
+        self.commands = {
+            constants.CMD_DEVICE_PROPERTIES: self.recording["device_properties"],
+            constants.CMD_MAC_ETH0: self.recording["ethmac"],
+            constants.CMD_MAC_WLAN0: self.recording["wifimac"],
+            constants.CMD_INSTALLED_APPS: self.recording["installed_apps"],
+        }
+        for name, cmds in SECTION_COMMANDS.items():
+            for cmd in cmds:
+                self.commands[cmd] = self.recording.get(name, "")
+
+        #: The number of shell commands that have been sent
+        self.count = 0
+
+    def fused(self, cmd):
+        """Get the output of a fused command (see :meth:`androidtv.basetv.basetv.BaseTV._cmd_fused`).
+
+        Parameters
+        ----------
+        cmd : str
+            The fused ADB shell command
+
+        Returns
+        -------
+        str
+            The output of the fused command
+
+        """
+        names = REGEX_FUSED_SECTION.findall(cmd)
+
+        # If the command is lazy and the device is off, only the first section is run
+        if "$SCREEN_ON_AWAKE" in cmd and not self.recording.get(names[0], "").startswith("11"):
+            names = names[:1]
+
+        return "".join(
+            "{}{}\n{}\n".format(constants.FUSED_DELIMITER, name, self.recording.get(name, "")) for name in names
+        )
+
+    def shell(self, cmd):
+        """Get the output of a shell command.
+
+        Parameters
+        ----------
+        cmd : str
+            The ADB shell command
+
+        Returns
+        -------
+        str
+            The recorded output, or an empty string if the command was not recorded
+
+        """
+        self.count += 1
+
+        if constants.FUSED_DELIMITER in cmd:
+            return self.fused(cmd)
+
+        if "getevent" in cmd:
+            return self.recording["getevent"]
+
+        return self.commands.get(cmd, "")
+
+
+class ReplayAdbDeviceTcp(object):
+    """A replacement for :class:`adb_shell.adb_device.AdbDeviceTcp` that replays a recording.
+
+    Parameters
+    ----------
+    replay : Replay
+        The recording that will be replayed
+    host : str
+        The address of the device
+    port : int
+        The device port
+    default_transport_timeout_s : float, None
+        Unused
+    banner : str, bytes, None
+        Unused
+
+    """
+
+    def __init__(self, replay, host, port=5555, default_transport_timeout_s=None, banner=None):
+        self.replay = replay
+        self.host = host
+        self.port = port
+        self.available = False
+
+    def close(self):
+        """Close the connection."""
+        self.available = False
+
+    def connect(self, *args, **kwargs):
+        """Connect to the device."""
+        self.available = True
+        return True
+
+    def shell(self, command, *args, **kwargs):
+        """Send an ADB shell command."""
+        if self.replay.latency_s:
+            time.sleep(self.replay.latency_s)
+        return self.replay.shell(command)
+
+
+class ReplayAdbDeviceTcpAsync(ReplayAdbDeviceTcp):
+    """A replacement for :class:`adb_shell.adb_device_async.AdbDeviceTcpAsync` that replays a recording."""
+
+    async def close(self):
+        """Close the connection."""
+        self.available = False
+
+    async def connect(self, *args, **kwargs):
+        """Connect to the device."""
+        self.available = True
+        return True
+
+    async def shell(self, command, *args, **kwargs):
+        """Send an ADB shell command."""
+        if self.replay.latency_s:
+            await asyncio.sleep(self.replay.latency_s)
+        return self.replay.shell(command)
+
+
+@contextmanager
+def patch_replay(replay):
+    """Replace the ADB devices in :mod:`androidtv.adb_manager` with ones that replay a recording.
+
+    Parameters
+    ----------
+    replay : Replay
+        The recording that will be replayed
+
+    """
+
+    def adb_device_tcp(*args, **kwargs):
+        return ReplayAdbDeviceTcp(replay, *args, **kwargs)
+
+    def adb_device_tcp_async(*args, **kwargs):
+        return ReplayAdbDeviceTcpAsync(replay, *args, **kwargs)
+
+    with patch("androidtv.adb_manager.adb_manager_sync.AdbDeviceTcp", adb_device_tcp), patch(
+        "androidtv.adb_manager.adb_manager_async.AdbDeviceTcpAsync", adb_device_tcp_async
+    ):
+        yield replay
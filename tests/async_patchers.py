@@ -1,7 +1,16 @@
 """Define patches used for androidtv tests."""
 
+import asyncio
+import struct
+import subprocess
 from unittest.mock import patch
 
+from adb_shell import constants
+from adb_shell.adb_message import AdbMessage, unpack
+from adb_shell.transport.base_transport_async import BaseTransportAsync
+
+from androidtv.constants import CMD_EXEC_OUT_PROBE
+
 try:
     from unittest.mock import AsyncMock
 except ImportError:
@@ -46,13 +55,19 @@ class AdbDeviceTcpAsyncFake(object):
     async def pull(self, *args, **kwargs):
         """Pull a file from the device."""
 
+    async def exec_out(self, cmd, *args, **kwargs):
+        """Send an ADB ``exec-out`` command, which is handled like a shell command (except for the probe)."""
+        if cmd == CMD_EXEC_OUT_PROBE:
+            return "\n"
+        return await self.shell(cmd, *args, **kwargs)
+
     async def shell(self, cmd, *args, **kwargs):
         """Send an ADB shell command."""
         return None
 
 
 class ClientAsyncFakeSuccess(object):
-    """A fake of the `ppadb.client.Client` class when the connection and shell commands succeed."""
+    """A fake of the `adb_manager_async.ClientAsync` class when the connection and shell commands succeed."""
 
     def __init__(self, host="127.0.0.1", port=5037):
         """Initialize a `ClientAsyncFakeSuccess` instance."""
@@ -66,7 +81,7 @@ class ClientAsyncFakeSuccess(object):
 
 
 class ClientAsyncFakeFail(object):
-    """A fake of the `ppadb.client.Client` class when the connection and shell commands fail."""
+    """A fake of the `adb_manager_async.ClientAsync` class when the connection and shell commands fail."""
 
     def __init__(self, host="127.0.0.1", port=5037):
         """Initialize a `ClientAsyncFakeFail` instance."""
@@ -78,7 +93,7 @@ class ClientAsyncFakeFail(object):
 
 
 class DeviceAsyncFake(object):
-    """A fake of the `ppadb.device.Device` class."""
+    """A fake of the `adb_manager_async.DeviceAsync` class."""
 
     def __init__(self, host):
         """Initialize a `DeviceAsyncFake` instance."""
@@ -90,17 +105,17 @@ class DeviceAsyncFake(object):
     async def pull(self, *args, **kwargs):
         """Pull a file from the device."""
 
-    async def shell(self, cmd):
+    async def shell(self, cmd, decode=True):
         """Send an ADB shell command."""
         raise NotImplementedError
 
-    async def screencap(self):
+    async def screencap(self, raw=False):
         """Take a screencap."""
         raise NotImplementedError
 
 
 def patch_connect(success):
-    """Mock the `adb_shell.adb_device_async.AdbDeviceTcpAsync` and `ppadb.client.Client` classes."""
+    """Mock the `adb_shell.adb_device_async.AdbDeviceTcpAsync` and `adb_manager_async.ClientAsync` classes."""
 
     async def connect_success_python(self, *args, **kwargs):
         """Mock the `AdbDeviceTcpAsyncFake.connect` method when it succeeds."""
@@ -145,7 +160,7 @@ def patch_shell(response=None, error=False):
         self.shell_cmd = cmd
         raise AttributeError
 
-    async def shell_fail_server(self, cmd):
+    async def shell_fail_server(self, cmd, *args, **kwargs):
         """Mock the `DeviceAsyncFake.shell` method when it fails."""
         self.shell_cmd = cmd
         raise ConnectionResetError
@@ -186,3 +201,201 @@ PATCH_CONNECT_FAIL_CUSTOM_EXCEPTION = {
     KEY_PYTHON: async_patch("{}.{}.connect".format(__name__, ADB_DEVICE_TCP_ASYNC_FAKE), side_effect=CustomException),
     KEY_SERVER: async_patch("{}.{}.device".format(__name__, CLIENT_ASYNC_FAKE_SUCCESS), side_effect=CustomException),
 }
+
+
+class AdbTransportAsyncFake(BaseTransportAsync):
+    """A fake adb-shell transport that emulates the device side of the ADB protocol.
+
+    Shell commands are run locally via ``sh``.  An ``OPEN`` for ``shell:sh`` behaves like a long-lived ``sh`` stream:
+    each ``WRTE`` packet is run as a script and its output is written back on the same stream, in ``WRTE`` packets of
+    at most ``write_size`` bytes (if it is not ``None``).  If ``pty`` is ``True``, the stream behaves like an
+    interactive ``sh`` in a PTY on a device without ``stty``: the input is echoed, ``"\n"`` is output as ``"\r\n"``,
+    and a prompt is printed until ``PS1`` is set.
+
+    """
+
+    def __init__(self):
+        self._buffer = bytearray()
+        self._header = None
+        self._next_remote_id = 100
+        self.opened = []
+        self.kill_persistent_streams = False
+        self.write_size = None
+        self.pty = False
+        self._prompts = {}
+
+    async def close(self):
+        """Close the connection."""
+        self._buffer = bytearray()
+
+    async def connect(self, transport_timeout_s):
+        """Open the connection."""
+
+    async def bulk_read(self, numbytes, transport_timeout_s):
+        """Read data that was written by the fake device."""
+        ret = bytes(self._buffer[:numbytes])
+        del self._buffer[:numbytes]
+        return ret
+
+    async def bulk_write(self, data, transport_timeout_s):
+        """Receive data from adb-shell and write the fake device's response."""
+        if self._header is None:
+            self._header = unpack(data)
+            if self._header[3]:
+                # The payload will be sent in the next write
+                return len(data)
+            payload = b""
+        else:
+            payload = bytes(data)
+
+        cmd, arg0, arg1, _, _ = self._header
+        self._header = None
+        command = constants.WIRE_TO_ID[cmd]
+
+        if command == constants.CNXN:
+            self._send(constants.CNXN, constants.VERSION, constants.MAX_ADB_DATA, b"device::\0")
+
+        elif command == constants.OPEN:
+            destination = payload.rstrip(b"\0")
+            remote_id = self._next_remote_id
+            self._next_remote_id += 1
+            self.opened.append(destination)
+            self._send(constants.OKAY, remote_id, arg0)
+
+            if destination != b"shell:sh":
+                self._send(constants.WRTE, remote_id, arg0, self._run(destination.split(b":", 1)[1]))
+                self._send(constants.CLSE, remote_id, arg0)
+            elif self.pty:
+                self._prompts[remote_id] = b"$ "
+                self._send(constants.WRTE, remote_id, arg0, self._prompts[remote_id])
+
+        elif command == constants.WRTE:
+            if self.kill_persistent_streams:
+                self._send(constants.CLSE, arg1, arg0)
+            else:
+                self._send(constants.OKAY, arg1, arg0)
+                output = self._run(payload)
+                if self.pty:
+                    if b"PS1=" in payload:
+                        self._prompts[arg1] = b""
+                    output = (payload + output).replace(b"\n", b"\r\n") + self._prompts[arg1]
+                write_size = self.write_size or len(output) or 1
+                for i in range(0, len(output), write_size):
+                    self._send(constants.WRTE, arg1, arg0, output[i : i + write_size])
+
+        elif command == constants.CLSE:
+            self._send(constants.CLSE, arg1, arg0)
+
+        return len(data)
+
+    @staticmethod
+    def _run(script):
+        """Run a script via ``sh`` and return its output."""
+        return subprocess.run(["sh"], input=script, stdout=subprocess.PIPE, stderr=subprocess.STDOUT).stdout
+
+    def _send(self, command, arg0, arg1, data=b""):
+        """Queue a packet that will be read by adb-shell."""
+        msg = AdbMessage(command, arg0, arg1, data)
+        self._buffer += msg.pack() + data
+
+
+class AdbServerFake(object):
+    """A fake ADB server that listens on a local port.
+
+    Shell commands are looked up in ``shell_responses`` or else run locally via ``sh``, and files that are pushed via
+    ``sync:`` are stored in ``files``.  Commands that are sent via ``exec:`` are handled like shell commands, unless
+    ``exec_supported`` is ``False``.
+
+    """
+
+    def __init__(self, serials=("HOST:5555",)):
+        self.serials = serials
+        self.files = {}
+        self.shell_responses = {}
+        self.exec_supported = True
+        self.active = 0
+        self.max_active = 0
+        self.port = None
+        self._server = None
+
+    async def start(self):
+        """Start the server."""
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        """Stop the server."""
+        self._server.close()
+        await self._server.wait_closed()
+
+    @staticmethod
+    async def _request(reader):
+        """Read a length-prefixed request."""
+        length = int(await reader.readexactly(4), 16)
+        return (await reader.readexactly(length)).decode("utf-8")
+
+    async def _handle(self, reader, writer):
+        """Handle a connection from a client."""
+        self.active += 1
+        self.max_active = max(self.active, self.max_active)
+
+        try:
+            # Give other connections a chance to open
+            await asyncio.sleep(0.01)
+
+            request = await self._request(reader)
+            if request == "host:devices":
+                devices = "".join("{}\tdevice\n".format(serial) for serial in self.serials).encode("utf-8")
+                writer.write(b"OKAY" + "{:04X}".format(len(devices)).encode("utf-8") + devices)
+                return
+
+            if request.split(":", 2)[-1] not in self.serials:
+                writer.write(b"FAIL" + b"device not found")
+                return
+
+            writer.write(b"OKAY")
+            request = await self._request(reader)
+            if request.startswith("exec:") and not self.exec_supported:
+                writer.write(b"FAIL" + b"closed")
+                return
+
+            writer.write(b"OKAY")
+
+            if request.startswith(("shell:", "exec:")):
+                cmd = request.split(":", 1)[1]
+                if cmd in self.shell_responses:
+                    writer.write(self.shell_responses[cmd])
+                else:
+                    writer.write(AdbTransportAsyncFake._run(cmd.encode("utf-8")))
+
+            elif request == "sync:":
+                await self._sync(reader, writer)
+
+        finally:
+            await writer.drain()
+            writer.close()
+            self.active -= 1
+
+    async def _sync(self, reader, writer):
+        """Handle a ``sync:`` request."""
+        flag = await reader.readexactly(4)
+        path = (await reader.readexactly(struct.unpack("<I", await reader.readexactly(4))[0])).decode("utf-8")
+
+        if flag == b"RECV":
+            if path not in self.files:
+                writer.write(b"FAIL" + struct.pack("<I", 14) + b"file not found")
+                return
+            writer.write(b"DATA" + struct.pack("<I", len(self.files[path])) + self.files[path])
+            writer.write(b"DONE" + struct.pack("<I", 0))
+
+        elif flag == b"SEND":
+            data = bytearray()
+            while True:
+                flag = await reader.readexactly(4)
+                length = struct.unpack("<I", await reader.readexactly(4))[0]
+                if flag == b"DONE":
+                    break
+                data += await reader.readexactly(length)
+
+            self.files[path.split(",")[0]] = bytes(data)
+            writer.write(b"OKAY" + struct.pack("<I", 0))
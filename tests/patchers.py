@@ -7,6 +7,8 @@ except ImportError:
     # Python2
     from mock import patch
 
+from androidtv.constants import CMD_EXEC_OUT_PROBE
+
 
 KEY_PYTHON = "python"
 KEY_SERVER = "server"
@@ -38,6 +40,12 @@ class AdbDeviceTcpFake(object):
     def pull(self, *args, **kwargs):
         """Pull a file from the device."""
 
+    def exec_out(self, cmd, *args, **kwargs):
+        """Send an ADB ``exec-out`` command, which is handled like a shell command (except for the probe)."""
+        if cmd == CMD_EXEC_OUT_PROBE:
+            return "\n"
+        return self.shell(cmd, *args, **kwargs)
+
     def shell(self, cmd, *args, **kwargs):
         """Send an ADB shell command."""
         return None
@@ -1,12 +1,27 @@
 import asyncio
 from contextlib import asynccontextmanager
+import os
 import sys
+import tempfile
 import unittest
 from unittest.mock import patch
 
 sys.path.insert(0, "..")
 
-from androidtv.adb_manager.adb_manager_async import _acquire, ADBPythonAsync, ADBServerAsync
+from adb_shell.adb_device_async import AdbDeviceAsync
+from adb_shell.exceptions import AdbTimeoutError
+
+from androidtv import constants
+from androidtv.adb_manager.adb_manager_async import (
+    _acquire,
+    _split_lines,
+    ADBPythonAsync,
+    ADBServerAsync,
+    ClientAsync,
+    PersistentShellAsync,
+    PriorityLockAsync,
+    SingleFlightAsync,
+)
 from androidtv.exceptions import LockNotAcquiredException
 
 from . import async_patchers
@@ -56,7 +71,7 @@ class AsyncFakeLock:
     def __init__(self):
         self._acquired = True
 
-    async def acquire(self):
+    async def acquire(self, *args, **kwargs):
         if self._acquired:
             self._acquired = False
             return True
@@ -72,7 +87,7 @@ class AsyncLockedLock(AsyncFakeLock):
 
 
 class AsyncTimedLock(AsyncFakeLock):
-    async def acquire(self):
+    async def acquire(self, *args, **kwargs):
         await asyncio.sleep(1.0)
         return await super().acquire()
 
@@ -103,6 +118,220 @@ class TestLock(unittest.TestCase):
                 pass  # self.assertTrue(False)
 
 
+class TestPriorityLockAsync(unittest.TestCase):
+    """Test the `PriorityLockAsync` class."""
+
+    @awaiter
+    async def test_priority(self):
+        """Check that waiters are served by priority and then in the order in which they arrived."""
+        lock = PriorityLockAsync()
+        order = []
+
+        async def waiter(name, priority):
+            await lock.acquire(priority)
+            order.append(name)
+            await asyncio.sleep(0)
+            lock.release()
+
+        await lock.acquire()
+        tasks = [
+            asyncio.ensure_future(waiter(name, priority))
+            for name, priority in (
+                ("poll1", constants.PRIORITY_POLL),
+                ("bulk", constants.PRIORITY_BULK),
+                ("poll2", constants.PRIORITY_POLL),
+                ("key", constants.PRIORITY_INTERACTIVE),
+            )
+        ]
+        await asyncio.sleep(0)
+
+        # A new caller cannot jump the queue while the lock is being handed over
+        lock.release()
+        self.assertTrue(lock.locked())
+
+        await asyncio.gather(*tasks)
+        self.assertListEqual(order, ["key", "poll1", "poll2", "bulk"])
+        self.assertFalse(lock.locked())
+
+        with self.assertRaises(RuntimeError):
+            lock.release()
+
+    @awaiter
+    async def test_timeout(self):
+        """Check that a waiter that times out is removed from the queue."""
+        lock = PriorityLockAsync()
+        await lock.acquire()
+
+        with self.assertRaises(LockNotAcquiredException):
+            async with _acquire(lock, 0.01, priority=constants.PRIORITY_POLL):
+                pass
+
+        lock.release()
+        self.assertFalse(lock.locked())
+
+    @awaiter
+    async def test_cancelled_after_handover(self):
+        """Check that the lock is passed on if a waiter is cancelled after the lock was handed to it."""
+        lock = PriorityLockAsync()
+        await lock.acquire()
+
+        task = asyncio.ensure_future(lock.acquire(constants.PRIORITY_CONTROL))
+        await asyncio.sleep(0)
+        lock.release()
+        task.cancel()
+
+        with self.assertRaises(asyncio.CancelledError):
+            await task
+        self.assertFalse(lock.locked())
+
+    @awaiter
+    async def test_key_before_polling(self):
+        """Check that a key press is sent before polling commands that were queued earlier."""
+        with async_patchers.PATCH_ADB_DEVICE_TCP, async_patchers.patch_connect(True)["python"]:
+            adb = ADBPythonAsync("HOST", 5555)
+            await adb.connect()
+
+        sent = []
+
+        async def shell(cmd, *args, **kwargs):
+            sent.append(cmd)
+            await asyncio.sleep(0.01)
+            return ""
+
+        with patch.object(adb._adb, "shell", shell):
+            # Wait until the first command is being sent
+            first = asyncio.ensure_future(adb.shell(constants.CMD_STREAM_MUSIC))
+            while not sent:
+                await asyncio.sleep(0)
+
+            await asyncio.gather(
+                first,
+                adb.shell(constants.CMD_RUNNING_APPS),
+                adb.shell(constants.CMD_WAKE_LOCK_SIZE),
+                adb.shell("input keyevent 26"),
+            )
+
+        self.assertListEqual(
+            sent,
+            [constants.CMD_STREAM_MUSIC, "input keyevent 26", constants.CMD_RUNNING_APPS, constants.CMD_WAKE_LOCK_SIZE],
+        )
+
+
+class TestSingleFlightAsync(unittest.TestCase):
+    """Test the `SingleFlightAsync` class."""
+
+    def setUp(self):
+        self.calls = []
+
+    async def call(self, value, delay_s=0.01):
+        self.calls.append(value)
+        await asyncio.sleep(delay_s)
+        if isinstance(value, Exception):
+            raise value
+        return value
+
+    @awaiter
+    async def test_in_flight(self):
+        """Check that concurrent calls with the same key share a single call."""
+        single_flight = SingleFlightAsync()
+        results = await asyncio.gather(
+            single_flight.run("a", self.call, 1),
+            single_flight.run("a", self.call, 2),
+            single_flight.run("b", self.call, 3),
+        )
+        self.assertListEqual(results, [1, 1, 3])
+        self.assertListEqual(self.calls, [1, 3])
+
+        # With no TTL, the result is not reused once the call has completed
+        self.assertEqual(await single_flight.run("a", self.call, 4), 4)
+
+    @awaiter
+    async def test_exception(self):
+        """Check that an exception is raised for all the callers."""
+        single_flight = SingleFlightAsync()
+        results = await asyncio.gather(
+            single_flight.run("a", self.call, ValueError()),
+            single_flight.run("a", self.call, 2),
+            return_exceptions=True,
+        )
+        self.assertIsInstance(results[0], ValueError)
+        self.assertIs(results[1], results[0])
+        self.assertEqual(len(self.calls), 1)
+
+    @awaiter
+    async def test_ttl(self):
+        """Check that a result is reused until it expires or is forgotten."""
+        single_flight = SingleFlightAsync(ttl_s=0.05)
+        self.assertEqual(await single_flight.run("a", self.call, 1), 1)
+        self.assertEqual(await single_flight.run("a", self.call, 2), 1)
+
+        single_flight.forget("a")
+        self.assertEqual(await single_flight.run("a", self.call, 3), 3)
+
+        await asyncio.sleep(0.05)
+        self.assertEqual(await single_flight.run("a", self.call, 4), 4)
+        self.assertListEqual(self.calls, [1, 3, 4])
+
+    @awaiter
+    async def test_forget_in_flight(self):
+        """Check that a call that is forgotten while it is in flight is neither joined nor stored."""
+        single_flight = SingleFlightAsync(ttl_s=60.0)
+        first = asyncio.ensure_future(single_flight.run("a", self.call, 1))
+        await asyncio.sleep(0)
+
+        single_flight.forget()
+        self.assertEqual(await single_flight.run("a", self.call, 2), 2)
+        self.assertEqual(await first, 1)
+        self.assertEqual(await single_flight.run("a", self.call, 3), 2)
+        self.assertListEqual(self.calls, [1, 2])
+
+    @awaiter
+    async def test_cancelled_caller(self):
+        """Check that the call is not interrupted if the caller that started it is cancelled."""
+        single_flight = SingleFlightAsync()
+        first = asyncio.ensure_future(single_flight.run("a", self.call, 1))
+        await asyncio.sleep(0)
+        second = asyncio.ensure_future(single_flight.run("a", self.call, 2))
+        await asyncio.sleep(0)
+
+        first.cancel()
+        self.assertEqual(await second, 1)
+        self.assertListEqual(self.calls, [1])
+
+    @awaiter
+    async def test_adb_shell(self):
+        """Check that identical polling commands are coalesced, but control commands are not."""
+        with async_patchers.PATCH_ADB_DEVICE_TCP, async_patchers.patch_connect(True)["python"]:
+            adb = ADBPythonAsync("HOST", 5555)
+            await adb.connect()
+
+        async def shell(cmd, *args, **kwargs):
+            return await self.call(cmd)
+
+        with patch.object(adb._adb, "shell", shell):
+            await asyncio.gather(*[adb.shell(constants.CMD_STREAM_MUSIC) for _ in range(3)])
+            await asyncio.gather(*[adb.shell("input keyevent 24") for _ in range(3)])
+
+        self.assertListEqual(self.calls, [constants.CMD_STREAM_MUSIC] + ["input keyevent 24"] * 3)
+
+    @awaiter
+    async def test_adb_shell_side_effects(self):
+        """Check that polling commands with side effects are not coalesced."""
+        with async_patchers.PATCH_ADB_DEVICE_TCP, async_patchers.patch_connect(True)["python"]:
+            adb = ADBPythonAsync("HOST", 5555)
+            await adb.connect()
+
+        async def shell(cmd, *args, **kwargs):
+            return await self.call(cmd)
+
+        adb.single_flight.ttl_s = 60.0
+        with patch.object(adb._adb, "shell", shell):
+            await asyncio.gather(*[adb.shell("input text a") for _ in range(2)])
+            await adb.shell("input text a")
+
+        self.assertListEqual(self.calls, ["input text a"] * 3)
+
+
 class TestADBPythonAsync(unittest.TestCase):
     """Test the `ADBPythonAsync` class."""
 
@@ -288,6 +517,66 @@ class TestADBPythonAsync(unittest.TestCase):
                 ):
                     self.assertEqual(await self.adb.screencap(), PNG_IMAGE)
 
+    @awaiter
+    async def test_exec_out(self):
+        """Test the `exec_out` method and the detection of whether the device supports the `exec:` service."""
+        self.assertIsNone(await self.adb.exec_out("TEST"))
+
+        with async_patchers.patch_connect(True)[self.PATCH_KEY], async_patchers.patch_shell("TEST")[self.PATCH_KEY]:
+            self.assertTrue(await self.adb.connect())
+
+            if isinstance(self.adb, ADBPythonAsync):
+                self.assertEqual(await self.adb.exec_out("TEST"), "TEST")
+                self.assertTrue(self.adb.exec_out_supported)
+
+                # The device does not respond to the `exec:` service
+                self.adb.exec_out_supported = None
+                with patch.object(
+                    self.adb._adb, "exec_out", side_effect=AdbTimeoutError, new_callable=async_patchers.AsyncMock
+                ) as exec_out:
+                    self.assertEqual(await self.adb.exec_out("TEST"), "TEST")
+                    self.assertEqual(await self.adb.exec_out("TEST"), "TEST")
+                    self.assertFalse(self.adb.exec_out_supported)
+                    exec_out.assert_called_once()
+                    self.assertEqual(
+                        exec_out.call_args[1]["transport_timeout_s"], constants.DEFAULT_EXEC_OUT_PROBE_TIMEOUT_S
+                    )
+
+                # The response to the probe is not the expected output
+                self.adb.exec_out_supported = None
+                with patch.object(
+                    self.adb._adb, "exec_out", return_value="error: closed", new_callable=async_patchers.AsyncMock
+                ):
+                    self.assertEqual(await self.adb.exec_out("TEST"), "TEST")
+                    self.assertFalse(self.adb.exec_out_supported)
+
+            else:
+                with patch.object(
+                    self.adb._adb_device,
+                    "exec_out",
+                    return_value=b"TEST",
+                    new_callable=async_patchers.AsyncMock,
+                    create=True,
+                ):
+                    self.assertEqual(await self.adb.exec_out("TEST"), "TEST")
+                    self.assertFalse(self.adb.exec_out_supported)
+
+                self.adb.exec_out_supported = None
+                with patch.object(
+                    self.adb._adb_device,
+                    "exec_out",
+                    side_effect=lambda cmd: b"\n" if cmd == constants.CMD_EXEC_OUT_PROBE else b"TEST",
+                    new_callable=async_patchers.AsyncMock,
+                    create=True,
+                ):
+                    self.assertEqual(await self.adb.exec_out("TEST"), "TEST")
+                    self.assertEqual(await self.adb.screencap(), b"TEST")
+                    self.assertTrue(self.adb.exec_out_supported)
+
+            # The detection is repeated after reconnecting
+            await self.adb.close()
+            self.assertIsNone(self.adb.exec_out_supported)
+
 
 class TestADBPythonUsbAsync(unittest.TestCase):
     """Test the `ADBPythonAsync` class using a USB connection."""
@@ -318,6 +607,38 @@ class TestADBServerAsync(TestADBPythonAsync):
                 self.assertFalse(await self.adb.connect())
                 self.assertFalse(self.adb.available)
 
+    @awaiter
+    async def test_streaming_shell(self):
+        """Test that the ``streaming_shell`` method works correctly."""
+        self.assertListEqual([line async for line in self.adb.streaming_shell("TEST")], [])
+
+        async def streaming_shell(cmd):
+            for line in ["one", "two"]:
+                yield line
+
+        with async_patchers.patch_connect(True)[self.PATCH_KEY]:
+            self.assertTrue(await self.adb.connect())
+            with patch.object(self.adb._adb_device, "streaming_shell", streaming_shell, create=True):
+                self.assertListEqual([line async for line in self.adb.streaming_shell("TEST")], ["one", "two"])
+
+    @awaiter
+    async def test_streaming_exec_out(self):
+        """Test that ``streaming_exec_out`` detects whether the device supports the ``exec:`` service first."""
+        services = []
+
+        async def streaming_exec_out(cmd, service):
+            services.append(service)
+            yield b"one"
+
+        with async_patchers.patch_connect(True)[self.PATCH_KEY]:
+            self.assertTrue(await self.adb.connect())
+            with patch.object(self.adb._adb_device, "streaming_exec_out", streaming_exec_out, create=True):
+                self.assertListEqual([chunk async for chunk in self.adb.streaming_exec_out("TEST")], [b"one"])
+
+        # The fake device does not support `exec:`
+        self.assertFalse(self.adb.exec_out_supported)
+        self.assertListEqual(services, ["shell"])
+
 
 class TestADBPythonAsyncWithAuthentication(unittest.TestCase):
     """Test the `ADBPythonAsync` class."""
@@ -353,6 +674,68 @@ class TestADBPythonAsyncWithAuthentication(unittest.TestCase):
             self.assertTrue(await self.adb.connect())
             self.assertTrue(self.adb.available)
 
+    @awaiter
+    async def test_load_adbkey_cached(self):
+        """Test that the signer is only loaded again if the ``adbkey`` file is modified."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            adbkey = os.path.join(tmpdir, "adbkey")
+            with open(adbkey, "w") as f:
+                f.write("PRIVATE KEY")
+
+            with patch(
+                "androidtv.adb_manager.adb_manager_async.PythonRSASigner", side_effect=lambda pub, priv: object()
+            ) as patch_signer, patch.dict("androidtv.adb_manager.adb_manager_async._SIGNERS", clear=True):
+                signer = await ADBPythonAsync.load_adbkey(adbkey)
+                self.assertIs(await ADBPythonAsync.load_adbkey(adbkey), signer)
+                patch_signer.assert_called_once_with("", "PRIVATE KEY")
+
+                mtime = os.path.getmtime(adbkey)
+                os.utime(adbkey, (mtime + 10, mtime + 10))
+                self.assertIsNot(await ADBPythonAsync.load_adbkey(adbkey), signer)
+                self.assertEqual(patch_signer.call_count, 2)
+
+    @awaiter
+    async def test_handshake_limit(self):
+        """Test that the number of concurrent authentication handshakes is bounded."""
+        in_progress = []
+        max_in_progress = []
+
+        async def connect(*args, **kwargs):
+            in_progress.append(None)
+            max_in_progress.append(len(in_progress))
+            await asyncio.sleep(0.01)
+            in_progress.pop()
+
+        with async_patchers.PATCH_ADB_DEVICE_TCP:
+            adbs = [ADBPythonAsync("HOST{}".format(i), 5555, "adbkey", signer="SIGNER") for i in range(3)]
+
+        with patch.object(ADBPythonAsync, "max_concurrent_handshakes", 2):
+            for adb in adbs:
+                adb._adb.connect = connect
+            self.assertListEqual(await asyncio.gather(*[adb.connect() for adb in adbs]), [True, True, True])
+
+        self.assertEqual(max(max_in_progress), 2)
+
+    @awaiter
+    async def test_handshake_limit_streaming(self):
+        """Test that the connections for streaming commands count towards the handshake limit."""
+        with async_patchers.PATCH_ADB_DEVICE_TCP:
+            adb = ADBPythonAsync("HOST", 5555, "adbkey", signer="SIGNER")
+
+        with patch.object(
+            ADBPythonAsync, "max_concurrent_handshakes", 1
+        ), async_patchers.PATCH_ADB_DEVICE_TCP, async_patchers.patch_connect(True)["python"]:
+            semaphore = ADBPythonAsync._get_handshake_semaphore()
+            async with semaphore:
+                connection = adb._streaming_connection()
+                task = asyncio.ensure_future(connection.__aenter__())
+                await asyncio.sleep(0.01)
+                self.assertFalse(task.done())
+
+            await task
+            await connection.__aexit__(None, None, None)
+            self.assertFalse(semaphore.locked())
+
 
 class TestADBPythonAsyncClose(unittest.TestCase):
     """Test the `ADBPythonAsync.close` method."""
@@ -371,3 +754,302 @@ class TestADBPythonAsyncClose(unittest.TestCase):
 
             await self.adb.close()
             self.assertFalse(self.adb.available)
+
+
+class TestPersistentShellAsync(unittest.TestCase):
+    """Test the `PersistentShellAsync` class."""
+
+    @awaiter
+    async def setUp(self):
+        self.transport = async_patchers.AdbTransportAsyncFake()
+        self.device = AdbDeviceAsync(self.transport, banner="banner")
+        await self.device.connect()
+        self.shell = PersistentShellAsync(self.device)
+
+    @awaiter
+    async def test_shell(self):
+        """Test that commands are sent via a single stream."""
+        self.assertFalse(self.shell.is_open)
+        self.assertEqual(await self.shell.shell("echo 'one'"), "one\n")
+        self.assertEqual(await self.shell.shell("echo -n two ; exit 1"), "two")
+        self.assertEqual(await self.shell.shell("cat"), "")
+        self.assertEqual(await self.shell.shell("echo three"), "three\n")
+        self.assertEqual(await self.shell.shell("printf '\\377'", decode=False), b"\xff")
+        self.assertTrue(self.shell.is_open)
+        self.assertListEqual(self.transport.opened, [b"shell:sh"])
+
+    @awaiter
+    async def test_shell_split_sentinel(self):
+        """Test that the sentinel is found when it is split across several messages."""
+        self.transport.write_size = 5
+        self.assertEqual(await self.shell.shell("echo one"), "one\n")
+        self.assertEqual(await self.shell.shell("printf '%s' " + "x" * 1000), "x" * 1000)
+
+        self.transport.write_size = 1
+        self.assertEqual(await self.shell.shell("echo two"), "two\n")
+        self.assertListEqual(self.transport.opened, [b"shell:sh"])
+
+    @awaiter
+    async def test_shell_pty(self):
+        """Test that the echo and the "\\r\\n" line endings are removed if the shell runs in a PTY."""
+        self.transport.pty = True
+        self.assertEqual(await self.shell.shell("echo one"), "one\n")
+        self.assertEqual(await self.shell.shell("printf 'two\\nthree'"), "two\nthree")
+        self.assertEqual(await self.shell.shell("true"), "")
+        self.assertEqual(await self.shell.shell("printf '\\377\\n'", decode=False), b"\xff\n")
+
+        self.transport.write_size = 3
+        self.assertEqual(await self.shell.shell("echo four"), "four\n")
+        self.assertListEqual(self.transport.opened, [b"shell:sh"])
+
+    @awaiter
+    async def test_shell_reopen(self):
+        """Test that a new stream is opened if the old one was closed by the device."""
+        self.assertEqual(await self.shell.shell("echo one"), "one\n")
+
+        self.transport.kill_persistent_streams = True
+        with self.assertRaises(ConnectionResetError):
+            await self.shell.shell("echo two")
+        self.assertFalse(self.shell.is_open)
+        self.assertListEqual(self.transport.opened, [b"shell:sh", b"shell:sh"])
+
+        self.transport.kill_persistent_streams = False
+        self.assertEqual(await self.shell.shell("echo three"), "three\n")
+        self.assertListEqual(self.transport.opened, [b"shell:sh", b"shell:sh", b"shell:sh"])
+
+    @awaiter
+    async def test_close(self):
+        """Test the `PersistentShellAsync.close` method."""
+        await self.shell.close()
+        self.assertEqual(await self.shell.shell("echo one"), "one\n")
+        await self.shell.close()
+        self.assertFalse(self.shell.is_open)
+        self.assertEqual(await self.device.shell("echo two"), "two\n")
+
+
+class TestADBPythonAsyncPersistentShell(unittest.TestCase):
+    """Test the `ADBPythonAsync` class with a persistent shell."""
+
+    @awaiter
+    async def setUp(self):
+        self.transport = async_patchers.AdbTransportAsyncFake()
+        with patch(
+            "androidtv.adb_manager.adb_manager_async.AdbDeviceTcpAsync",
+            lambda *args, **kwargs: AdbDeviceAsync(self.transport, banner="banner"),
+        ):
+            self.adb = ADBPythonAsync("HOST", 5555, persistent_shell=True)
+
+    @awaiter
+    async def test_shell(self):
+        """Test that shell commands use the persistent shell."""
+        self.assertTrue(await self.adb.connect())
+        self.assertEqual(await self.adb.shell("echo one"), "one\n")
+        self.assertEqual(await self.adb.shell("echo two"), "two\n")
+        self.assertListEqual(self.transport.opened, [b"shell:sh"])
+
+        # Reconnecting invalidates the stream
+        self.assertTrue(await self.adb.connect())
+        self.assertEqual(await self.adb.shell("echo three"), "three\n")
+        self.assertListEqual(self.transport.opened, [b"shell:sh", b"shell:sh"])
+
+        await self.adb.close()
+        self.assertIsNone(await self.adb.shell("echo four"))
+
+    def test_usb(self):
+        """Test that the persistent shell is not used for USB connections."""
+        with patch("androidtv.adb_manager.adb_manager_async.AdbDeviceUsbAsync"):
+            adb = ADBPythonAsync("", 5555, persistent_shell=True)
+        self.assertIsNone(adb._persistent_shell)
+
+
+class TestADBPythonAsyncStreamingShell(unittest.TestCase):
+    """Test the `ADBPythonAsync.streaming_shell` method."""
+
+    @awaiter
+    async def setUp(self):
+        self.transports = []
+
+        def adb_device_tcp_async(*args, **kwargs):
+            self.transports.append(async_patchers.AdbTransportAsyncFake())
+            return AdbDeviceAsync(self.transports[-1], banner="banner")
+
+        self.patch_adb_device_tcp_async = patch(
+            "androidtv.adb_manager.adb_manager_async.AdbDeviceTcpAsync", adb_device_tcp_async
+        )
+
+        with self.patch_adb_device_tcp_async:
+            self.adb = ADBPythonAsync("HOST", 5555)
+            self.assertTrue(await self.adb.connect())
+
+            self.lines = [line async for line in self.adb.streaming_shell("printf 'one\\r\\ntwo\\nthree'")]
+
+    def test_streaming_shell(self):
+        """Test that the output is split into lines and that a separate connection is used."""
+        self.assertListEqual(self.lines, ["one", "two", "three"])
+        self.assertEqual(len(self.transports), 2)
+        self.assertListEqual(self.transports[0].opened, [])
+        self.assertListEqual(self.transports[1].opened, [b"shell:printf 'one\\r\\ntwo\\nthree'"])
+
+    @awaiter
+    async def test_streaming_exec_out(self):
+        """Test that the output is yielded unmodified via the `exec:` service on a separate connection."""
+        with self.patch_adb_device_tcp_async:
+            output = b"".join([chunk async for chunk in self.adb.streaming_exec_out("printf 'one\\r\\ntwo'")])
+            self.assertEqual(output, b"one\r\ntwo")
+            self.assertListEqual(self.transports[2].opened, [b"exec:printf 'one\\r\\ntwo'"])
+
+            # Whether the device supports `exec:` was detected first
+            self.assertTrue(self.adb.exec_out_supported)
+            self.assertListEqual(self.transports[0].opened, [b"exec:" + constants.CMD_EXEC_OUT_PROBE.encode("utf-8")])
+
+            self.adb.exec_out_supported = False
+            self.assertEqual(b"".join([chunk async for chunk in self.adb.streaming_exec_out("printf one")]), b"one")
+            self.assertListEqual(self.transports[3].opened, [b"shell:printf one"])
+
+        await self.adb.close()
+        self.assertListEqual([chunk async for chunk in self.adb.streaming_exec_out("printf one")], [])
+
+    @awaiter
+    async def test_streaming_shell_not_available(self):
+        """Test that nothing is yielded if the device is not connected."""
+        await self.adb.close()
+        self.assertListEqual([line async for line in self.adb.streaming_shell("echo test")], [])
+
+    @awaiter
+    async def test_split_lines(self):
+        """Test that chunks of output are split into lines."""
+
+        async def chunks():
+            for chunk in ["o", "ne\r\ntw", "o\n\nth", "ree"]:
+                yield chunk
+
+        self.assertListEqual([line async for line in _split_lines(chunks())], ["one", "two", "", "three"])
+
+
+class TestClientAsync(unittest.TestCase):
+    """Test the `ClientAsync` and `DeviceAsync` classes."""
+
+    @awaiter
+    async def test_device(self):
+        """Test the `ClientAsync.device` method."""
+        server = async_patchers.AdbServerFake()
+        await server.start()
+        client = ClientAsync("127.0.0.1", server.port)
+
+        self.assertEqual((await client.device("HOST:5555")).serial, "HOST:5555")
+        self.assertIsNone(await client.device("OTHER:5555"))
+        await server.stop()
+
+        with self.assertRaises(RuntimeError):
+            await client.device("HOST:5555")
+
+    @awaiter
+    async def test_shell(self):
+        """Test the `DeviceAsync.shell` and `DeviceAsync.screencap` methods."""
+        server = async_patchers.AdbServerFake()
+        await server.start()
+        client = ClientAsync("127.0.0.1", server.port)
+        device = await client.device("HOST:5555")
+
+        self.assertEqual(await device.shell("echo test"), "test\n")
+        self.assertListEqual(
+            [line async for line in device.streaming_shell("printf 'one\\r\\ntwo\\n'")], ["one", "two"]
+        )
+
+        server.shell_responses["/system/bin/screencap -p"] = PNG_IMAGE.replace(b"\n", b"\r\n")
+        self.assertEqual(await device.screencap(), PNG_IMAGE)
+
+        server.shell_responses["/system/bin/screencap -p"] = PNG_IMAGE
+        self.assertEqual(await device.screencap(), PNG_IMAGE)
+
+        # Raw screencaps are not modified
+        server.shell_responses["/system/bin/screencap"] = b"\r\n"
+        self.assertEqual(await device.screencap(raw=True), b"\r\n")
+
+        self.assertEqual(await device.exec_out("echo test"), b"test\n")
+        self.assertEqual(
+            b"".join([chunk async for chunk in device.streaming_exec_out("printf 'one\\r\\n'")]), b"one\r\n"
+        )
+
+        server.exec_supported = False
+        with self.assertRaises(RuntimeError):
+            await device.exec_out("echo test")
+        self.assertEqual(b"".join([chunk async for chunk in device.streaming_exec_out("printf one", "shell")]), b"one")
+
+        # The device is no longer connected to the ADB server
+        server.serials = []
+        with self.assertRaises(RuntimeError):
+            await device.shell("echo test")
+
+        await server.stop()
+
+    @awaiter
+    async def test_max_connections(self):
+        """Test that the number of simultaneous connections to the ADB server is bounded."""
+        server = async_patchers.AdbServerFake()
+        await server.start()
+        client = ClientAsync("127.0.0.1", server.port, max_connections=2)
+        device = await client.device("HOST:5555")
+
+        # A different client for the same server shares the limit
+        device2 = await ClientAsync("127.0.0.1", server.port, max_connections=2).device("HOST:5555")
+
+        results = await asyncio.gather(*[dev.shell("echo {}".format(i)) for i, dev in enumerate([device, device2] * 4)])
+        self.assertListEqual(results, ["{}\n".format(i) for i in range(8)])
+        self.assertEqual(server.max_active, 2)
+        await server.stop()
+
+    @awaiter
+    async def test_max_connections_streaming_shell(self):
+        """Test that an open ``streaming_shell`` stream does not count against the connection limit."""
+        server = async_patchers.AdbServerFake()
+        await server.start()
+        device = await ClientAsync("127.0.0.1", server.port, max_connections=1).device("HOST:5555")
+
+        stream = device.streaming_shell("printf 'one\\ntwo\\n'")
+        self.assertEqual(await stream.__anext__(), "one")
+
+        self.assertEqual(await asyncio.wait_for(device.shell("echo test"), 1.0), "test\n")
+        await stream.aclose()
+        await server.stop()
+
+    @awaiter
+    async def test_max_connections_streaming_exec_out(self):
+        """Test that an open ``streaming_exec_out`` stream does not count against the connection limit."""
+        server = async_patchers.AdbServerFake()
+        await server.start()
+        device = await ClientAsync("127.0.0.1", server.port, max_connections=1).device("HOST:5555")
+
+        stream = device.streaming_exec_out("printf one")
+        self.assertEqual(await stream.__anext__(), b"one")
+
+        self.assertEqual(await asyncio.wait_for(device.shell("echo test"), 1.0), "test\n")
+        await stream.aclose()
+        await server.stop()
+
+    @awaiter
+    async def test_push_pull(self):
+        """Test the `DeviceAsync.push` and `DeviceAsync.pull` methods."""
+        server = async_patchers.AdbServerFake()
+        await server.start()
+        device = await ClientAsync("127.0.0.1", server.port).device("HOST:5555")
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            local_path = os.path.join(tmpdir, "local.bin")
+            with open(local_path, "wb") as f:
+                f.write(b"\x00" * 100000)
+
+            await device.push(local_path, "/sdcard/test.bin")
+            self.assertEqual(server.files["/sdcard/test.bin"], b"\x00" * 100000)
+
+            pulled_path = os.path.join(tmpdir, "pulled.bin")
+            self.assertIsNone(await device.pull("/sdcard/test.bin", pulled_path))
+            with open(pulled_path, "rb") as f:
+                self.assertEqual(f.read(), b"\x00" * 100000)
+
+            self.assertEqual(await device.pull("/sdcard/missing.bin", pulled_path), "file not found")
+
+            with self.assertRaises(FileNotFoundError):
+                await device.push(os.path.join(tmpdir, "missing.bin"), "/sdcard/missing.bin")
+
+        await server.stop()
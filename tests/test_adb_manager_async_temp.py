@@ -1,4 +1,4 @@
-"""Tests for the ClientAsync and AdbDeviceUsbAsync classes."""
+"""Tests for the AdbDeviceUsbAsync class."""
 
 import unittest
 from unittest.mock import patch
@@ -8,48 +8,9 @@ try:
 except (ImportError, OSError):
     UsbTransport = None
 
-from androidtv.adb_manager.adb_manager_async import AdbDeviceUsbAsync, ClientAsync
+from androidtv.adb_manager.adb_manager_async import AdbDeviceUsbAsync
 
 from .async_wrapper import awaiter
-from . import patchers
-
-
-class TestAsyncClientDevice(unittest.TestCase):
-    """Test the ``ClientAsync`` and ``DeviceAsync`` classes defined in ``adb_manager_async.py``.
-
-    These tests can be removed once true async support for using an ADB server is available.
-
-    """
-
-    @awaiter
-    async def test_async_client_device(self):
-        """Test the ClientAsync class."""
-        with patch("androidtv.adb_manager.adb_manager_async.Client", patchers.ClientFakeSuccess):
-            client = ClientAsync("host", "port")
-
-            device = await client.device("serial")
-
-            with patch("{}.DeviceFake.shell".format(patchers.__name__)):
-                await device.shell("test")
-
-            with patch("{}.DeviceFake.push".format(patchers.__name__)):
-                await device.push("local_path", "device_path")
-
-            with patch("{}.DeviceFake.pull".format(patchers.__name__)):
-                await device.pull("device_path", "local_path")
-
-            with patch("{}.DeviceFake.screencap".format(patchers.__name__)):
-                await device.screencap()
-
-    @awaiter
-    async def test_async_client_device_fail(self):
-        """Test the ClientAsync class when it fails."""
-        with patch("androidtv.adb_manager.adb_manager_async.Client", patchers.ClientFakeFail):
-            client = ClientAsync("host", "port")
-
-            device = await client.device("serial")
-
-            self.assertFalse(device)
 
 
 @unittest.skipIf(UsbTransport is None, "UsbTransport cannot be imported")
@@ -1,5 +1,7 @@
 from contextlib import contextmanager
 import sys
+import threading
+import time
 import unittest
 
 try:
@@ -9,8 +11,10 @@ except ImportError:
 
 sys.path.insert(0, "..")
 
+from adb_shell.exceptions import AdbTimeoutError
 from adb_shell.transport.tcp_transport import TcpTransport
-from androidtv.adb_manager.adb_manager_sync import _acquire, ADBPythonSync, ADBServerSync
+from androidtv import constants
+from androidtv.adb_manager.adb_manager_sync import _acquire, _priority, ADBPythonSync, ADBServerSync, PriorityLockSync
 from androidtv.exceptions import LockNotAcquiredException
 from . import patchers
 
@@ -77,6 +81,61 @@ class LockedLock(FakeLock):
         self._acquired = False
 
 
+class TestPriorityLockSync(unittest.TestCase):
+    """Test the `PriorityLockSync` class."""
+
+    def test_priority(self):
+        """Check that waiters are served by priority and then in the order in which they arrived."""
+        lock = PriorityLockSync()
+        order = []
+
+        def waiter(name, priority):
+            self.assertTrue(lock.acquire(priority, timeout=5.0))
+            order.append(name)
+            lock.release()
+
+        self.assertTrue(lock.acquire())
+        threads = []
+        for name, priority in (
+            ("poll1", constants.PRIORITY_POLL),
+            ("bulk", constants.PRIORITY_BULK),
+            ("poll2", constants.PRIORITY_POLL),
+            ("key", constants.PRIORITY_INTERACTIVE),
+        ):
+            threads.append(threading.Thread(target=waiter, args=(name, priority)))
+            threads[-1].start()
+
+            # Wait until the thread is in the queue
+            while len(lock._waiters) < len(threads):
+                time.sleep(0.001)
+
+        lock.release()
+        for thread in threads:
+            thread.join()
+
+        self.assertListEqual(order, ["key", "poll1", "poll2", "bulk"])
+        self.assertFalse(lock.locked())
+
+        with self.assertRaises(RuntimeError):
+            lock.release()
+
+    def test_timeout(self):
+        """Check that a waiter that times out is skipped when the lock is released."""
+        lock = PriorityLockSync()
+        self.assertTrue(lock.acquire())
+        self.assertFalse(lock.acquire(constants.PRIORITY_POLL, timeout=0.01))
+
+        lock.release()
+        self.assertFalse(lock.locked())
+        self.assertTrue(lock.acquire(timeout=0))
+
+    def test_priority_from_command(self):
+        """Check that the priority is determined from the type of command."""
+        self.assertEqual(_priority("input keyevent 26"), constants.PRIORITY_INTERACTIVE)
+        self.assertEqual(_priority(constants.CMD_LAUNCH_APP.format("com.netflix.ninja")), constants.PRIORITY_CONTROL)
+        self.assertEqual(_priority(constants.CMD_STREAM_MUSIC), constants.PRIORITY_POLL)
+
+
 class TestADBPythonSync(unittest.TestCase):
     """Test the `ADBPythonSync` class."""
 
@@ -253,6 +312,54 @@ class TestADBPythonSync(unittest.TestCase):
                 with patch.object(self.adb._adb_device, "screencap", return_value=PNG_IMAGE):
                     self.assertEqual(self.adb.screencap(), PNG_IMAGE)
 
+    def test_exec_out(self):
+        """Test the `exec_out` method and the detection of whether the device supports the `exec:` service."""
+        self.assertIsNone(self.adb.exec_out("TEST"))
+
+        with patchers.patch_connect(True)[self.PATCH_KEY], patchers.patch_shell("TEST")[self.PATCH_KEY]:
+            self.assertTrue(self.adb.connect())
+            self.assertEqual(self.adb.exec_out("TEST"), "TEST")
+
+            if isinstance(self.adb, ADBPythonSync):
+                self.assertTrue(self.adb.exec_out_supported)
+
+                # The device does not respond to the `exec:` service
+                self.adb.exec_out_supported = None
+                with patch.object(self.adb._adb, "exec_out", side_effect=AdbTimeoutError) as exec_out:
+                    self.assertEqual(self.adb.exec_out("TEST"), "TEST")
+                    self.assertEqual(self.adb.exec_out("TEST"), "TEST")
+                    self.assertFalse(self.adb.exec_out_supported)
+                    exec_out.assert_called_once()
+                    self.assertEqual(
+                        exec_out.call_args[1]["transport_timeout_s"], constants.DEFAULT_EXEC_OUT_PROBE_TIMEOUT_S
+                    )
+
+                # The response to the probe is not the expected output
+                self.adb.exec_out_supported = None
+                with patch.object(self.adb._adb, "exec_out", return_value="error: closed"):
+                    self.assertEqual(self.adb.exec_out("TEST"), "TEST")
+                    self.assertFalse(self.adb.exec_out_supported)
+
+            else:
+                self.assertFalse(self.adb.exec_out_supported)
+
+                self.adb.exec_out_supported = None
+                with patch.object(self.adb, "_exec", return_value=b"TEST"):
+                    self.assertEqual(self.adb.exec_out("TEST"), "TEST")
+                    self.assertFalse(self.adb.exec_out_supported)
+
+                self.adb.exec_out_supported = None
+                with patch.object(
+                    self.adb, "_exec", side_effect=lambda cmd: b"\n" if cmd == constants.CMD_EXEC_OUT_PROBE else b"TEST"
+                ):
+                    self.assertEqual(self.adb.exec_out("TEST"), "TEST")
+                    self.assertEqual(self.adb.exec_out("TEST", decode=False), b"TEST")
+                    self.assertTrue(self.adb.exec_out_supported)
+
+            # The detection is repeated after reconnecting
+            self.adb.close()
+            self.assertIsNone(self.adb.exec_out_supported)
+
 
 class TestADBPythonUsbSync(TestADBPythonSync):
     """Test the `ADBPythonSync` class using a USB connection."""
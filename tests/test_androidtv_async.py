@@ -8,6 +8,7 @@ sys.path.insert(0, "..")
 
 from androidtv import constants
 from androidtv.androidtv.androidtv_async import AndroidTVAsync
+from androidtv.scheduler import AdaptivePollScheduler
 
 from . import async_patchers
 from .async_wrapper import awaiter
@@ -56,6 +57,20 @@ STREAM_MUSIC_ON = """- STREAM_MUSIC:
    Devices: speaker"""
 
 
+MEDIA_SESSION_STATE_OUTPUT = "com.netflix.ninja\nstate=PlaybackState {state=3, position=0, buffered position=0, speed=0.0, updated=65749, actions=240640, custom actions=[], active item id=-1, error=null}"
+
+FUSED_PROPERTIES_OUTPUT = "".join(
+    "{0}{1}\n{2}\n".format(constants.FUSED_DELIMITER, name, output)
+    for name, output in [
+        ("screen_on_awake_wake_lock_size", "11Wake Locks: size=2"),
+        ("audio_state", "1"),
+        ("current_app_media_session_state", MEDIA_SESSION_STATE_OUTPUT),
+        ("stream_music", STREAM_MUSIC_ON),
+        ("hdmi_input", "HW2"),
+    ]
+)
+
+
 class TestAndroidTVAsyncPython(unittest.TestCase):
     PATCH_KEY = "python"
     ADB_ATTR = "_adb"
@@ -105,24 +120,21 @@ class TestAndroidTVAsyncPython(unittest.TestCase):
     async def test_stream_music_properties(self):
         """Check that the ``stream_music_properties`` method works correctly."""
         with async_patchers.patch_shell(None)[self.PATCH_KEY]:
-            with patch_calls(self.atv, self.atv._audio_output_device) as audio_output_device, patch_calls(
-                self.atv, self.atv._is_volume_muted
-            ) as is_volume_muted, patch_calls(self.atv, self.atv._volume) as volume, patch_calls(
-                self.atv, self.atv._volume_level
-            ) as volume_level:
+            with patch_calls(self.atv, self.atv._parse_stream_music) as parse_stream_music, patch_calls(
+                self.atv, self.atv._volume
+            ) as volume, patch_calls(self.atv, self.atv._volume_level) as volume_level:
                 await self.atv.stream_music_properties()
-                assert audio_output_device.called
-                assert is_volume_muted.called
+                assert parse_stream_music.called
                 assert volume.called
                 assert volume_level.called
 
-            with patch_calls(self.atv, self.atv._audio_output_device) as audio_output_device:
+            with patch_calls(self.atv, self.atv._parse_stream_music) as parse_stream_music:
                 await self.atv.audio_output_device()
-                assert audio_output_device.called
+                assert parse_stream_music.called
 
-            with patch_calls(self.atv, self.atv._is_volume_muted) as is_volume_muted:
+            with patch_calls(self.atv, self.atv._parse_stream_music) as parse_stream_music:
                 await self.atv.is_volume_muted()
-                assert is_volume_muted.called
+                assert parse_stream_music.called
 
             with patch_calls(self.atv, self.atv._volume) as volume:
                 await self.atv.volume()
@@ -271,6 +283,37 @@ class TestAndroidTVAsyncPython(unittest.TestCase):
                 assert not running_apps.called
                 assert get_hdmi_input.called
 
+    @awaiter
+    async def test_get_properties_fused(self):
+        """Check that ``get_properties(fused=True)`` works correctly."""
+        with async_patchers.patch_shell(FUSED_PROPERTIES_OUTPUT)[self.PATCH_KEY]:
+            properties = await self.atv.get_properties(get_running_apps=False, lazy=True, fused=True)
+            self.assertEqual(
+                getattr(self.atv._adb, self.ADB_ATTR).shell_cmd, self.atv._cmd_fused_properties(False, True)
+            )
+            self.assertTupleEqual(
+                properties,
+                (
+                    True,
+                    True,
+                    constants.STATE_PAUSED,
+                    2,
+                    "com.netflix.ninja",
+                    3,
+                    "hmdi_arc",
+                    False,
+                    22,
+                    ["com.netflix.ninja"],
+                    "HW2",
+                ),
+            )
+
+        with async_patchers.patch_shell(["Failed to write while dumping service", FUSED_PROPERTIES_OUTPUT])[
+            self.PATCH_KEY
+        ]:
+            properties = await self.atv.get_properties_dict(get_running_apps=False, fused=True)
+            self.assertEqual(properties["current_app"], "com.netflix.ninja")
+
     @awaiter
     async def test_get_properties_dict(self):
         """Check that ``get_properties_dict()`` works correctly."""
@@ -299,5 +342,217 @@ class TestAndroidTVAsyncServer(TestAndroidTVAsyncPython):
             await self.atv.adb_connect()
 
 
+class TestAndroidTVAsyncChanges(unittest.TestCase):
+    """Test the ``changes`` and ``subscribe`` methods."""
+
+    UPDATES = [
+        (constants.STATE_PLAYING, "com.netflix.ninja", None, "hmdi_arc", False, 0.5, None),
+        (constants.STATE_PLAYING, "com.netflix.ninja", None, "hmdi_arc", False, 0.5, None),
+        (constants.STATE_PAUSED, "com.netflix.ninja", None, "hmdi_arc", False, 0.6, None),
+        (constants.STATE_PAUSED, "com.netflix.ninja", None, "hmdi_arc", False, 0.6, None),
+    ]
+
+    def setUp(self):
+        with async_patchers.PATCH_ADB_DEVICE_TCP:
+            self.atv = AndroidTVAsync("HOST", 5555)
+
+        self.update_calls = []
+        updates = iter(self.UPDATES)
+
+        async def update(**kwargs):
+            self.update_calls.append(kwargs)
+            try:
+                return next(updates)
+            except StopIteration:
+                return self.UPDATES[-1]
+
+        self.atv.update = update
+
+    @awaiter
+    async def test_changes(self):
+        """Check that only the fields that changed are yielded."""
+        results = []
+        async for changes in self.atv.changes(interval_s=0, lazy=False):
+            results.append(changes)
+            if len(results) == 2:
+                break
+
+        self.assertEqual(
+            results[0],
+            {
+                "state": constants.STATE_PLAYING,
+                "current_app": "com.netflix.ninja",
+                "running_apps": None,
+                "audio_output_device": "hmdi_arc",
+                "is_volume_muted": False,
+                "volume_level": 0.5,
+                "hdmi_input": None,
+            },
+        )
+        self.assertEqual(results[1], {"state": constants.STATE_PAUSED, "volume_level": 0.6})
+        self.assertEqual(self.update_calls[0], {"lazy": False})
+
+        # The poll loop has stopped
+        await asyncio.sleep(0.01)
+        self.assertIsNone(self.atv._poll_task)
+        self.assertListEqual(self.atv._subscribers, [])
+
+    @awaiter
+    async def test_changes_fields(self):
+        """Check that only the requested fields are yielded."""
+        changes = self.atv.changes(fields=["volume_level"], interval_s=0)
+        self.assertEqual(await changes.__anext__(), {"volume_level": 0.5})
+        self.assertEqual(await changes.__anext__(), {"volume_level": 0.6})
+        await changes.aclose()
+
+        with self.assertRaises(ValueError):
+            async for changes in self.atv.changes(fields=["volume"]):
+                pass
+
+    @awaiter
+    async def test_changes_coalesced(self):
+        """Check that changes are coalesced when the subscriber falls behind."""
+        changes = self.atv.changes(interval_s=0)
+        await changes.__anext__()
+
+        # Let the poll loop run through all of the updates
+        while len(self.update_calls) < len(self.UPDATES) + 1:
+            await asyncio.sleep(0)
+
+        self.assertEqual(await changes.__anext__(), {"state": constants.STATE_PAUSED, "volume_level": 0.6})
+        await changes.aclose()
+
+    @awaiter
+    async def test_subscribe(self):
+        """Check that callbacks and coroutine callbacks receive the changes."""
+        results = []
+        async_results = []
+
+        async def async_callback(changes):
+            async_results.append(changes)
+
+        unsubscribe = self.atv.subscribe(results.append, fields=["state"], interval_s=0)
+        async_unsubscribe = self.atv.subscribe(async_callback, fields=["state", "volume_level"], interval_s=0)
+
+        # The `update` arguments must match those of the existing subscribers
+        with self.assertRaises(ValueError):
+            self.atv.subscribe(results.append, lazy=False)
+
+        while len(self.update_calls) < len(self.UPDATES):
+            await asyncio.sleep(0)
+        await asyncio.sleep(0)
+
+        await unsubscribe()
+        self.assertIsNotNone(self.atv._poll_task)
+        await async_unsubscribe()
+        self.assertIsNone(self.atv._poll_task)
+
+        self.assertEqual(results, [{"state": constants.STATE_PLAYING}, {"state": constants.STATE_PAUSED}])
+        self.assertEqual(
+            async_results,
+            [
+                {"state": constants.STATE_PLAYING, "volume_level": 0.5},
+                {"state": constants.STATE_PAUSED, "volume_level": 0.6},
+            ],
+        )
+
+    @awaiter
+    async def test_update_fails(self):
+        """Check that the poll loop keeps running if an update raises an exception."""
+
+        async def update(**kwargs):
+            self.update_calls.append(kwargs)
+            if len(self.update_calls) == 1:
+                raise RuntimeError("failed")
+            return self.UPDATES[0]
+
+        self.atv.update = update
+        changes = self.atv.changes(fields=["state"], interval_s=0)
+        self.assertEqual(await changes.__anext__(), {"state": constants.STATE_PLAYING})
+        self.assertEqual(len(self.update_calls), 2)
+        await changes.aclose()
+
+    @awaiter
+    async def test_watch_events(self):
+        """Check that changes from the event log are applied without a full update until the stream is lost."""
+        properties = {
+            "screen_on": True,
+            "awake": True,
+            "audio_state": constants.STATE_IDLE,
+            "wake_lock_size": 2,
+            "current_app": constants.APP_NETFLIX,
+            "media_session_state": 3,
+            "audio_output_device": "hmdi_arc",
+            "is_volume_muted": False,
+            "volume": None,
+            "running_apps": None,
+            "hdmi_input": None,
+        }
+        properties_calls = []
+        events_queue = asyncio.Queue()
+
+        async def get_properties_dict(**kwargs):
+            properties_calls.append(kwargs)
+            return dict(properties)
+
+        async def events():
+            while True:
+                event = await events_queue.get()
+                if event is None:
+                    return
+                yield event
+
+        self.atv.get_properties_dict = get_properties_dict
+        self.atv.events = events
+        self.atv.watch_events = True
+
+        changes = self.atv.changes(fields=["state", "current_app"], interval_s=60, lazy=False)
+        self.assertEqual(
+            await changes.__anext__(), {"state": constants.STATE_PLAYING, "current_app": constants.APP_NETFLIX}
+        )
+
+        await events_queue.put({"current_app": constants.APP_ATV_LAUNCHER})
+        self.assertEqual(
+            await changes.__anext__(), {"state": constants.STATE_IDLE, "current_app": constants.APP_ATV_LAUNCHER}
+        )
+
+        await events_queue.put({"screen_on": False, "awake": False})
+        self.assertEqual(await changes.__anext__(), {"state": constants.STATE_OFF})
+        self.assertListEqual(properties_calls, [{"lazy": False}])
+
+        # Losing the event stream triggers a full update
+        await events_queue.put(None)
+        self.assertEqual(
+            await changes.__anext__(), {"state": constants.STATE_PLAYING, "current_app": constants.APP_NETFLIX}
+        )
+        self.assertEqual(len(properties_calls), 2)
+        self.assertListEqual(self.update_calls, [])
+        await changes.aclose()
+
+    @awaiter
+    async def test_poll_scheduler(self):
+        """Check that the poll loop records updates in the scheduler and wakes up early when a command is sent."""
+        self.atv.poll_scheduler = AdaptivePollScheduler(
+            state_intervals_s={constants.STATE_PLAYING: 10.0}, min_interval_s=0, burst_interval_s=0
+        )
+        self.atv.poll_scheduler.attach(self.atv)
+
+        changes = self.atv.changes(fields=["state"], interval_s=0)
+        self.assertEqual(await changes.__anext__(), {"state": constants.STATE_PLAYING})
+        self.assertEqual(self.atv.poll_scheduler.state, constants.STATE_PLAYING)
+
+        # The poll loop is waiting for 10 seconds
+        await asyncio.sleep(0.01)
+        self.assertEqual(len(self.update_calls), 1)
+
+        # Sending a command wakes the poll loop and starts a burst of updates
+        with async_patchers.patch_connect(True)["python"], async_patchers.patch_shell("")["python"]:
+            await self.atv.adb_connect()
+            await self.atv.media_play()
+
+        self.assertEqual(await changes.__anext__(), {"state": constants.STATE_PAUSED})
+        await changes.aclose()
+
+
 if __name__ == "__main__":
     unittest.main()
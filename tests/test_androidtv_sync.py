@@ -84,6 +84,22 @@ GET_PROPERTIES_OUTPUT = (
 )
 STATE_NONE = (None, None, None, None, None, None, None)
 
+MEDIA_SESSION_STATE_OUTPUT = "com.netflix.ninja\nstate=PlaybackState {state=3, position=0, buffered position=0, speed=0.0, updated=65749, actions=240640, custom actions=[], active item id=-1, error=null}"
+
+FUSED_PROPERTIES_OUTPUT = "".join(
+    "{0}{1}\n{2}\n".format(constants.FUSED_DELIMITER, name, output)
+    for name, output in [
+        ("screen_on_awake_wake_lock_size", "11Wake Locks: size=2"),
+        ("audio_state", "1"),
+        ("current_app_media_session_state", MEDIA_SESSION_STATE_OUTPUT),
+        ("stream_music", STREAM_MUSIC_ON),
+        ("running_apps", RUNNING_APPS_OUTPUT),
+        ("hdmi_input", "HW2"),
+    ]
+)
+
+FUSED_PROPERTIES_OUTPUT_OFF = "{0}screen_on_awake_wake_lock_size\n00\n".format(constants.FUSED_DELIMITER)
+
 STATE_DETECTION_RULES1 = {"com.amazon.tv.launcher": ["off"]}
 STATE_DETECTION_RULES2 = {"com.amazon.tv.launcher": ["media_session_state", "off"]}
 STATE_DETECTION_RULES3 = {"com.amazon.tv.launcher": [{"idle": {"wake_lock_size": 2}}]}
@@ -334,6 +350,54 @@ class TestAndroidTVSyncPython(unittest.TestCase):
                 assert not running_apps.called
                 assert get_hdmi_input.called
 
+    def test_get_properties_fused(self):
+        """Check that ``get_properties(fused=True)`` works correctly."""
+        with patchers.patch_shell(FUSED_PROPERTIES_OUTPUT)[self.PATCH_KEY]:
+            properties = self.atv.get_properties(lazy=True, fused=True)
+            self.assertEqual(
+                getattr(self.atv._adb, self.ADB_ATTR).shell_cmd, self.atv._cmd_fused_properties(True, True)
+            )
+            self.assertTupleEqual(
+                properties,
+                (
+                    True,
+                    True,
+                    constants.STATE_PAUSED,
+                    2,
+                    "com.netflix.ninja",
+                    3,
+                    "hmdi_arc",
+                    False,
+                    22,
+                    RUNNING_APPS_LIST,
+                    "HW2",
+                ),
+            )
+
+            properties = self.atv.get_properties(get_running_apps=False, lazy=False, fused=True)
+            self.assertNotIn(constants.CMD_RUNNING_APPS, getattr(self.atv._adb, self.ADB_ATTR).shell_cmd)
+            self.assertListEqual(properties[9], ["com.netflix.ninja"])
+
+        with patchers.patch_shell(FUSED_PROPERTIES_OUTPUT_OFF)[self.PATCH_KEY]:
+            properties = self.atv.get_properties(lazy=True, fused=True)
+            self.assertTupleEqual(properties, (False, False, None, None, None, None, None, None, None, None, None))
+
+        with patchers.patch_shell(None)[self.PATCH_KEY]:
+            properties = self.atv.get_properties(lazy=True, fused=True)
+            self.assertTupleEqual(properties, (None, None, None, None, None, None, None, None, None, None, None))
+
+        # Retry if the power service fails to dump
+        with patchers.patch_shell(["Failed to write while dumping service", FUSED_PROPERTIES_OUTPUT])[self.PATCH_KEY]:
+            properties = self.atv.get_properties(lazy=True, fused=True)
+            self.assertEqual(properties[4], "com.netflix.ninja")
+
+        with patchers.patch_shell(FUSED_PROPERTIES_OUTPUT)[self.PATCH_KEY]:
+            state = self.atv.update(fused=True)
+            self.assertTupleEqual(
+                state,
+                (constants.STATE_PLAYING, "com.netflix.ninja", RUNNING_APPS_LIST, "hmdi_arc", False, 22 / 60.0, "HW2"),
+            )
+
     def test_get_properties_dict(self):
         """Check that ``get_properties_dict()`` works correctly."""
         with patchers.patch_shell(None)[self.PATCH_KEY]:
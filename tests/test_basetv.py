@@ -6,6 +6,7 @@ sys.path.insert(0, "..")
 
 from androidtv import constants
 from androidtv.androidtv.base_androidtv import BaseAndroidTV
+from androidtv.basetv.basetv import BaseTV, StreamMusic
 from androidtv.firetv.base_firetv import BaseFireTV
 
 
@@ -17,3 +18,148 @@ class TestBaseTV(unittest.TestCase):
     def test_base_fire_tv(self):
         """Test that ``BaseFireTV.__init__`` runs without error."""
         BaseFireTV("host")
+
+    def test_update_fields(self):
+        """Test that ``UPDATE_FIELDS`` matches the values returned by ``_update``."""
+        self.assertEqual(len(BaseAndroidTV.UPDATE_FIELDS), len(BaseAndroidTV("host")._update(*[None] * 11)))
+        self.assertEqual(len(BaseFireTV.UPDATE_FIELDS), len(BaseFireTV("host")._update(*[None] * 7)))
+
+    def test_cmd_fused(self):
+        """Test that ``BaseTV._cmd_fused`` builds the expected commands."""
+        commands = [("first", "FIRST"), ("second", "SECOND")]
+
+        self.assertEqual(
+            BaseTV._cmd_fused(commands),
+            "echo '{0}first' ; ( FIRST ) ; echo ; echo '{0}second' ; ( SECOND ) ; echo".format(
+                constants.FUSED_DELIMITER
+            ),
+        )
+
+        self.assertEqual(
+            BaseTV._cmd_fused(commands, lazy=True),
+            "echo '{0}first' ; SCREEN_ON_AWAKE=$(FIRST) ; echo \"$SCREEN_ON_AWAKE\" ; "
+            "case \"$SCREEN_ON_AWAKE\" in 11*) echo '{0}second' ; ( SECOND ) ; echo ;; esac".format(
+                constants.FUSED_DELIMITER
+            ),
+        )
+
+        self.assertEqual(
+            BaseTV._cmd_fused(commands[:1], lazy=True),
+            "echo '{0}first' ; SCREEN_ON_AWAKE=$(FIRST) ; echo \"$SCREEN_ON_AWAKE\"".format(constants.FUSED_DELIMITER),
+        )
+
+    def test_parse_fused(self):
+        """Test that ``BaseTV._parse_fused`` splits the output into sections."""
+        self.assertDictEqual(BaseTV._parse_fused(None), {})
+
+        output = "{0}first\n11\n{0}second\nline1\nline2\n\n{0}third\n\n".format(constants.FUSED_DELIMITER)
+        self.assertDictEqual(BaseTV._parse_fused(output), {"first": "11", "second": "line1\nline2\n", "third": ""})
+
+        output = "{0}first\r\n11\r\n{0}second\r\n\r\n".format(constants.FUSED_DELIMITER)
+        self.assertDictEqual(BaseTV._parse_fused(output), {"first": "11", "second": ""})
+
+    def test_parse_stream_music(self):
+        """Test that ``BaseTV._parse_stream_music`` gets the properties from the ``STREAM_MUSIC`` block."""
+        self.assertEqual(BaseTV._parse_stream_music(None), StreamMusic(None, None, None, {}))
+        self.assertEqual(BaseTV._parse_stream_music(""), StreamMusic(None, None, None, {}))
+
+        # There is no terminating "- STREAM" line
+        self.assertEqual(
+            BaseTV._parse_stream_music("- STREAM_MUSIC:\n   Muted: false\n   Max: 60"),
+            StreamMusic(None, None, None, {}),
+        )
+
+        stream_music_raw = """- STREAM_MUSIC:
+   Muted: true
+   Min: 0
+   Max: 15
+   Current: 2 (speaker): 11, 4 (headset): 10, 400 (hdmi): 6, 40000000 (default): 11
+   Devices: hdmi
+- STREAM_ALARM:
+   Muted: false
+   Max: 7
+   Current: 2 (speaker): 3, 400 (hdmi): 3
+   Devices: speaker"""
+        self.assertEqual(
+            BaseTV._parse_stream_music(stream_music_raw),
+            StreamMusic("hdmi", True, 15, {"speaker": 11, "headset": 10, "hdmi": 6, "default": 11}),
+        )
+
+        # Android 12 reports the stream alias and indents the fields differently
+        stream_music_raw = """- STREAM_MUSIC:
+      Muted: false
+      Muted Internally: false
+      Min: 0
+      Max: 25
+      streamVolume:8
+      Current: 2 (speaker): 8, 4000000 (usb_headset): 5, 40000000 (default): 8
+      Devices: speaker
+      Volume Group: AUDIO_STREAM_MUSIC
+- STREAM_ALARM:"""
+        self.assertEqual(
+            BaseTV._parse_stream_music(stream_music_raw),
+            StreamMusic("speaker", False, 25, {"speaker": 8, "usb_headset": 5, "default": 8}),
+        )
+
+    def test_volume(self):
+        """Test that ``BaseTV._volume`` gets the volume of the current audio device and sets ``max_volume``."""
+        btv = BaseAndroidTV("host")
+        self.assertIsNone(btv._volume(StreamMusic(None, None, 60, {"speaker": 20})))
+        self.assertEqual(btv.max_volume, 60.0)
+
+        # ``max_volume`` is only set once
+        self.assertEqual(btv._volume(StreamMusic("hdmi", False, 15, {"speaker": 20, "hdmi": 6})), 6)
+        self.assertEqual(btv.max_volume, 60.0)
+
+        self.assertIsNone(btv._volume(StreamMusic("hdmi", False, 15, {"speaker": 20})))
+
+    def test_parse_event(self):
+        """Test that ``BaseTV._parse_event`` gets the properties from a line of ``logcat`` output."""
+        self.assertDictEqual(BaseTV._parse_event(""), {})
+        self.assertDictEqual(BaseTV._parse_event("--------- beginning of events"), {})
+        self.assertDictEqual(BaseTV._parse_event("I/screen_toggled( 1234): 0"), {"screen_on": False, "awake": False})
+        self.assertDictEqual(BaseTV._parse_event("I/screen_toggled(  987): 1\r"), {"screen_on": True, "awake": True})
+        self.assertDictEqual(
+            BaseTV._parse_event(
+                "I/am_set_resumed_activity( 1234): [0,com.netflix.ninja/.MainActivity,resumeTopActivityInnerLocked]"
+            ),
+            {"current_app": "com.netflix.ninja"},
+        )
+        self.assertDictEqual(
+            BaseTV._parse_event("I/am_focused_activity(  567): [com.amazon.tv.launcher/.ui.HomeActivity_vNext]"),
+            {"current_app": "com.amazon.tv.launcher"},
+        )
+        self.assertDictEqual(BaseTV._parse_event("I/am_focused_activity(  567): [0,NULL]"), {})
+
+    def test_compile_state_detection_rules(self):
+        """Test that ``BaseTV._compile_state_detection_rules`` drops the rules that can never be used."""
+        self.assertDictEqual(BaseTV._compile_state_detection_rules(None), {})
+
+        table = BaseTV._compile_state_detection_rules(
+            {
+                "app1": ["media_session_state", "idle", "audio_state"],
+                "app2": [{"INVALID": {"wake_lock_size": 1}}, {"paused": {"INVALID": 1}}, {"playing": "INVALID"}],
+                "app3": [{"paused": {"wake_lock_size": 1}, "playing": {}}, "audio_state"],
+            }
+        )
+        self.assertEqual(len(table["app1"]), 2)
+        self.assertEqual(table["app2"], ())
+        self.assertEqual(len(table["app3"]), 3)
+
+        self.assertEqual(BaseTV._evaluate_state_detection_rules(table["app1"], media_session_state=3), "playing")
+        self.assertEqual(BaseTV._evaluate_state_detection_rules(table["app1"], audio_state="paused"), "idle")
+        self.assertIsNone(BaseTV._evaluate_state_detection_rules(table["app2"], wake_lock_size=1))
+        self.assertEqual(BaseTV._evaluate_state_detection_rules(table["app3"], wake_lock_size=1), "paused")
+        self.assertEqual(BaseTV._evaluate_state_detection_rules(table["app3"], wake_lock_size=2), "playing")
+
+    def test_state_detection_rules_setter(self):
+        """Test that the state detection rules are compiled when they are set."""
+        btv = BaseAndroidTV("host", state_detection_rules={"app": ["paused"]})
+        self.assertEqual(btv._custom_state_detection("app"), "paused")
+
+        btv._state_detection_rules = {"app": ["standby"]}
+        self.assertDictEqual(btv._state_detection_rules, {"app": ["standby"]})
+        self.assertEqual(btv._custom_state_detection("app"), "standby")
+
+        btv._state_detection_rules = None
+        self.assertIsNone(btv._custom_state_detection("app"))
@@ -33,6 +33,147 @@ class TestBaseTVAsyncPython(unittest.TestCase):
         """Test that the available property works correctly."""
         self.assertTrue(self.btv.available)
 
+    @awaiter
+    async def test_single_flight_ttl(self):
+        """Check that the response to a polling command is reused if a TTL is set."""
+        with async_patchers.patch_shell("1")[self.PATCH_KEY]:
+            self.assertTrue(await self.btv.screen_on())
+
+        self.btv.set_single_flight_ttl(60.0)
+        with async_patchers.patch_shell("0")[self.PATCH_KEY]:
+            self.assertFalse(await self.btv.screen_on())
+        with async_patchers.patch_shell("1")[self.PATCH_KEY]:
+            self.assertFalse(await self.btv.screen_on())
+
+        self.btv.set_single_flight_ttl(0)
+        with async_patchers.patch_shell("1")[self.PATCH_KEY]:
+            self.assertTrue(await self.btv.screen_on())
+
+    @awaiter
+    async def test_single_flight_ttl_control_command(self):
+        """Check that the reused responses are discarded when a control command is sent."""
+        self.btv.set_single_flight_ttl(60.0)
+        with async_patchers.patch_shell("1")[self.PATCH_KEY]:
+            self.assertTrue(await self.btv.screen_on())
+            await self.btv.launch_app("com.app")
+
+        with async_patchers.patch_shell("0")[self.PATCH_KEY]:
+            self.assertFalse(await self.btv.screen_on())
+
+    @awaiter
+    async def test_single_flight_ttl_adb_shell(self):
+        """Check that the response to an arbitrary command is not reused, even if a TTL is set."""
+        self.btv.set_single_flight_ttl(60.0)
+        with async_patchers.patch_shell("a")[self.PATCH_KEY]:
+            self.assertEqual(await self.btv.adb_shell("input text a"), "a")
+        with async_patchers.patch_shell("b")[self.PATCH_KEY]:
+            self.assertEqual(await self.btv.adb_shell("input text a"), "b")
+
+    @awaiter
+    async def test_changes_no_update(self):
+        """Test that ``changes`` raises an exception because ``BaseTVAsync`` does not have an ``update`` method."""
+        with self.assertRaises(TypeError):
+            async for _ in self.btv.changes():
+                pass
+
+    @awaiter
+    async def test_events(self):
+        """Test that ``events`` yields the properties from the device's event log."""
+
+        async def streaming_shell(cmd):
+            self.assertEqual(cmd, constants.CMD_WATCH_EVENTS)
+            for line in [
+                "--------- beginning of events",
+                "I/am_set_resumed_activity( 1234): [0,com.netflix.ninja/.MainActivity,resumeTopActivityInnerLocked]",
+                "I/screen_toggled( 1234): 0",
+            ]:
+                yield line
+
+        with patch.object(self.btv._adb, "streaming_shell", streaming_shell):
+            self.assertListEqual(
+                [properties async for properties in self.btv.events()],
+                [{"current_app": "com.netflix.ninja"}, {"screen_on": False, "awake": False}],
+            )
+
+    @awaiter
+    async def test_stream_screen(self):
+        """Test that ``stream_screen`` restarts ``screenrecord`` until the time limit is reached."""
+        commands = []
+
+        async def streaming_exec_out(cmd):
+            commands.append(cmd)
+            for chunk in [b"\x00\x00\x00\x01", b"\x67"]:
+                yield chunk
+
+        with patch.object(self.btv._adb, "streaming_exec_out", streaming_exec_out), patch(
+            "androidtv.basetv.basetv_async.time.monotonic",
+            side_effect=[0.0, 0.0, 180.0, 180.0, 199.5, 199.5, 200.0, 200.0],
+        ):
+            chunks = [chunk async for chunk in self.btv.stream_screen(1000000, "1280x720", 200)]
+
+        self.assertEqual(len(chunks), 6)
+        self.assertListEqual(
+            commands,
+            [
+                "screenrecord --output-format=h264 --bit-rate 1000000 --time-limit 180 --size 1280x720 -",
+                "screenrecord --output-format=h264 --bit-rate 1000000 --time-limit 20 --size 1280x720 -",
+                "screenrecord --output-format=h264 --bit-rate 1000000 --time-limit 1 --size 1280x720 -",
+            ],
+        )
+
+        async def streaming_exec_out_empty(cmd):
+            commands.append(cmd)
+            return
+            yield  # pylint: disable=unreachable
+
+        # The stream ends if the recorder does not start
+        commands = []
+        with patch.object(self.btv._adb, "streaming_exec_out", streaming_exec_out_empty):
+            self.assertListEqual([chunk async for chunk in self.btv.stream_screen()], [])
+        self.assertListEqual(
+            commands, [constants.CMD_SCREENRECORD.format(constants.DEFAULT_SCREENRECORD_BITRATE, 180, "")]
+        )
+
+        async def streaming_exec_out_error(cmd):
+            commands.append(cmd)
+            for chunk in [b"ERR", b"OR: unable to create video/avc codec\n"]:
+                yield chunk
+
+        # Error messages are not passed on as H.264
+        commands = []
+        with patch.object(self.btv._adb, "streaming_exec_out", streaming_exec_out_error):
+            with self.assertLogs("androidtv.basetv.basetv_async", "WARNING") as logs:
+                self.assertListEqual([chunk async for chunk in self.btv.stream_screen()], [])
+        self.assertEqual(len(commands), 1)
+        self.assertIn("ERROR: unable to create video/avc codec", logs.output[0])
+
+        # The stream ends if the recorder exits well before its time limit
+        commands = []
+        with patch.object(self.btv._adb, "streaming_exec_out", streaming_exec_out), patch(
+            "androidtv.basetv.basetv_async.time.monotonic", side_effect=[0.0, 5.0]
+        ):
+            self.assertListEqual([chunk async for chunk in self.btv.stream_screen()], [b"\x00\x00\x00\x01", b"\x67"])
+        self.assertEqual(len(commands), 1)
+
+    @awaiter
+    async def test_command_listeners(self):
+        """Test that command listeners are called when control commands are sent."""
+        commands = []
+        remove_listener = self.btv.add_command_listener(commands.append)
+
+        with async_patchers.patch_connect(True)[self.PATCH_KEY], async_patchers.patch_shell("")[self.PATCH_KEY]:
+            await self.btv.adb_shell("TEST")
+            await self.btv.launch_app("TEST")
+            await self.btv.stop_app("TEST")
+            await self.btv.media_play()
+            self.btv.max_volume = 15
+            await self.btv.set_volume_level(0.5)
+            self.assertListEqual(commands, ["launch_app", "stop_app", "key", "set_volume_level"])
+
+            remove_listener()
+            await self.btv.media_pause()
+            self.assertEqual(len(commands), 4)
+
     @awaiter
     async def test_adb_close(self):
         """Test that the ``adb_close`` method works correctly."""
@@ -233,6 +233,24 @@ class TestBaseTVSyncPython(unittest.TestCase):
         with patch.object(self.btv._adb, "screencap", return_value=PNG_IMAGE):
             self.assertEqual(self.btv.adb_screencap(), PNG_IMAGE)
 
+    def test_command_listeners(self):
+        """Test that command listeners are called when control commands are sent."""
+        commands = []
+        remove_listener = self.btv.add_command_listener(commands.append)
+
+        with patchers.patch_connect(True)[self.PATCH_KEY], patchers.patch_shell("")[self.PATCH_KEY]:
+            self.btv.adb_shell("TEST")
+            self.btv.launch_app("TEST")
+            self.btv.stop_app("TEST")
+            self.btv.media_play()
+            self.btv.max_volume = 15
+            self.btv.set_volume_level(0.5)
+            self.assertListEqual(commands, ["launch_app", "stop_app", "key", "set_volume_level"])
+
+            remove_listener()
+            self.btv.media_pause()
+            self.assertEqual(len(commands), 4)
+
     def test_keys(self):
         """Test that the key methods send the correct commands."""
         with patchers.patch_connect(True)[self.PATCH_KEY], patchers.patch_shell("")[self.PATCH_KEY]:
@@ -0,0 +1,74 @@
+import sys
+import unittest
+
+
+sys.path.insert(0, "..")
+
+from androidtv import constants
+from benchmarks import __main__ as runner
+from benchmarks.bench_update import TimeUpdate
+from benchmarks.recordings import RECORDINGS
+from benchmarks.replay import Replay
+
+
+class TestReplay(unittest.TestCase):
+    def test_recordings(self):
+        """Check that each recording gives the same update whether or not the commands are fused."""
+        for device in RECORDINGS:
+            with self.subTest(device=device):
+                bench = TimeUpdate()
+                bench.setup(device)
+
+                try:
+                    update = bench.tv_sync.update()
+                    self.assertIsNotNone(update[0])
+                    self.assertIsNotNone(update[1])
+                    self.assertEqual(bench.tv_sync.update(fused=True), update)
+                    self.assertEqual(bench.loop.run_until_complete(bench.tv_async.update()), update)
+                    self.assertEqual(bench.loop.run_until_complete(bench.tv_async.update(fused=True)), update)
+
+                finally:
+                    bench.teardown(device)
+
+    def test_lazy(self):
+        """Check that only the first section of a lazy fused command is replayed when the device is off."""
+        recording = dict(RECORDINGS["android9"], screen_on_awake_wake_lock_size="")
+        replay = Replay(recording)
+        bench = TimeUpdate()
+        bench.setup("android9")
+
+        try:
+            bench.tv_sync._adb._adb.replay = replay
+            self.assertEqual(bench.tv_sync.update(lazy=True, fused=True)[0], constants.STATE_OFF)
+            self.assertEqual(replay.count, 1)
+
+        finally:
+            bench.teardown("android9")
+
+
+class TestRunner(unittest.TestCase):
+    def test_iter_benchmarks(self):
+        """Check that the benchmarks are discovered."""
+        names = [name for name, _, _ in runner.iter_benchmarks("update_sync")]
+        self.assertIn("bench_update.TimeUpdate.time_update_sync", names)
+        self.assertIn("bench_update.CpuUpdate.time_update_sync_fused", names)
+        self.assertNotIn("bench_update.TimeUpdate.time_update_async", names)
+
+    def test_iter_params(self):
+        """Check that the parameters are combined like in asv."""
+
+        class Single(object):
+            params = ["a", "b"]
+            param_names = ["x"]
+
+        class Multiple(object):
+            params = [["a", "b"], [1, 2]]
+            param_names = ["x", "y"]
+
+        self.assertListEqual(list(runner.iter_params(object)), [()])
+        self.assertListEqual(list(runner.iter_params(Single)), [("a",), ("b",)])
+        self.assertListEqual(list(runner.iter_params(Multiple)), [("a", 1), ("a", 2), ("b", 1), ("b", 2)])
+
+
+if __name__ == "__main__":
+    unittest.main()
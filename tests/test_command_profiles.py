@@ -0,0 +1,107 @@
+import sys
+import unittest
+from unittest.mock import patch
+
+
+sys.path.insert(0, "..")
+
+from androidtv import command_profiles, constants
+from androidtv.androidtv.androidtv_sync import AndroidTVSync
+from androidtv.command_profiles import CommandProfile, DeviceFamily, register_device_family
+from androidtv.firetv.firetv_sync import FireTVSync
+
+from . import patchers
+
+
+CHROMECAST_PROPERTIES = {"manufacturer": "Google", "model": "Chromecast", "sw_version": "12", "product_id": "sabrina"}
+
+ASKEY_PROPERTIES = {"manufacturer": "askey", "model": "", "sw_version": "11", "product_id": "sti6130d350"}
+
+
+class TestCommandProfile(unittest.TestCase):
+    def test_default(self):
+        """Check that the defaults are used when no device family matches."""
+        profile = CommandProfile(constants.DeviceEnum.ANDROIDTV, {"sw_version": "9"})
+        self.assertDictEqual(profile.commands, command_profiles.DEFAULT_COMMANDS)
+        self.assertSetEqual(set(profile.sources.values()), {"default"})
+
+    def test_families(self):
+        """Check that the first matching family that provides a command wins."""
+        profile = CommandProfile(constants.DeviceEnum.ANDROIDTV, CHROMECAST_PROPERTIES)
+        self.assertEqual(profile.commands["current_app"], constants.CMD_CURRENT_APP_GOOGLE_TV)
+        self.assertEqual(profile.commands["launch_app"], constants.CMD_LAUNCH_APP_GOOGLE_TV)
+        self.assertEqual(profile.commands["audio_state"], constants.CMD_AUDIO_STATE11)
+        self.assertEqual(profile.commands["turn_off"], constants.CMD_TURN_OFF_ANDROIDTV)
+        self.assertEqual(profile.sources["current_app"], "google_tv")
+        self.assertEqual(profile.sources["audio_state"], "android12")
+
+        profile = CommandProfile(constants.DeviceEnum.ANDROIDTV, ASKEY_PROPERTIES)
+        self.assertEqual(
+            profile.commands["current_app_media_session_state"],
+            constants.CMD_CURRENT_APP_MEDIA_SESSION_STATE_ASKEY_STI6130,
+        )
+        self.assertEqual(profile.commands["launch_app"], constants.CMD_LAUNCH_APP11)
+
+        profile = CommandProfile(constants.DeviceEnum.ANDROIDTV, {"sw_version": "14"})
+        self.assertEqual(profile.commands["current_app"], constants.CMD_CURRENT_APP13)
+        self.assertEqual(profile.commands["volume_set"], constants.CMD_VOLUME_SET_COMMAND11)
+
+        # The Android version does not matter for Fire TV devices
+        profile = CommandProfile(constants.DeviceEnum.FIRETV, {"sw_version": "11"})
+        self.assertEqual(profile.commands["current_app"], constants.CMD_CURRENT_APP)
+        self.assertEqual(profile.commands["launch_app"], constants.CMD_LAUNCH_APP_FIRETV)
+        self.assertEqual(profile.commands["turn_on"], constants.CMD_TURN_ON_FIRETV)
+
+    def test_custom_commands(self):
+        """Check that custom commands take precedence over the device families."""
+        profile = CommandProfile(constants.DeviceEnum.ANDROIDTV, CHROMECAST_PROPERTIES, {"current_app": "custom"})
+        self.assertEqual(profile.commands["current_app"], "custom")
+        self.assertEqual(profile.sources["current_app"], "custom")
+
+    def test_register_device_family(self):
+        """Check that a new device family can be registered."""
+        family = DeviceFamily("sony", {"hdmi_input": "sony hdmi"}, manufacturer="Sony", sw_versions=["11"])
+
+        with patch.object(command_profiles, "DEVICE_FAMILIES", list(command_profiles.DEVICE_FAMILIES)):
+            register_device_family(family)
+            profile = CommandProfile(constants.DeviceEnum.ANDROIDTV, {"manufacturer": "Sony", "sw_version": "11"})
+            self.assertEqual(profile.commands["hdmi_input"], "sony hdmi")
+            self.assertEqual(profile.commands["current_app"], constants.CMD_CURRENT_APP11)
+
+        self.assertNotIn(family, command_profiles.DEVICE_FAMILIES)
+
+
+class TestCommandProfileDevice(unittest.TestCase):
+    def test_memoized(self):
+        """Check that the commands are only resolved again when the device properties or custom commands change."""
+        with patchers.PATCH_ADB_DEVICE_TCP:
+            atv = AndroidTVSync("HOST", 5555)
+
+        profile = atv.command_profile
+        self.assertIs(atv.command_profile, profile)
+        self.assertEqual(atv._cmd_current_app(), constants.CMD_CURRENT_APP)
+
+        atv.device_properties = dict(CHROMECAST_PROPERTIES)
+        self.assertIsNot(atv.command_profile, profile)
+        self.assertEqual(atv._cmd_current_app(), constants.CMD_CURRENT_APP_GOOGLE_TV)
+
+        profile = atv.command_profile
+        atv.customize_command(constants.CUSTOM_CURRENT_APP, "custom")
+        self.assertIsNot(atv.command_profile, profile)
+        self.assertEqual(atv._cmd_current_app(), "custom")
+
+        atv.customize_command(constants.CUSTOM_CURRENT_APP, None)
+        self.assertEqual(atv._cmd_current_app(), constants.CMD_CURRENT_APP_GOOGLE_TV)
+
+    def test_from_base(self):
+        """Check that the commands are resolved for the type of the device after it is converted."""
+        with patchers.PATCH_ADB_DEVICE_TCP:
+            atv = AndroidTVSync("HOST", 5555)
+
+        self.assertEqual(atv._cmd_launch_app("app"), constants.CMD_LAUNCH_APP.format("app"))
+        ftv = FireTVSync.from_base(atv)
+        self.assertEqual(ftv._cmd_launch_app("app"), constants.CMD_LAUNCH_APP_FIRETV.format("app"))
+
+
+if __name__ == "__main__":
+    unittest.main()
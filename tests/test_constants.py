@@ -77,6 +77,12 @@ class TestConstants(unittest.TestCase):
         # CMD_AWAKE
         self.assertCommand(constants.CMD_AWAKE, r"dumpsys power | grep mWakefulness | grep -q Awake")
 
+        # CMD_BUILD_FINGERPRINT
+        self.assertCommand(constants.CMD_BUILD_FINGERPRINT, r"getprop ro.build.fingerprint")
+
+        # CMD_BYTE_RANGE
+        self.assertCommand(constants.CMD_BYTE_RANGE, r"tail -c +{} {} | head -c {}")
+
         # CMD_CURRENT_APP
         self.assertCommand(
             constants.CMD_CURRENT_APP,
@@ -147,12 +153,18 @@ class TestConstants(unittest.TestCase):
             r"CURRENT_APP=$(dumpsys activity a . | grep mResumedActivity) && CURRENT_APP=${CURRENT_APP#*ActivityRecord{* * } && CURRENT_APP=${CURRENT_APP#*{* * } && CURRENT_APP=${CURRENT_APP%%/*} && CURRENT_APP=${CURRENT_APP%\}*} && echo $CURRENT_APP && dumpsys media_session | grep -A 100 'Sessions Stack' | grep -A 100 $CURRENT_APP | grep -m 1 'state=PlaybackState {'",
         )
 
+        # CMD_DEVICE_FINGERPRINT
+        self.assertCommand(constants.CMD_DEVICE_FINGERPRINT, r"getprop ro.serialno && getprop ro.build.fingerprint")
+
         # CMD_DEVICE_PROPERTIES
         self.assertCommand(
             constants.CMD_DEVICE_PROPERTIES,
             r"getprop ro.product.manufacturer && getprop ro.product.model && getprop ro.serialno && getprop ro.build.version.release && getprop ro.product.vendor.device",
         )
 
+        # CMD_EXEC_OUT_PROBE
+        self.assertCommand(constants.CMD_EXEC_OUT_PROBE, r"echo")
+
         # CMD_HDMI_INPUT
         self.assertCommand(
             constants.CMD_HDMI_INPUT,
@@ -228,6 +240,20 @@ class TestConstants(unittest.TestCase):
         # CMD_RUNNING_APPS
         self.assertCommand(constants.CMD_RUNNING_APPS, r"ps -A | grep u0_a")
 
+        # CMD_SCREENCAP_GEOMETRY
+        self.assertCommand(
+            constants.CMD_SCREENCAP_GEOMETRY,
+            r"screencap {0} && head -c 16 {0} | od -An -tu4 && wc -c < {0} ; rm -f {0}",
+        )
+
+        # CMD_SCREENCAP_RANGES
+        self.assertCommand(constants.CMD_SCREENCAP_RANGES, r"screencap {0} && {{ {1} ; }} ; rm -f {0}")
+
+        # CMD_SCREENRECORD
+        self.assertCommand(
+            constants.CMD_SCREENRECORD, r"screenrecord --output-format=h264 --bit-rate {} --time-limit {}{} -"
+        )
+
         # CMD_SCREEN_ON
         self.assertCommand(
             constants.CMD_SCREEN_ON,
@@ -285,6 +311,12 @@ class TestConstants(unittest.TestCase):
         # CMD_WAKE_LOCK_SIZE
         self.assertCommand(constants.CMD_WAKE_LOCK_SIZE, r"dumpsys power | grep Locks | grep 'size='")
 
+        # CMD_WATCH_EVENTS
+        self.assertCommand(
+            constants.CMD_WATCH_EVENTS,
+            r"logcat -b events -v brief -T 1 -s am_focused_activity:I am_set_resumed_activity:I wm_set_resumed_activity:I screen_toggled:I",
+        )
+
         # Assert that the keys were checked in alphabetical order
         self.assertEqual(self._cmds, sorted(cmds.keys()))
 
@@ -0,0 +1,116 @@
+from io import BytesIO
+import sys
+import unittest
+
+
+sys.path.insert(0, "..")
+
+from adb_shell.adb_device import AdbDeviceTcp
+from adb_shell.adb_device_async import AdbDeviceTcpAsync
+from adb_shell.exceptions import DeviceAuthError
+
+from androidtv import setup
+from androidtv.setup_async import setup as setup_async
+from benchmarks.emulator import AdbEmulator, AdbEmulatorThread, VirtualDevice, make_png
+from benchmarks.replay import Replay
+
+from .async_wrapper import awaiter
+
+
+class SignerFake(object):
+    """A fake signer that is accepted by the emulator."""
+
+    def Sign(self, data):
+        return b"signature"
+
+    def GetPublicKey(self):
+        return "public key"
+
+
+class TestAdbEmulator(unittest.TestCase):
+    @awaiter
+    async def test_shell(self):
+        """Check that shell commands and screencaps are served via the ``adb_shell`` TCP transport."""
+        async with AdbEmulator() as emulator:
+            port = await emulator.add(VirtualDevice("android12", screencap=make_png(4, 4)))
+            adb = AdbDeviceTcpAsync("127.0.0.1", port, default_transport_timeout_s=5.0)
+
+            self.assertTrue(await adb.connect())
+            self.assertEqual(await adb.shell("pm list packages"), Replay("android12").shell("pm list packages"))
+            self.assertEqual(await adb.shell("unknown command"), "")
+            self.assertEqual(await adb.shell("screencap -p", decode=False), make_png(4, 4))
+            await adb.close()
+
+            self.assertEqual(emulator.devices[port].connections, 1)
+            self.assertEqual(emulator.devices[port].streams, 3)
+
+    @awaiter
+    async def test_sync(self):
+        """Check that files can be listed, pulled, and pushed."""
+        async with AdbEmulator() as emulator:
+            device = VirtualDevice(files={"/sdcard/test.txt": b"test", "/sdcard/dir/other.txt": b"other"})
+            port = await emulator.add(device)
+            adb = AdbDeviceTcpAsync("127.0.0.1", port, default_transport_timeout_s=5.0)
+            await adb.connect()
+
+            self.assertEqual((await adb.stat("/sdcard/test.txt"))[1], 4)
+            self.assertEqual([bytes(f.filename) for f in await adb.list("/sdcard")], [b"test.txt"])
+
+            stream = BytesIO()
+            await adb.pull("/sdcard/test.txt", stream)
+            self.assertEqual(stream.getvalue(), b"test")
+
+            # Larger than a single ADB packet
+            data = bytes(range(256)) * 1000
+            await adb.push(BytesIO(data), "/sdcard/pushed.bin")
+            self.assertEqual(device.files["/sdcard/pushed.bin"], data)
+
+            await adb.close()
+
+    @awaiter
+    async def test_auth(self):
+        """Check that authentication is required if ``auth=True``."""
+        async with AdbEmulator() as emulator:
+            port = await emulator.add(VirtualDevice(auth=True))
+
+            adb = AdbDeviceTcpAsync("127.0.0.1", port, default_transport_timeout_s=5.0)
+            with self.assertRaises(DeviceAuthError):
+                await adb.connect()
+
+            self.assertTrue(await adb.connect(rsa_keys=[SignerFake()]))
+            await adb.close()
+
+    @awaiter
+    async def test_update(self):
+        """Check that ``update`` gives the same result via the emulator as via :class:`benchmarks.replay.Replay`."""
+        async with AdbEmulator() as emulator:
+            ports = await emulator.start(2, "android9", latency_s=0.001, jitter_s=0.001)
+
+            atv = await setup_async("127.0.0.1", ports[0])
+            atv_persistent = await setup_async("127.0.0.1", ports[1], persistent_shell=True)
+
+            update = await atv.update()
+            self.assertEqual(update[:2], ("playing", "com.netflix.ninja"))
+            self.assertEqual(await atv.update(fused=True), update)
+            self.assertEqual(await atv_persistent.update(), update)
+            self.assertEqual(await atv_persistent.update(fused=True), update)
+
+            await atv.adb_close()
+            await atv_persistent.adb_close()
+
+    def test_thread(self):
+        """Check that the emulator can be used with the sync API via :class:`AdbEmulatorThread`."""
+        with AdbEmulatorThread(2, "fireos7") as emulator:
+            self.assertEqual(len(emulator.ports), 2)
+
+            adb = AdbDeviceTcp("127.0.0.1", emulator.ports[1], default_transport_timeout_s=5.0)
+            self.assertTrue(adb.connect())
+            adb.close()
+
+            ftv = setup("127.0.0.1", emulator.ports[0])
+            self.assertEqual(ftv.update()[:2], ("playing", "com.amazon.avod"))
+            ftv.adb_close()
+
+
+if __name__ == "__main__":
+    unittest.main()
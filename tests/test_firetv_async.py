@@ -130,6 +130,21 @@ class TestFireTVAsyncPython(unittest.TestCase):
                 assert not running_apps.called
                 assert get_hdmi_input.called
 
+    @awaiter
+    async def test_get_properties_fused(self):
+        """Check that ``get_properties(fused=True)`` works correctly."""
+        fused_output = (
+            "{0}screen_on_awake_wake_lock_size\n11Wake Locks: size=2\n"
+            "{0}current_app_media_session_state\ncom.amazon.tv.launcher\n"
+            "{0}hdmi_input\n\n".format(constants.FUSED_DELIMITER)
+        )
+        with async_patchers.patch_shell(fused_output)[self.PATCH_KEY]:
+            properties = await self.ftv.get_properties(get_running_apps=False, lazy=True, fused=True)
+            self.assertEqual(
+                getattr(self.ftv._adb, self.ADB_ATTR).shell_cmd, self.ftv._cmd_fused_properties(False, True)
+            )
+            self.assertTupleEqual(properties, (True, True, 2, "com.amazon.tv.launcher", None, None, None))
+
     @awaiter
     async def test_get_properties_dict(self):
         """Check that ``get_properties_dict()`` works correctly."""
@@ -29,6 +29,16 @@ RUNNING_APPS_LIST = ["com.netflix.ninja", "com.amazon.device.controllermanager"]
 
 STATE_NONE = (None, None, None, None)
 
+FUSED_PROPERTIES_OUTPUT = "".join(
+    "{0}{1}\n{2}\n".format(constants.FUSED_DELIMITER, name, output)
+    for name, output in [
+        ("screen_on_awake_wake_lock_size", "11Wake Locks: size=2"),
+        ("current_app_media_session_state", "com.amazon.tv.launcher\nstate=3"),
+        ("running_apps", RUNNING_APPS_OUTPUT),
+        ("hdmi_input", "HW2"),
+    ]
+)
+
 STATE_DETECTION_RULES1 = {"com.amazon.tv.launcher": ["off"]}
 STATE_DETECTION_RULES2 = {"com.amazon.tv.launcher": ["media_session_state", "off"]}
 STATE_DETECTION_RULES3 = {"com.amazon.tv.launcher": [{"standby": {"wake_lock_size": 2}}]}
@@ -154,6 +164,25 @@ class TestFireTVSyncPython(unittest.TestCase):
                 assert not running_apps.called
                 assert get_hdmi_input.called
 
+    def test_get_properties_fused(self):
+        """Check that ``get_properties(fused=True)`` works correctly."""
+        with patchers.patch_shell(FUSED_PROPERTIES_OUTPUT)[self.PATCH_KEY]:
+            properties = self.ftv.get_properties(lazy=True, fused=True)
+            self.assertEqual(
+                getattr(self.ftv._adb, self.ADB_ATTR).shell_cmd, self.ftv._cmd_fused_properties(True, True)
+            )
+            self.assertTupleEqual(properties, (True, True, 2, "com.amazon.tv.launcher", 3, RUNNING_APPS_LIST, "HW2"))
+
+        with patchers.patch_shell("{}screen_on_awake_wake_lock_size\n10\n".format(constants.FUSED_DELIMITER))[
+            self.PATCH_KEY
+        ]:
+            properties = self.ftv.get_properties(lazy=True, fused=True)
+            self.assertTupleEqual(properties, (True, False, None, None, None, None, None))
+
+        with patchers.patch_shell(None)[self.PATCH_KEY]:
+            properties = self.ftv.get_properties(get_running_apps=False, lazy=False, fused=True)
+            self.assertTupleEqual(properties, (None, None, None, None, None, None, None))
+
     def test_get_properties_dict(self):
         """Check that ``get_properties_dict()`` works correctly."""
         with patchers.patch_shell(None)[self.PATCH_KEY]:
@@ -0,0 +1,199 @@
+import asyncio
+import sys
+import unittest
+from unittest.mock import patch
+
+
+sys.path.insert(0, "..")
+
+from androidtv.fleet_async import FleetAsync, FleetUpdate
+
+from .async_wrapper import awaiter
+
+
+class DeviceFake(object):
+    """A fake device whose ``update`` method takes ``delay`` seconds."""
+
+    def __init__(self, host, delay=0.0, exception=None):
+        self.host = host
+        self.port = 5555
+        self.delay = delay
+        self.exception = exception
+        self.updates = 0
+        self.closed = False
+
+    async def update(self, **kwargs):
+        self.updates += 1
+        await asyncio.sleep(self.delay)
+        if self.exception:
+            raise self.exception
+        return (self.host, kwargs)
+
+    async def adb_close(self):
+        self.closed = True
+
+
+class TestFleetAsync(unittest.TestCase):
+    def setUp(self):
+        self.fleet = FleetAsync(max_concurrency=2, timeout_s=0.5, jitter_s=0)
+
+    def test_add_remove(self):
+        """Test the ``FleetAsync.add`` and ``FleetAsync.remove`` methods."""
+        device = DeviceFake("HOST1")
+        self.assertEqual(self.fleet.add(device), "HOST1:5555")
+        self.assertEqual(self.fleet.add(DeviceFake("HOST2"), "tv2"), "tv2")
+        self.assertEqual(len(self.fleet), 2)
+        self.assertIn("tv2", self.fleet)
+
+        with self.assertRaises(ValueError):
+            self.fleet.add(DeviceFake("HOST1"))
+
+        self.assertIs(self.fleet.remove("HOST1:5555"), device)
+        self.assertNotIn("HOST1:5555", self.fleet)
+
+    @awaiter
+    async def test_setup(self):
+        """Test the ``FleetAsync.setup`` method."""
+        device = DeviceFake("HOST")
+
+        async def setup_fake(host, port, **kwargs):
+            self.assertEqual(kwargs, {"adbkey": "adbkey"})
+            return device
+
+        with patch("androidtv.fleet_async.setup", setup_fake):
+            self.assertIs(await self.fleet.setup("HOST", adbkey="adbkey"), device)
+
+        self.assertIs(self.fleet.devices["HOST:5555"], device)
+
+        await self.fleet.close()
+        self.assertTrue(device.closed)
+
+    @awaiter
+    async def test_update(self):
+        """Test that results are yielded as they complete."""
+        self.fleet.add(DeviceFake("SLOW", 0.2), "slow")
+        self.fleet.add(DeviceFake("FAST", 0.0), "fast")
+        self.fleet.add(DeviceFake("FAIL", 0.0, RuntimeError("failed")), "fail")
+        self.fleet.add(DeviceFake("HUNG", 5.0), "hung")
+
+        updates = [update async for update in self.fleet.update(lazy=False)]
+        names = [update.name for update in updates]
+
+        self.assertEqual(len(names), 4)
+        self.assertLess(names.index("fast"), names.index("slow"))
+        self.assertEqual(names[-1], "hung")
+
+        updates = {update.name: update for update in updates}
+        self.assertEqual(
+            updates["fast"], FleetUpdate("fast", self.fleet.devices["fast"], ("FAST", {"lazy": False}), None)
+        )
+        self.assertIsNone(updates["fail"].result)
+        self.assertIsInstance(updates["fail"].exception, RuntimeError)
+        self.assertIsInstance(updates["hung"].exception, asyncio.TimeoutError)
+
+    @awaiter
+    async def test_update_concurrency(self):
+        """Test that no more than ``max_concurrency`` devices are updated at once."""
+        active = 0
+        max_active = 0
+
+        class CountingDeviceFake(DeviceFake):
+            async def update(self, **kwargs):
+                nonlocal active, max_active
+                active += 1
+                max_active = max(active, max_active)
+                await asyncio.sleep(0.01)
+                active -= 1
+                return True
+
+        for i in range(6):
+            self.fleet.add(CountingDeviceFake("HOST{}".format(i)))
+
+        updates = await self.fleet.update_all(names=["HOST0:5555", "HOST1:5555", "HOST2:5555", "HOST3:5555"])
+        self.assertEqual(sorted(updates), ["HOST0:5555", "HOST1:5555", "HOST2:5555", "HOST3:5555"])
+        self.assertEqual(max_active, 2)
+
+    @awaiter
+    async def test_update_jitter(self):
+        """Test that updates are delayed by a random amount of time."""
+        self.fleet.add(DeviceFake("HOST"))
+
+        with patch("androidtv.fleet_async.random.uniform", return_value=0.25) as uniform, patch(
+            "androidtv.fleet_async.asyncio.sleep", wraps=asyncio.sleep
+        ) as sleep:
+            await self.fleet.update_all(jitter_s=1.0)
+            uniform.assert_called_once_with(0, 1.0)
+            sleep.assert_any_call(0.25)
+
+    @awaiter
+    async def test_update_stop_early(self):
+        """Test that the remaining updates are cancelled when the caller stops iterating."""
+        slow = DeviceFake("SLOW", 0.3)
+        self.fleet.add(DeviceFake("FAST"))
+        self.fleet.add(slow)
+
+        updates = self.fleet.update()
+        self.assertEqual((await updates.__anext__()).name, "FAST:5555")
+        await updates.aclose()
+        self.assertEqual(slow.updates, 1)
+
+    @awaiter
+    async def test_poll(self):
+        """Test the ``FleetAsync.poll`` method."""
+        fast = DeviceFake("FAST")
+        slow = DeviceFake("SLOW", 0.05)
+        self.fleet.add(fast)
+        self.fleet.add(slow)
+
+        names = []
+        async for update in self.fleet.poll(0.01):
+            names.append(update.name)
+            if len(names) == 6:
+                break
+
+        self.assertIn("SLOW:5555", names)
+        self.assertGreater(names.count("FAST:5555"), names.count("SLOW:5555"))
+
+        # Polling has stopped
+        updates = fast.updates
+        await asyncio.sleep(0.05)
+        self.assertEqual(fast.updates, updates)
+
+    @awaiter
+    async def test_poll_scheduler(self):
+        """Test that ``FleetAsync.poll`` uses a device's ``poll_scheduler``."""
+
+        class SchedulerFake(object):
+            def __init__(self):
+                self.states = []
+
+            def record_update(self, state):
+                self.states.append(state)
+
+        class ScheduledDeviceFake(DeviceFake):
+            async def wait_for_next_poll(self, interval_s):
+                self.intervals.append(interval_s)
+                await asyncio.sleep(0)
+
+        device = ScheduledDeviceFake("HOST")
+        device.intervals = []
+        device.poll_scheduler = SchedulerFake()
+        failing = ScheduledDeviceFake("FAIL", exception=RuntimeError("failed"))
+        failing.intervals = []
+        failing.poll_scheduler = SchedulerFake()
+        self.fleet.add(device)
+        self.fleet.add(failing)
+
+        updates = self.fleet.poll(60)
+        for _ in range(4):
+            await updates.__anext__()
+        await updates.aclose()
+
+        self.assertIn("HOST", device.poll_scheduler.states)
+        self.assertNotIn(None, device.poll_scheduler.states)
+        self.assertEqual(set(failing.poll_scheduler.states), {None})
+        self.assertEqual(set(device.intervals + failing.intervals), {60})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,139 @@
+import asyncio
+import sys
+import unittest
+from unittest.mock import patch
+
+
+sys.path.insert(0, "..")
+
+from androidtv import constants
+from androidtv.adb_manager.adb_manager_async import ADBPythonAsync
+from androidtv.androidtv.androidtv_sync import AndroidTVSync
+from androidtv.exceptions import LockNotAcquiredException
+from androidtv.metrics import CommandMetrics, Histogram, command_name
+
+from . import async_patchers
+from . import patchers
+from .async_wrapper import awaiter
+from .test_adb_manager_sync import LockedLock
+
+
+class TestCommandName(unittest.TestCase):
+    def test_command_name(self):
+        """Check that commands are named after the constants from which they are built."""
+        self.assertEqual(command_name(constants.CMD_STREAM_MUSIC), "stream_music")
+        self.assertEqual(command_name(constants.CMD_SCREEN_ON + constants.CMD_SUCCESS1_FAILURE0), "screen_on")
+        self.assertEqual(command_name(constants.CMD_CURRENT_APP13), "current_app")
+        self.assertEqual(command_name(constants.CMD_CURRENT_APP_GOOGLE_TV), "current_app")
+        self.assertEqual(command_name(constants.CMD_TURN_OFF_FIRETV), "turn_off")
+        self.assertEqual(command_name(constants.CMD_LAUNCH_APP.format("com.netflix.ninja")), "launch_app")
+        self.assertEqual(command_name(constants.CMD_LAUNCH_APP_FIRETV.format("com.netflix.ninja")), "launch_app")
+        self.assertEqual(command_name(constants.CMD_VOLUME_SET_COMMAND11.format(10)), "volume_set")
+        self.assertEqual(command_name("input keyevent 85"), "key")
+        self.assertEqual(
+            command_name("echo '{}screen_on' ; ( true ) ; echo".format(constants.FUSED_DELIMITER)), "fused"
+        )
+        self.assertEqual(command_name("ls /sdcard"), "other")
+
+
+class TestHistogram(unittest.TestCase):
+    def test_histogram(self):
+        """Check that the buckets are cumulative and include ``+Inf``."""
+        histogram = Histogram((1, 10))
+        for value in (0.5, 1, 5, 50):
+            histogram.observe(value)
+
+        self.assertListEqual(histogram.cumulative(), [(1, 2), (10, 3), (float("inf"), 4)])
+        self.assertDictEqual(histogram.as_dict(), {"buckets": {1: 2, 10: 3, float("inf"): 4}, "count": 4, "sum": 56.5})
+
+
+class TestCommandMetrics(unittest.TestCase):
+    def setUp(self):
+        self.metrics = CommandMetrics(latency_buckets_s=(0.1, 1.0), size_buckets=(10,))
+
+    def test_as_dict(self):
+        """Check the plain dictionary export."""
+        self.metrics.observe("HOST:5555", "screen_on", 0.05, 0.5, 1, False)
+        self.metrics.observe("HOST:5555", "screen_on", 2.0, None, None, True)
+
+        metrics = self.metrics.as_dict()["HOST:5555"]["screen_on"]
+        self.assertDictEqual(metrics["lock_wait_s"]["buckets"], {0.1: 1, 1.0: 1, float("inf"): 2})
+        self.assertEqual(metrics["transport_s"]["count"], 1)
+        self.assertEqual(metrics["response_size"]["sum"], 1)
+        self.assertEqual(metrics["failures"], 1)
+
+        self.metrics.reset()
+        self.assertDictEqual(self.metrics.as_dict(), {})
+
+    def test_prometheus(self):
+        """Check the Prometheus text export."""
+        self.metrics.observe("HOST:5555", "screen_on", 0.05, 0.5, 1, False)
+        text = self.metrics.prometheus()
+
+        self.assertIn("# TYPE androidtv_adb_lock_wait_seconds histogram\n", text)
+        self.assertIn(
+            'androidtv_adb_lock_wait_seconds_bucket{device="HOST:5555",command="screen_on",le="0.1"} 1\n', text
+        )
+        self.assertIn(
+            'androidtv_adb_transport_seconds_bucket{device="HOST:5555",command="screen_on",le="0.1"} 0\n', text
+        )
+        self.assertIn(
+            'androidtv_adb_transport_seconds_bucket{device="HOST:5555",command="screen_on",le="+Inf"} 1\n', text
+        )
+        self.assertIn('androidtv_adb_response_size_sum{device="HOST:5555",command="screen_on"} 1.0\n', text)
+        self.assertIn('androidtv_adb_failures_total{device="HOST:5555",command="screen_on"} 0\n', text)
+
+    def test_device_sync(self):
+        """Check that the commands sent by a device are measured."""
+        with patchers.PATCH_ADB_DEVICE_TCP:
+            atv = AndroidTVSync("HOST", 5555)
+
+        atv.set_metrics(self.metrics)
+        with patchers.patch_connect(True)["python"], patchers.patch_shell("1")["python"]:
+            atv.adb_connect()
+            self.assertTrue(atv.screen_on())
+            atv.media_play()
+
+        metrics = self.metrics.as_dict()["HOST:5555"]
+        self.assertEqual(metrics["screen_on"]["transport_s"]["count"], 1)
+        self.assertEqual(metrics["screen_on"]["response_size"]["sum"], 1)
+        self.assertEqual(metrics["key"]["failures"], 0)
+
+        with patch.object(atv._adb, "_adb_lock", LockedLock()):
+            with self.assertRaises(LockNotAcquiredException):
+                atv.screen_on()
+
+        metrics = self.metrics.as_dict()["HOST:5555"]
+        self.assertEqual(metrics["screen_on"]["failures"], 1)
+        self.assertEqual(metrics["screen_on"]["lock_wait_s"]["count"], 2)
+        self.assertEqual(metrics["screen_on"]["transport_s"]["count"], 1)
+
+        atv.set_metrics(None)
+        with patchers.patch_shell("1")["python"]:
+            atv.screen_on()
+        self.assertEqual(self.metrics.as_dict()["HOST:5555"]["screen_on"]["lock_wait_s"]["count"], 2)
+
+    @awaiter
+    async def test_lock_wait_async(self):
+        """Check that the time spent waiting for the lock is separated from the transport time."""
+        with async_patchers.PATCH_ADB_DEVICE_TCP, async_patchers.patch_connect(True)["python"]:
+            adb = ADBPythonAsync("HOST", 5555)
+            await adb.connect()
+
+        async def shell(cmd, *args, **kwargs):
+            await asyncio.sleep(0.05)
+            return "output"
+
+        adb.metrics = self.metrics
+        with patch.object(adb._adb, "shell", shell):
+            await asyncio.gather(adb.shell("cmd1"), adb.shell("cmd2"))
+
+        metrics = self.metrics.as_dict()["HOST:5555"]["other"]
+        self.assertEqual(metrics["lock_wait_s"]["count"], 2)
+        self.assertGreaterEqual(metrics["lock_wait_s"]["sum"], 0.04)
+        self.assertGreaterEqual(metrics["transport_s"]["sum"], 0.09)
+        self.assertEqual(metrics["response_size"]["sum"], 12)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,173 @@
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+
+sys.path.insert(0, "..")
+
+from androidtv import constants, setup
+from androidtv.firetv.firetv_async import FireTVAsync
+from androidtv.firetv.firetv_sync import FireTVSync
+from androidtv.profile_cache import ProfileCache
+from androidtv.setup_async import setup as setup_async, setup_many
+
+from . import async_patchers
+from . import patchers
+from .async_wrapper import awaiter
+
+
+FINGERPRINT = "SERIAL123\nAmazon/mantis/mantis:7.1.2/NS6296/4657:user/amazon-release-keys"
+
+DEVICE_PROPERTIES_OUTPUT = "Amazon\nAFTSSS\nSERIAL123\n7.1.2\nmantis"
+
+ETHMAC_OUTPUT = "link/ether ab:cd:ef:gh:ij:kl brd ff:ff:ff:ff:ff:ff"
+
+INSTALLED_APPS_OUTPUT = "package:com.netflix.ninja\npackage:com.amazon.tv.launcher\n"
+
+DEVICE_PROPERTIES_DICT = {
+    "manufacturer": "Amazon",
+    "model": "AFTSSS",
+    "serialno": "SERIAL123",
+    "sw_version": "7.1.2",
+    "product_id": "mantis",
+    "ethmac": "ab:cd:ef:gh:ij:kl",
+    "wifimac": None,
+}
+
+#: The responses to the commands that are sent when the profile is not in the cache
+DISCOVERY_RESPONSES = [FINGERPRINT, DEVICE_PROPERTIES_OUTPUT, ETHMAC_OUTPUT, None, INSTALLED_APPS_OUTPUT]
+
+
+class TestProfileCache(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, "profiles.json")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_get_set(self):
+        """Check that profiles are persisted and only returned if the fingerprint matches."""
+        cache = ProfileCache(self.path)
+        self.assertIsNone(cache.get("HOST:5555", FINGERPRINT))
+
+        cache.set("HOST:5555", FINGERPRINT, {"installed_apps": []})
+        self.assertTrue(os.path.exists(self.path))
+        self.assertFalse(os.path.exists(self.path + ".tmp"))
+
+        cache = ProfileCache(self.path)
+        self.assertEqual(cache.get("HOST:5555", FINGERPRINT), {"installed_apps": [], "fingerprint": FINGERPRINT})
+        self.assertIsNone(cache.get("HOST:5555", "OTHER"))
+        self.assertIsNone(cache.get("HOST:5555", None))
+        self.assertIsNone(cache.get("OTHER:5555", FINGERPRINT))
+
+        cache.invalidate("HOST:5555")
+        self.assertIsNone(ProfileCache(self.path).get("HOST:5555", FINGERPRINT))
+
+    def test_invalid_file(self):
+        """Check that an unreadable or outdated file is treated as an empty cache."""
+        with open(self.path, "w") as f:
+            f.write("not json")
+        self.assertDictEqual(ProfileCache(self.path).load(), {})
+
+        with open(self.path, "w") as f:
+            json.dump({"version": constants.PROFILE_CACHE_VERSION - 1, "profiles": {"HOST:5555": {}}}, f)
+        self.assertDictEqual(ProfileCache(self.path).load(), {})
+
+    def test_write_order(self):
+        """Check that changes are tracked and that an older dump does not overwrite a newer one."""
+        cache = ProfileCache(self.path)
+        self.assertFalse(cache.unsaved)
+
+        cache.set("HOST1:5555", FINGERPRINT, {}, save=False)
+        self.assertTrue(cache.unsaved)
+        self.assertFalse(os.path.exists(self.path))
+        dump1 = cache.dump()
+
+        cache.set("HOST2:5555", FINGERPRINT, {}, save=False)
+        dump2 = cache.dump()
+
+        cache.write(dump2)
+        self.assertFalse(cache.unsaved)
+        cache.write(dump1)
+        self.assertSetEqual(set(ProfileCache(self.path).load()), {"HOST1:5555", "HOST2:5555"})
+
+    def test_setup(self):
+        """Check that ``setup`` only retrieves the device properties when they are not in the cache."""
+        cache = ProfileCache(self.path)
+
+        with patchers.PATCH_ADB_DEVICE_TCP, patchers.patch_connect(True)["python"], patchers.patch_shell(
+            DISCOVERY_RESPONSES
+        )["python"]:
+            ftv = setup("HOST", 5555, profile_cache=cache)
+            self.assertIsInstance(ftv, FireTVSync)
+            self.assertDictEqual(ftv.device_properties, DEVICE_PROPERTIES_DICT)
+            self.assertListEqual(ftv.installed_apps, ["com.netflix.ninja", "com.amazon.tv.launcher"])
+
+        # The max volume is stored once it is known
+        ftv.max_volume = 15
+        self.assertTrue(ftv.save_device_profile(cache))
+
+        with patchers.PATCH_ADB_DEVICE_TCP, patchers.patch_connect(True)["python"], patchers.patch_shell(FINGERPRINT)[
+            "python"
+        ]:
+            ftv = setup("HOST", 5555, profile_cache=ProfileCache(self.path))
+            self.assertIsInstance(ftv, FireTVSync)
+            self.assertEqual(ftv._adb._adb.shell_cmd, constants.CMD_DEVICE_FINGERPRINT)
+            self.assertDictEqual(ftv.device_properties, DEVICE_PROPERTIES_DICT)
+            self.assertListEqual(ftv.installed_apps, ["com.netflix.ninja", "com.amazon.tv.launcher"])
+            self.assertEqual(ftv.max_volume, 15)
+
+    def test_setup_unavailable(self):
+        """Check that nothing is stored if the device properties could not be determined."""
+        cache = ProfileCache(self.path)
+
+        with patchers.PATCH_ADB_DEVICE_TCP, patchers.patch_connect(True)["python"], patchers.patch_shell(None)[
+            "python"
+        ]:
+            setup("HOST", 5555, profile_cache=cache)
+
+        self.assertDictEqual(cache.load(), {})
+        self.assertFalse(os.path.exists(self.path))
+
+    @awaiter
+    async def test_setup_async(self):
+        """Check that ``setup_async`` only retrieves the device properties when they are not in the cache."""
+        with async_patchers.PATCH_ADB_DEVICE_TCP, async_patchers.patch_connect(True)[
+            "python"
+        ], async_patchers.patch_shell(DISCOVERY_RESPONSES)["python"]:
+            ftv = await setup_async("HOST", 5555, profile_cache=ProfileCache(self.path))
+            self.assertIsInstance(ftv, FireTVAsync)
+
+        with async_patchers.PATCH_ADB_DEVICE_TCP, async_patchers.patch_connect(True)[
+            "python"
+        ], async_patchers.patch_shell(FINGERPRINT)["python"]:
+            ftv = await setup_async("HOST", 5555, profile_cache=ProfileCache(self.path))
+            self.assertIsInstance(ftv, FireTVAsync)
+            self.assertDictEqual(ftv.device_properties, DEVICE_PROPERTIES_DICT)
+            self.assertListEqual(ftv.installed_apps, ["com.netflix.ninja", "com.amazon.tv.launcher"])
+
+    @awaiter
+    async def test_setup_many_async(self):
+        """Check that ``setup_many`` writes the profile cache once, after all of the devices have been set up."""
+        cache = ProfileCache(self.path)
+        configs = [{"host": "HOST1"}, {"host": "HOST2"}]
+
+        with async_patchers.PATCH_ADB_DEVICE_TCP, async_patchers.patch_connect(True)[
+            "python"
+        ], async_patchers.patch_shell(DISCOVERY_RESPONSES)["python"], patch.object(
+            cache, "write", wraps=cache.write
+        ) as write:
+            results = [result async for result in setup_many(configs, max_discoveries=1, profile_cache=cache)]
+
+        self.assertListEqual([result.exception for result in results], [None, None])
+        write.assert_called_once()
+        self.assertSetEqual(set(ProfileCache(self.path).load()), {"HOST1:5555", "HOST2:5555"})
+
+
+if __name__ == "__main__":
+    unittest.main()
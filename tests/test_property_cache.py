@@ -0,0 +1,99 @@
+import sys
+import unittest
+from unittest.mock import patch
+
+
+sys.path.insert(0, "..")
+
+from androidtv import constants
+from androidtv.androidtv.androidtv_sync import AndroidTVSync
+from androidtv.property_cache import PropertyCache
+
+from . import patchers
+from .test_androidtv_sync import STREAM_MUSIC_ON
+
+
+class TestPropertyCache(unittest.TestCase):
+    def test_get_set(self):
+        """Check that properties expire after their TTL and that only properties with a TTL are cached."""
+        cache = PropertyCache({"screen_on": 1.0})
+
+        with patch("androidtv.property_cache.monotonic", return_value=100.0):
+            cache.set("screen_on", False)
+            cache.set("current_app", "com.netflix.ninja")
+            cache.set("screen_on", None)
+
+        with patch("androidtv.property_cache.monotonic", return_value=100.5):
+            self.assertFalse(cache.get("screen_on"))
+            self.assertIsNone(cache.get("current_app"))
+
+        with patch("androidtv.property_cache.monotonic", return_value=101.0):
+            self.assertIsNone(cache.get("screen_on"))
+
+    def test_invalidate(self):
+        """Check that properties can be removed from the cache."""
+        cache = PropertyCache()
+        cache.set("screen_on", True)
+        cache.set("current_app", "com.netflix.ninja")
+
+        cache.invalidate("screen_on")
+        self.assertIsNone(cache.get("screen_on"))
+        self.assertEqual(cache.get("current_app"), "com.netflix.ninja")
+
+        cache.invalidate()
+        self.assertIsNone(cache.get("current_app"))
+
+
+class TestPropertyCacheDevice(unittest.TestCase):
+    def setUp(self):
+        with patchers.PATCH_ADB_DEVICE_TCP, patchers.patch_connect(True)["python"]:
+            self.atv = AndroidTVSync("HOST", 5555)
+            self.atv.adb_connect()
+
+        self.cache = self.atv.enable_property_cache()
+
+    def test_cached_properties(self):
+        """Check that cached properties are not retrieved again until a control command is sent."""
+        with patchers.patch_shell("1")["python"]:
+            self.assertTrue(self.atv.screen_on())
+
+        with patchers.patch_shell("0")["python"]:
+            self.assertTrue(self.atv.screen_on())
+            self.atv.media_play()
+            self.assertFalse(self.atv.screen_on())
+
+        self.atv.disable_property_cache()
+        with patchers.patch_shell("1")["python"]:
+            self.assertTrue(self.atv.screen_on())
+
+        # The cache is no longer attached to the device
+        self.cache.set("screen_on", False)
+        self.atv.media_play()
+        self.assertFalse(self.cache.get("screen_on"))
+
+    def test_unavailable(self):
+        """Check that nothing is cached if the device did not respond."""
+        with patchers.patch_shell(None)["python"]:
+            self.assertFalse(self.atv.screen_on())
+            self.assertIsNone(self.atv.current_app())
+
+        self.assertIsNone(self.cache.get("screen_on"))
+        self.assertIsNone(self.cache.get("current_app"))
+
+    def test_volume_up(self):
+        """Check that repeated volume commands only retrieve the volume once."""
+        with patchers.patch_shell(STREAM_MUSIC_ON)["python"]:
+            with patch.object(self.atv._adb, "shell", wraps=self.atv._adb.shell) as shell:
+                self.assertEqual(self.atv.volume_up(), 23.0 / 60)
+                self.assertEqual(self.atv.volume_up(), 24.0 / 60)
+                self.assertEqual(self.atv.volume_down(), 23.0 / 60)
+                self.assertEqual(self.atv.set_volume_level(0.5), 0.5)
+                self.assertEqual(self.atv.volume(), 30)
+
+        cmds = [call.args[0] for call in shell.call_args_list]
+        self.assertEqual(cmds.count(constants.CMD_STREAM_MUSIC), 1)
+        self.assertEqual(len(cmds), 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
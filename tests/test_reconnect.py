@@ -0,0 +1,142 @@
+import sys
+import unittest
+from unittest.mock import patch
+
+
+sys.path.insert(0, "..")
+
+from androidtv import constants
+from androidtv.androidtv.androidtv_async import AndroidTVAsync
+from androidtv.androidtv.androidtv_sync import AndroidTVSync
+from androidtv.reconnect import ReconnectSupervisor
+
+from . import async_patchers
+from . import patchers
+from .async_wrapper import awaiter
+
+
+class TestReconnectSupervisor(unittest.TestCase):
+    def setUp(self):
+        self.supervisor = ReconnectSupervisor(
+            initial_delay_s=1.0,
+            backoff_factor=2.0,
+            max_delay_s=3.0,
+            jitter=0.1,
+            failure_threshold=4,
+            open_duration_s=100.0,
+        )
+
+    def test_backoff(self):
+        """Check that the delay grows exponentially up to the maximum and then the circuit opens."""
+        with patch("androidtv.reconnect.random.uniform", return_value=0.0):
+            self.assertListEqual([self.supervisor.record_failure() for _ in range(3)], [1.0, 2.0, 3.0])
+            self.assertFalse(self.supervisor.circuit_open)
+            self.assertEqual(self.supervisor.health, constants.HEALTH_RECONNECTING)
+
+            self.assertEqual(self.supervisor.record_failure(), 100.0)
+            self.assertTrue(self.supervisor.circuit_open)
+            self.assertEqual(self.supervisor.health, constants.HEALTH_CIRCUIT_OPEN)
+
+            # A failed attempt after the circuit was open opens it again
+            self.assertEqual(self.supervisor.record_failure(), 100.0)
+
+        self.supervisor.record_success()
+        self.assertEqual(self.supervisor.failures, 0)
+        self.assertTrue(self.supervisor.allow_attempt())
+
+    def test_jitter(self):
+        """Check that the delay is randomly lengthened or shortened."""
+        with patch("androidtv.reconnect.random.uniform", return_value=0.1) as patch_uniform:
+            self.assertAlmostEqual(self.supervisor.record_failure(), 1.1)
+            patch_uniform.assert_called_once_with(-0.1, 0.1)
+
+    def test_allow_attempt(self):
+        """Check that no attempt is allowed until the delay has passed."""
+        self.assertTrue(self.supervisor.allow_attempt())
+
+        with patch("androidtv.reconnect.random.uniform", return_value=0.0), patch(
+            "androidtv.reconnect.monotonic", return_value=10.0
+        ):
+            self.supervisor.record_failure()
+            self.assertFalse(self.supervisor.allow_attempt())
+
+        with patch("androidtv.reconnect.monotonic", return_value=11.0):
+            self.assertTrue(self.supervisor.allow_attempt())
+
+
+class TestReconnectDevice(unittest.TestCase):
+    def setUp(self):
+        with patchers.PATCH_ADB_DEVICE_TCP:
+            self.atv = AndroidTVSync("HOST", 5555)
+
+    def test_health(self):
+        """Check the health of the connection with and without a supervisor."""
+        self.assertEqual(self.atv.health, constants.HEALTH_DISCONNECTED)
+
+        with patchers.patch_connect(True)["python"]:
+            self.assertTrue(self.atv.reconnect())
+            self.assertEqual(self.atv.health, constants.HEALTH_CONNECTED)
+
+        self.atv.enable_reconnect()
+        self.assertEqual(self.atv.health, constants.HEALTH_CONNECTED)
+
+        self.atv._adb.close()
+        self.assertEqual(self.atv.health, constants.HEALTH_RECONNECTING)
+
+        self.atv.disable_reconnect()
+        self.assertEqual(self.atv.health, constants.HEALTH_DISCONNECTED)
+
+    def test_reconnect(self):
+        """Check that reconnects are only attempted when the supervisor allows them."""
+        supervisor = self.atv.enable_reconnect(initial_delay_s=10.0, jitter=0.0, failure_threshold=2)
+
+        with patchers.patch_connect(False)["python"], patch.object(
+            self.atv, "adb_connect", wraps=self.atv.adb_connect
+        ) as adb_connect, patch("androidtv.reconnect.monotonic", return_value=100.0):
+            self.assertFalse(self.atv.reconnect())
+            adb_connect.assert_called_once_with(log_errors=True)
+
+            # Waiting for the backoff delay to pass
+            self.assertIsNone(self.atv.update()[0])
+            self.assertEqual(adb_connect.call_count, 1)
+
+            with patch("androidtv.reconnect.monotonic", return_value=110.0), self.assertLogs(
+                "androidtv.basetv.basetv_sync", level="WARNING"
+            ):
+                self.assertFalse(self.atv.reconnect())
+                adb_connect.assert_called_with(log_errors=False)
+
+            self.assertEqual(self.atv.health, constants.HEALTH_CIRCUIT_OPEN)
+
+        with patchers.patch_connect(True)["python"], patchers.patch_shell("")["python"], patch(
+            "androidtv.reconnect.monotonic", return_value=10000.0
+        ):
+            self.atv.update()
+            self.assertEqual(self.atv.health, constants.HEALTH_CONNECTED)
+            self.assertEqual(supervisor.failures, 0)
+
+    @awaiter
+    async def test_reconnect_async(self):
+        """Check that the async device reconnects before updating."""
+        with async_patchers.PATCH_ADB_DEVICE_TCP:
+            atv = AndroidTVAsync("HOST", 5555)
+
+        supervisor = atv.enable_reconnect(jitter=0.0)
+
+        with async_patchers.patch_connect(False)["python"]:
+            self.assertFalse(await atv.reconnect())
+            self.assertEqual(supervisor.failures, 1)
+
+            # Waiting for the backoff delay to pass
+            self.assertFalse(await atv.reconnect())
+            self.assertEqual(supervisor.failures, 1)
+
+        supervisor.next_attempt = None
+        with async_patchers.patch_connect(True)["python"], async_patchers.patch_shell("")["python"]:
+            await atv.update()
+            self.assertEqual(atv.health, constants.HEALTH_CONNECTED)
+            self.assertEqual(supervisor.failures, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
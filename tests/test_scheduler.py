@@ -0,0 +1,111 @@
+import sys
+import unittest
+from unittest.mock import patch
+
+
+sys.path.insert(0, "..")
+
+from androidtv import constants
+from androidtv.androidtv.androidtv_sync import AndroidTVSync
+from androidtv.scheduler import AdaptivePollScheduler
+
+from . import patchers
+
+
+class TestAdaptivePollScheduler(unittest.TestCase):
+    def setUp(self):
+        self.scheduler = AdaptivePollScheduler(
+            state_intervals_s={constants.STATE_PLAYING: 2.0, constants.STATE_OFF: 60.0},
+            default_interval_s=5.0,
+            min_interval_s=1.0,
+            max_interval_s=120.0,
+            burst_interval_s=0.5,
+            burst_duration_s=10.0,
+            unavailable_interval_s=5.0,
+            backoff_factor=2.0,
+        )
+
+    def test_default_state_intervals(self):
+        """Check that the default state intervals are copied."""
+        scheduler = AdaptivePollScheduler()
+        self.assertDictEqual(scheduler.state_intervals_s, constants.DEFAULT_POLL_STATE_INTERVALS_S)
+        self.assertIsNot(scheduler.state_intervals_s, constants.DEFAULT_POLL_STATE_INTERVALS_S)
+
+    def test_state_intervals(self):
+        """Check that the interval depends on the state."""
+        self.assertEqual(self.scheduler.interval_s, 5.0)
+
+        self.scheduler.record_update(constants.STATE_PLAYING)
+        self.assertEqual(self.scheduler.interval_s, 2.0)
+
+        self.scheduler.record_update(constants.STATE_OFF)
+        self.assertEqual(self.scheduler.interval_s, 60.0)
+
+        self.scheduler.record_update(constants.STATE_IDLE)
+        self.assertEqual(self.scheduler.interval_s, 5.0)
+
+    def test_burst(self):
+        """Check that the interval is shortened for ``burst_duration_s`` seconds after a command."""
+        self.scheduler.record_update(constants.STATE_OFF)
+
+        with patch("androidtv.scheduler.time.time", return_value=100.0):
+            self.scheduler.record_command("turn_on")
+            self.assertEqual(self.scheduler.interval_s, 1.0)
+
+        with patch("androidtv.scheduler.time.time", return_value=109.0):
+            self.assertEqual(self.scheduler.interval_s, 1.0)
+
+        with patch("androidtv.scheduler.time.time", return_value=111.0):
+            self.assertEqual(self.scheduler.interval_s, 60.0)
+
+    def test_backoff(self):
+        """Check that the interval grows exponentially while the device is unavailable."""
+        self.scheduler.record_update(constants.STATE_PLAYING)
+        self.scheduler.record_command()
+
+        intervals = []
+        for _ in range(7):
+            self.scheduler.record_update(None)
+            intervals.append(self.scheduler.interval_s)
+
+        self.assertListEqual(intervals, [5.0, 10.0, 20.0, 40.0, 80.0, 120.0, 120.0])
+        self.assertEqual(self.scheduler.failures, 7)
+
+        self.scheduler.record_update(constants.STATE_OFF)
+        self.assertEqual(self.scheduler.failures, 0)
+        self.assertEqual(self.scheduler.state, constants.STATE_OFF)
+
+    def test_backoff_overflow(self):
+        """Check that the interval stays at the maximum after many consecutive failed updates."""
+        for _ in range(1100):
+            self.scheduler.record_update(None)
+
+        self.assertEqual(self.scheduler.interval_s, 120.0)
+
+        scheduler = AdaptivePollScheduler(backoff_factor=2)
+        for _ in range(1100):
+            scheduler.record_update(None)
+
+        self.assertEqual(scheduler.interval_s, scheduler.max_interval_s)
+
+    def test_attach(self):
+        """Check that commands sent to an attached device start a burst."""
+        with patchers.PATCH_ADB_DEVICE_TCP:
+            atv = AndroidTVSync("HOST", 5555)
+
+        self.scheduler.record_update(constants.STATE_OFF)
+        detach = self.scheduler.attach(atv)
+
+        with patchers.patch_connect(True)["python"], patchers.patch_shell("")["python"]:
+            atv.adb_connect()
+            atv.media_play()
+            self.assertEqual(self.scheduler.interval_s, 1.0)
+
+            detach()
+            self.scheduler._burst_until = None
+            atv.media_play()
+            self.assertEqual(self.scheduler.interval_s, 60.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,274 @@
+import asyncio
+import struct
+import sys
+import unittest
+from unittest.mock import patch
+import zlib
+
+
+sys.path.insert(0, "..")
+
+from androidtv import constants
+from androidtv.androidtv.androidtv_async import AndroidTVAsync
+from androidtv.androidtv.androidtv_sync import AndroidTVSync
+from androidtv.screencap import (
+    ScreencapGeometry,
+    crop_region,
+    encode_png,
+    parse_raw_screencap,
+    parse_screencap_geometry,
+    pixel_ranges,
+    ranges_cmd,
+    region_ranges,
+    screencap_hash,
+)
+
+from . import async_patchers
+from . import patchers
+from .async_wrapper import awaiter
+
+
+PIXELS = bytes(range(24))
+
+RAW_SCREENCAP = struct.pack("<IIII", 3, 2, constants.SCREENCAP_PIXEL_FORMAT_RGBA_8888, 0) + PIXELS
+
+GEOMETRY_OUTPUT = "          3          2          1          0\n40\n"
+
+GEOMETRY = ScreencapGeometry(3, 2, constants.SCREENCAP_PIXEL_FORMAT_RGBA_8888, 16)
+
+
+def decode_png(png):
+    """Get the width, height, and uncompressed image data from a PNG image that was created by `encode_png`."""
+    assert png.startswith(b"\x89PNG\r\n\x1a\n")
+    width, height = struct.unpack_from(">II", png, 16)
+    idat_length = struct.unpack_from(">I", png, 33)[0]
+    assert png[37:41] == b"IDAT"
+    return width, height, zlib.decompress(png[41 : 41 + idat_length])
+
+
+class TestParseRawScreencap(unittest.TestCase):
+    def test_header(self):
+        """Check that the 12-byte and 16-byte headers are both parsed."""
+        screencap = parse_raw_screencap(RAW_SCREENCAP)
+        self.assertEqual(screencap[:3], (3, 2, constants.SCREENCAP_PIXEL_FORMAT_RGBA_8888))
+        self.assertEqual(bytes(screencap.pixels), PIXELS)
+
+        screencap = parse_raw_screencap(RAW_SCREENCAP[:12] + PIXELS)
+        self.assertEqual(bytes(screencap.pixels), PIXELS)
+
+    def test_crlf(self):
+        """Check that the "\\n" -> "\\r\\n" conversion by older devices is undone."""
+        screencap = parse_raw_screencap(RAW_SCREENCAP.replace(b"\n", b"\r\n"))
+        self.assertEqual(bytes(screencap.pixels), PIXELS)
+
+    def test_invalid(self):
+        """Check that ``None`` is returned for output that is not a raw screencap."""
+        self.assertIsNone(parse_raw_screencap(None))
+        self.assertIsNone(parse_raw_screencap(b"\x89PNG\r\n\x1a\n"))
+        self.assertIsNone(parse_raw_screencap(RAW_SCREENCAP[:-1]))
+        self.assertIsNone(parse_raw_screencap(struct.pack("<IIII", 3, 2, 99, 0) + PIXELS))
+
+
+class TestEncodePng(unittest.TestCase):
+    def test_encode_png(self):
+        """Check the encoded PNG image."""
+        png = encode_png(parse_raw_screencap(RAW_SCREENCAP))
+        self.assertTupleEqual(decode_png(png), (3, 2, b"\x00" + PIXELS[:12] + b"\x00" + PIXELS[12:]))
+
+    def test_scale(self):
+        """Check that every ``scale``-th pixel is kept."""
+        png = encode_png(parse_raw_screencap(RAW_SCREENCAP), scale=2)
+        self.assertTupleEqual(decode_png(png), (2, 1, b"\x00" + PIXELS[:4] + PIXELS[8:12]))
+
+    def test_pixel_formats(self):
+        """Check that each pixel format is converted to RGBA or RGB."""
+        for pixel_format, color_type, data in [
+            (constants.SCREENCAP_PIXEL_FORMAT_RGBX_8888, 2, bytes(b for i, b in enumerate(PIXELS) if i % 4 != 3)),
+            (
+                constants.SCREENCAP_PIXEL_FORMAT_BGRA_8888,
+                6,
+                bytes(PIXELS[i - i % 4 + (2, 1, 0, 3)[i % 4]] for i in range(24)),
+            ),
+        ]:
+            with self.subTest(pixel_format=pixel_format):
+                png = encode_png(parse_raw_screencap(struct.pack("<III", 3, 2, pixel_format) + PIXELS))
+                self.assertEqual(png[25], color_type)
+                self.assertTupleEqual(
+                    decode_png(png), (3, 2, b"\x00" + data[: len(data) // 2] + b"\x00" + data[len(data) // 2 :])
+                )
+
+        rgb_888 = parse_raw_screencap(struct.pack("<III", 2, 2, constants.SCREENCAP_PIXEL_FORMAT_RGB_888) + PIXELS[:12])
+        self.assertEqual(encode_png(rgb_888)[25], 2)
+        self.assertTupleEqual(decode_png(encode_png(rgb_888)), (2, 2, b"\x00" + PIXELS[:6] + b"\x00" + PIXELS[6:12]))
+        self.assertTupleEqual(decode_png(encode_png(rgb_888, scale=2)), (1, 1, b"\x00" + PIXELS[:3]))
+
+        # Red, green, blue, white, black, and a mix (R = 16/31, G = 32/63, B = 8/31) in RGB_565
+        rgb_565 = parse_raw_screencap(
+            struct.pack(
+                "<III6H", 3, 2, constants.SCREENCAP_PIXEL_FORMAT_RGB_565, 0xF800, 0x07E0, 0x001F, 0xFFFF, 0, 0x8408
+            )
+        )
+        self.assertEqual(encode_png(rgb_565)[25], 2)
+        self.assertTupleEqual(
+            decode_png(encode_png(rgb_565)),
+            (3, 2, b"\x00\xff\x00\x00\x00\xff\x00\x00\x00\xff\x00\xff\xff\xff\x00\x00\x00\x83\x81\x41"),
+        )
+        self.assertTupleEqual(decode_png(encode_png(rgb_565, scale=2)), (2, 1, b"\x00\xff\x00\x00\x00\x00\xff"))
+
+    def test_unsupported(self):
+        """Check that an unknown pixel format raises a ``ValueError``."""
+        with self.assertRaises(ValueError):
+            encode_png(parse_raw_screencap(RAW_SCREENCAP)._replace(pixel_format=99))
+
+
+class TestSampling(unittest.TestCase):
+    def test_parse_screencap_geometry(self):
+        """Check that the header size is determined from the size of the raw screencap."""
+        self.assertEqual(parse_screencap_geometry(GEOMETRY_OUTPUT), GEOMETRY)
+        self.assertEqual(parse_screencap_geometry("3 2 1 16909060\n36"), GEOMETRY._replace(header_size=12))
+
+        self.assertIsNone(parse_screencap_geometry(None))
+        self.assertIsNone(parse_screencap_geometry(""))
+        self.assertIsNone(parse_screencap_geometry("3 2 99 0\n40"))
+        self.assertIsNone(parse_screencap_geometry("3 2 1 0\n100"))
+        self.assertIsNone(parse_screencap_geometry("screencap: not found"))
+
+    def test_ranges(self):
+        """Check the byte ranges of pixels and regions."""
+        self.assertListEqual(pixel_ranges(GEOMETRY, [(0, 0), (2, 1)]), [(16, 4), (36, 4)])
+        self.assertListEqual(region_ranges(GEOMETRY, 1, 0, 2, 2), [(20, 20)])
+        self.assertListEqual(region_ranges(GEOMETRY, 0, 1, 3, 1), [(28, 12)])
+        self.assertListEqual(region_ranges(GEOMETRY, 0, 0, 3, 2), [(16, 24)])
+
+        with self.assertRaises(ValueError):
+            pixel_ranges(GEOMETRY, [(3, 0)])
+        with self.assertRaises(ValueError):
+            region_ranges(GEOMETRY, 1, 1, 2, 2)
+
+        region = crop_region(GEOMETRY, 2, 2, PIXELS[4:24])
+        self.assertEqual(region[:3], (2, 2, constants.SCREENCAP_PIXEL_FORMAT_RGBA_8888))
+        self.assertEqual(bytes(region.pixels), PIXELS[4:12] + PIXELS[16:24])
+        self.assertEqual(bytes(crop_region(GEOMETRY, 3, 2, PIXELS).pixels), PIXELS)
+
+        self.assertEqual(
+            ranges_cmd([(16, 4), (36, 4)]),
+            "screencap {0} && {{ tail -c +17 {0} | head -c 4 ; tail -c +37 {0} | head -c 4 ; }} ; rm -f {0}".format(
+                constants.SCREENCAP_RANGES_PATH
+            ),
+        )
+
+
+class TestScreencapDevice(unittest.TestCase):
+    def test_adb_screencap_raw(self):
+        """Check that a raw screencap is taken and encoded on the host."""
+        with patchers.PATCH_ADB_DEVICE_TCP, patchers.patch_connect(True)["python"]:
+            atv = AndroidTVSync("HOST", 5555)
+            atv.adb_connect()
+
+        with patchers.patch_shell(RAW_SCREENCAP)["python"]:
+            self.assertEqual(bytes(atv.adb_screencap_raw().pixels), PIXELS)
+            self.assertEqual(atv._adb._adb.shell_cmd, "screencap")
+            self.assertEqual(decode_png(atv.adb_screencap(raw=True))[:2], (3, 2))
+
+        for pixel_format in constants.SCREENCAP_PIXEL_FORMAT_SIZES:
+            size = 3 * 2 * constants.SCREENCAP_PIXEL_FORMAT_SIZES[pixel_format]
+            with patchers.patch_shell(struct.pack("<III", 3, 2, pixel_format) + PIXELS[:size])["python"]:
+                self.assertEqual(decode_png(atv.adb_screencap(raw=True, scale=2))[:2], (2, 1))
+
+        with patchers.patch_shell(b"")["python"]:
+            self.assertIsNone(atv.adb_screencap(raw=True))
+
+    def test_adb_screencap_pixels(self):
+        """Check that only the sampled pixels are transferred and that the geometry is only determined once."""
+        with patchers.PATCH_ADB_DEVICE_TCP, patchers.patch_connect(True)["python"]:
+            atv = AndroidTVSync("HOST", 5555)
+            atv.adb_connect()
+
+        with patchers.patch_shell([GEOMETRY_OUTPUT, PIXELS[:4] + PIXELS[20:]])["python"]:
+            self.assertListEqual(atv.adb_screencap_pixels([(0, 0), (2, 1)]), [PIXELS[:4], PIXELS[20:]])
+            self.assertEqual(atv._adb._adb.shell_cmd, ranges_cmd([(16, 4), (36, 4)]))
+
+        with patchers.patch_shell(PIXELS[12:])["python"]:
+            region = atv.adb_screencap_region(0, 1, 3, 1)
+            self.assertEqual(region[:3], (3, 1, constants.SCREENCAP_PIXEL_FORMAT_RGBA_8888))
+            self.assertEqual(bytes(region.pixels), PIXELS[12:])
+
+            # The output is incomplete
+            self.assertIsNone(atv.adb_screencap_pixels([(0, 0)]))
+
+        with patchers.patch_shell("")["python"]:
+            self.assertIsNone(atv.adb_screencap_geometry(refresh=True))
+            self.assertIsNone(atv.adb_screencap_pixels([(0, 0)]))
+            self.assertIsNone(atv.adb_screencap_region(0, 0, 1, 1))
+
+    @awaiter
+    async def test_adb_screencap_raw_async(self):
+        """Check that a raw screencap is taken and encoded on the host."""
+        with async_patchers.PATCH_ADB_DEVICE_TCP, async_patchers.patch_connect(True)["python"]:
+            atv = AndroidTVAsync("HOST", 5555)
+            await atv.adb_connect()
+
+        with async_patchers.patch_shell(RAW_SCREENCAP)["python"]:
+            self.assertEqual(decode_png(await atv.adb_screencap(raw=True, scale=2))[:2], (2, 1))
+            self.assertEqual(atv._adb._adb.shell_cmd, "screencap")
+
+        with async_patchers.patch_shell([GEOMETRY_OUTPUT, PIXELS[4:8]])["python"]:
+            self.assertListEqual(await atv.adb_screencap_pixels([(1, 0)]), [PIXELS[4:8]])
+
+        with async_patchers.patch_shell(PIXELS[4:12])["python"]:
+            self.assertEqual(bytes((await atv.adb_screencap_region(1, 0, 2, 1)).pixels), PIXELS[4:12])
+
+        # The rows of the region are extracted as a single byte range and cropped on the host
+        with async_patchers.patch_shell(PIXELS[4:24])["python"]:
+            region = await atv.adb_screencap_region(1, 0, 2, 2)
+            self.assertEqual(bytes(region.pixels), PIXELS[4:12] + PIXELS[16:24])
+            self.assertEqual(atv._adb._adb.shell_cmd, ranges_cmd([(20, 20)]))
+
+
+class TestScreencapCache(unittest.TestCase):
+    def test_screencap_hash(self):
+        """Check that the hash identifies the content of the image."""
+        self.assertEqual(len(screencap_hash(PIXELS)), 16)
+        self.assertEqual(screencap_hash(PIXELS), screencap_hash(bytes(PIXELS)))
+        self.assertNotEqual(screencap_hash(PIXELS), screencap_hash(PIXELS[1:]))
+
+    @awaiter
+    async def test_get_screencap(self):
+        """Check that concurrent callers share a screencap, which is reused until it is too old."""
+        with async_patchers.PATCH_ADB_DEVICE_TCP:
+            atv = AndroidTVAsync("HOST", 5555)
+
+        calls = []
+
+        async def adb_screencap(raw=False, scale=1):
+            calls.append((raw, scale))
+            await asyncio.sleep(0.01)
+            return PIXELS
+
+        with patch.object(atv, "adb_screencap", adb_screencap):
+            screencaps = await asyncio.gather(*[atv.get_screencap() for _ in range(3)])
+            self.assertEqual(len(calls), 1)
+            self.assertTrue(all(screencap == screencaps[0] for screencap in screencaps))
+            self.assertEqual(screencaps[0].image, PIXELS)
+            self.assertEqual(screencaps[0].hash, screencap_hash(PIXELS))
+
+            # The image is omitted if it has not changed
+            screencap = await atv.get_screencap(if_changed_since=screencaps[0].hash)
+            self.assertIsNone(screencap.image)
+            self.assertEqual(screencap.hash, screencaps[0].hash)
+            self.assertEqual(len(calls), 1)
+
+            # Raw screencaps are cached separately
+            await atv.get_screencap(raw=True, scale=2)
+            self.assertListEqual(calls, [(False, 1), (True, 2)])
+
+            atv.set_screencap_max_age(0)
+            self.assertEqual((await atv.get_screencap(if_changed_since="0")).image, PIXELS)
+            self.assertEqual(len(calls), 3)
+
+        with patch.object(atv, "adb_screencap", return_value=None, new_callable=async_patchers.AsyncMock):
+            self.assertIsNone(await atv.get_screencap())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -5,7 +5,7 @@ from unittest.mock import patch
 
 sys.path.insert(0, "..")
 
-from androidtv.setup_async import setup
+from androidtv.setup_async import setup, setup_many
 from androidtv.androidtv.androidtv_async import AndroidTVAsync
 from androidtv.firetv.firetv_async import FireTVAsync
 
@@ -75,6 +75,67 @@ class TestSetup(unittest.TestCase):
             self.assertIsInstance(atv, FireTVAsync)
             self.assertDictEqual(atv.device_properties, DEVICE_PROPERTIES_DICT2)
 
+    @awaiter
+    async def test_setup_many(self):
+        """Test that the ``setup_many`` function yields each device and loads the ADB keys once."""
+        configs = [
+            {"host": "HOST1"},
+            {"host": "HOST2", "device_class": "androidtv"},
+            {"host": "HOST3", "device_class": "INVALID"},
+        ]
+
+        async def load_adbkey(adbkey):
+            return "SIGNER:" + adbkey
+
+        with async_patchers.PATCH_ADB_DEVICE_TCP, async_patchers.patch_connect(True)[
+            self.PATCH_KEY
+        ], async_patchers.patch_shell(DEVICE_PROPERTIES_OUTPUT1)[self.PATCH_KEY], patch(
+            "androidtv.setup_async.ADBPythonAsync.load_adbkey", side_effect=load_adbkey
+        ) as patch_load_adbkey:
+            results = {
+                result.config["host"]: result
+                async for result in setup_many(configs, max_connects=1, max_discoveries=2, adbkey="adbkey")
+            }
+
+        patch_load_adbkey.assert_called_once_with("adbkey")
+
+        self.assertIsInstance(results["HOST1"].device, FireTVAsync)
+        self.assertEqual(results["HOST1"].device._adb._signer, "SIGNER:adbkey")
+        self.assertDictEqual(results["HOST1"].device.device_properties, DEVICE_PROPERTIES_DICT1)
+        self.assertIsNone(results["HOST1"].exception)
+
+        self.assertIsInstance(results["HOST2"].device, AndroidTVAsync)
+        self.assertIs(results["HOST2"].config, configs[1])
+
+        self.assertIsNone(results["HOST3"].device)
+        self.assertIsInstance(results["HOST3"].exception, ValueError)
+
+    @awaiter
+    async def test_setup_many_adbkey_error(self):
+        """Test that the ``setup_many`` function reports a missing ADB key for each device that uses it."""
+        configs = [{"host": "HOST1", "adbkey": "missing"}, {"host": "HOST2"}, {"host": "HOST3", "adbkey": "missing"}]
+
+        async def load_adbkey(adbkey):
+            if adbkey == "missing":
+                raise FileNotFoundError(adbkey)
+            return "SIGNER:" + adbkey
+
+        with async_patchers.PATCH_ADB_DEVICE_TCP, async_patchers.patch_connect(True)[
+            self.PATCH_KEY
+        ], async_patchers.patch_shell(DEVICE_PROPERTIES_OUTPUT1)[self.PATCH_KEY], patch(
+            "androidtv.setup_async.ADBPythonAsync.load_adbkey", side_effect=load_adbkey
+        ) as patch_load_adbkey:
+            results = {result.config["host"]: result async for result in setup_many(configs, adbkey="adbkey")}
+
+        self.assertEqual(patch_load_adbkey.call_count, 2)
+
+        self.assertIsInstance(results["HOST2"].device, FireTVAsync)
+        self.assertIsNone(results["HOST2"].exception)
+
+        for host in ("HOST1", "HOST3"):
+            self.assertIsNone(results[host].device)
+            self.assertIsInstance(results[host].exception, FileNotFoundError)
+
 
 if __name__ == "__main__":
     unittest.main()